@@ -2,11 +2,18 @@
 
 from __future__ import annotations
 
+import datetime
 import uuid
 
 from sqlalchemy.orm import Session
 
-from db.models import BacktestEquityCurve, BacktestRun, BacktestTradeLog
+from db.models import (
+    BacktestEquityCurve,
+    BacktestJob,
+    BacktestRun,
+    BacktestRunBlob,
+    BacktestTradeLog,
+)
 
 
 def get_runs(
@@ -31,6 +38,32 @@ def get_run_by_id(db: Session, run_id: uuid.UUID) -> BacktestRun | None:
     return db.query(BacktestRun).filter(BacktestRun.run_id == run_id).first()
 
 
+def get_cached_run(
+    db: Session, request_key: str, since: datetime.datetime
+) -> BacktestRun | None:
+    """Return the newest successful run for a request key started at or after since."""
+    return (
+        db.query(BacktestRun)
+        .filter(
+            BacktestRun.request_key == request_key,
+            BacktestRun.status == "success",
+            BacktestRun.started_at >= since,
+        )
+        .order_by(BacktestRun.started_at.desc())
+        .first()
+    )
+
+
+def get_job_by_id(db: Session, job_id: uuid.UUID) -> BacktestJob | None:
+    """Return a single async backtest job by ID."""
+    return db.query(BacktestJob).filter(BacktestJob.job_id == job_id).first()
+
+
+def get_run_blob(db: Session, run_id: uuid.UUID) -> BacktestRunBlob | None:
+    """Return the compact equity/trade blob of a run (None for row-stored runs)."""
+    return db.query(BacktestRunBlob).filter(BacktestRunBlob.run_id == run_id).first()
+
+
 def get_equity_curve(db: Session, run_id: uuid.UUID) -> list[BacktestEquityCurve]:
     """Return equity curve records for a backtest run."""
     return (
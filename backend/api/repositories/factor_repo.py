@@ -4,9 +4,12 @@ from __future__ import annotations
 
 import datetime
 
+import pandas as pd
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from db.models import FactorDaily
+from db.models import FactorDaily, FactorDailyWide
+from research_engine.factors import ALL_FACTOR_NAMES, FACTOR_VERSION
 
 
 def get_latest_factor(
@@ -44,3 +47,100 @@ def get_factors(
     if end_date:
         query = query.filter(FactorDaily.date <= end_date)
     return query.order_by(FactorDaily.date.asc()).offset(offset).limit(limit).all()
+
+
+def _resolve_factor_names(factor_names: list[str] | None) -> list[str]:
+    if factor_names is None:
+        return list(ALL_FACTOR_NAMES)
+    unknown = [name for name in factor_names if name not in ALL_FACTOR_NAMES]
+    if unknown:
+        raise ValueError(f"Unknown factor names: {unknown}. Available: {ALL_FACTOR_NAMES}")
+    return list(factor_names)
+
+
+def _pivot_long(db: Session, filters: list, names: list[str]) -> pd.DataFrame:
+    """Single factor_daily query pivoted to wide (fallback for rows not yet in the wide table)."""
+    stmt = (
+        select(FactorDaily.asset_id, FactorDaily.date, FactorDaily.factor_name, FactorDaily.value)
+        .where(*filters, FactorDaily.factor_name.in_(names))
+    )
+    long = pd.DataFrame(
+        db.execute(stmt).all(), columns=["asset_id", "date", "factor_name", "value"]
+    )
+    if long.empty:
+        return pd.DataFrame(columns=["asset_id", "date", *names])
+    wide = long.pivot_table(
+        index=["asset_id", "date"], columns="factor_name", values="value", aggfunc="first",
+    )
+    return wide.reindex(columns=names).reset_index()
+
+
+def _factor_frame(
+    db: Session,
+    asset_ids: list[str],
+    names: list[str],
+    start_date: datetime.date | None,
+    end_date: datetime.date | None,
+    version: str,
+) -> pd.DataFrame:
+    """Rows of (asset_id, date, *names) from factor_daily_wide (factor_daily fallback)."""
+
+    def _filters(model) -> list:
+        filters = [model.asset_id.in_(asset_ids), model.version == version]
+        if start_date:
+            filters.append(model.date >= start_date)
+        if end_date:
+            filters.append(model.date <= end_date)
+        return filters
+
+    stmt = (
+        select(FactorDailyWide.asset_id, FactorDailyWide.date,
+               *(getattr(FactorDailyWide, name) for name in names))
+        .where(*_filters(FactorDailyWide))
+    )
+    frame = pd.DataFrame(db.execute(stmt).all(), columns=["asset_id", "date", *names])
+
+    # Assets without wide rows (pre-backfill) are read from factor_daily in one query
+    missing = sorted(set(asset_ids) - set(frame["asset_id"]))
+    if missing:
+        filters = _filters(FactorDaily)
+        filters[0] = FactorDaily.asset_id.in_(missing)
+        fallback = _pivot_long(db, filters, names)
+        if not fallback.empty:
+            frame = fallback if frame.empty else pd.concat([frame, fallback], ignore_index=True)
+
+    frame["date"] = pd.to_datetime(frame["date"])
+    frame[names] = frame[names].astype(float)
+    return frame
+
+
+def get_factor_frame(
+    db: Session,
+    asset_id: str,
+    factor_names: list[str] | None = None,
+    start_date: datetime.date | None = None,
+    end_date: datetime.date | None = None,
+    version: str = FACTOR_VERSION,
+) -> pd.DataFrame:
+    """Return factors for one asset as a DataFrame in a single query.
+
+    Index is a DatetimeIndex named ``date``; columns are the requested factor
+    names (default: all) with NaN where a factor is missing.
+    """
+    names = _resolve_factor_names(factor_names)
+    frame = _factor_frame(db, [asset_id], names, start_date, end_date, version)
+    return frame.set_index("date").sort_index()[names]
+
+
+def get_factor_panel(
+    db: Session,
+    asset_ids: list[str],
+    factor_names: list[str] | None = None,
+    start_date: datetime.date | None = None,
+    end_date: datetime.date | None = None,
+    version: str = FACTOR_VERSION,
+) -> pd.DataFrame:
+    """Return factors for several assets as one (asset_id, date)-indexed DataFrame."""
+    names = _resolve_factor_names(factor_names)
+    frame = _factor_frame(db, asset_ids, names, start_date, end_date, version)
+    return frame.set_index(["asset_id", "date"]).sort_index()[names]
@@ -3,21 +3,32 @@
 from __future__ import annotations
 
 import logging
+from typing import Literal
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from api.dependencies import get_db
 from api.repositories import backtest_repo
 from api.schemas.backtest import (
+    BacktestBootstrapResponse,
+    BacktestJobResponse,
     BacktestRunRequest,
     BacktestRunResponse,
     EquityCurveResponse,
     TradeLogResponse,
 )
 from api.schemas.common import PaginationParams
-from api.services.backtest_service import run_backtest_on_demand
+from api.services.backtest_job_service import JobQueueFull, stream_job_events, submit_job
+from api.services.backtest_service import (
+    bootstrap_equity_bands,
+    iter_equity_json,
+    load_equity_columns,
+    load_trades,
+    run_backtest_on_demand,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -39,6 +50,44 @@ def run_backtest_endpoint(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/backtests/jobs", response_model=BacktestJobResponse, status_code=202)
+def submit_backtest_job(
+    request: BacktestRunRequest,
+    db: Session = Depends(get_db),
+) -> BacktestJobResponse:
+    """Queue an on-demand backtest; poll the job or stream its events for progress."""
+    try:
+        job = submit_job(db, request)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except JobQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    return BacktestJobResponse.model_validate(job)
+
+
+@router.get("/backtests/jobs/{job_id}", response_model=BacktestJobResponse)
+def get_backtest_job(
+    job_id: UUID,
+    db: Session = Depends(get_db),
+) -> BacktestJobResponse:
+    """Return the status and progress of a backtest job."""
+    job = backtest_repo.get_job_by_id(db, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Backtest job not found")
+    return BacktestJobResponse.model_validate(job)
+
+
+@router.get("/backtests/jobs/{job_id}/events")
+def stream_backtest_job(
+    job_id: UUID,
+    db: Session = Depends(get_db),
+) -> StreamingResponse:
+    """SSE stream of job progress; ends once the job succeeds or fails."""
+    if backtest_repo.get_job_by_id(db, job_id) is None:
+        raise HTTPException(status_code=404, detail="Backtest job not found")
+    return StreamingResponse(stream_job_events(job_id), media_type="text/event-stream")
+
+
 @router.get("/backtests", response_model=list[BacktestRunResponse])
 def list_backtests(
     strategy_id: str | None = Query(default=None, description="전략 ID"),
@@ -73,13 +122,13 @@ def get_backtest(
 def get_backtest_equity(
     run_id: UUID,
     db: Session = Depends(get_db),
-) -> list[EquityCurveResponse]:
-    """Return equity curve for a backtest run."""
+) -> StreamingResponse:
+    """Return equity curve for a backtest run (JSON array streamed in chunks)."""
     run = backtest_repo.get_run_by_id(db, run_id)
     if run is None:
         raise HTTPException(status_code=404, detail="Backtest run not found")
-    rows = backtest_repo.get_equity_curve(db, run_id)
-    return [EquityCurveResponse.model_validate(r) for r in rows]
+    columns = load_equity_columns(db, run_id)
+    return StreamingResponse(iter_equity_json(run_id, columns), media_type="application/json")
 
 
 @router.get("/backtests/{run_id}/trades", response_model=list[TradeLogResponse])
@@ -91,5 +140,26 @@ def get_backtest_trades(
     run = backtest_repo.get_run_by_id(db, run_id)
     if run is None:
         raise HTTPException(status_code=404, detail="Backtest run not found")
-    rows = backtest_repo.get_trades(db, run_id)
-    return [TradeLogResponse.model_validate(r) for r in rows]
+    return [TradeLogResponse.model_validate(t) for t in load_trades(db, run_id)]
+
+
+@router.get("/backtests/{run_id}/bootstrap", response_model=BacktestBootstrapResponse)
+def get_backtest_bootstrap(
+    run_id: UUID,
+    paths: int = Query(default=2000, ge=100, le=20_000, description="리샘플 경로 수"),
+    method: Literal["stationary", "block"] = Query(default="stationary"),
+    block_size: int = Query(default=20, ge=1, le=252, description="(평균) 블록 길이(일)"),
+    seed: int | None = Query(default=None),
+    db: Session = Depends(get_db),
+) -> BacktestBootstrapResponse:
+    """Return bootstrap percentile bands of CAGR/MDD/Sharpe/Sortino for a run."""
+    run = backtest_repo.get_run_by_id(db, run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail="Backtest run not found")
+    equity = load_equity_columns(db, run_id)["equity"]
+    try:
+        return bootstrap_equity_bands(
+            run_id, equity, n_paths=paths, method=method, block_size=block_size, seed=seed
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -4,6 +4,7 @@ from fastapi import APIRouter, Response
 from sqlalchemy import text
 
 from db.session import SessionLocal
+from db.ts_cache import get_ts_cache
 
 router = APIRouter(prefix="/v1", tags=["health"])
 
@@ -24,6 +25,12 @@ def health_check():
     return {"status": "ok", "db": db_status}
 
 
+@router.get("/health/cache")
+def cache_stats():
+    """In-process price/factor cache counters (entries, bytes, hits/misses, evictions)."""
+    return get_ts_cache().stats()
+
+
 @router.get("/ready")
 def readiness_check():
     """Readiness probe. Returns 503 when DB is unreachable."""
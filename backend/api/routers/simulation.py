@@ -5,6 +5,10 @@ from sqlalchemy.orm import Session
 
 from api.dependencies import get_db
 from api.schemas.simulation import (
+    RollingEntryRequest,
+    RollingEntryResponse,
+    SimulateBatchRequest,
+    SimulateBatchResponse,
     SimulatePortfolioRequest,
     SimulatePortfolioResponse,
     SimulateReplayRequest,
@@ -50,10 +54,38 @@ def simulate_portfolio(
     req: SimulatePortfolioRequest,
     db: Session = Depends(get_db),
 ) -> SimulatePortfolioResponse:
-    """Tab C — 고정 비중 포트폴리오 적립식 (연 리밸런싱)."""
+    """Tab C — 고정 비중 포트폴리오 적립식 (preset 또는 사용자 비중, 리밸런싱 주기 선택)."""
     try:
         return simulation_service.simulate_portfolio(db, req)
     except ValueError as e:
         raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/rolling-entry", response_model=RollingEntryResponse)
+def simulate_rolling_entry(
+    req: RollingEntryRequest,
+    db: Session = Depends(get_db),
+) -> RollingEntryResponse:
+    """진입 시점 분석 — 모든 월 시작일 × 적립 기간 KPI 행렬 (heatmap)."""
+    try:
+        return simulation_service.simulate_rolling_entry(db, req)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/batch", response_model=SimulateBatchResponse)
+def simulate_batch(
+    req: SimulateBatchRequest,
+    db: Session = Depends(get_db),
+) -> SimulateBatchResponse:
+    """여러 시나리오 비교 — 데이터 한 번 로드, 병렬 계산, 열 배열 응답."""
+    try:
+        return simulation_service.simulate_batch(db, req)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import datetime
+from typing import Literal
 from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict
@@ -15,6 +16,9 @@ class BacktestRunRequest(BaseModel):
     end_date: datetime.date | None = None
     initial_cash: float = 10_000_000
     commission_pct: float = 0.001
+    # asset_id="ALL" only: shared-cash portfolio sizing / periodic rebalancing
+    sizing: Literal["equal", "active"] = "equal"
+    rebalance: Literal["W", "M", "Q", "Y"] | None = None
 
 
 class BacktestRunResponse(BaseModel):
@@ -30,6 +34,22 @@ class BacktestRunResponse(BaseModel):
     ended_at: datetime.datetime | None = None
 
 
+class BacktestJobResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    job_id: UUID
+    status: str  # queued | running | success | failed
+    stage: str | None = None
+    progress_current: int = 0
+    progress_total: int = 0
+    message: str | None = None
+    run_id: UUID | None = None
+    error_message: str | None = None
+    created_at: datetime.datetime
+    started_at: datetime.datetime | None = None
+    ended_at: datetime.datetime | None = None
+
+
 class EquityCurveResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -53,3 +73,18 @@ class TradeLogResponse(BaseModel):
     shares: float
     pnl: float | None = None
     cost: float | None = None
+
+
+class BootstrapMetricBand(BaseModel):
+    point: float
+    mean: float
+    percentiles: dict[str, float]
+
+
+class BacktestBootstrapResponse(BaseModel):
+    run_id: UUID
+    method: str
+    block_size: int
+    n_paths: int
+    n_days: int
+    metrics: dict[str, BootstrapMetricBand]
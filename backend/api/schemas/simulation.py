@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from typing import Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 # ── 공통 ─────────────────────────────────────────────────────────────────────
 
@@ -62,13 +62,142 @@ class SimulateStrategyResponse(BaseModel):
 
 
 class SimulatePortfolioRequest(BaseModel):
-    preset_key: str = Field(..., description="preset 키 (QQQ_TLT_BTC 등)")
+    """preset_key 또는 weights 중 하나만 지정."""
+
+    preset_key: str | None = Field(None, description="preset 키 (QQQ_TLT_BTC 등)")
+    weights: dict[str, float] | None = Field(
+        None, description="사용자 비중 {asset_code: 비중} (합 = 1, 최대 10개 자산)"
+    )
     monthly_amount: int = Field(..., ge=100_000, le=10_000_000)
     period_years: Literal[3, 5, 10] = Field(10)
+    rebalance: Literal["none", "monthly", "quarterly", "yearly", "threshold"] = Field(
+        "yearly", description="리밸런싱 주기 (threshold = 비중 이탈 시)"
+    )
+    rebalance_threshold: float = Field(
+        0.05, gt=0, lt=1, description="threshold 모드 비중 이탈 허용폭"
+    )
+
+    @model_validator(mode="after")
+    def _check_allocation(self) -> SimulatePortfolioRequest:
+        _check_allocation(self.preset_key, self.weights)
+        return self
+
+
+def _check_allocation(preset_key: str | None, weights: dict[str, float] | None) -> None:
+    if (preset_key is None) == (weights is None):
+        raise ValueError("exactly one of preset_key or weights is required")
+    if weights is not None:
+        if not 1 <= len(weights) <= 10:
+            raise ValueError("weights must contain between 1 and 10 assets")
+        if any(w <= 0 for w in weights.values()):
+            raise ValueError("weights must be positive")
+        if abs(sum(weights.values()) - 1.0) > 1e-6:
+            raise ValueError("weights must sum to 1")
 
 
 class SimulatePortfolioResponse(BaseModel):
-    preset_key: str
+    preset_key: str  # 사용자 비중이면 "custom"
     preset_name: str
+    rebalance: str = "yearly"
+    rebalance_count: int = 0
     curve: list[EquityPointResponse]
     kpi: KpiResponse
+
+
+# ── 진입 시점 분석 (rolling entry) ────────────────────────────────────────────
+
+
+class RollingEntryRequest(BaseModel):
+    asset_code: str = Field(..., description="자산 코드 (QQQ / KS200 / WBI / JEPI 등)")
+    monthly_amount: int = Field(1_000_000, ge=100_000, le=10_000_000, description="월 적립금 (KRW)")
+    lookback_years: int = Field(20, ge=1, le=30, description="시작 월 후보를 찾을 과거 기간 (연)")
+    horizons_years: list[int] = Field(
+        [1, 3, 5, 10], min_length=1, max_length=10, description="적립 기간 목록 (연)"
+    )
+
+    @field_validator("horizons_years")
+    @classmethod
+    def _check_horizons(cls, v: list[int]) -> list[int]:
+        if any(h < 1 or h > 30 for h in v):
+            raise ValueError("horizons_years must be between 1 and 30")
+        return sorted(set(v))
+
+
+class RollingEntryResponse(BaseModel):
+    """(기간 × 시작 월) 행렬 — 행 = horizons_years, 열 = start_dates, 기간 부족 셀 = null."""
+
+    asset_code: str
+    monthly_amount: int
+    start_dates: list[str]
+    horizons_years: list[int]
+    total_deposit_krw: list[int]
+    final_asset_krw: list[list[float | None]]
+    total_return: list[list[float | None]]
+    annualized_return: list[list[float | None]]
+    yearly_worst_mdd: list[list[float | None]]
+
+
+# ── batch ─────────────────────────────────────────────────────────────────────
+
+
+class BatchScenario(BaseModel):
+    """한 시나리오 — kind별로 Tab A/B/C 단건 요청과 같은 필드를 쓴다."""
+
+    kind: Literal["replay", "strategy", "portfolio"]
+    asset_code: str | None = Field(None, description="replay / strategy 자산 코드")
+    strategy: Literal["A", "B"] | None = Field(None, description="strategy 전략 종류")
+    preset_key: str | None = Field(None, description="portfolio preset 키")
+    weights: dict[str, float] | None = Field(None, description="portfolio 사용자 비중")
+    monthly_amount: int = Field(1_000_000, ge=100_000, le=10_000_000)
+    period_years: Literal[3, 5, 10] = Field(10)
+    rebalance: Literal["none", "monthly", "quarterly", "yearly", "threshold"] = "yearly"
+    rebalance_threshold: float = Field(0.05, gt=0, lt=1)
+
+    @model_validator(mode="after")
+    def _check_kind_fields(self) -> BatchScenario:
+        if self.kind in ("replay", "strategy") and not self.asset_code:
+            raise ValueError(f"{self.kind} scenario requires asset_code")
+        if self.kind == "strategy" and self.strategy is None:
+            raise ValueError("strategy scenario requires strategy")
+        if self.kind == "portfolio":
+            _check_allocation(self.preset_key, self.weights)
+        return self
+
+    @property
+    def label(self) -> str:
+        if self.kind == "replay":
+            return self.asset_code
+        if self.kind == "strategy":
+            return f"{self.asset_code}:{self.strategy}"
+        return self.preset_key or "custom"
+
+
+class SimulateBatchRequest(BaseModel):
+    scenarios: list[BatchScenario] = Field(..., min_length=1, max_length=100)
+    include_curves: bool = Field(False, description="시나리오별 KRW 평가액 곡선 포함 여부")
+
+
+class BatchCurveResponse(BaseModel):
+    dates: list[str]
+    krw_value: list[float]
+
+
+class SimulateBatchResponse(BaseModel):
+    """열 배열 — i번째 원소 = scenarios[i]. 실패한 시나리오는 KPI null + error.
+
+    event_count는 strategy, rebalance_count는 portfolio 시나리오에만 값이 있다.
+    """
+
+    kind: list[str]
+    label: list[str]
+    monthly_amount: list[int]
+    period_years: list[int]
+    final_asset_krw: list[float | None]
+    total_return: list[float | None]
+    annualized_return: list[float | None]
+    yearly_worst_mdd: list[float | None]
+    total_deposit_krw: list[int | None]
+    event_count: list[int | None]
+    rebalance_count: list[int | None]
+    error: list[str | None]
+    curves: list[BatchCurveResponse | None] | None = None
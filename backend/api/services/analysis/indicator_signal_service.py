@@ -23,7 +23,8 @@ from dataclasses import dataclass
 
 from sqlalchemy.orm import Session
 
-from api.repositories import factor_repo, price_repo
+from api.repositories import factor_repo
+from db.ts_cache import get_ts_cache
 
 
 @dataclass
@@ -62,21 +63,19 @@ def _build_factor_series(
     start_date: datetime.date | None,
     end_date: datetime.date | None,
 ) -> dict[datetime.date, dict[str, float]]:
-    """Fetch factor data and organise as {date: {factor_name: value}}."""
+    """Fetch factor data (one query) and organise as {date: {factor_name: value}}."""
+    frame = factor_repo.get_factor_frame(
+        db,
+        asset_id,
+        factor_names=factor_names,
+        start_date=start_date,
+        end_date=end_date,
+    )
     result: dict[datetime.date, dict[str, float]] = {}
-    for fname in factor_names:
-        rows = factor_repo.get_factors(
-            db,
-            asset_id=asset_id,
-            factor_name=fname,
-            start_date=start_date,
-            end_date=end_date,
-            limit=5000,
-        )
-        for r in rows:
-            if r.value is None or math.isnan(r.value):
-                continue
-            result.setdefault(r.date, {})[fname] = r.value
+    for ts, row in zip(frame.index, frame.to_dict("records")):
+        values = {k: v for k, v in row.items() if not math.isnan(v)}
+        if values:
+            result[ts.date()] = values
     return result
 
 
@@ -86,15 +85,11 @@ def _build_price_map(
     start_date: datetime.date | None,
     end_date: datetime.date | None,
 ) -> dict[datetime.date, float]:
-    """Fetch prices and return {date: close}."""
-    rows = price_repo.get_prices(
-        db,
-        asset_id,
-        start_date=start_date,
-        end_date=end_date,
-        limit=5000,
+    """Return {date: close} from the shared time-series cache."""
+    series = get_ts_cache().close_series(
+        db, asset_id, start_date=start_date, end_date=end_date
     )
-    return {r.date: float(r.close) for r in rows if r.close}
+    return {ts.date(): float(v) for ts, v in series.items() if v}
 
 
 # ---------------------------------------------------------------------------
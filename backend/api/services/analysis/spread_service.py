@@ -8,7 +8,7 @@ from dataclasses import dataclass, field
 import pandas as pd
 from sqlalchemy.orm import Session
 
-from api.repositories import price_repo
+from db.ts_cache import get_ts_cache
 
 
 @dataclass
@@ -43,16 +43,11 @@ def _build_close_series(
     start_date: datetime.date | None,
     end_date: datetime.date | None,
 ) -> pd.Series:
-    """Fetch prices and build a close price series indexed by date."""
-    prices = price_repo.get_prices(
-        db, asset_id, start_date=start_date, end_date=end_date, limit=5000, offset=0
+    """Close price series indexed by date, from the shared time-series cache."""
+    series = get_ts_cache().close_series(
+        db, asset_id, start_date=start_date, end_date=end_date
     )
-    if not prices:
-        return pd.Series(dtype=float)
-    return pd.Series(
-        {p.date: float(p.close) for p in prices},
-        name=asset_id,
-    ).sort_index()
+    return pd.Series(series.to_numpy(), index=series.index.date, name=asset_id)
 
 
 def compute_spread(
@@ -0,0 +1,322 @@
+"""Asynchronous on-demand backtests — table-backed job queue + bounded worker threads.
+
+submit_job inserts a queued backtest_job row and returns immediately. Worker
+threads (backtest_job_workers per API process) claim the oldest queued job
+with a conditional UPDATE — candidates are picked with
+SELECT ... FOR UPDATE SKIP LOCKED on Postgres — so any number of API processes
+can share the queue without extra services. Each job runs the regular
+run_backtest_on_demand pipeline (result cache included); its progress is
+written back to the row, and stream_job_events turns row changes into SSE.
+Idle workers periodically requeue running jobs whose process died, so they
+neither stall nor hold backtest_job_max_pending slots until a restart.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import threading
+import time
+import uuid
+from collections.abc import AsyncGenerator, Callable
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from api.schemas.backtest import BacktestJobResponse, BacktestRunRequest
+from api.services.backtest_service import run_backtest_on_demand, validate_backtest_request
+from config.settings import settings
+from db.models import BacktestJob
+from db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+PENDING_STATUSES = ("queued", "running")
+TERMINAL_STATUSES = ("success", "failed")
+
+SessionFactory = Callable[[], Session]
+
+# submit_job: count + insert under one lock so concurrent submits cannot overshoot
+# backtest_job_max_pending (thread lock in-process, advisory lock across processes)
+_submit_lock = threading.Lock()
+_SUBMIT_ADVISORY_KEY = 0x62746A6F62  # "btjob"
+
+
+class JobQueueFull(RuntimeError):
+    """Too many queued/running jobs; the caller should retry later."""
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _session_factory() -> SessionFactory:
+    if SessionLocal is None:
+        raise RuntimeError("Database not configured (DATABASE_URL missing)")
+    return SessionLocal
+
+
+# ---------------------------------------------------------------------------
+# Queue operations
+# ---------------------------------------------------------------------------
+
+def submit_job(db: Session, request: BacktestRunRequest) -> BacktestJob:
+    """Validate and enqueue a backtest request, then wake the local workers.
+
+    Raises:
+        ValueError: Invalid strategy_id or asset_id.
+        JobQueueFull: backtest_job_max_pending jobs are already pending.
+    """
+    validate_backtest_request(request)
+    with _submit_lock:
+        if db.get_bind().dialect.name == "postgresql":
+            # held until commit/rollback: other processes' submits wait here
+            db.execute(select(func.pg_advisory_xact_lock(_SUBMIT_ADVISORY_KEY)))
+        pending = db.execute(
+            select(func.count()).select_from(BacktestJob)
+            .where(BacktestJob.status.in_(PENDING_STATUSES))
+        ).scalar()
+        if pending >= settings.backtest_job_max_pending:
+            db.rollback()
+            raise JobQueueFull(f"{pending} backtest jobs pending; retry later")
+
+        job = BacktestJob(
+            job_id=uuid.uuid4(),
+            status="queued",
+            request_json=request.model_dump(mode="json"),
+            stage="queued",
+            progress_current=0,
+            progress_total=0,
+            created_at=_now(),
+        )
+        db.add(job)
+        db.commit()
+    get_job_runner().wake()
+    return job
+
+
+def claim_next_job(db: Session) -> uuid.UUID | None:
+    """Atomically move the oldest queued job to running; None if nothing is queued."""
+    candidate = db.execute(
+        select(BacktestJob.job_id)
+        .where(BacktestJob.status == "queued")
+        .order_by(BacktestJob.created_at)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    ).scalar()
+    if candidate is None:
+        db.rollback()
+        return None
+
+    now = _now()
+    claimed = db.execute(
+        update(BacktestJob)
+        .where(BacktestJob.job_id == candidate, BacktestJob.status == "queued")
+        .values(status="running", stage="prepare", started_at=now, updated_at=now)
+    ).rowcount
+    db.commit()
+    return candidate if claimed == 1 else None
+
+
+def requeue_stale_jobs(db: Session, stale_seconds: float) -> int:
+    """Put running jobs without a progress update for stale_seconds back in the queue."""
+    cutoff = _now() - timedelta(seconds=stale_seconds)
+    count = db.execute(
+        update(BacktestJob)
+        .where(BacktestJob.status == "running", BacktestJob.updated_at < cutoff)
+        .values(status="queued", stage="queued", updated_at=_now())
+    ).rowcount
+    db.commit()
+    if count:
+        logger.warning("Requeued %d stale backtest jobs", count)
+    return count
+
+
+def _update_job(session_factory: SessionFactory, job_id: uuid.UUID, **values) -> None:
+    with session_factory() as db:
+        db.execute(
+            update(BacktestJob)
+            .where(BacktestJob.job_id == job_id)
+            .values(updated_at=_now(), **values)
+        )
+        db.commit()
+
+
+def run_job(session_factory: SessionFactory, job_id: uuid.UUID) -> None:
+    """Execute one claimed job and record its outcome on the row."""
+
+    def progress(stage: str, current: int, total: int, message: str | None = None) -> None:
+        _update_job(
+            session_factory, job_id,
+            stage=stage, progress_current=current, progress_total=total,
+            message=message[:200] if message else None,
+        )
+
+    with session_factory() as db:
+        job = db.get(BacktestJob, job_id)
+        request = BacktestRunRequest.model_validate(job.request_json)
+        try:
+            response = run_backtest_on_demand(request, db, progress=progress)
+        except Exception as e:
+            db.rollback()
+            logger.warning("Backtest job %s failed: %s", job_id, e)
+            _update_job(
+                session_factory, job_id,
+                status="failed", stage="done", error_message=str(e), ended_at=_now(),
+            )
+            return
+
+    _update_job(
+        session_factory, job_id,
+        status="success", stage="done", run_id=response.run_id, message=None,
+        ended_at=_now(),
+    )
+    logger.info("Backtest job %s done → run %s", job_id, response.run_id)
+
+
+# ---------------------------------------------------------------------------
+# Worker pool
+# ---------------------------------------------------------------------------
+
+class BacktestJobRunner:
+    """Fixed set of daemon threads draining the backtest_job queue."""
+
+    def __init__(
+        self,
+        session_factory: SessionFactory,
+        workers: int = 2,
+        poll_seconds: float = 5.0,
+    ):
+        self.session_factory = session_factory
+        self.workers = workers
+        self.poll_seconds = poll_seconds
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._requeue_lock = threading.Lock()
+        self._last_requeue = float("-inf")
+
+    def start(self) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            self._stop.clear()
+            self._requeue_stale(force=True)
+            for i in range(self.workers):
+                thread = threading.Thread(
+                    target=self._work, name=f"backtest-job-{i}", daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+        logger.info("Backtest job runner started (%d workers)", self.workers)
+
+    def wake(self) -> None:
+        """Signal idle workers that a job was queued."""
+        self._wake.set()
+
+    def stop(self, timeout: float | None = None) -> None:
+        with self._lock:
+            self._stop.set()
+            self._wake.set()
+            for thread in self._threads:
+                thread.join(timeout)
+            self._threads = []
+
+    def _requeue_stale(self, force: bool = False) -> None:
+        """Requeue orphaned running jobs, at most every stale_seconds / 4 per process.
+
+        Jobs of a crashed process stay "running" (and count toward
+        backtest_job_max_pending) until some live worker puts them back.
+        """
+        stale_seconds = settings.backtest_job_stale_seconds
+        now = time.monotonic()
+        with self._requeue_lock:
+            if not force and now - self._last_requeue < stale_seconds / 4:
+                return
+            self._last_requeue = now
+        with self.session_factory() as db:
+            requeue_stale_jobs(db, stale_seconds)
+
+    def _work(self) -> None:
+        while not self._stop.is_set():
+            try:
+                with self.session_factory() as db:
+                    job_id = claim_next_job(db)
+            except Exception as e:
+                logger.error("Backtest job claim failed: %s", e)
+                job_id = None
+            if job_id is None:
+                try:
+                    self._requeue_stale()
+                except Exception as e:
+                    logger.error("Stale backtest job requeue failed: %s", e)
+                self._wake.wait(self.poll_seconds)
+                self._wake.clear()
+                continue
+            try:
+                run_job(self.session_factory, job_id)
+            except Exception:
+                logger.exception("Backtest job %s crashed", job_id)
+
+
+_runner: BacktestJobRunner | None = None
+_runner_lock = threading.Lock()
+
+
+def get_job_runner() -> BacktestJobRunner:
+    """Process-wide runner, started on first use (sized from settings)."""
+    global _runner
+    if _runner is None:
+        with _runner_lock:
+            if _runner is None:
+                runner = BacktestJobRunner(
+                    _session_factory(),
+                    workers=settings.backtest_job_workers,
+                    poll_seconds=settings.backtest_job_poll_seconds,
+                )
+                runner.start()
+                _runner = runner
+    return _runner
+
+
+# ---------------------------------------------------------------------------
+# Progress streaming
+# ---------------------------------------------------------------------------
+
+def _sse(evt: dict) -> str:
+    """SSE data line from dict."""
+    return f"data: {json.dumps(evt, ensure_ascii=False)}\n\n"
+
+
+def _job_snapshot(session_factory: SessionFactory, job_id: uuid.UUID) -> dict | None:
+    with session_factory() as db:
+        job = db.get(BacktestJob, job_id)
+        if job is None:
+            return None
+        return BacktestJobResponse.model_validate(job).model_dump(mode="json")
+
+
+async def stream_job_events(
+    job_id: uuid.UUID,
+    session_factory: SessionFactory | None = None,
+    poll_seconds: float | None = None,
+) -> AsyncGenerator[str, None]:
+    """Yield an SSE event whenever the job row changes, until it finishes."""
+    session_factory = session_factory or _session_factory()
+    poll_seconds = poll_seconds if poll_seconds is not None else settings.backtest_job_sse_seconds
+    last: dict | None = None
+    while True:
+        snapshot = await asyncio.to_thread(_job_snapshot, session_factory, job_id)
+        if snapshot is None:
+            yield _sse({"type": "error", "detail": "Backtest job not found"})
+            return
+        if snapshot != last:
+            yield _sse({"type": "progress", **snapshot})
+            last = snapshot
+        if snapshot["status"] in TERMINAL_STATUSES:
+            yield _sse({"type": "done", "status": snapshot["status"]})
+            return
+        await asyncio.sleep(poll_seconds)
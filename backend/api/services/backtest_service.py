@@ -2,32 +2,122 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
 import logging
+import math
+import threading
+import uuid
+from collections.abc import Callable, Iterator
+from datetime import datetime, timedelta, timezone
 
+import numpy as np
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
-from api.schemas.backtest import BacktestRunRequest, BacktestRunResponse
+from api.repositories import backtest_repo
+from api.schemas.backtest import (
+    BacktestBootstrapResponse,
+    BacktestRunRequest,
+    BacktestRunResponse,
+    BootstrapMetricBand,
+)
+from config.settings import settings
+from db.models import PriceDaily
+from db.price_loader import load_price_frames
 from research_engine.backtest import BacktestConfig, run_backtest, run_backtest_multi
-from research_engine.backtest_store import store_backtest_result
-from research_engine.factors import compute_all_factors
+from research_engine.backtest_codec import TRADE_COLUMNS, decode_equity_curve, decode_trades
+from research_engine.backtest_store import (
+    _config_to_dict,
+    evict_backtest_runs,
+    store_backtest_result,
+)
+from research_engine.bootstrap import bootstrap_metrics, returns_from_equity
+from research_engine.factors import FACTOR_VERSION, compute_factors
 from research_engine.metrics import compute_metrics
-from research_engine.preprocessing import load_prices, preprocess
+from research_engine.preprocessing import load_prices, preprocess_prices
 from research_engine.strategies import STRATEGY_REGISTRY, get_strategy
 
 logger = logging.getLogger(__name__)
 
 VALID_ASSET_IDS = {"KS200", "005930", "000660", "SOXL", "BTC", "GC=F", "SI=F"}
 
+# progress(stage, current, total, message): stage is prepare | backtest | metrics | store
+ProgressCallback = Callable[[str, int, int, "str | None"], None]
+
+# Request keys being computed in this process → set when the run is stored
+_inflight: dict[str, threading.Event] = {}
+_inflight_lock = threading.Lock()
+
+
+def _data_version(db: Session, asset_ids: list[str]) -> str:
+    """Latest price ingest for the assets plus the factor version."""
+    latest = db.execute(
+        select(func.max(PriceDaily.ingested_at)).where(PriceDaily.asset_id.in_(asset_ids))
+    ).scalar()
+    return f"{latest.isoformat() if latest else ''}|{FACTOR_VERSION}"
+
+
+def backtest_request_key(
+    strategy,
+    asset_ids: list[str],
+    start: str | None,
+    end: str | None,
+    config: BacktestConfig,
+    data_version: str,
+) -> str:
+    """Content key of an on-demand backtest: identical inputs → identical key."""
+    payload = {
+        "strategy_id": strategy.strategy_id,
+        "params": vars(strategy),
+        "asset_ids": sorted(asset_ids),
+        "start": start,
+        "end": end,
+        "config": _config_to_dict(config),
+        "data_version": data_version,
+    }
+    raw = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _no_progress(stage: str, current: int, total: int, message: str | None = None) -> None:
+    pass
+
+
+def validate_backtest_request(request: BacktestRunRequest) -> None:
+    """Reject unknown strategy / asset ids.
+
+    Raises:
+        ValueError: Invalid strategy_id or asset_id.
+    """
+    if request.strategy_id not in STRATEGY_REGISTRY:
+        available = list(STRATEGY_REGISTRY.keys())
+        raise ValueError(
+            f"Unknown strategy: {request.strategy_id}. Available: {available}"
+        )
+    if request.asset_id.upper() != "ALL" and request.asset_id not in VALID_ASSET_IDS:
+        raise ValueError(
+            f"Unknown asset_id: {request.asset_id}. "
+            f"Available: {sorted(VALID_ASSET_IDS)} or 'ALL'"
+        )
+
 
 def run_backtest_on_demand(
     request: BacktestRunRequest,
     db: Session,
+    progress: ProgressCallback | None = None,
 ) -> BacktestRunResponse:
     """Execute a backtest and store results.
 
+    Identical requests (strategy and params, assets, dates, config and data
+    version) return the stored run while it is younger than
+    backtest_cache_ttl_hours; a duplicate arriving while the first is still
+    running waits for it instead of starting a second pipeline.
+
     Args:
         request: BacktestRunRequest with strategy/asset/config.
         db: SQLAlchemy session.
+        progress: Optional stage callback (asset i of N while preparing).
 
     Returns:
         BacktestRunResponse with run_id and metrics.
@@ -36,62 +126,195 @@ def run_backtest_on_demand(
         ValueError: Invalid strategy_id, asset_id, or insufficient data.
         RuntimeError: DB storage failure.
     """
-    # 1. Validate strategy_id
-    if request.strategy_id not in STRATEGY_REGISTRY:
-        available = list(STRATEGY_REGISTRY.keys())
-        raise ValueError(
-            f"Unknown strategy: {request.strategy_id}. Available: {available}"
-        )
-
-    # 2. Validate asset_id
+    # 1. Validate strategy_id / asset_id
+    validate_backtest_request(request)
     is_all = request.asset_id.upper() == "ALL"
-    if not is_all and request.asset_id not in VALID_ASSET_IDS:
-        raise ValueError(
-            f"Unknown asset_id: {request.asset_id}. "
-            f"Available: {sorted(VALID_ASSET_IDS)} or 'ALL'"
-        )
+    progress = progress or _no_progress
 
-    # 3. Build config
+    # 2. Build config
     config = BacktestConfig(
         initial_cash=request.initial_cash,
         commission_pct=request.commission_pct,
+        sizing=request.sizing,
+        rebalance=request.rebalance,
     )
 
     start = str(request.start_date) if request.start_date else None
     end = str(request.end_date) if request.end_date else None
 
-    # 4. Run pipeline
     strategy = get_strategy(request.strategy_id)
     asset_ids = sorted(VALID_ASSET_IDS) if is_all else [request.asset_id]
 
+    # 3. Reuse a stored run for an identical request, or wait for one in flight
+    if settings.backtest_cache_ttl_hours <= 0:
+        return _execute(db, strategy, asset_ids, is_all, config, start, end, None, progress)
+
+    key = backtest_request_key(
+        strategy, asset_ids, start, end, config, _data_version(db, asset_ids)
+    )
+    since = datetime.now(timezone.utc) - timedelta(hours=settings.backtest_cache_ttl_hours)
+    cached = backtest_repo.get_cached_run(db, key, since)
+    if cached is not None:
+        logger.info("Backtest cache hit %s → run %s", key[:12], cached.run_id)
+        return BacktestRunResponse.model_validate(cached)
+
+    with _inflight_lock:
+        pending = _inflight.get(key)
+        if pending is None:
+            _inflight[key] = threading.Event()
+
+    if pending is not None:
+        logger.info("Backtest %s already running, waiting for it", key[:12])
+        pending.wait(timeout=settings.backtest_inflight_wait_seconds)
+        cached = backtest_repo.get_cached_run(db, key, since)
+        if cached is not None:
+            return BacktestRunResponse.model_validate(cached)
+        # The first request failed or timed out: run it here without claiming the key
+        return _execute(db, strategy, asset_ids, is_all, config, start, end, key, progress)
+
+    try:
+        return _execute(db, strategy, asset_ids, is_all, config, start, end, key, progress)
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key).set()
+
+
+def _execute(db, strategy, asset_ids, is_all, config, start, end, request_key, progress):
+    """Run the pipeline, store the result and evict stale cached runs."""
     if is_all:
-        result = _run_multi(db, strategy, asset_ids, config, start, end)
+        result = _run_multi(db, strategy, asset_ids, config, start, end, progress)
     else:
-        result = _run_single(db, strategy, asset_ids[0], config, start, end)
+        result = _run_single(db, strategy, asset_ids[0], config, start, end, progress)
 
-    # 5. Compute metrics
+    progress("metrics", 0, 1, None)
     metrics = compute_metrics(result)
 
-    # 6. Store to DB
-    store_result = store_backtest_result(db, result, metrics)
+    progress("store", 0, 1, None)
+    store_result = store_backtest_result(db, result, metrics, request_key=request_key)
     if store_result.status != "success":
         raise RuntimeError(
             f"Backtest store failed: {'; '.join(store_result.errors)}"
         )
 
-    # 7. Fetch stored run and return response
-    from api.repositories import backtest_repo
+    if request_key is not None:
+        try:
+            if evict_backtest_runs(
+                db, settings.backtest_cache_ttl_hours, settings.backtest_cache_max_runs
+            ):
+                db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.warning("Backtest cache eviction failed: %s", e)
 
     run = backtest_repo.get_run_by_id(db, store_result.run_id)
     return BacktestRunResponse.model_validate(run)
 
 
-def _run_single(db, strategy, asset_id, config, start, end):
+def load_equity_columns(db: Session, run_id: uuid.UUID) -> dict[str, np.ndarray]:
+    """Equity curve of a run as arrays (date, equity, drawdown), blob or row storage."""
+    blob = backtest_repo.get_run_blob(db, run_id)
+    if blob is not None:
+        return decode_equity_curve(blob.equity_blob)
+    rows = backtest_repo.get_equity_curve(db, run_id)
+    return {
+        "date": np.array([row.date for row in rows], dtype="datetime64[D]"),
+        "equity": np.array([row.equity for row in rows], dtype=float),
+        "drawdown": np.array([row.drawdown for row in rows], dtype=float),
+    }
+
+
+def _json_number(value: float) -> str:
+    return repr(value) if math.isfinite(value) else "null"
+
+
+def iter_equity_json(
+    run_id: uuid.UUID,
+    columns: dict[str, np.ndarray],
+    chunk_rows: int = 2048,
+) -> Iterator[str]:
+    """Serialize equity columns as a JSON array of EquityCurveResponse objects, in chunks."""
+    row = '{{"run_id":' + json.dumps(str(run_id)) + ',"date":"{}","equity":{},"drawdown":{}}}'
+    dates = columns["date"].astype(str)
+    n = len(dates)
+    yield "["
+    for lo in range(0, n, chunk_rows):
+        hi = min(lo + chunk_rows, n)
+        equity = columns["equity"][lo:hi]
+        drawdown = columns["drawdown"][lo:hi]
+        # float repr is the JSON number text; NaN/Infinity are not JSON → null
+        fmt = repr if np.isfinite(equity).all() and np.isfinite(drawdown).all() else _json_number
+        chunk = ",".join(
+            map(
+                row.format,
+                dates[lo:hi].tolist(),
+                map(fmt, equity.tolist()),
+                map(fmt, drawdown.tolist()),
+            )
+        )
+        yield ("," if lo else "") + chunk
+    yield "]"
+
+
+def load_trades(db: Session, run_id: uuid.UUID) -> list[dict]:
+    """Trade log of a run as TradeLogResponse-shaped dicts, blob or row storage."""
+    blob = backtest_repo.get_run_blob(db, run_id)
+    if blob is not None:
+        return [
+            {"id": i, "run_id": run_id, **trade}
+            for i, trade in enumerate(decode_trades(blob.trades_blob), start=1)
+        ]
+    return [
+        {"id": row.id, "run_id": row.run_id, **{c: getattr(row, c) for c in TRADE_COLUMNS}}
+        for row in backtest_repo.get_trades(db, run_id)
+    ]
+
+
+def bootstrap_equity_bands(
+    run_id: uuid.UUID,
+    equity: np.ndarray,
+    n_paths: int = 2000,
+    method: str = "stationary",
+    block_size: int = 20,
+    seed: int | None = None,
+) -> BacktestBootstrapResponse:
+    """Bootstrap percentile bands of CAGR/MDD/Sharpe/Sortino from a stored equity curve.
+
+    Raises:
+        ValueError: Equity curve too short to resample.
+    """
+    result = bootstrap_metrics(
+        returns_from_equity(equity),
+        n_paths=n_paths,
+        method=method,
+        block_size=block_size,
+        seed=seed,
+    )
+    bands = result.percentiles()
+    return BacktestBootstrapResponse(
+        run_id=run_id,
+        method=result.method,
+        block_size=result.block_size,
+        n_paths=result.n_paths,
+        n_days=result.n_days,
+        metrics={
+            metric: BootstrapMetricBand(
+                point=result.point[metric],
+                mean=float(values.mean()),
+                percentiles=bands[metric],
+            )
+            for metric, values in result.samples.items()
+        },
+    )
+
+
+def _run_single(db, strategy, asset_id, config, start, end, progress=_no_progress):
     """Run single-asset backtest pipeline."""
+    progress("prepare", 0, 1, asset_id)
     prices = load_prices(db, asset_id, start=start, end=end)
-    processed = preprocess(prices, asset_id)
-    factors = compute_all_factors(processed)
-    signals = strategy.generate_signals(factors, asset_id)
+    processed = preprocess_prices(prices, asset_id)
+    factors = compute_factors(processed, strategy.required_factors)
+    signals = strategy.generate_signals(factors, asset_id, with_meta=False)
+    progress("backtest", 1, 1, asset_id)
     return run_backtest(
         prices=processed,
         signals=signals.signals,
@@ -101,16 +324,17 @@ def _run_single(db, strategy, asset_id, config, start, end):
     )
 
 
-def _run_multi(db, strategy, asset_ids, config, start, end):
+def _run_multi(db, strategy, asset_ids, config, start, end, progress=_no_progress):
     """Run multi-asset backtest pipeline."""
     price_dict = {}
     signal_dict = {}
-    for aid in asset_ids:
+    frames = load_price_frames(db, asset_ids, start=start, end=end)
+    for i, aid in enumerate(asset_ids):
+        progress("prepare", i, len(asset_ids), aid)
         try:
-            prices = load_prices(db, aid, start=start, end=end)
-            processed = preprocess(prices, aid)
-            factors = compute_all_factors(processed)
-            sig = strategy.generate_signals(factors, aid)
+            processed = preprocess_prices(frames[aid], aid)
+            factors = compute_factors(processed, strategy.required_factors)
+            sig = strategy.generate_signals(factors, aid, with_meta=False)
             price_dict[aid] = processed
             signal_dict[aid] = sig.signals
         except ValueError:
@@ -120,6 +344,7 @@ def _run_multi(db, strategy, asset_ids, config, start, end):
     if not price_dict:
         raise ValueError("No price data available for any asset")
 
+    progress("backtest", len(asset_ids), len(asset_ids), None)
     return run_backtest_multi(
         price_dict=price_dict,
         signal_dict=signal_dict,
@@ -7,8 +7,9 @@ import datetime
 import pandas as pd
 from sqlalchemy.orm import Session
 
-from api.repositories import asset_repo, price_repo
+from api.repositories import asset_repo
 from api.schemas.correlation import CorrelationPeriod, CorrelationResponse
+from db.ts_cache import get_ts_cache
 
 
 def compute_correlation(
@@ -42,22 +43,12 @@ def compute_correlation(
     if len(asset_ids) < 2:
         raise ValueError("At least 2 assets required for correlation")
 
-    # Fetch prices and build close price DataFrame
+    # Close series from the shared time-series cache
+    cache = get_ts_cache()
     frames: dict[str, pd.Series] = {}
     for aid in asset_ids:
-        prices = price_repo.get_prices(
-            db,
-            aid,
-            start_date=start_date,
-            end_date=end_date,
-            limit=5000,
-            offset=0,
-        )
-        if prices:
-            series = pd.Series(
-                {p.date: p.close for p in prices},
-                name=aid,
-            )
+        series = cache.close_series(db, aid, start_date=start_date, end_date=end_date)
+        if not series.empty:
             frames[aid] = series
 
     if len(frames) < 2:
@@ -80,8 +71,8 @@ def compute_correlation(
     # Round values
     matrix = [[round(v, 4) if pd.notna(v) else 0.0 for v in row] for row in matrix]
 
-    actual_start = df.index.min()
-    actual_end = df.index.max()
+    actual_start = df.index.min().date()
+    actual_end = df.index.max().date()
 
     return CorrelationResponse(
         asset_ids=used_ids,
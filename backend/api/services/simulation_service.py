@@ -3,14 +3,25 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import date as date_type
+from datetime import timedelta
 
+import numpy as np
 import pandas as pd
 from sqlalchemy.orm import Session
 
 from api.schemas.simulation import (
+    BatchCurveResponse,
+    BatchScenario,
     EquityPointResponse,
     KpiResponse,
+    RollingEntryRequest,
+    RollingEntryResponse,
+    SimulateBatchRequest,
+    SimulateBatchResponse,
     SimulatePortfolioRequest,
     SimulatePortfolioResponse,
     SimulateReplayRequest,
@@ -18,9 +29,16 @@ from api.schemas.simulation import (
     SimulateStrategyRequest,
     SimulateStrategyResponse,
 )
-from db.models import PriceDaily
-from research_engine.simulation.portfolio import PRESETS, Portfolio
-from research_engine.simulation.replay import EquityPoint, KpiResult, compute_kpi, replay
+from config.settings import settings
+from db.ts_cache import get_ts_cache
+from research_engine.simulation.portfolio import PRESETS, PortfolioCurve, run_portfolio
+from research_engine.simulation.replay import (
+    EquityPoint,
+    KpiResult,
+    compute_kpi,
+    compute_kpi_arrays,
+    replay,
+)
 from research_engine.simulation.strategy_a import StrategyA
 from research_engine.simulation.strategy_b import StrategyB
 
@@ -29,6 +47,12 @@ logger = logging.getLogger(__name__)
 # 알려진 자산 통화 (DB currency 컬럼으로 대체 가능하지만 빠른 조회용)
 _USD_ASSETS = {"QQQ", "SPY", "SCHD", "JEPI", "TLT", "NVDA", "GOOGL", "TSLA", "SOXL"}
 _KRW_ASSETS = {"KS200", "005930", "000660", "BTC", "WBI"}
+_FX_LOOKBACK_DAYS = 7  # Tab C / batch: 첫 거래일 이전 환율 탐색 범위
+
+
+def _currency_of(asset_code: str, asset) -> str:
+    """asset_master currency, 없으면 알려진 USD 자산 목록으로 추정."""
+    return asset.currency if asset else ("USD" if asset_code in _USD_ASSETS else "KRW")
 
 
 def _to_equity_response(pt: EquityPoint) -> EquityPointResponse:
@@ -78,19 +102,10 @@ def _load_price_and_fx(
     start_date = end_date - relativedelta(years=period_years)
 
     asset = db.query(AssetMaster).filter_by(asset_id=asset_code).first()
-    currency = asset.currency if asset else ("USD" if asset_code in _USD_ASSETS else "KRW")
+    currency = _currency_of(asset_code, asset)
     annual_yield = float(asset.annual_yield) if asset else 0.0
 
-    rows = (
-        db.query(PriceDaily)
-        .filter(PriceDaily.asset_id == asset_code, PriceDaily.date >= start_date, PriceDaily.date <= end_date)
-        .order_by(PriceDaily.date)
-        .all()
-    )
-    prices = pd.Series(
-        {pd.Timestamp(r.date): float(r.close) for r in rows if r.close is not None},
-        name="close",
-    ).dropna() if rows else pd.Series(dtype=float)
+    prices = get_ts_cache().close_series(db, asset_code, start_date, end_date, name="close")
 
     fx_series: pd.Series | None = None
     if currency == "USD" and not prices.empty:
@@ -102,12 +117,32 @@ def _load_price_and_fx(
 
 def simulate_strategy(db: Session, req: SimulateStrategyRequest) -> SimulateStrategyResponse:
     """Tab B 전략 시뮬레이션 (Strategy A or B)."""
-    from research_engine.simulation.replay import _first_trading_days_of_month
-
     prices, fx_series, currency, annual_yield = _load_price_and_fx(db, req.asset_code, req.period_years)
     if prices.empty:
         raise ValueError(f"가격 데이터 없음: {req.asset_code}")
 
+    curve, kpi, event_count = _strategy_curve(
+        req, prices, fx_series, currency, annual_yield
+    )
+    return SimulateStrategyResponse(
+        asset_code=req.asset_code,
+        strategy=req.strategy,
+        curve=[_to_equity_response(pt) for pt in curve],
+        kpi=_to_kpi_response(kpi),
+        event_count=event_count,
+    )
+
+
+def _strategy_curve(
+    req: SimulateStrategyRequest,
+    prices: pd.Series,
+    fx_series: pd.Series | None,
+    currency: str,
+    annual_yield: float,
+) -> tuple[list[EquityPoint], KpiResult, int]:
+    """Tab B 일별 루프 (DB 접근 없음). returns (curve, kpi, event_count)."""
+    from research_engine.simulation.replay import _first_trading_days_of_month
+
     daily_yield_mult = 1.0 + annual_yield / 252.0
     trading_index = prices.index
     first_days = _first_trading_days_of_month(trading_index)
@@ -189,120 +224,348 @@ def simulate_strategy(db: Session, req: SimulateStrategyRequest) -> SimulateStra
         curve.append(EquityPoint(date=ts.date(), krw_value=krw_value, local_value=local_value, shares=shares))
 
     kpi = compute_kpi(curve, total_deposit, req.period_years)
-    return SimulateStrategyResponse(
+    return curve, kpi, event_count
+
+
+# ── 진입 시점 분석 ──────────────────────────────────────────────────────────
+
+
+def _matrix(values: np.ndarray) -> list[list[float | None]]:
+    """NaN → None 인 2차원 리스트 (JSON null)."""
+    return [[None if v != v else v for v in row] for row in values.tolist()]
+
+
+def simulate_rolling_entry(db: Session, req: RollingEntryRequest) -> RollingEntryResponse:
+    """모든 월 시작일 × 기간 적립식 결과 (Tab A replay와 같은 입력·규칙)."""
+    from db.models import AssetMaster
+    from research_engine.simulation.replay import _replay_inputs
+    from research_engine.simulation.rolling import rolling_entry_analysis
+
+    asset = None
+    if req.asset_code != "WBI":
+        asset = db.query(AssetMaster).filter_by(asset_id=req.asset_code).first()
+    inputs = _replay_inputs(req.asset_code, asset, req.lookback_years, date_type.today(), db)
+    result = rolling_entry_analysis(
+        inputs.prices,
+        inputs.fx_series,
+        inputs.currency,
+        inputs.annual_yield,
+        req.monthly_amount,
+        [12 * h for h in req.horizons_years],
+    )
+    return RollingEntryResponse(
         asset_code=req.asset_code,
-        strategy=req.strategy,
-        curve=[_to_equity_response(pt) for pt in curve],
-        kpi=_to_kpi_response(kpi),
-        event_count=event_count,
+        monthly_amount=req.monthly_amount,
+        start_dates=[str(d) for d in result.start_dates],
+        horizons_years=req.horizons_years,
+        total_deposit_krw=result.total_deposit_krw.tolist(),
+        final_asset_krw=_matrix(result.final_asset_krw),
+        total_return=_matrix(result.total_return),
+        annualized_return=_matrix(result.annualized_return),
+        yearly_worst_mdd=_matrix(result.yearly_worst_mdd),
     )
 
 
 # ── Tab C ────────────────────────────────────────────────────────────────────
 
 
+def _portfolio_weights(req: SimulatePortfolioRequest) -> tuple[str, str, dict[str, float]]:
+    """(preset_key, preset_name, weights) — 사용자 비중이면 preset_key = "custom"."""
+    if req.weights is not None:
+        name = " / ".join(f"{code} {w:.0%}" for code, w in req.weights.items())
+        return "custom", name, dict(req.weights)
+    if req.preset_key not in PRESETS:
+        raise ValueError(f"알 수 없는 preset_key: {req.preset_key}. 선택 가능: {list(PRESETS.keys())}")
+    preset = PRESETS[req.preset_key]
+    return req.preset_key, preset.name, dict(preset.weights)
+
+
+def _portfolio_curve(
+    req: SimulatePortfolioRequest,
+    weights: dict[str, float],
+    panel: pd.DataFrame,
+    assets: dict,
+    fx_all: pd.Series | None,
+) -> PortfolioCurve:
+    """close panel → run_portfolio (DB 접근 없음).
+
+    fx_all은 USD 자산의 첫 거래일 며칠 전부터 덮는 USD/KRW 시계열.
+    """
+    from research_engine.simulation.replay import _align_fx
+
+    asset_codes = list(weights)
+    # 상장 전 재정규화는 기간 안에 가격이 있는 자산에만 — 오타·미수집 자산은 거부
+    unknown = [code for code in asset_codes if code not in assets]
+    if unknown:
+        raise ValueError(f"asset not found in asset_master: {', '.join(unknown)}")
+    no_data = [code for code in asset_codes if panel[code].isna().all()]
+    if no_data:
+        raise ValueError(f"가격 데이터 없음: {', '.join(no_data)}")
+
+    # 공통 trading days: 모든 자산의 합집합 (forward-fill로 결측 처리)
+    panel = panel.loc[panel.notna().any(axis=1), asset_codes]
+    if panel.empty:
+        raise ValueError("가격 데이터 없음")
+    dates = panel.index.to_numpy(dtype="datetime64[ns]")
+    prices = panel.ffill().to_numpy(dtype=float)
+
+    # 자산별 환율 열: 상장 기간 안에서는 그날 환율, 마지막 가격일 이후엔 그날 환율 유지
+    listed = panel.notna().to_numpy()
+    fx_rates = np.ones_like(prices)
+    for j, code in enumerate(asset_codes):
+        if fx_all is None or not listed[:, j].any():
+            continue
+        if _currency_of(code, assets.get(code)) != "USD":
+            continue
+        last = dates[listed[:, j]][-1]
+        fx = fx_all if fx_all.empty else fx_all.loc[:last]
+        if not fx.empty:  # 환율 없음 → 환산 안 함 (기존 Portfolio와 같은 규칙)
+            fx_rates[:, j] = _align_fx(fx, np.minimum(dates, last))
+
+    annual_yields = np.array([
+        float(assets[code].annual_yield) if code in assets else 0.0 for code in asset_codes
+    ])
+    return run_portfolio(
+        dates,
+        prices,
+        fx_rates,
+        np.array([weights[code] for code in asset_codes]),
+        annual_yields,
+        req.monthly_amount,
+        rebalance=req.rebalance,
+        threshold=req.rebalance_threshold,
+    )
+
+
 def simulate_portfolio(db: Session, req: SimulatePortfolioRequest) -> SimulatePortfolioResponse:
-    """Tab C 포트폴리오 적립식 시뮬레이션."""
+    """Tab C 포트폴리오 적립식 시뮬레이션 (preset 또는 사용자 비중, 리밸런싱 주기 선택)."""
     from dateutil.relativedelta import relativedelta
 
-    from research_engine.simulation.replay import _first_trading_days_of_month
-
-    if req.preset_key not in PRESETS:
-        raise ValueError(f"알 수 없는 preset_key: {req.preset_key}. 선택 가능: {list(PRESETS.keys())}")
+    from db.models import AssetMaster
+    from research_engine.simulation.fx import load_fx_series
 
-    preset = PRESETS[req.preset_key]
-    portfolio = Portfolio(preset)
-    asset_codes = list(preset.weights.keys())
+    preset_key, preset_name, weights = _portfolio_weights(req)
+    asset_codes = list(weights)
 
     end_date = date_type.today()
     start_date = end_date - relativedelta(years=req.period_years)
 
-    # 가격 + 환율 로드 (자산별)
-    prices_map: dict[str, pd.Series] = {}
-    fx_map: dict[str, pd.Series | None] = {}
-    from db.models import AssetMaster
-    from research_engine.simulation.fx import load_fx_series
+    # 가격 (한 번의 쿼리) + 자산 메타 (한 번의 쿼리) + 환율 (한 번의 쿼리)
+    panel = get_ts_cache().close_panel(db, asset_codes, start_date, end_date)
+    assets = {
+        a.asset_id: a
+        for a in db.query(AssetMaster).filter(AssetMaster.asset_id.in_(asset_codes)).all()
+    }
+    fx_all: pd.Series | None = None
+    if any(_currency_of(code, assets.get(code)) == "USD" for code in asset_codes):
+        # 첫날이 주말·휴일이어도 직전 환율을 쓰도록 며칠 앞에서부터 로드
+        fx_all = load_fx_series(db, start_date - timedelta(days=_FX_LOOKBACK_DAYS), end_date)
+
+    result = _portfolio_curve(req, weights, panel, assets, fx_all)
+    kpi = compute_kpi_arrays(
+        result.dates, result.krw_value, result.total_deposit_krw, req.period_years
+    )
+    # local_value = krw (단순화: multi-asset이라 local=KRW)
+    curve = [
+        EquityPointResponse(date=str(d), krw_value=v, local_value=v, shares=0.0)
+        for d, v in zip(result.dates.astype("datetime64[D]"), result.krw_value.tolist())
+    ]
+    return SimulatePortfolioResponse(
+        preset_key=preset_key,
+        preset_name=preset_name,
+        rebalance=req.rebalance,
+        rebalance_count=result.rebalance_count,
+        curve=curve,
+        kpi=_to_kpi_response(kpi),
+    )
+
+
+# ── batch ────────────────────────────────────────────────────────────────────
 
-    for code in asset_codes:
-        rows = (
-            db.query(PriceDaily)
-            .filter(PriceDaily.asset_id == code, PriceDaily.date >= start_date, PriceDaily.date <= end_date)
-            .order_by(PriceDaily.date)
-            .all()
+
+@dataclass
+class _ScenarioResult:
+    kpi: KpiResult
+    dates: np.ndarray  # datetime64
+    krw_value: np.ndarray
+    event_count: int | None = None
+    rebalance_count: int | None = None
+
+
+def _scenario_codes(scenario: BatchScenario) -> list[str]:
+    if scenario.kind != "portfolio":
+        return [scenario.asset_code]
+    if scenario.weights is not None:
+        return list(scenario.weights)
+    preset = PRESETS.get(scenario.preset_key)
+    return list(preset.weights) if preset else []
+
+
+def _prepare_scenario(
+    db: Session,
+    scenario: BatchScenario,
+    assets: dict,
+    fx_all: pd.Series | None,
+    end_date: date_type,
+) -> Callable[[], _ScenarioResult]:
+    """입력 준비 (요청 스레드, 캐시에서 잘라내기만) → 계산 함수 (세션 없이 병렬 실행)."""
+    from dateutil.relativedelta import relativedelta
+
+    from research_engine.simulation.replay import _replay_inputs, replay_arrays
+
+    code = scenario.asset_code
+    start_date = end_date - relativedelta(years=scenario.period_years)
+
+    if scenario.kind == "replay":
+        inputs = _replay_inputs(
+            code, assets.get(code), scenario.period_years, end_date, db, fx_all=fx_all
         )
-        if rows:
-            prices_map[code] = pd.Series(
-                {pd.Timestamp(r.date): float(r.close) for r in rows}, name="close"
+
+        def run_replay() -> _ScenarioResult:
+            curve, kpi = replay_arrays(
+                inputs.prices, inputs.fx_series, inputs.currency, inputs.annual_yield,
+                scenario.monthly_amount, scenario.period_years,
             )
-        asset = db.query(AssetMaster).filter_by(asset_id=code).first()
-        currency = asset.currency if asset else ("USD" if code in _USD_ASSETS else "KRW")
-        if currency == "USD" and code in prices_map and not prices_map[code].empty:
-            fx_map[code] = load_fx_series(db, prices_map[code].index[0].date(), prices_map[code].index[-1].date())
-        else:
-            fx_map[code] = None
+            return _ScenarioResult(kpi, curve.dates, curve.krw_value)
+
+        return run_replay
+
+    if scenario.kind == "strategy":
+        prices = get_ts_cache().close_series(db, code, start_date, end_date, name="close")
+        if prices.empty:
+            raise ValueError(f"가격 데이터 없음: {code}")
+        asset = assets.get(code)
+        currency = _currency_of(code, asset)
+        fx_series = None
+        if currency == "USD" and fx_all is not None:
+            fx_series = fx_all.loc[prices.index[0]:prices.index[-1]]
+        req = SimulateStrategyRequest(
+            asset_code=code,
+            strategy=scenario.strategy,
+            monthly_amount=scenario.monthly_amount,
+            period_years=scenario.period_years,
+        )
 
-    # 공통 trading days: 모든 자산의 합집합 (forward-fill로 결측 처리)
-    all_dates = set()
-    for s in prices_map.values():
-        all_dates.update(s.index.tolist())
-    trading_index = pd.DatetimeIndex(sorted(all_dates))
+        def run_strategy() -> _ScenarioResult:
+            curve, kpi, event_count = _strategy_curve(
+                req, prices, fx_series, currency, float(asset.annual_yield) if asset else 0.0
+            )
+            krw = np.array([pt.krw_value for pt in curve])
+            return _ScenarioResult(
+                kpi, prices.index.to_numpy(), krw, event_count=event_count
+            )
 
-    if len(trading_index) == 0:
-        raise ValueError("가격 데이터 없음")
+        return run_strategy
 
-    first_days = _first_trading_days_of_month(trading_index)
-    last_trading_days_set: set[pd.Timestamp] = set()
-    for year in range(trading_index[0].year, trading_index[-1].year + 1):
-        yr_idx = trading_index[trading_index.year == year]
-        if len(yr_idx):
-            last_trading_days_set.add(yr_idx[-1])
+    req = SimulatePortfolioRequest(
+        preset_key=scenario.preset_key,
+        weights=scenario.weights,
+        monthly_amount=scenario.monthly_amount,
+        period_years=scenario.period_years,
+        rebalance=scenario.rebalance,
+        rebalance_threshold=scenario.rebalance_threshold,
+    )
+    _, _, weights = _portfolio_weights(req)
+    panel = get_ts_cache().close_panel(db, list(weights), start_date, end_date)
 
-    # annual_yield 조회
-    annual_yields: dict[str, float] = {}
-    for code in asset_codes:
-        asset = db.query(AssetMaster).filter_by(asset_id=code).first()
-        annual_yields[code] = float(asset.annual_yield) if asset else 0.0
+    def run_portfolio_scenario() -> _ScenarioResult:
+        result = _portfolio_curve(req, weights, panel, assets, fx_all)
+        kpi = compute_kpi_arrays(
+            result.dates, result.krw_value, result.total_deposit_krw, req.period_years
+        )
+        return _ScenarioResult(
+            kpi, result.dates, result.krw_value, rebalance_count=result.rebalance_count
+        )
 
-    total_deposit = 0
-    curve: list[EquityPoint] = []
+    return run_portfolio_scenario
 
-    for ts in trading_index:
-        # 현재 가격 (결측이면 이전 값 사용)
-        prices_today: dict[str, float] = {}
-        fx_today: dict[str, float | None] = {}
-        for code in asset_codes:
-            if code not in prices_map:
-                continue
-            s = prices_map[code]
-            val = float(s.asof(ts)) if ts not in s.index else float(s[ts])
-            if val > 0:
-                prices_today[code] = val
-            fx_s = fx_map.get(code)
-            fx_today[code] = float(fx_s.asof(ts)) if fx_s is not None and not fx_s.empty else None
-
-        if not prices_today:
-            continue
 
-        # D-16: 적립
-        if ts in first_days:
-            portfolio.deposit(req.monthly_amount, prices_today, fx_today)
-            total_deposit += req.monthly_amount
+def simulate_batch(db: Session, req: SimulateBatchRequest) -> SimulateBatchResponse:
+    """여러 시나리오 (자산 × 기간 × 금액 × 전략 × preset) 한 번에.
 
-        # 배당
-        portfolio.apply_dividends(annual_yields, prices_today, fx_today)
+    가격 (한 번의 쿼리) + 자산 메타 (한 번의 쿼리) + 환율 (한 번의 쿼리)을
+    시나리오 합집합으로 로드한 뒤, 시나리오 계산은 스레드 풀에서 돈다.
+    잘못된 시나리오 (자산 없음·데이터 없음)는 그 칸만 error로 채운다.
 
-        # 연말 리밸런싱
-        if ts in last_trading_days_set:
-            portfolio.rebalance(prices_today, fx_today)
+    스레드로 겹쳐지는 것은 NumPy/pandas 커널에서 시간을 쓰는 replay·portfolio
+    시나리오뿐이다. strategy 시나리오 (Tab B)는 순수 Python 일별 루프라 GIL에
+    묶여 사실상 한 번에 하나씩 돈다 — 워커 수를 늘려도 빨라지지 않는다.
+    """
+    from dateutil.relativedelta import relativedelta
 
-        krw_value = portfolio.total_krw_value(prices_today, fx_today)
-        # local_value = krw (단순화: multi-asset이라 local=KRW)
-        curve.append(EquityPoint(date=ts.date(), krw_value=krw_value, local_value=krw_value, shares=0.0))
+    from db.models import AssetMaster
+    from research_engine.simulation.fx import load_fx_series
 
-    kpi = compute_kpi(curve, total_deposit, req.period_years)
-    return SimulatePortfolioResponse(
-        preset_key=req.preset_key,
-        preset_name=preset.name,
-        curve=[_to_equity_response(pt) for pt in curve],
-        kpi=_to_kpi_response(kpi),
+    codes = sorted({c for sc in req.scenarios for c in _scenario_codes(sc)} - {"WBI"})
+    get_ts_cache().prices_many(db, codes)
+    assets = {
+        a.asset_id: a
+        for a in db.query(AssetMaster).filter(AssetMaster.asset_id.in_(codes)).all()
+    }
+    end_date = date_type.today()
+    fx_all: pd.Series | None = None
+    if any(_currency_of(code, assets.get(code)) == "USD" for code in codes):
+        longest = max(sc.period_years for sc in req.scenarios)
+        fx_all = load_fx_series(
+            db,
+            end_date - relativedelta(years=longest) - timedelta(days=_FX_LOOKBACK_DAYS),
+            end_date,
+        )
+
+    tasks: list[Callable[[], _ScenarioResult] | str] = []
+    for sc in req.scenarios:
+        try:
+            tasks.append(_prepare_scenario(db, sc, assets, fx_all, end_date))
+        except ValueError as e:
+            tasks.append(str(e))
+
+    def _run(task: Callable[[], _ScenarioResult]) -> _ScenarioResult | str:
+        try:
+            return task()
+        except ValueError as e:
+            return str(e)
+
+    runnable = [t for t in tasks if callable(t)]
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(settings.simulation_batch_workers, len(runnable))),
+        thread_name_prefix="simulate",
+    ) as pool:
+        computed = list(pool.map(_run, runnable))
+    done = iter(computed)
+    results = [next(done) if callable(t) else t for t in tasks]
+
+    columns: dict[str, list] = {
+        name: [] for name in (
+            "final_asset_krw", "total_return", "annualized_return", "yearly_worst_mdd",
+            "total_deposit_krw", "event_count", "rebalance_count", "error",
+        )
+    }
+    curves: list[BatchCurveResponse | None] = []
+    for result in results:
+        ok = isinstance(result, _ScenarioResult)
+        kpi = result.kpi if ok else None
+        for name in ("final_asset_krw", "total_return", "annualized_return",
+                     "yearly_worst_mdd", "total_deposit_krw"):
+            columns[name].append(getattr(kpi, name) if ok else None)
+        columns["event_count"].append(result.event_count if ok else None)
+        columns["rebalance_count"].append(result.rebalance_count if ok else None)
+        columns["error"].append(None if ok else result)
+        curves.append(
+            BatchCurveResponse(
+                dates=[str(d) for d in result.dates.astype("datetime64[D]")],
+                krw_value=result.krw_value.tolist(),
+            ) if ok and req.include_curves else None
+        )
+
+    logger.info(
+        "simulate_batch: %d scenarios, %d assets, %d failed",
+        len(req.scenarios), len(codes), sum(e is not None for e in columns["error"]),
+    )
+    return SimulateBatchResponse(
+        kind=[sc.kind for sc in req.scenarios],
+        label=[sc.label for sc in req.scenarios],
+        monthly_amount=[sc.monthly_amount for sc in req.scenarios],
+        period_years=[sc.period_years for sc in req.scenarios],
+        curves=curves if req.include_curves else None,
+        **columns,
     )
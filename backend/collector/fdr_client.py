@@ -7,6 +7,8 @@ from datetime import datetime, timezone
 
 import pandas as pd
 
+from collector.fetch_cache import FetchCacheConfigError, FetchCacheMiss, get_fetch_cache
+from collector.rate_limit import get_rate_limiter
 from config.settings import settings
 
 logger = logging.getLogger(__name__)
@@ -40,10 +42,24 @@ BASE_DELAY = settings.fdr_base_delay
 
 
 def _fetch_raw(fdr_symbol: str, start: str, end: str) -> pd.DataFrame:
-    """Call FDR and return raw DataFrame."""
+    """Call FDR and return raw DataFrame (rate-limited per source).
+
+    Served from the on-disk fetch cache when enabled; in offline mode a cache
+    miss raises FetchCacheMiss without touching the network.
+    """
+    cache = get_fetch_cache()
+    if cache is not None:
+        cached = cache.get(fdr_symbol, start, end)
+        if cached is not None:
+            return cached
+
     import FinanceDataReader as fdr
 
-    return fdr.DataReader(fdr_symbol, start, end)
+    get_rate_limiter("fdr").acquire()
+    df = fdr.DataReader(fdr_symbol, start, end)
+    if cache is not None and df is not None and len(df) > 0:
+        cache.put(fdr_symbol, start, end, df)
+    return df
 
 
 def _standardize(df: pd.DataFrame, asset_id: str) -> pd.DataFrame:
@@ -109,6 +125,11 @@ def fetch_ohlcv(asset_id: str, start: str, end: str) -> pd.DataFrame:
                     len(df), asset_id, symbol, attempt + 1,
                 )
                 return _standardize(df, asset_id)
+            except FetchCacheConfigError:
+                raise  # misconfigured offline mode: never retry or fall back online
+            except FetchCacheMiss as e:
+                last_error = e
+                break  # offline replay: retrying cannot help, try the next symbol
             except Exception as e:
                 last_error = e
                 if attempt < max_retries - 1:
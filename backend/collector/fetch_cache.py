@@ -0,0 +1,175 @@
+"""On-disk Parquet cache for raw FDR responses, with TTL, size eviction and offline replay.
+
+Entries are content-addressed by the request (fdr_symbol, start, end) plus the
+fetch date, so snapshots taken on different days coexist:
+
+    <cache_dir>/<sha1(symbol|start|end)[:20]>_<YYYYMMDD>.parquet
+
+Online, the newest snapshot younger than the TTL is served. Offline, the newest
+snapshot is served regardless of age and a miss raises FetchCacheMiss instead of
+touching the network.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from datetime import date
+from pathlib import Path
+
+import pandas as pd
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class FetchCacheMiss(LookupError):
+    """Offline mode: the requested window has no cached snapshot."""
+
+
+class FetchCacheConfigError(RuntimeError):
+    """Offline mode requested without a cache directory to replay from."""
+
+
+def _request_key(fdr_symbol: str, start: str | None, end: str | None) -> str:
+    raw = f"{fdr_symbol}|{start or ''}|{end or ''}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]
+
+
+class FetchCache:
+    def __init__(
+        self,
+        cache_dir: str | Path,
+        ttl_seconds: float = 24 * 3600,
+        max_bytes: int = 512 * 1024 * 1024,
+        offline: bool = False,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self._lock = threading.Lock()
+
+    def _snapshots(self, key: str) -> list[Path]:
+        """Snapshots for a request key, newest fetch date first."""
+        return sorted(self.cache_dir.glob(f"{key}_*.parquet"), reverse=True)
+
+    def get(self, fdr_symbol: str, start: str | None, end: str | None) -> pd.DataFrame | None:
+        """Return the cached response or None (raises FetchCacheMiss when offline)."""
+        key = _request_key(fdr_symbol, start, end)
+        now = time.time()
+        for path in self._snapshots(key):
+            try:
+                age = now - path.stat().st_mtime
+                if not self.offline and age > self.ttl_seconds:
+                    continue
+                df = pd.read_parquet(path)
+                os.utime(path, (now, path.stat().st_mtime))  # atime = last use (LRU)
+            except (OSError, ValueError) as e:
+                logger.warning("Unreadable fetch cache entry %s: %s", path.name, e)
+                continue
+            logger.debug("Fetch cache hit %s (%s~%s) from %s", fdr_symbol, start, end, path.name)
+            return df
+
+        if self.offline:
+            raise FetchCacheMiss(f"No cached response for {fdr_symbol} ({start}~{end})")
+        return None
+
+    def put(
+        self, fdr_symbol: str, start: str | None, end: str | None, df: pd.DataFrame
+    ) -> Path:
+        """Store a response as today's snapshot, then enforce the size budget."""
+        key = _request_key(fdr_symbol, start, end)
+        path = self.cache_dir / f"{key}_{date.today():%Y%m%d}.parquet"
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        df.to_parquet(tmp)
+        os.replace(tmp, path)  # atomic: concurrent readers never see partial files
+        self.evict()
+        return path
+
+    def evict(self) -> int:
+        """Drop expired snapshots (online only), then least recently used ones over budget.
+
+        Returns the number of files removed.
+        """
+        with self._lock:
+            now = time.time()
+            entries = []
+            for path in self.cache_dir.glob("*.parquet"):
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                entries.append((max(st.st_atime, st.st_mtime), st.st_mtime, st.st_size, path))
+
+            removed = 0
+            keep = []
+            for last_used, mtime, size, path in entries:
+                if not self.offline and now - mtime > self.ttl_seconds:
+                    path.unlink(missing_ok=True)
+                    removed += 1
+                else:
+                    keep.append((last_used, size, path))
+
+            total = sum(size for _, size, _ in keep)
+            for _, size, path in sorted(keep, key=lambda e: e[0]):
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+                removed += 1
+
+        if removed:
+            logger.info("Fetch cache evicted %d entries (%.1f MB kept)", removed, total / 1e6)
+        return removed
+
+
+_cache: FetchCache | None = None
+_configured = False
+_config_lock = threading.Lock()
+
+
+def configure_fetch_cache(
+    cache_dir: str | None,
+    ttl_hours: float | None = None,
+    max_mb: int | None = None,
+    offline: bool | None = None,
+) -> FetchCache | None:
+    """Install the process-wide cache (cache_dir None/empty disables it).
+
+    Raises:
+        FetchCacheConfigError: offline mode without a cache_dir — there is
+            nothing to replay from, and falling back to the network would
+            break the offline contract. Nothing is installed, so every later
+            fetch raises again instead of going online.
+    """
+    global _cache, _configured
+    offline = offline if offline is not None else settings.fdr_offline
+    with _config_lock:
+        if not cache_dir:
+            if offline:
+                raise FetchCacheConfigError(
+                    "FDR offline mode requires a cache directory (FDR_CACHE_DIR)"
+                )
+            _cache = None
+        else:
+            _cache = FetchCache(
+                cache_dir,
+                ttl_seconds=(ttl_hours if ttl_hours is not None else settings.fdr_cache_ttl_hours)
+                * 3600,
+                max_bytes=(max_mb if max_mb is not None else settings.fdr_cache_max_mb)
+                * 1024 * 1024,
+                offline=offline,
+            )
+        _configured = True
+        return _cache
+
+
+def get_fetch_cache() -> FetchCache | None:
+    """Process-wide cache, built from settings on first use (None = disabled)."""
+    if not _configured:
+        configure_fetch_cache(settings.fdr_cache_dir)
+    return _cache
@@ -2,6 +2,7 @@
 
 FDR 'USD/KRW' 일봉을 수집해 fx_daily 테이블에 UPSERT.
 충돌 키: date (PK). 동일 구간 재실행 시 usd_krw_close만 덮어씀 (idempotent).
+성공 시 job_run 행을 남기고 ts_cache를 비워 환율을 쓰는 캐시가 갱신되게 한다.
 """
 
 import argparse
@@ -15,8 +16,9 @@ from sqlalchemy.dialects.postgresql import insert
 from collector.alerting import send_discord_alert
 from collector.fdr_client import _fetch_raw
 from config.settings import settings
-from db.models import FxDaily
+from db.models import FxDaily, JobRun
 from db.session import SessionLocal
+from db.ts_cache import get_ts_cache
 
 logger = logging.getLogger(__name__)
 
@@ -74,7 +76,14 @@ def run(start: str, end: str) -> dict:
 
         with SessionLocal() as session:
             upserted = upsert_fx_daily(session, df)
+            # job_run.ended_at이 ts_cache data_version을 움직여 다른 프로세스의
+            # 캐시(USD replay unit curve 포함)도 새 환율로 다시 계산된다
+            session.add(JobRun(
+                job_name="fx_collector", started_at=started,
+                ended_at=datetime.now(timezone.utc), status="success",
+            ))
             session.commit()
+        get_ts_cache().invalidate()
 
         elapsed = (datetime.now(timezone.utc) - started).total_seconds()
         logger.info("fx_collector: %d row upserted (%.1fs)", upserted, elapsed)
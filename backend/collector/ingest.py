@@ -2,17 +2,24 @@
 
 import json
 import logging
+import queue
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from datetime import datetime, timezone
+from datetime import date, datetime, timedelta, timezone
 
-from sqlalchemy.dialects.postgresql import insert
+import numpy as np
+import pandas as pd
+from sqlalchemy import func, select
 
 from collector.alerting import format_failure_message, send_discord_alert
 from collector.fdr_client import fetch_ohlcv
 from collector.validators import validate_ohlcv
 from config.settings import settings
+from db.bulk import bulk_upsert
 from db.models import AssetMaster, JobRun, PriceDaily
+from db.ts_cache import get_ts_cache
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +29,7 @@ class IngestResult:
     asset_id: str
     status: str  # "success" | "validation_failed" | "fetch_failed"
     row_count: int = 0
+    unchanged_count: int = 0  # sync mode: fetched rows identical to stored ones
     errors: list[str] = field(default_factory=list)
     warnings: list[str] = field(default_factory=list)
     elapsed_ms: float = 0.0
@@ -32,26 +40,80 @@ def _upsert(session, df, chunk_size: int = 1000) -> int:
 
     Conflict key: (asset_id, date, source).
     Updated columns: open, high, low, close, volume, ingested_at.
-    Processes in chunks of chunk_size rows.
+    Large frames are streamed through COPY (db.bulk); small ones are
+    executed in chunks of chunk_size rows.
 
     Returns total row count processed.
     """
-    records = df.to_dict(orient="records")
-    total = 0
-    update_cols = ["open", "high", "low", "close", "volume", "ingested_at"]
-
-    for i in range(0, len(records), chunk_size):
-        chunk = records[i : i + chunk_size]
-        stmt = insert(PriceDaily).values(chunk)
-        stmt = stmt.on_conflict_do_update(
-            index_elements=["asset_id", "date", "source"],
-            set_={col: stmt.excluded[col] for col in update_cols},
+    result = bulk_upsert(
+        session,
+        PriceDaily,
+        df,
+        conflict_cols=["asset_id", "date", "source"],
+        update_cols=["open", "high", "low", "close", "volume", "ingested_at"],
+        chunk_size=chunk_size,
+    )
+    return result.row_count
+
+
+_COMPARE_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+
+def _last_stored_date(session, asset_id: str) -> date | None:
+    """Latest price_daily date for an asset (index scan on ix_price_daily_asset_date)."""
+    return session.execute(
+        select(func.max(PriceDaily.date)).where(PriceDaily.asset_id == asset_id)
+    ).scalar()
+
+
+def _sync_start(
+    session, asset_id: str, start: str | None, end: str, overlap_days: int
+) -> str | None:
+    """Fetch start for sync mode, or None if the asset is already up to date.
+
+    The window re-covers the last overlap_days calendar days before the last
+    stored date so late revisions are picked up. Assets with no stored rows
+    start at `start`.
+    """
+    last = _last_stored_date(session, asset_id)
+    if last is None:
+        if start is None:
+            raise ValueError(f"No stored prices for {asset_id}; a start date is required")
+        return start
+    if last >= date.fromisoformat(end):
+        return None
+    sync_start = last - timedelta(days=overlap_days)
+    if start is not None:
+        sync_start = max(sync_start, date.fromisoformat(start))
+    return sync_start.isoformat()
+
+
+def _drop_unchanged(session, df):
+    """Drop fetched rows whose OHLCV values equal the stored row.
+
+    Returns (rows to write, number of unchanged rows).
+    """
+    asset_id = df["asset_id"].iloc[0]
+    dates = pd.to_datetime(df["date"]).dt.date
+    columns = [getattr(PriceDaily, c) for c in _COMPARE_COLUMNS]
+    rows = session.execute(
+        select(PriceDaily.date, PriceDaily.source, *columns)
+        .where(
+            PriceDaily.asset_id == asset_id,
+            PriceDaily.date >= dates.min(),
+            PriceDaily.date <= dates.max(),
         )
-        session.execute(stmt)
-        total += len(chunk)
+    ).all()
+    if not rows:
+        return df, 0
 
-    session.flush()
-    return total
+    stored = pd.DataFrame(rows, columns=["date", "source", *_COMPARE_COLUMNS])
+    incoming = df[["source", *_COMPARE_COLUMNS]].assign(date=dates.to_numpy())
+    merged = incoming.merge(stored, on=["date", "source"], how="left", suffixes=("", "_db"))
+    same = np.ones(len(merged), dtype=bool)
+    for col in _COMPARE_COLUMNS:
+        same &= (merged[col] == merged[f"{col}_db"]).to_numpy()
+    return df[~same], int(same.sum())
 
 
 def _create_job_run(session, job_name: str):
@@ -96,28 +158,15 @@ def _finish_job_run(session, job, results: list["IngestResult"]):
         send_discord_alert(settings.alert_webhook_url, msg)
 
 
-def ingest_asset(asset_id: str, start: str, end: str, session=None) -> IngestResult:
-    """Single asset ingest pipeline: fetch → validate → store.
-
-    Args:
-        asset_id: Internal asset identifier
-        start: Start date string
-        end: End date string
-        session: SQLAlchemy session (None = skip DB store)
-
-    Returns:
-        IngestResult with status and details
-    """
-    t0 = time.perf_counter()
-    logger.info("Ingesting %s (%s ~ %s)", asset_id, start, end)
-
+def _fetch_and_validate(asset_id: str, start: str, end: str, t0: float):
+    """Fetch + validate stage. Returns (df, row_count, None) or (None, 0, failed result)."""
     # 1. Fetch
     try:
         df = fetch_ohlcv(asset_id, start, end)
     except Exception as e:
         elapsed = (time.perf_counter() - t0) * 1000
         logger.error("Fetch failed for %s: %s", asset_id, e)
-        return IngestResult(
+        return None, 0, IngestResult(
             asset_id=asset_id,
             status="fetch_failed",
             errors=[str(e)],
@@ -129,19 +178,29 @@ def ingest_asset(asset_id: str, start: str, end: str, session=None) -> IngestRes
     if not result.is_valid:
         elapsed = (time.perf_counter() - t0) * 1000
         logger.error("Validation failed for %s: %s", asset_id, result.errors)
-        return IngestResult(
+        return None, 0, IngestResult(
             asset_id=asset_id,
             status="validation_failed",
             row_count=result.row_count,
             errors=result.errors,
             elapsed_ms=elapsed,
         )
+    return df, result.row_count, None
 
-    # 3. Store
-    row_count = result.row_count
+
+def _store(
+    session, asset_id: str, df, row_count: int, t0: float, sync: bool = False
+) -> IngestResult:
+    """Store stage: upsert + commit on the given session (None = skip DB store).
+
+    With sync=True, rows identical to what is already stored are skipped.
+    """
+    unchanged = 0
     if session is not None:
         try:
-            row_count = _upsert(session, df)
+            if sync:
+                df, unchanged = _drop_unchanged(session, df)
+            row_count = _upsert(session, df) if len(df) else 0
             session.commit()
         except Exception as e:
             session.rollback()
@@ -155,51 +214,223 @@ def ingest_asset(asset_id: str, start: str, end: str, session=None) -> IngestRes
             )
 
     elapsed = (time.perf_counter() - t0) * 1000
-    logger.info("Ingested %s: %d rows in %.0fms", asset_id, row_count, elapsed)
+    logger.info(
+        "Ingested %s: %d rows (%d unchanged) in %.0fms", asset_id, row_count, unchanged, elapsed,
+    )
     return IngestResult(
         asset_id=asset_id,
         status="success",
         row_count=row_count,
+        unchanged_count=unchanged,
         elapsed_ms=elapsed,
     )
 
 
-def ingest_all(start: str, end: str, session=None) -> list[IngestResult]:
-    """Ingest all active assets.
+def _up_to_date(asset_id: str) -> IngestResult:
+    logger.info("%s already up to date, skipping fetch", asset_id)
+    return IngestResult(asset_id=asset_id, status="success")
+
+
+def ingest_asset(
+    asset_id: str, start: str | None, end: str, session=None, sync: bool = False
+) -> IngestResult:
+    """Single asset ingest pipeline: fetch → validate → store.
+
+    Args:
+        asset_id: Internal asset identifier
+        start: Start date string (sync mode: only used when nothing is stored)
+        end: End date string
+        session: SQLAlchemy session (None = skip DB store)
+        sync: Fetch only the gap after the last stored date (plus
+            settings.ingest_sync_overlap_days) and skip unchanged rows.
+            Requires a session.
+
+    Returns:
+        IngestResult with status and details
+    """
+    t0 = time.perf_counter()
+    if sync and session is not None:
+        try:
+            start = _sync_start(session, asset_id, start, end, settings.ingest_sync_overlap_days)
+        except ValueError as e:
+            return IngestResult(asset_id=asset_id, status="fetch_failed", errors=[str(e)])
+        if start is None:
+            return _up_to_date(asset_id)
+    logger.info("Ingesting %s (%s ~ %s)", asset_id, start, end)
+
+    df, row_count, failed = _fetch_and_validate(asset_id, start, end, t0)
+    if failed is not None:
+        return failed
+
+    # 3. Store
+    return _store(session, asset_id, df, row_count, t0, sync=sync)
+
+
+_HANDOFF_POLL_SECONDS = 0.1  # worker re-checks the stop flag while the queue is full
+
+
+def _ingest_concurrent(
+    windows: dict[str, str],
+    end: str,
+    session,
+    workers: int,
+    queue_size: int,
+    sync: bool = False,
+) -> dict[str, IngestResult]:
+    """Fetch/validate on a thread pool; the calling thread is the single DB writer.
+
+    Workers hand validated frames to the writer through a bounded queue, so at
+    most queue_size fetched frames wait in memory while the writer upserts.
+
+    Args:
+        windows: {asset_id: fetch start date}.
+    """
+    handoff: queue.Queue = queue.Queue(maxsize=max(queue_size, 1))
+    stop = threading.Event()  # set when the writer aborts; workers drop their frames
+
+    def _worker(asset_id: str, start: str) -> None:
+        if stop.is_set():
+            return
+        t0 = time.perf_counter()
+        logger.info("Ingesting %s (%s ~ %s)", asset_id, start, end)
+        try:
+            item = (asset_id, t0, *_fetch_and_validate(asset_id, start, end, t0))
+        except Exception as e:  # never leave the writer waiting
+            item = (asset_id, t0, None, 0, IngestResult(
+                asset_id=asset_id, status="fetch_failed", errors=[str(e)],
+            ))
+        while not stop.is_set():
+            try:
+                handoff.put(item, timeout=_HANDOFF_POLL_SECONDS)
+                return
+            except queue.Full:
+                continue
+
+    results: dict[str, IngestResult] = {}
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ingest")
+    try:
+        for asset_id, start in windows.items():
+            pool.submit(_worker, asset_id, start)
+
+        for _ in windows:
+            asset_id, t0, df, row_count, failed = handoff.get()
+            if failed is None:
+                failed = _store(session, asset_id, df, row_count, t0, sync=sync)
+            results[asset_id] = failed
+    except BaseException:
+        # workers blocked on the full queue would otherwise keep shutdown() waiting forever
+        stop.set()
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    pool.shutdown()
+    return results
+
+
+def ingest_all(
+    start: str | None,
+    end: str,
+    session=None,
+    asset_ids: list[str] | None = None,
+    workers: int | None = None,
+    sync: bool = False,
+) -> list[IngestResult]:
+    """Ingest all active (or the given) assets.
 
     If session is provided, queries asset_master for active assets
     and records a job_run entry.
     Otherwise falls back to SYMBOL_MAP keys (no job_run).
+
+    With workers > 1 (default: settings.ingest_workers) assets are fetched
+    concurrently while this thread performs every DB write on `session`.
+    With sync=True (requires a session) each asset fetches only the gap
+    after its last stored date; see ingest_asset.
     """
     from collector.fdr_client import SYMBOL_MAP
 
-    if session is not None:
-        try:
-            assets = session.query(AssetMaster).filter(AssetMaster.is_active.is_(True)).all()
-            asset_ids = [a.asset_id for a in assets]
-        except Exception:
-            logger.warning("Could not query asset_master, falling back to SYMBOL_MAP")
+    if asset_ids is None:
+        if session is not None:
+            try:
+                assets = session.query(AssetMaster).filter(AssetMaster.is_active.is_(True)).all()
+                asset_ids = [a.asset_id for a in assets]
+            except Exception:
+                logger.warning("Could not query asset_master, falling back to SYMBOL_MAP")
+                asset_ids = list(SYMBOL_MAP.keys())
+        else:
             asset_ids = list(SYMBOL_MAP.keys())
-    else:
-        asset_ids = list(SYMBOL_MAP.keys())
 
-    # Create job_run record
+    if workers is None:
+        workers = settings.ingest_workers
+    sync = sync and session is not None
+
+    # Create job_run record; commit so per-asset rollbacks cannot discard it
     job = None
     if session is not None:
-        job = _create_job_run(session, f"ingest_all({start}~{end})")
+        mode = "sync" if sync else "ingest_all"
+        job = _create_job_run(session, f"{mode}({start or ''}~{end})")
+        session.commit()
 
-    results: list[IngestResult] = []
-    for asset_id in asset_ids:
-        result = ingest_asset(asset_id, start, end, session)
-        results.append(result)
+    try:
+        results = _run_ingest(asset_ids, start, end, session, workers, sync)
+    except BaseException as e:
+        if job is not None:
+            session.rollback()
+            job.status = "failure"
+            job.ended_at = datetime.now(timezone.utc)
+            job.error_message = json.dumps({"aborted": str(e) or type(e).__name__})
+            session.commit()
+        get_ts_cache().invalidate()
+        raise
 
     # Finish job_run
     if session is not None and job is not None:
         _finish_job_run(session, job, results)
         session.commit()
+    get_ts_cache().invalidate()  # price rows changed: drop this process's cached arrays
 
     success = sum(1 for r in results if r.status == "success")
     total = len(results)
     logger.info("Ingest complete: %d/%d succeeded", success, total)
 
     return results
+
+
+def _run_ingest(
+    asset_ids: list[str],
+    start: str | None,
+    end: str,
+    session,
+    workers: int,
+    sync: bool,
+) -> list[IngestResult]:
+    """Resolve per-asset fetch windows, then ingest sequentially or concurrently."""
+    if workers <= 1 or len(asset_ids) <= 1:
+        return [ingest_asset(asset_id, start, end, session, sync=sync) for asset_id in asset_ids]
+
+    results: dict[str, IngestResult] = {}
+    windows: dict[str, str] = {}
+    for asset_id in asset_ids:
+        if not sync:
+            windows[asset_id] = start
+            continue
+        try:
+            asset_start = _sync_start(
+                session, asset_id, start, end, settings.ingest_sync_overlap_days,
+            )
+        except ValueError as e:
+            results[asset_id] = IngestResult(
+                asset_id=asset_id, status="fetch_failed", errors=[str(e)],
+            )
+            continue
+        if asset_start is None:
+            results[asset_id] = _up_to_date(asset_id)
+        else:
+            windows[asset_id] = asset_start
+
+    if windows:
+        results.update(_ingest_concurrent(
+            windows, end, session,
+            workers=min(workers, len(windows)),
+            queue_size=settings.ingest_queue_size,
+            sync=sync,
+        ))
+    return [results[asset_id] for asset_id in asset_ids]
@@ -0,0 +1,45 @@
+"""Thread-safe per-source rate limiting for upstream data fetches."""
+
+import threading
+import time
+
+from config.settings import settings
+
+
+class RateLimiter:
+    """Spaces calls at least 1/rate seconds apart across all threads.
+
+    A rate of 0 (or less) disables limiting.
+    """
+
+    def __init__(self, rate_per_sec: float):
+        self.interval = 1.0 / rate_per_sec if rate_per_sec > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def acquire(self) -> float:
+        """Block until the next slot is free. Returns seconds waited."""
+        if self.interval == 0.0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        wait = slot - now
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+_LIMITERS: dict[str, RateLimiter] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def get_rate_limiter(source: str) -> RateLimiter:
+    """Return the process-wide limiter for a data source (settings.ingest_rate_limits)."""
+    with _LIMITERS_LOCK:
+        limiter = _LIMITERS.get(source)
+        if limiter is None:
+            limiter = RateLimiter(settings.ingest_rate_limits.get(source, 0.0))
+            _LIMITERS[source] = limiter
+        return limiter
@@ -6,6 +6,28 @@ class Settings(BaseSettings):
     fdr_timeout: int = 30
     fdr_max_retries: int = 3
     fdr_base_delay: float = 1.0
+    fdr_cache_dir: str = ""  # on-disk Parquet fetch cache (empty = disabled)
+    fdr_cache_ttl_hours: float = 24.0
+    fdr_cache_max_mb: int = 512
+    fdr_offline: bool = False  # replay from fdr_cache_dir only, never hit the network
+    ingest_workers: int = 4
+    ingest_queue_size: int = 8
+    ingest_rate_limits: dict[str, float] = {"fdr": 4.0}  # requests/sec per source
+    ingest_sync_overlap_days: int = 7  # sync mode re-fetch window for revisions
+    ts_cache_max_mb: int = 256  # in-process price/factor array cache budget
+    ts_cache_check_seconds: float = 30.0  # data-version poll interval
+    replay_unit_cache_entries: int = 256  # DCA unit curves kept per process (asset × period)
+    # threads evaluating /v1/silver/simulate/batch scenarios; only replay/portfolio
+    # scenarios overlap (strategy scenarios are a pure-Python loop held by the GIL)
+    simulation_batch_workers: int = 4
+    backtest_cache_ttl_hours: float = 168.0  # reuse identical on-demand runs (0 = disabled)
+    backtest_cache_max_runs: int = 500  # cached on-demand runs kept (newest first)
+    backtest_inflight_wait_seconds: float = 300.0  # duplicate request waits for the first
+    backtest_job_workers: int = 2  # async backtest worker threads per API process
+    backtest_job_max_pending: int = 20  # queued + running jobs before submit returns 429
+    backtest_job_poll_seconds: float = 5.0  # idle worker re-check of the job table
+    backtest_job_sse_seconds: float = 0.5  # job progress poll interval for SSE
+    backtest_job_stale_seconds: float = 900.0  # running job without progress → requeued
     log_level: str = "INFO"
     alert_webhook_url: str = ""
     cors_origins: str = ""  # comma-separated extra origins for CORS
@@ -0,0 +1,49 @@
+"""Add backtest_job queue table
+
+Revision ID: a3c5e7f9b1d2
+Revises: f2a4b6c8d0e1
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c5e7f9b1d2'
+down_revision: Union[str, Sequence[str], None] = 'f2a4b6c8d0e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('backtest_job',
+        sa.Column('job_id', sa.UUID(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('request_json', sa.JSON(), nullable=False),
+        sa.Column('stage', sa.String(length=20), nullable=True),
+        sa.Column('progress_current', sa.Integer(), nullable=False),
+        sa.Column('progress_total', sa.Integer(), nullable=False),
+        sa.Column('message', sa.String(length=200), nullable=True),
+        sa.Column('run_id', sa.UUID(), nullable=True),
+        sa.Column('error_message', sa.Text(), nullable=True),
+        sa.Column(
+            'created_at', sa.DateTime(timezone=True),
+            server_default=sa.text('now()'), nullable=False,
+        ),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('ended_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('job_id')
+    )
+    op.create_index(
+        'ix_backtest_job_status_created', 'backtest_job', ['status', 'created_at'], unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_backtest_job_status_created', table_name='backtest_job')
+    op.drop_table('backtest_job')
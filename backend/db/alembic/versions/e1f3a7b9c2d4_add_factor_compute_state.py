@@ -0,0 +1,37 @@
+"""Add factor_compute_state table
+
+Revision ID: e1f3a7b9c2d4
+Revises: c9b884d01cb4
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1f3a7b9c2d4'
+down_revision: Union[str, Sequence[str], None] = 'c9b884d01cb4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('factor_compute_state',
+        sa.Column('asset_id', sa.String(length=20), nullable=False),
+        sa.Column('version', sa.String(length=10), nullable=False),
+        sa.Column('last_date', sa.Date(), nullable=False),
+        sa.Column('state_json', sa.JSON(), nullable=False),
+        sa.Column(
+            'updated_at', sa.DateTime(timezone=True),
+            server_default=sa.text('now()'), nullable=False,
+        ),
+        sa.PrimaryKeyConstraint('asset_id', 'version')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('factor_compute_state')
@@ -0,0 +1,61 @@
+"""Add factor_daily_wide table and backfill from factor_daily
+
+Revision ID: f2a4b6c8d0e1
+Revises: e1f3a7b9c2d4
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a4b6c8d0e1'
+down_revision: Union[str, Sequence[str], None] = 'e1f3a7b9c2d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copy of research_engine.factors.ALL_FACTOR_NAMES at this revision
+FACTOR_COLUMNS = [
+    'ret_1d', 'ret_5d', 'ret_20d', 'ret_63d',
+    'sma_20', 'sma_60', 'sma_120',
+    'ema_12', 'ema_26', 'macd', 'macd_signal',
+    'roc', 'rsi_14',
+    'vol_20', 'atr_14',
+    'vol_zscore_20',
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('factor_daily_wide',
+        sa.Column('asset_id', sa.String(length=20), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('version', sa.String(length=10), nullable=False),
+        *[sa.Column(name, sa.Float(), nullable=True) for name in FACTOR_COLUMNS],
+        sa.PrimaryKeyConstraint('asset_id', 'date', 'version')
+    )
+    op.create_index(
+        'ix_factor_daily_wide_asset_date', 'factor_daily_wide',
+        ['asset_id', sa.literal_column('date DESC')], unique=False,
+    )
+
+    # Backfill: pivot existing long rows in a single INSERT ... SELECT
+    pivot = ',\n            '.join(
+        f"max(value) FILTER (WHERE factor_name = '{name}')" for name in FACTOR_COLUMNS
+    )
+    op.execute(f"""
+        INSERT INTO factor_daily_wide (asset_id, date, version, {', '.join(FACTOR_COLUMNS)})
+        SELECT asset_id, date, version,
+            {pivot}
+        FROM factor_daily
+        GROUP BY asset_id, date, version
+        ON CONFLICT DO NOTHING
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_factor_daily_wide_asset_date', table_name='factor_daily_wide')
+    op.drop_table('factor_daily_wide')
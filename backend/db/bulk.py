@@ -0,0 +1,244 @@
+"""Bulk write layer: COPY into a temp table + one INSERT ... SELECT ... ON CONFLICT.
+
+On PostgreSQL (psycopg2 / psycopg 3) rows are streamed as CSV through
+``COPY ... FROM STDIN`` into a transaction-scoped temp table and merged into
+the target with a single statement. Small batches and other engines (SQLite
+in tests) fall back to a chunked executemany INSERT with the same conflict
+semantics. Every call runs inside the caller's session transaction.
+"""
+
+import io
+import json
+import logging
+import time
+import uuid
+from dataclasses import dataclass
+
+import pandas as pd
+from sqlalchemy import JSON, Date, Integer, Table, insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Below this many rows the temp-table round trips cost more than they save
+COPY_MIN_ROWS = 1000
+
+# Rows serialised per COPY chunk (bounds the CSV buffer size)
+COPY_CHUNK_ROWS = 100_000
+
+_NULL = "\\N"
+
+
+@dataclass
+class BulkWriteResult:
+    table: str
+    row_count: int
+    method: str  # "copy" | "executemany"
+    elapsed_ms: float = 0.0
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.row_count / (self.elapsed_ms / 1000) if self.elapsed_ms > 0 else 0.0
+
+
+def _dialect_name(session: Session) -> str:
+    name = getattr(session.get_bind().dialect, "name", "")
+    return name if isinstance(name, str) else ""
+
+
+def _copy_cursor(session: Session):
+    """Return a DBAPI cursor on the session's connection if it supports COPY."""
+    raw = session.connection().connection.driver_connection
+    cursor = raw.cursor()
+    if hasattr(cursor, "copy_expert") or hasattr(cursor, "copy"):
+        return cursor
+    cursor.close()
+    return None
+
+
+def _prepare_frame(table: Table, frame: pd.DataFrame, columns: list[str]) -> pd.DataFrame:
+    """Coerce columns to the text forms COPY expects for their SQL types."""
+    out = frame[columns].copy()
+    for name in columns:
+        col_type = table.c[name].type
+        series = out[name]
+        if isinstance(col_type, JSON):
+            out[name] = series.map(
+                lambda v: json.dumps(v, ensure_ascii=False) if v is not None else None
+            )
+        elif isinstance(col_type, Integer) and series.dtype.kind == "f":
+            out[name] = series.astype("Int64")
+        elif isinstance(col_type, Date) and series.dtype.kind == "M":
+            out[name] = series.dt.strftime("%Y-%m-%d")
+    return out
+
+
+def _copy_frame(cursor, tmp: str, frame: pd.DataFrame, columns: list[str]) -> None:
+    sql = (
+        f"COPY {tmp} ({', '.join(columns)}) FROM STDIN "
+        f"WITH (FORMAT csv, NULL '{_NULL}')"
+    )
+    for i in range(0, len(frame), COPY_CHUNK_ROWS):
+        buf = io.StringIO()
+        frame.iloc[i : i + COPY_CHUNK_ROWS].to_csv(buf, index=False, header=False, na_rep=_NULL)
+        buf.seek(0)
+        if hasattr(cursor, "copy_expert"):  # psycopg2
+            cursor.copy_expert(sql, buf)
+        else:  # psycopg 3
+            with cursor.copy(sql) as copy:
+                copy.write(buf.getvalue())
+
+
+def _merge_sql(
+    target: str,
+    tmp: str,
+    columns: list[str],
+    conflict_cols: list[str],
+    update_cols: list[str],
+) -> str:
+    cols = ", ".join(columns)
+    sql = f"INSERT INTO {target} ({cols}) SELECT {cols} FROM {tmp}"
+    if conflict_cols:
+        sql += f" ON CONFLICT ({', '.join(conflict_cols)})"
+        if update_cols:
+            sql += " DO UPDATE SET " + ", ".join(f"{c} = EXCLUDED.{c}" for c in update_cols)
+        else:
+            sql += " DO NOTHING"
+    return sql
+
+
+def _write_copy(
+    cursor,
+    table: Table,
+    frame: pd.DataFrame,
+    columns: list[str],
+    conflict_cols: list[str],
+    update_cols: list[str],
+) -> None:
+    frame = _prepare_frame(table, frame, columns)
+    if not conflict_cols:
+        _copy_frame(cursor, table.name, frame, columns)
+        return
+
+    tmp = f"_bulk_{table.name}_{uuid.uuid4().hex[:8]}"
+    cursor.execute(
+        f"CREATE TEMP TABLE {tmp} ON COMMIT DROP AS "
+        f"SELECT {', '.join(columns)} FROM {table.name} WITH NO DATA"
+    )
+    _copy_frame(cursor, tmp, frame, columns)
+    cursor.execute(_merge_sql(table.name, tmp, columns, conflict_cols, update_cols))
+    cursor.execute(f"DROP TABLE {tmp}")
+
+
+def _write_executemany(
+    session: Session,
+    table: Table,
+    records: list[dict],
+    conflict_cols: list[str],
+    update_cols: list[str],
+    chunk_size: int,
+) -> None:
+    if conflict_cols:
+        insert_fn = sqlite_insert if _dialect_name(session) == "sqlite" else pg_insert
+        stmt = insert_fn(table)
+        if update_cols:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=conflict_cols,
+                set_={col: stmt.excluded[col] for col in update_cols},
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=conflict_cols)
+    else:
+        stmt = insert(table)
+
+    for i in range(0, len(records), chunk_size):
+        session.execute(stmt, records[i : i + chunk_size])
+
+
+def _to_records(frame: pd.DataFrame) -> list[dict]:
+    return frame.astype(object).where(frame.notna(), None).to_dict(orient="records")
+
+
+def bulk_upsert(
+    session: Session,
+    model,
+    rows: pd.DataFrame | list[dict],
+    conflict_cols: list[str] | None = None,
+    update_cols: list[str] | None = None,
+    chunk_size: int = 1000,
+    copy_threshold: int = COPY_MIN_ROWS,
+) -> BulkWriteResult:
+    """Write rows into a model's table with INSERT ... ON CONFLICT semantics.
+
+    Args:
+        model: ORM model class (or Table).
+        rows: DataFrame or list of dicts keyed by column name. Columns not in
+            the table are ignored.
+        conflict_cols: Conflict target (default: primary key). Pass [] for a
+            plain append without conflict handling.
+        update_cols: Columns overwritten on conflict (default: every written
+            column outside the conflict target; [] = DO NOTHING).
+        chunk_size: Rows per executemany batch on the fallback path.
+        copy_threshold: Minimum rows before the COPY path is used.
+    """
+    table: Table = getattr(model, "__table__", model)
+    t0 = time.perf_counter()
+    n = len(rows)
+    if n == 0:
+        return BulkWriteResult(table=table.name, row_count=0, method="executemany")
+
+    first = rows.columns if isinstance(rows, pd.DataFrame) else rows[0].keys()
+    columns = [c for c in first if c in table.c]
+    if conflict_cols is None:
+        conflict_cols = [c.name for c in table.primary_key.columns]
+    if update_cols is None:
+        update_cols = [c for c in columns if c not in conflict_cols]
+
+    cursor = None
+    if n >= copy_threshold and _dialect_name(session) == "postgresql":
+        cursor = _copy_cursor(session)
+
+    if cursor is not None:
+        session.flush()  # pending ORM writes must precede the raw COPY
+        frame = rows if isinstance(rows, pd.DataFrame) else pd.DataFrame.from_records(rows)
+        try:
+            _write_copy(cursor, table, frame, columns, conflict_cols, update_cols)
+        finally:
+            cursor.close()
+        method = "copy"
+    else:
+        if isinstance(rows, pd.DataFrame):
+            records = _to_records(rows[columns])
+        else:
+            records = rows
+        _write_executemany(session, table, records, conflict_cols, update_cols, chunk_size)
+        method = "executemany"
+
+    session.flush()
+    result = BulkWriteResult(
+        table=table.name,
+        row_count=n,
+        method=method,
+        elapsed_ms=(time.perf_counter() - t0) * 1000,
+    )
+    logger.info(
+        "Bulk write %s: %d rows via %s in %.0fms (%.0f rows/s)",
+        result.table, n, method, result.elapsed_ms, result.rows_per_sec,
+    )
+    return result
+
+
+def bulk_insert(
+    session: Session,
+    model,
+    rows: pd.DataFrame | list[dict],
+    chunk_size: int = 1000,
+    copy_threshold: int = COPY_MIN_ROWS,
+) -> BulkWriteResult:
+    """Append rows without conflict handling (COPY straight into the table)."""
+    return bulk_upsert(
+        session, model, rows, conflict_cols=[], update_cols=[],
+        chunk_size=chunk_size, copy_threshold=copy_threshold,
+    )
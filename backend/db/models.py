@@ -10,6 +10,7 @@ from sqlalchemy import (
     ForeignKey,
     Index,
     Integer,
+    LargeBinary,
     Numeric,
     String,
     Text,
@@ -65,6 +66,7 @@ class PriceDaily(Base):
     __table_args__ = (
         Index("ix_price_daily_asset_date", "asset_id", date.desc()),
         Index("ix_price_daily_date", "date"),
+        Index("ix_price_daily_ingested_at", "ingested_at"),  # ts_cache data_version
     )
 
 
@@ -96,6 +98,50 @@ class FactorDaily(Base):
     )
 
 
+class FactorDailyWide(Base):
+    """Wide factor storage: one row per (asset, date, version), one column per factor."""
+
+    __tablename__ = "factor_daily_wide"
+
+    asset_id: Mapped[str] = mapped_column(String(20), primary_key=True)
+    date: Mapped["Date"] = mapped_column(Date, primary_key=True)
+    version: Mapped[str] = mapped_column(String(10), primary_key=True)
+    ret_1d: Mapped[float | None] = mapped_column(Float, nullable=True)
+    ret_5d: Mapped[float | None] = mapped_column(Float, nullable=True)
+    ret_20d: Mapped[float | None] = mapped_column(Float, nullable=True)
+    ret_63d: Mapped[float | None] = mapped_column(Float, nullable=True)
+    sma_20: Mapped[float | None] = mapped_column(Float, nullable=True)
+    sma_60: Mapped[float | None] = mapped_column(Float, nullable=True)
+    sma_120: Mapped[float | None] = mapped_column(Float, nullable=True)
+    ema_12: Mapped[float | None] = mapped_column(Float, nullable=True)
+    ema_26: Mapped[float | None] = mapped_column(Float, nullable=True)
+    macd: Mapped[float | None] = mapped_column(Float, nullable=True)
+    macd_signal: Mapped[float | None] = mapped_column(Float, nullable=True)
+    roc: Mapped[float | None] = mapped_column(Float, nullable=True)
+    rsi_14: Mapped[float | None] = mapped_column(Float, nullable=True)
+    vol_20: Mapped[float | None] = mapped_column(Float, nullable=True)
+    atr_14: Mapped[float | None] = mapped_column(Float, nullable=True)
+    vol_zscore_20: Mapped[float | None] = mapped_column(Float, nullable=True)
+
+    __table_args__ = (
+        Index("ix_factor_daily_wide_asset_date", "asset_id", date.desc()),
+    )
+
+
+class FactorComputeState(Base):
+    """Incremental factor state per (asset, version): EWM states + OHLCV tail."""
+
+    __tablename__ = "factor_compute_state"
+
+    asset_id: Mapped[str] = mapped_column(String(20), primary_key=True)
+    version: Mapped[str] = mapped_column(String(10), primary_key=True)
+    last_date: Mapped["Date"] = mapped_column(Date, nullable=False)
+    state_json: Mapped[dict] = mapped_column(JSON, nullable=False)
+    updated_at: Mapped["DateTime"] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
+    )
+
+
 class SignalDaily(Base):
     __tablename__ = "signal_daily"
 
@@ -130,6 +176,12 @@ class BacktestRun(Base):
         DateTime(timezone=True), nullable=True
     )
     status: Mapped[str] = mapped_column(String(20), nullable=False)
+    # sha256 of the on-demand request + data version (NULL for batch research runs)
+    request_key: Mapped[str | None] = mapped_column(String(64), nullable=True)
+
+    __table_args__ = (
+        Index("ix_backtest_run_request_key", "request_key", started_at.desc()),
+    )
 
 
 class BacktestEquityCurve(Base):
@@ -161,6 +213,55 @@ class BacktestTradeLog(Base):
     cost: Mapped[float | None] = mapped_column(Float, nullable=True)
 
 
+class BacktestRunBlob(Base):
+    """Compact equity curve + trade log of a run (research_engine.backtest_codec)."""
+
+    __tablename__ = "backtest_run_blob"
+
+    run_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True
+    )
+    format_version: Mapped[int] = mapped_column(Integer, nullable=False)
+    n_equity: Mapped[int] = mapped_column(Integer, nullable=False)
+    n_trades: Mapped[int] = mapped_column(Integer, nullable=False)
+    equity_blob: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    trades_blob: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+
+
+class BacktestJob(Base):
+    """Queued on-demand backtest (table-backed queue, claimed by API worker threads)."""
+
+    __tablename__ = "backtest_job"
+
+    job_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    status: Mapped[str] = mapped_column(String(20), nullable=False)  # queued|running|success|failed
+    request_json: Mapped[dict] = mapped_column(JSON, nullable=False)
+    stage: Mapped[str | None] = mapped_column(String(20), nullable=True)
+    progress_current: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    progress_total: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    message: Mapped[str | None] = mapped_column(String(200), nullable=True)
+    run_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
+    error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped["DateTime"] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    started_at: Mapped["DateTime | None"] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    updated_at: Mapped["DateTime | None"] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    ended_at: Mapped["DateTime | None"] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+    __table_args__ = (
+        Index("ix_backtest_job_status_created", "status", "created_at"),
+    )
+
+
 class JobRun(Base):
     __tablename__ = "job_run"
 
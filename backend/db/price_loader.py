@@ -0,0 +1,141 @@
+"""Column-wise price_daily loader: many assets, one Core query, NumPy columns.
+
+``session.query(PriceDaily)`` builds a mapped object per row and registers it
+in the session's identity map, which dominates load time for multi-year
+histories. Here the requested columns are selected with a Core ``select``
+for every asset at once, the result rows are transposed into per-column
+arrays and split at asset boundaries. Rows are ordered by
+(asset_id, date, source); when several sources share a date the last one
+wins, as in ``db.ts_cache``.
+"""
+
+from __future__ import annotations
+
+import datetime
+from collections.abc import Iterable, Sequence
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from db.models import PriceDaily
+
+PRICE_COLUMNS = ("open", "high", "low", "close", "volume")
+_INT_COLUMNS = {"volume"}
+
+_DateLike = datetime.date | str | None
+_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+PriceArrays = tuple[np.ndarray, dict[str, np.ndarray]]
+
+
+def _dtype(column: str) -> type:
+    return np.int64 if column in _INT_COLUMNS else np.float64
+
+
+def _to_datetime64(dates: Sequence[datetime.date]) -> np.ndarray:
+    """datetime.date objects → datetime64[ns] (via ordinals; ~20x faster than np.array)."""
+    ordinals = np.fromiter((d.toordinal() for d in dates), dtype=np.int64, count=len(dates))
+    return (ordinals - _EPOCH_ORDINAL).astype("datetime64[D]").astype("datetime64[ns]")
+
+
+def _empty_arrays(columns: Sequence[str]) -> PriceArrays:
+    return (
+        np.array([], dtype="datetime64[ns]"),
+        {name: np.array([], dtype=_dtype(name)) for name in columns},
+    )
+
+
+def fetch_price_arrays(
+    session: Session,
+    asset_ids: Iterable[str],
+    columns: Sequence[str] = PRICE_COLUMNS,
+    start: _DateLike = None,
+    end: _DateLike = None,
+) -> dict[str, PriceArrays]:
+    """Load price columns for several assets in one query.
+
+    Returns:
+        asset_id → (ascending datetime64[ns] dates, {column: array}) for every
+        requested asset; assets without rows get empty arrays. volume is
+        int64, the price columns float64.
+    """
+    asset_ids = list(dict.fromkeys(asset_ids))
+    out = {asset_id: _empty_arrays(columns) for asset_id in asset_ids}
+    if not asset_ids:
+        return out
+
+    stmt = select(
+        PriceDaily.asset_id, PriceDaily.date, *[getattr(PriceDaily, c) for c in columns]
+    )
+    if len(asset_ids) == 1:
+        stmt = stmt.where(PriceDaily.asset_id == asset_ids[0])
+    else:
+        stmt = stmt.where(PriceDaily.asset_id.in_(asset_ids))
+    if start is not None:
+        stmt = stmt.where(PriceDaily.date >= start)
+    if end is not None:
+        stmt = stmt.where(PriceDaily.date <= end)
+    stmt = stmt.order_by(PriceDaily.asset_id, PriceDaily.date, PriceDaily.source)
+
+    rows = session.execute(stmt).all()
+    if not rows:
+        return out
+
+    raw = list(zip(*rows))
+    assets = np.array(raw[0], dtype=object)
+    dates = _to_datetime64(raw[1])
+    values = {name: np.array(raw[i + 2], dtype=_dtype(name)) for i, name in enumerate(columns)}
+
+    # keep the last row of each (asset, date) run, then cut at asset changes
+    new_asset = assets[1:] != assets[:-1]
+    keep = np.r_[new_asset | (dates[1:] != dates[:-1]), True]
+    if not keep.all():
+        assets, dates = assets[keep], dates[keep]
+        values = {name: arr[keep] for name, arr in values.items()}
+        new_asset = assets[1:] != assets[:-1]
+
+    bounds = np.r_[0, np.flatnonzero(new_asset) + 1, len(assets)]
+    for lo, hi in zip(bounds[:-1], bounds[1:]):
+        out[assets[lo]] = (dates[lo:hi], {name: arr[lo:hi] for name, arr in values.items()})
+    return out
+
+
+def load_price_frames(
+    session: Session,
+    asset_ids: Iterable[str],
+    start: _DateLike = None,
+    end: _DateLike = None,
+    columns: Sequence[str] = PRICE_COLUMNS,
+) -> dict[str, pd.DataFrame]:
+    """Per-asset DataFrames indexed by ``date`` (empty frame when an asset has no rows)."""
+    return {
+        asset_id: pd.DataFrame(values, index=pd.DatetimeIndex(dates, name="date"))
+        for asset_id, (dates, values) in fetch_price_arrays(
+            session, asset_ids, columns, start, end
+        ).items()
+    }
+
+
+def load_price_panel(
+    session: Session,
+    asset_ids: Iterable[str],
+    column: str = "close",
+    start: _DateLike = None,
+    end: _DateLike = None,
+) -> pd.DataFrame:
+    """One column for many assets as an aligned (dates × assets) frame.
+
+    The index is the union of all assets' dates; an asset is NaN on dates it
+    has no row for. Columns follow asset_ids, including assets with no data.
+    """
+    arrays = fetch_price_arrays(session, asset_ids, [column], start, end)
+    index = np.unique(np.concatenate(
+        [np.array([], dtype="datetime64[ns]")] + [dates for dates, _ in arrays.values()]
+    ))
+    panel = np.full((len(index), len(arrays)), np.nan)
+    for j, (dates, values) in enumerate(arrays.values()):
+        panel[np.searchsorted(index, dates), j] = values[column]
+    return pd.DataFrame(
+        panel, index=pd.DatetimeIndex(index, name="date"), columns=list(arrays)
+    )
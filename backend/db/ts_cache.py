@@ -0,0 +1,388 @@
+"""Process-wide in-memory time-series cache (prices + factors as NumPy arrays).
+
+Each entry is one asset's full history held as column arrays sharing a sorted
+``datetime64[ns]`` date axis. Readers get read-only views sliced by date
+(``np.searchsorted``), so serving a window never copies the underlying data.
+
+Freshness: the cache is stamped with a data version token
+``(max(job_run.ended_at), max(price_daily.ingested_at))``, re-read from the DB
+at most every ``check_seconds``; when it moves every entry is dropped. An
+ingest run in the same process also calls ``invalidate()`` directly.
+
+Derived caches (e.g. DCA unit curves) key their entries by ``generation``,
+which moves on every such drop.
+
+Memory: entries are evicted least-recently-used once their array bytes exceed
+``max_bytes``.
+"""
+
+from __future__ import annotations
+
+import datetime
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from config.settings import settings
+from db.models import FactorDaily, FactorDailyWide, JobRun, PriceDaily
+from db.price_loader import PRICE_COLUMNS as _PRICE_COLUMNS
+from db.price_loader import fetch_price_arrays
+
+logger = logging.getLogger(__name__)
+
+PRICE_COLUMNS = list(_PRICE_COLUMNS)
+FACTOR_COLUMNS = [
+    c.name for c in FactorDailyWide.__table__.columns
+    if c.name not in ("asset_id", "date", "version")
+]
+
+_DateLike = datetime.date | str | None
+
+
+def _to_datetime64(value: _DateLike) -> np.datetime64 | None:
+    if value is None:
+        return None
+    return np.datetime64(pd.Timestamp(value), "ns")
+
+
+def _readonly(arr: np.ndarray) -> np.ndarray:
+    arr.flags.writeable = False
+    return arr
+
+
+@dataclass(frozen=True)
+class SeriesBlock:
+    """One asset's columns on a shared ascending date axis (arrays are read-only)."""
+
+    asset_id: str
+    dates: np.ndarray  # datetime64[ns]
+    columns: dict[str, np.ndarray]  # float64, aligned with dates
+
+    @property
+    def nbytes(self) -> int:
+        return self.dates.nbytes + sum(a.nbytes for a in self.columns.values())
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def window(self, start: _DateLike = None, end: _DateLike = None) -> SeriesBlock:
+        """Rows with start <= date <= end, as views into this block."""
+        lo = 0 if start is None else int(np.searchsorted(self.dates, _to_datetime64(start)))
+        hi = (
+            len(self.dates) if end is None
+            else int(np.searchsorted(self.dates, _to_datetime64(end), side="right"))
+        )
+        return SeriesBlock(
+            asset_id=self.asset_id,
+            dates=self.dates[lo:hi],
+            columns={name: arr[lo:hi] for name, arr in self.columns.items()},
+        )
+
+    def series(self, column: str, name: str | None = None) -> pd.Series:
+        """Column as a DatetimeIndex-ed Series (default name: asset_id), without copying."""
+        return pd.Series(
+            self.columns[column],
+            index=pd.DatetimeIndex(self.dates, copy=False),
+            name=name or self.asset_id,
+            copy=False,
+        )
+
+    def frame(self, columns: list[str] | None = None) -> pd.DataFrame:
+        """DataFrame of the given (default: all) columns."""
+        names = columns if columns is not None else list(self.columns)
+        return pd.DataFrame(
+            {name: self.columns[name] for name in names},
+            index=pd.DatetimeIndex(self.dates, name="date"),
+        )
+
+
+def _empty_block(asset_id: str, columns: list[str]) -> SeriesBlock:
+    return SeriesBlock(
+        asset_id=asset_id,
+        dates=_readonly(np.array([], dtype="datetime64[ns]")),
+        columns={name: _readonly(np.array([], dtype=float)) for name in columns},
+    )
+
+
+def _block_from_rows(asset_id: str, rows: list, columns: list[str]) -> SeriesBlock:
+    """Build a block from (date, *columns) rows sorted by date.
+
+    Duplicate dates (several price sources) keep the last row.
+    """
+    if not rows:
+        return _empty_block(asset_id, columns)
+    dates = np.array([r[0] for r in rows], dtype="datetime64[ns]")
+    values = np.array([r[1:] for r in rows], dtype=float)
+    keep = np.r_[dates[1:] != dates[:-1], True]
+    if not keep.all():
+        dates, values = dates[keep], values[keep]
+    return SeriesBlock(
+        asset_id=asset_id,
+        dates=_readonly(dates),
+        columns={
+            name: _readonly(np.ascontiguousarray(values[:, i]))
+            for i, name in enumerate(columns)
+        },
+    )
+
+
+def load_price_blocks(session: Session, asset_ids: list[str]) -> dict[str, SeriesBlock]:
+    """Load several assets' full OHLCV histories in one query."""
+    return {
+        asset_id: SeriesBlock(
+            asset_id=asset_id,
+            dates=_readonly(dates),
+            columns={
+                name: _readonly(np.asarray(values[name], dtype=float))
+                for name in PRICE_COLUMNS
+            },
+        )
+        for asset_id, (dates, values) in fetch_price_arrays(
+            session, asset_ids, PRICE_COLUMNS
+        ).items()
+    }
+
+
+def load_price_block(session: Session, asset_id: str) -> SeriesBlock:
+    """Load an asset's full OHLCV history in one query."""
+    return load_price_blocks(session, [asset_id])[asset_id]
+
+
+def load_factor_block(session: Session, asset_id: str, version: str = "v1") -> SeriesBlock:
+    """Load an asset's full factor history (wide table, long-table fallback)."""
+    stmt = (
+        select(FactorDailyWide.date, *[getattr(FactorDailyWide, c) for c in FACTOR_COLUMNS])
+        .where(FactorDailyWide.asset_id == asset_id, FactorDailyWide.version == version)
+        .order_by(FactorDailyWide.date)
+    )
+    rows = session.execute(stmt).all()
+    if rows:
+        return _block_from_rows(asset_id, rows, FACTOR_COLUMNS)
+
+    long_rows = session.execute(
+        select(FactorDaily.date, FactorDaily.factor_name, FactorDaily.value)
+        .where(FactorDaily.asset_id == asset_id, FactorDaily.version == version)
+    ).all()
+    if not long_rows:
+        return _empty_block(asset_id, FACTOR_COLUMNS)
+    wide = (
+        pd.DataFrame(long_rows, columns=["date", "factor_name", "value"])
+        .pivot(index="date", columns="factor_name", values="value")
+        .reindex(columns=FACTOR_COLUMNS)
+        .sort_index()
+    )
+    return _block_from_rows(
+        asset_id, list(wide.itertuples(index=True, name=None)), FACTOR_COLUMNS
+    )
+
+
+def data_version(session: Session) -> tuple:
+    """Token that moves whenever an ingest finishes or price rows are rewritten.
+
+    Price ingest and the FX collector both record a job_run, so FX refreshes
+    move the token too. Both maxima are single index probes
+    (ix_price_daily_ingested_at; job_run is one row per run).
+    """
+    row = session.execute(
+        select(
+            select(func.max(JobRun.ended_at)).scalar_subquery(),
+            select(func.max(PriceDaily.ingested_at)).scalar_subquery(),
+        )
+    ).one()
+    return tuple(row)
+
+
+class TimeSeriesCache:
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024, check_seconds: float = 30.0):
+        self.max_bytes = max_bytes
+        self.check_seconds = check_seconds
+        self._entries: OrderedDict[tuple, SeriesBlock] = OrderedDict()
+        self._bytes = 0
+        self._version: tuple | None = None
+        self._checked_at = float("-inf")
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.generation = 0  # bumped whenever entries are dropped for freshness
+
+    # ── freshness ──
+
+    def invalidate(self) -> None:
+        """Drop every entry (the next read reloads from the DB)."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._checked_at = float("-inf")
+            self.invalidations += 1
+            self.generation += 1
+
+    def _check_version(self, session: Session) -> None:
+        now = time.monotonic()
+        if now - self._checked_at < self.check_seconds:
+            return
+        version = data_version(session)
+        with self._lock:
+            self._checked_at = now
+            if version == self._version:
+                return
+            if self._version is not None:
+                logger.info("Time-series cache invalidated: data version %s → %s",
+                            self._version, version)
+                self.invalidations += 1
+                self.generation += 1
+            self._version = version
+            self._entries.clear()
+            self._bytes = 0
+
+    def current_generation(self, session: Session) -> int:
+        """Generation after a (rate-limited) data-version check.
+
+        Derived caches keyed by this value go stale exactly when this cache
+        drops its entries (ingest in this process or a new data version).
+        """
+        self._check_version(session)
+        return self.generation
+
+    # ── entries ──
+
+    def _get(self, session: Session, key: tuple, loader) -> SeriesBlock:
+        self._check_version(session)
+        with self._lock:
+            block = self._entries.get(key)
+            if block is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return block
+            self.misses += 1
+            generation = self.generation
+
+        return self._put(key, loader(), generation)
+
+    def _put(self, key: tuple, block: SeriesBlock, generation: int) -> SeriesBlock:
+        """Store a freshly loaded block unless the cache was dropped while it loaded.
+
+        A load that started before an invalidation may hold pre-ingest rows;
+        it is returned to its caller but not cached under the new generation.
+        """
+        with self._lock:
+            if generation != self.generation:
+                return block
+            if key not in self._entries:
+                self._entries[key] = block
+                self._bytes += block.nbytes
+            self._evict()
+        return block
+
+    def _evict(self) -> None:
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            _, block = self._entries.popitem(last=False)
+            self._bytes -= block.nbytes
+            self.evictions += 1
+
+    def prices(self, session: Session, asset_id: str) -> SeriesBlock:
+        """Full OHLCV block for an asset."""
+        return self._get(
+            session, ("price", asset_id), lambda: load_price_block(session, asset_id)
+        )
+
+    def prices_many(self, session: Session, asset_ids: list[str]) -> dict[str, SeriesBlock]:
+        """Full OHLCV blocks for several assets; every miss is loaded in one query."""
+        self._check_version(session)
+        blocks: dict[str, SeriesBlock] = {}
+        with self._lock:
+            for asset_id in asset_ids:
+                block = self._entries.get(("price", asset_id))
+                if block is not None:
+                    self._entries.move_to_end(("price", asset_id))
+                    self.hits += 1
+                    blocks[asset_id] = block
+            missing = [a for a in dict.fromkeys(asset_ids) if a not in blocks]
+            self.misses += len(missing)
+            generation = self.generation
+
+        if missing:
+            for asset_id, block in load_price_blocks(session, missing).items():
+                blocks[asset_id] = self._put(("price", asset_id), block, generation)
+        return {asset_id: blocks[asset_id] for asset_id in asset_ids}
+
+    def factors(self, session: Session, asset_id: str, version: str = "v1") -> SeriesBlock:
+        """Full factor block for an asset (NaN where a factor is missing)."""
+        return self._get(
+            session,
+            ("factor", asset_id, version),
+            lambda: load_factor_block(session, asset_id, version),
+        )
+
+    def close_series(
+        self,
+        session: Session,
+        asset_id: str,
+        start_date: _DateLike = None,
+        end_date: _DateLike = None,
+        name: str | None = None,
+    ) -> pd.Series:
+        """Close prices in [start_date, end_date], DatetimeIndex-ed (default name: asset_id)."""
+        block = self.prices(session, asset_id).window(start_date, end_date)
+        return block.series("close", name=name)
+
+    def close_panel(
+        self,
+        session: Session,
+        asset_ids: list[str],
+        start_date: _DateLike = None,
+        end_date: _DateLike = None,
+    ) -> pd.DataFrame:
+        """Close prices in [start_date, end_date] as a (dates × assets) frame.
+
+        The index is the union of the assets' trading dates; an asset is NaN
+        on dates it has no price for.
+        """
+        series = [
+            block.window(start_date, end_date).series("close")
+            for block in self.prices_many(session, asset_ids).values()
+        ]
+        if not series:
+            return pd.DataFrame(index=pd.DatetimeIndex([], name="date"))
+        panel = pd.concat(series, axis=1, join="outer").sort_index()
+        panel.index.name = "date"
+        return panel
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+_cache: TimeSeriesCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_ts_cache() -> TimeSeriesCache:
+    """Process-wide cache, sized from settings on first use."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = TimeSeriesCache(
+                    max_bytes=settings.ts_cache_max_mb * 1024 * 1024,
+                    check_seconds=settings.ts_cache_check_seconds,
+                )
+    return _cache
@@ -18,6 +18,9 @@ class BacktestConfig:
     commission_pct: float = 0.001  # 0.1% 편도
     slippage_pct: float = 0.0  # 향후 확장
     allow_short: bool = False  # MVP: long-only
+    # Multi-asset portfolio only (run_portfolio_backtest)
+    sizing: str | dict[str, float] = "equal"  # "equal" | "active" | {asset_id: weight}
+    rebalance: str | None = None  # None | "W" | "M" | "Q" | "Y"
 
 
 @dataclass
@@ -43,6 +46,29 @@ class BacktestResult:
     buy_hold_equity: pd.DataFrame = field(default_factory=pd.DataFrame)
 
 
+@dataclass
+class BatchBacktestResult:
+    """Array output of run_backtest_batch (rows = assets, columns = dates).
+
+    Bars missing for an asset are NaN in every per-bar array. Trades form a
+    flat table ordered by asset row, then entry date; open positions at the
+    end have trade_exit_idx == -1 and NaN exit price.
+    """
+
+    equity: np.ndarray  # (A, N)
+    drawdown: np.ndarray  # (A, N)
+    position: np.ndarray  # (A, N) 1 while holding, 0 flat
+    buy_hold: np.ndarray  # (A, N)
+    trade_asset: np.ndarray  # (T,) asset row index
+    trade_entry_idx: np.ndarray  # (T,) date column index
+    trade_exit_idx: np.ndarray  # (T,) date column index, -1 if still open
+    trade_entry_price: np.ndarray
+    trade_exit_price: np.ndarray
+    trade_shares: np.ndarray
+    trade_pnl: np.ndarray
+    trade_cost: np.ndarray
+
+
 def run_backtest(
     prices: pd.DataFrame,
     signals: pd.DataFrame,
@@ -84,99 +110,26 @@ def run_backtest(
     closes = merged["close"].values
     sigs = merged["signal"].values.astype(int)
 
-    # --- Simulation ---
+    # --- Simulation (vectorized kernel, single row) ---
+    batch = run_backtest_batch(
+        opens=opens[np.newaxis, :],
+        closes=closes[np.newaxis, :],
+        signals=sigs[np.newaxis, :].astype(float),
+        config=config,
+    )
     n = len(dates)
-    cash = config.initial_cash
-    shares = 0.0
-    equity_arr = np.zeros(n)
-    trades: list[TradeRecord] = []
-    entry_date = None
-    entry_price = 0.0
-    trade_cost = 0.0
-
-    for i in range(n):
-        # Next-day execution: signal at t executes at t+1 open
-        if i > 0:
-            prev_sig = sigs[i - 1]
-            curr_open = opens[i]
-
-            # Buy signal & no position
-            if prev_sig == 1 and shares == 0.0:
-                comm = cash * config.commission_pct
-                investable = cash - comm
-                shares = investable / curr_open
-                entry_date = dates[i]
-                entry_price = curr_open
-                trade_cost = comm
-                cash = 0.0
-
-            # Exit signal & has position
-            elif prev_sig == 0 and shares > 0.0:
-                proceeds = shares * curr_open
-                comm = proceeds * config.commission_pct
-                cash = proceeds - comm
-                trade_cost += comm
-
-                pnl = cash - config.initial_cash if len(trades) == 0 else (
-                    shares * curr_open - shares * entry_price - trade_cost
-                )
-                # More accurate PnL: sell proceeds - buy cost - total commissions
-                sell_proceeds = shares * curr_open
-                buy_cost = shares * entry_price
-                pnl = sell_proceeds - buy_cost - trade_cost
-
-                trades.append(TradeRecord(
-                    asset_id=asset_id,
-                    entry_date=entry_date,
-                    entry_price=entry_price,
-                    exit_date=dates[i],
-                    exit_price=curr_open,
-                    side="long",
-                    shares=shares,
-                    pnl=pnl,
-                    cost=trade_cost,
-                ))
-                shares = 0.0
-                entry_date = None
-                trade_cost = 0.0
-
-        # Mark-to-market
-        equity_arr[i] = cash + shares * closes[i]
-
-    # Close open position at last close (record as open trade)
-    if shares > 0.0:
-        last_close = closes[-1]
-        sell_proceeds = shares * last_close
-        buy_cost = shares * entry_price
-        pnl = sell_proceeds - buy_cost - trade_cost
-        trades.append(TradeRecord(
-            asset_id=asset_id,
-            entry_date=entry_date,
-            entry_price=entry_price,
-            exit_date=None,
-            exit_price=None,
-            side="long",
-            shares=shares,
-            pnl=pnl,
-            cost=trade_cost,
-        ))
-
-    # --- Equity curve ---
-    running_max = np.maximum.accumulate(equity_arr)
-    drawdown = equity_arr / running_max - 1.0
+    equity_arr = batch.equity[0]
+    trades = _batch_trades_to_records(batch, [asset_id], dates)
 
     equity_df = pd.DataFrame({
         "date": dates,
         "equity": equity_arr,
-        "drawdown": drawdown,
+        "drawdown": batch.drawdown[0],
     })
 
-    # --- Buy & Hold benchmark ---
-    bh_shares = (config.initial_cash - config.initial_cash * config.commission_pct) / opens[0]
-    bh_equity = bh_shares * closes
     buy_hold_df = pd.DataFrame({
         "date": dates,
-        "equity": bh_equity,
+        "equity": batch.buy_hold[0],
     })
 
     logger.info(
@@ -200,10 +153,10 @@ def run_backtest_multi(
     strategy_id: str,
     config: BacktestConfig | None = None,
 ) -> BacktestResult:
-    """Run multi-asset backtest with equal weighting (1/N).
+    """Run a multi-asset backtest as one portfolio with a shared cash ledger.
 
-    Each asset gets an equal share of the initial capital and runs independently.
-    Equity curves are summed to produce the portfolio equity.
+    Assets present in both dicts are aligned onto one date axis and run
+    through run_portfolio_backtest (sizing / rebalancing from config).
 
     Args:
         price_dict: {asset_id: prices_df} mapping.
@@ -217,93 +170,578 @@ def run_backtest_multi(
     if config is None:
         config = BacktestConfig()
 
-    asset_ids = sorted(price_dict.keys())
-    n_assets = len(asset_ids)
-
-    if n_assets == 0:
+    asset_ids, dates, opens, closes, signals = align_backtest_inputs(price_dict, signal_dict)
+    if not asset_ids:
         return _empty_result(strategy_id, "MULTI", config)
+    return run_portfolio_backtest(opens, closes, signals, asset_ids, dates, strategy_id, config)
 
-    # Equal weight per asset
-    per_asset_config = BacktestConfig(
-        initial_cash=config.initial_cash / n_assets,
-        commission_pct=config.commission_pct,
-        slippage_pct=config.slippage_pct,
-        allow_short=config.allow_short,
-    )
 
-    results: list[BacktestResult] = []
-    for aid in asset_ids:
-        if aid not in signal_dict:
-            continue
-        r = run_backtest(
-            prices=price_dict[aid],
-            signals=signal_dict[aid],
-            asset_id=aid,
-            strategy_id=strategy_id,
-            config=per_asset_config,
+def run_portfolio_backtest(
+    opens: np.ndarray,
+    closes: np.ndarray,
+    signals: np.ndarray,
+    asset_ids: list[str],
+    dates: pd.DatetimeIndex | list,
+    strategy_id: str,
+    config: BacktestConfig | None = None,
+) -> BacktestResult:
+    """Backtest several assets against one cash pool on an aligned date axis.
+
+    Entry/exit timing is the single-asset rule (signal at t fills at t+1
+    open, long-only). What differs is the money: every fill draws from or
+    returns to one shared cash balance.
+
+    Sizing (config.sizing) sets each held asset's target share of portfolio
+    equity at entry: "equal" = 1/N of the universe, "active" = 1/number of
+    assets held after the bar's fills, or an {asset_id: weight} dict (weights
+    >= 0, sum <= 1). Buys needing more than the available cash are scaled
+    down pro rata. With config.rebalance ("W", "M", "Q", "Y") held positions
+    are traded back to target on the first bar of each period.
+
+    The state only changes on fill/rebalance bars, so the cash recurrence
+    runs once per such bar (vectorized over assets); the equity and
+    buy-and-hold curves are then built for every bar in one array pass.
+    A single asset with "equal" sizing reproduces run_backtest exactly.
+
+    Args:
+        opens, closes, signals: (A, N) arrays from align_backtest_inputs
+            (NaN = missing bar).
+        asset_ids: Row labels.
+        dates: Column labels.
+        strategy_id: Strategy identifier.
+        config: Backtest configuration. Uses defaults if None.
+
+    Returns:
+        BacktestResult (asset_id "MULTI") with the portfolio equity curve,
+        every round-trip trade and an equal-split buy-and-hold benchmark.
+    """
+    if config is None:
+        config = BacktestConfig()
+
+    opens = np.atleast_2d(np.asarray(opens, dtype=float))
+    closes = np.atleast_2d(np.asarray(closes, dtype=float))
+    sigs = np.trunc(np.atleast_2d(np.asarray(signals, dtype=float)))
+    if not (opens.shape == closes.shape == sigs.shape):
+        raise ValueError(
+            f"Shape mismatch: opens={opens.shape}, closes={closes.shape}, "
+            f"signals={sigs.shape}"
+        )
+    if opens.shape[0] != len(asset_ids) or opens.shape[1] != len(dates):
+        raise ValueError(
+            f"Labels do not match arrays: {len(asset_ids)} assets × {len(dates)} dates "
+            f"for shape {opens.shape}"
         )
-        results.append(r)
 
-    if not results:
+    valid, position, buys, sells = _signal_positions(opens, closes, sigs)
+
+    # Drop dates on which no asset trades (e.g. signal-only dates)
+    keep = valid.any(axis=0)
+    if not keep.any():
         return _empty_result(strategy_id, "MULTI", config)
+    if not keep.all():
+        opens, closes, valid = opens[:, keep], closes[:, keep], valid[:, keep]
+        position, buys, sells = position[:, keep], buys[:, keep], sells[:, keep]
+        dates = [d for d, k in zip(dates, keep) if k]
+    dates = list(dates)
+
+    n_assets, n = opens.shape
+    commission = config.commission_pct
+    initial_cash = float(config.initial_cash)
+    base_weights = _base_weights(config.sizing, asset_ids)
+    rebalance_bars = _rebalance_bars(pd.DatetimeIndex(dates), config.rebalance)
+
+    # Mark price per bar: last available close (0 before an asset's first bar)
+    mark = np.nan_to_num(_ffill_2d(np.where(valid, closes, np.nan)), nan=0.0)
+    prev_mark = np.zeros_like(mark)
+    prev_mark[:, 1:] = mark[:, :-1]
+
+    holding = position == 1.0
+    event_bars = np.flatnonzero(
+        buys.any(axis=0) | sells.any(axis=0) | (rebalance_bars & holding.any(axis=0))
+    )
 
-    # Merge equity curves on date
-    all_trades: list[TradeRecord] = []
-    equity_dfs: list[pd.DataFrame] = []
-
-    for r in results:
-        all_trades.extend(r.trades)
-        eq = r.equity_curve[["date", "equity"]].copy()
-        eq = eq.rename(columns={"equity": f"eq_{r.asset_id}"})
-        equity_dfs.append(eq)
-
-    merged = equity_dfs[0]
-    for df in equity_dfs[1:]:
-        merged = merged.merge(df, on="date", how="outer")
-
-    merged = merged.sort_values("date").ffill().bfill()
-    eq_cols = [c for c in merged.columns if c.startswith("eq_")]
-    merged["equity"] = merged[eq_cols].sum(axis=1)
-
-    running_max = merged["equity"].cummax()
-    merged["drawdown"] = merged["equity"] / running_max - 1.0
-
-    combined_equity = merged[["date", "equity", "drawdown"]].reset_index(drop=True)
-
-    # Buy & hold: sum of individual buy-holds
-    bh_dfs: list[pd.DataFrame] = []
-    for r in results:
-        bh = r.buy_hold_equity[["date", "equity"]].copy()
-        bh = bh.rename(columns={"equity": f"bh_{r.asset_id}"})
-        bh_dfs.append(bh)
-
-    if bh_dfs:
-        bh_merged = bh_dfs[0]
-        for df in bh_dfs[1:]:
-            bh_merged = bh_merged.merge(df, on="date", how="outer")
-        bh_merged = bh_merged.sort_values("date").ffill().bfill()
-        bh_cols = [c for c in bh_merged.columns if c.startswith("bh_")]
-        bh_merged["equity"] = bh_merged[bh_cols].sum(axis=1)
-        buy_hold_combined = bh_merged[["date", "equity"]].reset_index(drop=True)
-    else:
-        buy_hold_combined = pd.DataFrame(columns=["date", "equity"])
+    # --- Cash ledger: one step per event bar, vectorized over assets ---
+    cash = initial_cash
+    shares = np.zeros(n_assets)
+    cash_hist = np.empty(len(event_bars))
+    shares_hist = np.empty((n_assets, len(event_bars)))
+
+    # Open round trip per asset: entry bar, fills and costs so far
+    entry_bar = np.full(n_assets, -1)
+    entry_price = np.full(n_assets, np.nan)
+    bought_shares = np.zeros(n_assets)
+    bought_value = np.zeros(n_assets)
+    sold_value = np.zeros(n_assets)
+    trade_cost = np.zeros(n_assets)
+    closed: list[tuple] = []  # (row, entry_bar, exit_bar, entry_px, exit_px, shares, pnl, cost)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for e, j in enumerate(event_bars):
+            px = opens[:, j]
+            tradable = valid[:, j]
+
+            # Exits: sell everything at the open
+            out = sells[:, j]
+            if out.any():
+                proceeds = shares[out] * px[out]
+                comm_out = proceeds * commission
+                cash += float(np.sum(proceeds - comm_out))
+                sold_value[out] += proceeds
+                trade_cost[out] += comm_out
+                for r in np.flatnonzero(out):
+                    closed.append((
+                        r, entry_bar[r], j, entry_price[r], px[r], bought_shares[r],
+                        sold_value[r] - bought_value[r] - trade_cost[r], trade_cost[r],
+                    ))
+                shares[out] = 0.0
+                entry_bar[out] = -1
+                bought_shares[out] = bought_value[out] = sold_value[out] = trade_cost[out] = 0.0
+
+            held = holding[:, j]
+            value = shares * np.where(tradable, px, prev_mark[:, j])
+            equity = cash + float(np.sum(value))
+            target = _target_values(base_weights, config.sizing, held, equity)
+
+            entering = buys[:, j]
+            need = np.where(entering, target, 0.0)
+            if rebalance_bars[j]:
+                adjust = held & tradable & ~entering
+                delta = np.where(adjust, target - value, 0.0)
+                trim = delta < 0
+                if trim.any():
+                    sell_sh = -delta[trim] / px[trim]
+                    proceeds = sell_sh * px[trim]
+                    comm_out = proceeds * commission
+                    cash += float(np.sum(proceeds - comm_out))
+                    shares[trim] -= sell_sh
+                    sold_value[trim] += proceeds
+                    trade_cost[trim] += comm_out
+                need = need + np.maximum(delta, 0.0)
+
+            total_need = float(np.sum(need))
+            if total_need > 0:
+                spend = need * (cash / total_need) if total_need > cash else need
+                comm = spend * commission
+                sh = np.where(need > 0, (spend - comm) / px, 0.0)
+                cash -= float(np.sum(spend))
+                filled = need > 0
+                topped = filled & ~entering
+
+                entry_bar[entering] = j
+                entry_price[entering] = px[entering]
+                shares[filled] += sh[filled]
+                bought_shares[filled] += sh[filled]
+                bought_value[filled] += sh[filled] * px[filled]
+                trade_cost[filled] += comm[filled]
+                entry_price[topped] = bought_value[topped] / bought_shares[topped]
+
+            cash_hist[e] = cash
+            shares_hist[:, e] = shares
+
+    # --- Curves: step the ledger state over every bar in one pass ---
+    ordinal = np.searchsorted(event_bars, np.arange(n), side="right")
+    cash_path = np.r_[initial_cash, cash_hist][ordinal]
+    shares_path = np.hstack([np.zeros((n_assets, 1)), shares_hist])[:, ordinal]
+    equity = cash_path + (shares_path * mark).sum(axis=0)
+    running_max = np.maximum.accumulate(equity)
+    drawdown = equity / running_max - 1.0
+
+    # Buy & hold: 1/N of the cash per asset, all-in at its first open
+    first = valid.argmax(axis=1)
+    sleeve = initial_cash / n_assets
+    bh_shares = (sleeve - sleeve * commission) / opens[np.arange(n_assets), first]
+    started = np.arange(n)[np.newaxis, :] >= first[:, np.newaxis]
+    buy_hold = np.where(started, bh_shares[:, np.newaxis] * mark, sleeve).sum(axis=0)
+
+    # --- Trades: closed round trips, then open ones valued at the last close ---
+    for r in np.flatnonzero(entry_bar >= 0):
+        sell_value = sold_value[r] + shares[r] * mark[r, -1]
+        closed.append((
+            r, entry_bar[r], -1, entry_price[r], np.nan, bought_shares[r],
+            sell_value - bought_value[r] - trade_cost[r], trade_cost[r],
+        ))
+    closed.sort(key=lambda t: (t[0], t[1]))
+    trades = [
+        TradeRecord(
+            asset_id=asset_ids[r],
+            entry_date=dates[entry_i],
+            entry_price=float(entry_px),
+            exit_date=None if exit_i < 0 else dates[exit_i],
+            exit_price=None if exit_i < 0 else float(exit_px),
+            side="long",
+            shares=float(sh),
+            pnl=float(pnl),
+            cost=float(cost),
+        )
+        for r, entry_i, exit_i, entry_px, exit_px, sh, pnl, cost in closed
+    ]
 
     logger.info(
-        "Multi-asset backtest %s: %d assets, %d trades, final equity=%.0f",
-        strategy_id, n_assets, len(all_trades),
-        combined_equity["equity"].iloc[-1] if len(combined_equity) > 0 else 0,
+        "Portfolio backtest %s: %d assets, %d days, %d rebalance/fill bars, "
+        "%d trades, final equity=%.0f",
+        strategy_id, n_assets, n, len(event_bars), len(trades), equity[-1],
     )
 
     return BacktestResult(
         strategy_id=strategy_id,
         asset_id="MULTI",
         config=config,
-        equity_curve=combined_equity,
-        trades=all_trades,
-        buy_hold_equity=buy_hold_combined,
+        equity_curve=pd.DataFrame({"date": dates, "equity": equity, "drawdown": drawdown}),
+        trades=trades,
+        buy_hold_equity=pd.DataFrame({"date": dates, "equity": buy_hold}),
+    )
+
+
+REBALANCE_FREQS = ("W", "M", "Q", "Y")
+
+
+def _base_weights(sizing: str | dict[str, float], asset_ids: list[str]) -> np.ndarray:
+    """Per-asset target weights for "equal" / dict sizing ("active" is per bar)."""
+    n = len(asset_ids)
+    if isinstance(sizing, dict):
+        unknown = set(sizing) - set(asset_ids)
+        if unknown:
+            logger.warning("Sizing weights for assets not in the portfolio: %s", sorted(unknown))
+        weights = np.array([float(sizing.get(aid, 0.0)) for aid in asset_ids])
+        if (weights < 0).any() or weights.sum() > 1.0 + 1e-9:
+            raise ValueError("Sizing weights must be >= 0 and sum to at most 1")
+        return weights
+    if sizing not in ("equal", "active"):
+        raise ValueError(f"Unknown sizing: {sizing}. Use 'equal', 'active' or a weight dict")
+    return np.full(n, 1.0 / n)
+
+
+def _target_values(
+    base_weights: np.ndarray,
+    sizing: str | dict[str, float],
+    held: np.ndarray,
+    equity: float,
+) -> np.ndarray:
+    """Target position value per asset at this bar (0 for assets not held)."""
+    if sizing == "active":
+        n_held = int(held.sum())
+        weights = np.where(held, 1.0 / n_held, 0.0) if n_held else np.zeros(len(held))
+    else:
+        weights = np.where(held, base_weights, 0.0)
+    return weights * equity
+
+
+def _rebalance_bars(dates: pd.DatetimeIndex, rebalance: str | None) -> np.ndarray:
+    """True on the first bar of each new rebalance period (never the first bar)."""
+    bars = np.zeros(len(dates), dtype=bool)
+    if rebalance is None:
+        return bars
+    if rebalance not in REBALANCE_FREQS:
+        raise ValueError(f"Unknown rebalance: {rebalance}. Use one of {REBALANCE_FREQS}")
+    periods = dates.to_period(rebalance).asi8
+    bars[1:] = periods[1:] != periods[:-1]
+    return bars
+
+
+def run_backtest_batch(
+    opens: np.ndarray,
+    closes: np.ndarray,
+    signals: np.ndarray,
+    config: BacktestConfig | None = None,
+) -> BatchBacktestResult:
+    """Run many single-asset backtests at once on aligned (assets × dates) arrays.
+
+    Same rules as run_backtest (signal at t fills at t+1 open, long-only,
+    all-in / all-out with commission on both legs), evaluated as array
+    operations. Per-bar work is fully vectorized; the cash recurrence runs
+    once per trade ordinal across all assets, keeping the floating-point
+    operation order — and therefore the results — identical to the
+    original bar-by-bar loop.
+
+    A NaN in opens, closes or signals marks the bar as missing for that asset,
+    which is equivalent to the inner join done by run_backtest.
+
+    Args:
+        opens: (A, N) open prices. 1-D input is treated as a single asset.
+        closes: (A, N) close prices.
+        signals: (A, N) signal values (+1/0/-1), truncated toward zero.
+        config: Backtest configuration. Uses defaults if None.
+
+    Returns:
+        BatchBacktestResult with per-bar arrays and a flat trade table.
+    """
+    if config is None:
+        config = BacktestConfig()
+
+    opens = np.atleast_2d(np.asarray(opens, dtype=float))
+    closes = np.atleast_2d(np.asarray(closes, dtype=float))
+    sigs = np.trunc(np.atleast_2d(np.asarray(signals, dtype=float)))
+    if not (opens.shape == closes.shape == sigs.shape):
+        raise ValueError(
+            f"Shape mismatch: opens={opens.shape}, closes={closes.shape}, "
+            f"signals={sigs.shape}"
+        )
+
+    n_assets, n = opens.shape
+    rows = np.arange(n_assets)
+    commission = config.commission_pct
+    initial_cash = float(config.initial_cash)
+    valid, position, buys, sells = _signal_positions(opens, closes, sigs)
+
+    # --- Fills: cash recurrence per trade ordinal, vectorized over assets ---
+    n_buys = buys.sum(axis=1)
+    max_trades = int(n_buys.max()) if n_assets else 0
+    buy_idx = _event_indices(buys, max_trades)
+    sell_idx = _event_indices(sells, max_trades)
+
+    entry_price = np.full((n_assets, max_trades), np.nan)
+    exit_price = np.full((n_assets, max_trades), np.nan)
+    shares = np.zeros((n_assets, max_trades))
+    buy_comm = np.zeros((n_assets, max_trades))
+    sell_comm = np.zeros((n_assets, max_trades))
+    cash_levels = np.full((n_assets, max_trades + 1), initial_cash)
+
+    cash = np.full(n_assets, initial_cash)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for k in range(max_trades):
+            has_buy = buy_idx[:, k] >= 0
+            has_sell = sell_idx[:, k] >= 0
+
+            entry_open = np.where(has_buy, opens[rows, buy_idx[:, k]], np.nan)
+            comm = cash * commission
+            sh = np.where(has_buy, (cash - comm) / entry_open, 0.0)
+
+            exit_open = np.where(has_sell, opens[rows, sell_idx[:, k]], np.nan)
+            proceeds = sh * exit_open
+            comm_out = proceeds * commission
+            cash = np.where(has_sell, proceeds - comm_out, cash)
+
+            entry_price[:, k] = entry_open
+            exit_price[:, k] = exit_open
+            shares[:, k] = sh
+            buy_comm[:, k] = np.where(has_buy, comm, 0.0)
+            sell_comm[:, k] = np.where(has_sell, comm_out, 0.0)
+            cash_levels[:, k + 1] = cash
+
+    # --- Mark-to-market ---
+    hold_ord = np.maximum(np.cumsum(buys, axis=1) - 1, 0)
+    flat_ord = np.cumsum(sells, axis=1)
+    if max_trades:
+        held_value = np.take_along_axis(shares, hold_ord, axis=1) * closes
+    else:
+        held_value = np.zeros_like(closes)
+    flat_cash = np.take_along_axis(cash_levels, flat_ord, axis=1)
+    equity = np.where(position == 1.0, held_value, flat_cash)
+    equity[~valid] = np.nan
+
+    with np.errstate(invalid="ignore"):
+        running_max = np.fmax.accumulate(equity, axis=1)
+        drawdown = equity / running_max - 1.0
+
+    # --- Buy & Hold benchmark: all-in at the first valid open ---
+    has_data = valid.any(axis=1)
+    first_idx = valid.argmax(axis=1)
+    last_idx = n - 1 - valid[:, ::-1].argmax(axis=1) if n else first_idx
+    with np.errstate(invalid="ignore", divide="ignore"):
+        bh_shares = (initial_cash - initial_cash * commission) / opens[rows, first_idx]
+    bh_shares = np.where(has_data, bh_shares, np.nan)
+    buy_hold = bh_shares[:, np.newaxis] * closes
+    buy_hold[~valid] = np.nan
+
+    # --- Flat trade table ---
+    t_asset, t_ord = np.nonzero(buy_idx >= 0)
+    t_exit = sell_idx[t_asset, t_ord]
+    is_open = t_exit < 0
+    t_shares = shares[t_asset, t_ord]
+    t_entry = entry_price[t_asset, t_ord]
+    t_exit_price = exit_price[t_asset, t_ord]
+    t_cost = buy_comm[t_asset, t_ord] + sell_comm[t_asset, t_ord]
+
+    # Open positions are valued at the asset's last close
+    sell_value = np.where(
+        is_open,
+        t_shares * closes[t_asset, last_idx[t_asset]],
+        t_shares * t_exit_price,
+    )
+    t_pnl = sell_value - t_shares * t_entry - t_cost
+
+    return BatchBacktestResult(
+        equity=equity,
+        drawdown=drawdown,
+        position=np.where(valid, position, np.nan),
+        buy_hold=buy_hold,
+        trade_asset=t_asset,
+        trade_entry_idx=buy_idx[t_asset, t_ord],
+        trade_exit_idx=t_exit,
+        trade_entry_price=t_entry,
+        trade_exit_price=t_exit_price,
+        trade_shares=t_shares,
+        trade_pnl=t_pnl,
+        trade_cost=t_cost,
     )
 
 
+def batch_to_results(
+    batch: BatchBacktestResult,
+    asset_ids: list[str],
+    strategy_id: str,
+    dates: pd.DatetimeIndex | list,
+    config: BacktestConfig | None = None,
+) -> list[BacktestResult]:
+    """Split a batch run back into one BacktestResult per row.
+
+    Missing bars (NaN) are dropped per row, so each result looks exactly
+    like the output of run_backtest on that row's inputs.
+    """
+    if config is None:
+        config = BacktestConfig()
+
+    dates = list(dates)
+    all_trades = _batch_trades_to_records(batch, asset_ids, dates)
+    trades_by_row: dict[int, list[TradeRecord]] = {}
+    for row, trade in zip(batch.trade_asset.tolist(), all_trades):
+        trades_by_row.setdefault(row, []).append(trade)
+
+    results: list[BacktestResult] = []
+    for row, aid in enumerate(asset_ids):
+        valid = ~np.isnan(batch.equity[row])
+        if not valid.any():
+            results.append(_empty_result(strategy_id, aid, config))
+            continue
+        row_dates = [d for d, ok in zip(dates, valid) if ok]
+        results.append(BacktestResult(
+            strategy_id=strategy_id,
+            asset_id=aid,
+            config=config,
+            equity_curve=pd.DataFrame({
+                "date": row_dates,
+                "equity": batch.equity[row][valid],
+                "drawdown": batch.drawdown[row][valid],
+            }),
+            trades=trades_by_row.get(row, []),
+            buy_hold_equity=pd.DataFrame({
+                "date": row_dates,
+                "equity": batch.buy_hold[row][valid],
+            }),
+        ))
+    return results
+
+
+def align_backtest_inputs(
+    price_dict: dict[str, pd.DataFrame],
+    signal_dict: dict[str, pd.DataFrame],
+) -> tuple[list[str], pd.DatetimeIndex, np.ndarray, np.ndarray, np.ndarray]:
+    """Align per-asset prices and signals onto one (assets × dates) grid.
+
+    Only assets present in both dicts are kept (sorted). Dates outside an
+    asset's own price/signal intersection are NaN, so run_backtest_batch
+    treats them as missing bars.
+
+    Returns:
+        (asset_ids, dates, opens, closes, signals) ready for run_backtest_batch.
+    """
+    asset_ids = sorted(a for a in price_dict if a in signal_dict)
+    open_cols: dict[str, pd.Series] = {}
+    close_cols: dict[str, pd.Series] = {}
+    signal_cols: dict[str, pd.Series] = {}
+
+    for aid in asset_ids:
+        pr = price_dict[aid]
+        idx = pd.to_datetime(pr.index)
+        open_cols[aid] = pd.Series(pr["open"].values, index=idx)
+        close_cols[aid] = pd.Series(pr["close"].values, index=idx)
+
+        sig = signal_dict[aid]
+        sig_idx = pd.to_datetime(sig["date"])
+        signal_cols[aid] = pd.Series(
+            sig["signal"].values.astype(int), index=sig_idx
+        ).astype(float)
+
+    if not asset_ids:
+        empty = np.empty((0, 0))
+        return [], pd.DatetimeIndex([]), empty, empty, empty.copy()
+
+    opens = pd.DataFrame(open_cols).sort_index()
+    closes = pd.DataFrame(close_cols).reindex(opens.index)
+    signals = pd.DataFrame(signal_cols)
+    dates = opens.index.union(signals.index)
+    opens = opens.reindex(dates)
+    closes = closes.reindex(dates)
+    signals = signals.reindex(dates)
+
+    return (
+        asset_ids,
+        dates,
+        opens[asset_ids].to_numpy(dtype=float).T,
+        closes[asset_ids].to_numpy(dtype=float).T,
+        signals[asset_ids].to_numpy(dtype=float).T,
+    )
+
+
+def _signal_positions(
+    opens: np.ndarray, closes: np.ndarray, sigs: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Long/flat state per bar: the previous valid bar's signal decides today's fill.
+
+    Returns (valid, position, buys, sells) as (A, N) arrays; position is 1.0
+    while holding (carried across missing bars), buys/sells mark fill bars.
+    """
+    valid = np.isfinite(opens) & np.isfinite(closes) & np.isfinite(sigs)
+
+    prev_sig = np.full(sigs.shape, np.nan)
+    prev_sig[:, 1:] = _ffill_2d(np.where(valid, sigs, np.nan))[:, :-1]
+
+    events = np.full(sigs.shape, np.nan)
+    events[valid & (prev_sig == 1)] = 1.0
+    events[valid & (prev_sig == 0)] = 0.0
+    position = np.nan_to_num(_ffill_2d(events), nan=0.0)
+
+    prev_position = np.zeros_like(position)
+    prev_position[:, 1:] = position[:, :-1]
+    buys = valid & (position == 1.0) & (prev_position == 0.0)
+    sells = valid & (position == 0.0) & (prev_position == 1.0)
+    return valid, position, buys, sells
+
+
+def _ffill_2d(arr: np.ndarray) -> np.ndarray:
+    """Forward-fill NaNs along axis 1 (leading NaNs stay NaN)."""
+    if arr.size == 0:
+        return arr.copy()
+    idx = np.where(np.isnan(arr), 0, np.arange(arr.shape[1]))
+    np.maximum.accumulate(idx, axis=1, out=idx)
+    filled = arr[np.arange(arr.shape[0])[:, np.newaxis], idx]
+    return filled
+
+
+def _event_indices(mask: np.ndarray, width: int) -> np.ndarray:
+    """Column indices of True cells per row, left-packed into (A, width), -1 padded."""
+    out = np.full((mask.shape[0], width), -1, dtype=np.int64)
+    r, c = np.nonzero(mask)
+    if len(r):
+        ordinal = np.cumsum(mask, axis=1)[r, c] - 1
+        out[r, ordinal] = c
+    return out
+
+
+def _batch_trades_to_records(
+    batch: BatchBacktestResult,
+    asset_ids: list[str],
+    dates: list,
+) -> list[TradeRecord]:
+    """Convert the flat trade table of a batch run into TradeRecord objects."""
+    trades: list[TradeRecord] = []
+    for j in range(len(batch.trade_asset)):
+        exit_i = int(batch.trade_exit_idx[j])
+        is_open = exit_i < 0
+        trades.append(TradeRecord(
+            asset_id=asset_ids[int(batch.trade_asset[j])],
+            entry_date=dates[int(batch.trade_entry_idx[j])],
+            entry_price=batch.trade_entry_price[j],
+            exit_date=None if is_open else dates[exit_i],
+            exit_price=None if is_open else batch.trade_exit_price[j],
+            side="long",
+            shares=batch.trade_shares[j],
+            pnl=batch.trade_pnl[j],
+            cost=batch.trade_cost[j],
+        ))
+    return trades
+
+
 def _empty_result(
     strategy_id: str, asset_id: str, config: BacktestConfig
 ) -> BacktestResult:
@@ -0,0 +1,192 @@
+"""Compact columnar encoding of backtest equity curves and trade logs.
+
+A run's equity curve (or trade log) is stored as one blob instead of one row
+per date:
+
+    b"BTCZ" | version:u8 | zlib( header_len:u32 | header JSON | column bytes )
+
+Each column is packed by type before compression:
+    shuffle — fixed-width numbers with their bytes transposed (byte 0 of every
+              value, then byte 1, ...), so slowly varying floats compress well
+    delta   — dates as int32 days since epoch, first value then day gaps
+    cat     — strings as uint16 codes; the categories live in the header
+Missing dates are stored as NULL_DAY, missing floats as NaN. The drawdown
+column is left out when it is exactly equity / running max - 1 (as the
+backtest engines produce it) and rebuilt on decode.
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+import zlib
+
+import numpy as np
+import pandas as pd
+
+MAGIC = b"BTCZ"
+FORMAT_VERSION = 1
+NULL_DAY = np.iinfo(np.int32).min
+COMPRESS_LEVEL = 6
+
+EQUITY_COLUMNS = ("date", "equity", "drawdown")
+TRADE_COLUMNS = (
+    "asset_id", "entry_date", "entry_price", "exit_date", "exit_price",
+    "side", "shares", "pnl", "cost",
+)
+_TRADE_DATES = ("entry_date", "exit_date")
+_TRADE_STRINGS = ("asset_id", "side")
+
+
+def _shuffle(values: np.ndarray) -> bytes:
+    raw = np.ascontiguousarray(values).view(np.uint8).reshape(len(values), values.itemsize)
+    return raw.T.tobytes()
+
+
+def _unshuffle(buf: bytes, dtype: np.dtype, n: int) -> np.ndarray:
+    raw = np.frombuffer(buf, dtype=np.uint8).reshape(dtype.itemsize, n)
+    return np.ascontiguousarray(raw.T).view(dtype).reshape(n)
+
+
+def pack_columns(columns: dict[str, np.ndarray], encodings: dict[str, str]) -> bytes:
+    """Encode equal-length arrays into one compressed blob.
+
+    Args:
+        columns: name → 1-D array (int32 days for "delta", str for "cat").
+        encodings: name → "shuffle" | "delta" | "cat".
+    """
+    lengths = {len(v) for v in columns.values()}
+    if len(lengths) > 1:
+        raise ValueError(f"Columns differ in length: {sorted(lengths)}")
+    n = lengths.pop() if lengths else 0
+
+    specs, chunks = [], []
+    for name, values in columns.items():
+        enc = encodings[name]
+        spec: dict = {"name": name, "enc": enc}
+        if enc == "cat":
+            categories, codes = np.unique(np.asarray(values, dtype=str), return_inverse=True)
+            spec["categories"] = categories.tolist()
+            data = codes.astype(np.uint16)
+        elif enc == "delta":
+            days = np.asarray(values, dtype=np.int32)
+            data = np.diff(days, prepend=np.int32(0)).astype(np.int32) if n else days
+        elif enc == "shuffle":
+            data = np.asarray(values)
+        else:
+            raise ValueError(f"Unknown column encoding: {enc}")
+        spec["dtype"] = data.dtype.str
+        specs.append(spec)
+        chunks.append(_shuffle(data))
+
+    header = json.dumps({"n": n, "columns": specs}, separators=(",", ":")).encode("utf-8")
+    payload = struct.pack("<I", len(header)) + header + b"".join(chunks)
+    return MAGIC + struct.pack("<B", FORMAT_VERSION) + zlib.compress(payload, COMPRESS_LEVEL)
+
+
+def unpack_columns(blob: bytes) -> dict[str, np.ndarray]:
+    """Decode a blob from pack_columns back into its arrays."""
+    if blob[:4] != MAGIC:
+        raise ValueError("Not a backtest column blob")
+    version = blob[4]
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported backtest blob version: {version}")
+
+    payload = zlib.decompress(blob[5:])
+    (header_len,) = struct.unpack_from("<I", payload)
+    header = json.loads(payload[4:4 + header_len])
+    n = header["n"]
+
+    columns: dict[str, np.ndarray] = {}
+    offset = 4 + header_len
+    for spec in header["columns"]:
+        dtype = np.dtype(spec["dtype"])
+        size = dtype.itemsize * n
+        data = _unshuffle(payload[offset:offset + size], dtype, n)
+        offset += size
+        if spec["enc"] == "cat":
+            data = np.asarray(spec["categories"], dtype=object)[data]
+        elif spec["enc"] == "delta":
+            data = np.cumsum(data, dtype=np.int32)
+        columns[spec["name"]] = data
+    return columns
+
+
+# ---------------------------------------------------------------------------
+# Equity curve / trade log
+# ---------------------------------------------------------------------------
+
+def _days(values) -> np.ndarray:
+    """Dates (Timestamp / date / None) → int32 days since epoch, NULL_DAY for None."""
+    stamps = pd.to_datetime(pd.Series(values, dtype=object))
+    days = stamps.to_numpy(dtype="datetime64[D]").astype(np.int64)
+    days[stamps.isna().to_numpy()] = NULL_DAY
+    return days.astype(np.int32)
+
+
+def days_to_dates(days: np.ndarray) -> np.ndarray:
+    """int32 days → datetime64[D] (NaT for NULL_DAY)."""
+    out = days.astype("datetime64[D]")
+    out[days == NULL_DAY] = np.datetime64("NaT")
+    return out
+
+
+def _drawdown(equity: np.ndarray) -> np.ndarray:
+    return equity / np.maximum.accumulate(equity) - 1.0 if len(equity) else equity.copy()
+
+
+def encode_equity_curve(equity_df: pd.DataFrame) -> bytes:
+    """Pack a BacktestResult.equity_curve (date, equity, drawdown) into a blob."""
+    equity = equity_df["equity"].to_numpy(dtype=np.float64)
+    drawdown = equity_df["drawdown"].to_numpy(dtype=np.float64)
+    columns = {"date": _days(equity_df["date"]), "equity": equity}
+    encodings = {"date": "delta", "equity": "shuffle"}
+    if not np.array_equal(_drawdown(equity), drawdown, equal_nan=True):
+        columns["drawdown"] = drawdown
+        encodings["drawdown"] = "shuffle"
+    return pack_columns(columns, encodings)
+
+
+def decode_equity_curve(blob: bytes) -> dict[str, np.ndarray]:
+    """Blob → {"date": datetime64[D], "equity": float64, "drawdown": float64}."""
+    columns = unpack_columns(blob)
+    columns["date"] = days_to_dates(columns["date"])
+    if "drawdown" not in columns:
+        columns["drawdown"] = _drawdown(columns["equity"])
+    return columns
+
+
+def encode_trades(trades: list) -> bytes:
+    """Pack TradeRecord-like objects (or trade-log rows) into a blob."""
+    columns: dict[str, np.ndarray] = {}
+    encodings: dict[str, str] = {}
+    for name in TRADE_COLUMNS:
+        values = [getattr(t, name) for t in trades]
+        if name in _TRADE_DATES:
+            columns[name] = _days(values)
+        elif name in _TRADE_STRINGS:
+            columns[name] = np.asarray(values, dtype=str)
+            encodings[name] = "cat"
+            continue
+        else:
+            columns[name] = np.array(
+                [np.nan if v is None else v for v in values], dtype=np.float64
+            )
+        encodings[name] = "shuffle"
+    return pack_columns(columns, encodings)
+
+
+def decode_trades(blob: bytes) -> list[dict]:
+    """Blob → trade dicts (dates as datetime.date, missing values as None)."""
+    columns = unpack_columns(blob)
+    n = len(columns["asset_id"])
+    fields: dict[str, list] = {}
+    for name in TRADE_COLUMNS:
+        values = columns[name]
+        if name in _TRADE_DATES:
+            fields[name] = days_to_dates(values).astype(object).tolist()
+        elif name in _TRADE_STRINGS:
+            fields[name] = values.tolist()
+        else:
+            fields[name] = [None if np.isnan(v) else v for v in values.tolist()]
+    return [{name: fields[name][i] for name in TRADE_COLUMNS} for i in range(n)]
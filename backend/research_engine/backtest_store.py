@@ -4,12 +4,15 @@ import logging
 import time
 import uuid
 from dataclasses import dataclass, field
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
+import pandas as pd
+from sqlalchemy import delete, select
 from sqlalchemy.orm import Session
 
-from db.models import BacktestEquityCurve, BacktestRun, BacktestTradeLog
+from db.models import BacktestEquityCurve, BacktestRun, BacktestRunBlob, BacktestTradeLog
 from research_engine.backtest import BacktestResult
+from research_engine.backtest_codec import FORMAT_VERSION, encode_equity_curve, encode_trades
 from research_engine.metrics import PerformanceMetrics, metrics_to_dict
 
 logger = logging.getLogger(__name__)
@@ -34,6 +37,8 @@ def _config_to_dict(config) -> dict:
         "commission_pct": config.commission_pct,
         "slippage_pct": config.slippage_pct,
         "allow_short": config.allow_short,
+        "sizing": config.sizing,
+        "rebalance": config.rebalance,
     }
 
 
@@ -91,6 +96,8 @@ def store_backtest_result(
     session: Session,
     result: BacktestResult,
     metrics: PerformanceMetrics,
+    request_key: str | None = None,
+    compact: bool = True,
 ) -> BacktestStoreResult:
     """Store a backtest result (run + equity curve + trade log) into DB.
 
@@ -98,6 +105,9 @@ def store_backtest_result(
         session: SQLAlchemy session.
         result: BacktestResult from run_backtest / run_backtest_multi.
         metrics: PerformanceMetrics from compute_metrics.
+        request_key: Content key of an on-demand request, for result reuse.
+        compact: Store equity curve and trades as one backtest_run_blob row
+            instead of one row per date / trade.
 
     Returns:
         BacktestStoreResult with status and counts.
@@ -116,19 +126,30 @@ def store_backtest_result(
             metrics_json=metrics_to_dict(metrics),
             started_at=now,
             status="running",
+            request_key=request_key,
         )
         session.add(run)
         session.flush()
 
-        # 2. Insert equity curve
-        equity_records = _equity_curve_to_records(run_id, result.equity_curve)
-        if equity_records:
-            session.bulk_insert_mappings(BacktestEquityCurve, equity_records)
-
-        # 3. Insert trade log
-        trade_records = _trades_to_records(run_id, result.trades)
-        if trade_records:
-            session.bulk_insert_mappings(BacktestTradeLog, trade_records)
+        # 2-3. Equity curve + trade log
+        n_equity = len(result.equity_curve)
+        n_trades = len(result.trades)
+        if compact:
+            session.add(BacktestRunBlob(
+                run_id=run_id,
+                format_version=FORMAT_VERSION,
+                n_equity=n_equity,
+                n_trades=n_trades,
+                equity_blob=encode_equity_curve(result.equity_curve),
+                trades_blob=encode_trades(result.trades),
+            ))
+        else:
+            equity_records = _equity_curve_to_records(run_id, result.equity_curve)
+            if equity_records:
+                session.bulk_insert_mappings(BacktestEquityCurve, equity_records)
+            trade_records = _trades_to_records(run_id, result.trades)
+            if trade_records:
+                session.bulk_insert_mappings(BacktestTradeLog, trade_records)
 
         # 4. Update status to success
         run.status = "success"
@@ -154,14 +175,94 @@ def store_backtest_result(
     logger.info(
         "Stored backtest run %s for %s/%s (equity=%d, trades=%d) in %.0fms",
         run_id, result.strategy_id, result.asset_id,
-        len(equity_records), len(trade_records), elapsed,
+        n_equity, n_trades, elapsed,
     )
     return BacktestStoreResult(
         strategy_id=result.strategy_id,
         asset_id=result.asset_id,
         status="success",
         run_id=run_id,
-        row_count_equity=len(equity_records),
-        row_count_trades=len(trade_records),
+        row_count_equity=n_equity,
+        row_count_trades=n_trades,
         elapsed_ms=elapsed,
     )
+
+
+def evict_backtest_runs(
+    session: Session,
+    ttl_hours: float,
+    max_runs: int,
+) -> int:
+    """Delete cached on-demand runs (request_key set) that are stale.
+
+    A run is stale when it is older than ttl_hours or falls outside the
+    newest max_runs cached runs. Runs without a request_key (research
+    batches) are never touched. The caller commits.
+
+    Returns:
+        Number of runs deleted (equity curve and trade rows go with them).
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=ttl_hours)
+    cached = (
+        select(BacktestRun.run_id, BacktestRun.started_at)
+        .where(BacktestRun.request_key.is_not(None))
+        .order_by(BacktestRun.started_at.desc())
+    )
+    stale = [
+        run_id
+        for i, (run_id, started_at) in enumerate(session.execute(cached).all())
+        if i >= max_runs or _as_utc(started_at) < cutoff
+    ]
+    if not stale:
+        return 0
+
+    session.execute(delete(BacktestTradeLog).where(BacktestTradeLog.run_id.in_(stale)))
+    session.execute(delete(BacktestEquityCurve).where(BacktestEquityCurve.run_id.in_(stale)))
+    session.execute(delete(BacktestRunBlob).where(BacktestRunBlob.run_id.in_(stale)))
+    session.execute(delete(BacktestRun).where(BacktestRun.run_id.in_(stale)))
+    logger.info("Evicted %d cached backtest runs", len(stale))
+    return len(stale)
+
+
+def compact_backtest_run(
+    session: Session,
+    run_id: uuid.UUID,
+    keep_rows: bool = False,
+) -> BacktestRunBlob | None:
+    """Convert a run stored as per-date / per-trade rows into a backtest_run_blob.
+
+    Returns None when the run already has a blob. Unless keep_rows, the
+    original rows are deleted. The caller commits.
+    """
+    if session.get(BacktestRunBlob, run_id) is not None:
+        return None
+    equity_rows = session.execute(
+        select(BacktestEquityCurve.date, BacktestEquityCurve.equity, BacktestEquityCurve.drawdown)
+        .where(BacktestEquityCurve.run_id == run_id)
+        .order_by(BacktestEquityCurve.date)
+    ).all()
+    trade_rows = session.execute(
+        select(BacktestTradeLog)
+        .where(BacktestTradeLog.run_id == run_id)
+        .order_by(BacktestTradeLog.entry_date, BacktestTradeLog.id)
+    ).scalars().all()
+
+    equity_df = pd.DataFrame(equity_rows, columns=["date", "equity", "drawdown"])
+    blob = BacktestRunBlob(
+        run_id=run_id,
+        format_version=FORMAT_VERSION,
+        n_equity=len(equity_df),
+        n_trades=len(trade_rows),
+        equity_blob=encode_equity_curve(equity_df),
+        trades_blob=encode_trades(trade_rows),
+    )
+    session.add(blob)
+    if not keep_rows:
+        session.execute(delete(BacktestTradeLog).where(BacktestTradeLog.run_id == run_id))
+        session.execute(delete(BacktestEquityCurve).where(BacktestEquityCurve.run_id == run_id))
+    return blob
+
+
+def _as_utc(value: datetime) -> datetime:
+    """SQLite returns naive datetimes for timezone-aware columns."""
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
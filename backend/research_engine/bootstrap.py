@@ -0,0 +1,285 @@
+"""Bootstrap confidence intervals for backtest metrics.
+
+Daily returns of a backtest are resampled in blocks (preserving short-range
+autocorrelation and volatility clustering) into many synthetic paths, and
+CAGR, MDD, Sharpe and Sortino are computed for all paths at once:
+
+- Sum-type statistics (total log return, sum and sum of squares of returns and
+  of downside returns) come from prefix sums of the original series, one
+  difference per block — O(paths × blocks) instead of O(paths × days).
+- MDD needs the path itself: log returns are gathered into a
+  (paths × days) matrix, cumsummed and compared with their running peak.
+
+Paths are processed in chunks so peak memory stays bounded regardless of the
+path count.
+
+Methods:
+    stationary: Politis-Romano stationary bootstrap — circular blocks with
+        geometric lengths of mean block_size.
+    block: moving-block bootstrap — fixed-length blocks, non-circular.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from research_engine.backtest import BacktestResult
+from research_engine.metrics import TRADING_DAYS_PER_YEAR
+
+BOOTSTRAP_METHODS = ("stationary", "block")
+BOOTSTRAP_METRICS = ("cagr", "mdd", "sharpe", "sortino")
+DEFAULT_PERCENTILES = (5.0, 25.0, 50.0, 75.0, 95.0)
+
+# Upper bound on the working set of one chunk of paths
+DEFAULT_MAX_CHUNK_BYTES = 64 * 1024 * 1024
+
+# (paths × days) arrays alive at once per chunk: indices, log-equity, running peak
+_ARRAYS_PER_CHUNK = 3
+
+
+@dataclass
+class BootstrapResult:
+    method: str
+    block_size: int
+    n_paths: int
+    n_days: int  # resampled daily returns per path
+    point: dict[str, float]  # metrics of the original return series
+    samples: dict[str, np.ndarray] = field(repr=False)  # metric -> (n_paths,)
+
+    def percentiles(
+        self, q: tuple[float, ...] | list[float] = DEFAULT_PERCENTILES
+    ) -> dict[str, dict[str, float]]:
+        """{metric: {"p5": ..., "p50": ..., ...}} over the bootstrap paths."""
+        out: dict[str, dict[str, float]] = {}
+        for metric, values in self.samples.items():
+            levels = np.percentile(values, q)
+            out[metric] = {f"p{p:g}": float(v) for p, v in zip(q, levels)}
+        return out
+
+
+def returns_from_equity(equity: np.ndarray) -> np.ndarray:
+    """Simple daily returns of an equity curve (non-finite steps dropped)."""
+    equity = np.asarray(equity, dtype=float)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        returns = np.diff(equity) / equity[:-1]
+    return returns[np.isfinite(returns)]
+
+
+def _check_method(method: str) -> None:
+    if method not in BOOTSTRAP_METHODS:
+        raise ValueError(f"Unknown bootstrap method: {method}. Use one of {BOOTSTRAP_METHODS}")
+
+
+def sample_blocks(
+    n: int,
+    n_paths: int,
+    method: str = "stationary",
+    block_size: int = 20,
+    rng: np.random.Generator | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Draw the blocks of n_paths resampled paths of length n.
+
+    Returns:
+        (sources, lengths), both (n_paths, n_blocks) int64: block j of a path
+        copies days sources[j], sources[j]+1, ... (mod n) for lengths[j] days.
+        Lengths sum to exactly n per path; trailing unused blocks have length 0.
+    """
+    _check_method(method)
+    if rng is None:
+        rng = np.random.default_rng()
+    block_size = max(1, min(block_size, n))
+
+    if method == "block":
+        n_blocks = -(-n // block_size)
+        sources = rng.integers(0, n - block_size + 1, size=(n_paths, n_blocks))
+        lengths = np.full((n_paths, n_blocks), block_size, dtype=np.int64)
+    else:
+        expected = n / block_size
+        n_blocks = int(expected + 4 * np.sqrt(expected)) + 2
+        lengths = rng.geometric(1.0 / block_size, size=(n_paths, n_blocks))
+        while (lengths.sum(axis=1) < n).any():
+            extra = rng.geometric(1.0 / block_size, size=(n_paths, n_blocks))
+            lengths = np.concatenate([lengths, extra], axis=1)
+        sources = rng.integers(0, n, size=lengths.shape)
+
+    # Truncate at the path end
+    starts = np.cumsum(lengths, axis=1) - lengths
+    lengths = np.clip(n - starts, 0, lengths)
+    return sources, lengths
+
+
+def _unwrapped_indices(sources: np.ndarray, lengths: np.ndarray, n: int) -> np.ndarray:
+    """Path day indices into two copies of the series (values in [0, 2n)).
+
+    Built as the cumsum of unit steps plus one jump per block.
+    """
+    starts = np.cumsum(lengths, axis=1) - lengths
+    jumps = np.empty_like(sources)
+    jumps[:, 0] = sources[:, 0]
+    jumps[:, 1:] = sources[:, 1:] - sources[:, :-1] - lengths[:, :-1] + 1
+
+    dtype = np.int32 if 2 * n < np.iinfo(np.int32).max else np.int64
+    idx = np.ones((sources.shape[0], n), dtype=dtype)
+    rows, cols = np.nonzero(lengths > 0)
+    idx[rows, starts[rows, cols]] = jumps[rows, cols]
+    return np.cumsum(idx, axis=1, out=idx)
+
+
+def indices_from_blocks(sources: np.ndarray, lengths: np.ndarray, n: int) -> np.ndarray:
+    """(n_paths, n) day indices of the paths described by sample_blocks."""
+    idx = _unwrapped_indices(sources, lengths, n)
+    idx[idx >= n] -= n
+    return idx
+
+
+def bootstrap_indices(
+    n: int,
+    n_paths: int,
+    method: str = "stationary",
+    block_size: int = 20,
+    rng: np.random.Generator | None = None,
+) -> np.ndarray:
+    """(n_paths, n) resampling indices into a length-n series."""
+    sources, lengths = sample_blocks(n, n_paths, method, block_size, rng)
+    return indices_from_blocks(sources, lengths, n)
+
+
+def _finish(
+    n: int,
+    total_log: np.ndarray,
+    mdd: np.ndarray,
+    s1: np.ndarray,
+    s2: np.ndarray,
+    d_count: np.ndarray,
+    d1: np.ndarray,
+    d2: np.ndarray,
+) -> dict[str, np.ndarray]:
+    """Metrics from per-path sums, with compute_metrics conventions.
+
+    Equity is 1, (1+r1), ... (n+1 bars); std uses ddof=1 and a zero std gives 0.
+    """
+    years = (n + 1) / TRADING_DAYS_PER_YEAR
+    ann = np.sqrt(TRADING_DAYS_PER_YEAR)
+    mean = s1 / n
+    with np.errstate(invalid="ignore", divide="ignore"):
+        var = (s2 - s1 * mean) / (n - 1) if n > 1 else np.zeros_like(s1)
+        d_var = np.where(d_count > 1, (d2 - d1 * d1 / d_count) / (d_count - 1), 0.0)
+        sharpe = np.where(var > 0, mean * ann / np.sqrt(np.maximum(var, 0.0)), 0.0)
+        sortino = np.where(d_var > 0, mean * ann / np.sqrt(np.maximum(d_var, 0.0)), 0.0)
+    return {
+        "cagr": np.expm1(total_log / years),
+        "mdd": mdd,
+        "sharpe": sharpe,
+        "sortino": sortino,
+    }
+
+
+def _max_drawdown(log_returns: np.ndarray) -> np.ndarray:
+    """Row-wise MDD of (paths, days) log returns, in place (the curve starts at 1)."""
+    log_equity = np.cumsum(log_returns, axis=1, out=log_returns)
+    peak = np.maximum.accumulate(log_equity, axis=1)
+    np.maximum(peak, 0.0, out=peak)
+    np.subtract(log_equity, peak, out=peak)
+    return np.expm1(peak.min(axis=1))
+
+
+def path_metrics(returns: np.ndarray) -> dict[str, np.ndarray]:
+    """CAGR, MDD, Sharpe and Sortino for every row of a (paths, days) return matrix.
+
+    A single row reproduces compute_metrics on the matching equity curve.
+    """
+    returns = np.atleast_2d(np.asarray(returns, dtype=float))
+    downside = np.minimum(returns, 0.0)
+    log_returns = np.log1p(returns)
+    total_log = log_returns.sum(axis=1)
+    return _finish(
+        returns.shape[1],
+        total_log=total_log,
+        mdd=_max_drawdown(log_returns),
+        s1=returns.sum(axis=1),
+        s2=np.einsum("ij,ij->i", returns, returns),
+        d_count=np.count_nonzero(downside, axis=1),
+        d1=downside.sum(axis=1),
+        d2=np.einsum("ij,ij->i", downside, downside),
+    )
+
+
+def _circular_prefix(values: np.ndarray) -> np.ndarray:
+    """Prefix sums over two copies of values, so any circular window is one difference."""
+    return np.concatenate([[0.0], np.cumsum(np.tile(values, 2))])
+
+
+def bootstrap_metrics(
+    returns: np.ndarray,
+    n_paths: int = 10_000,
+    method: str = "stationary",
+    block_size: int = 20,
+    seed: int | None = None,
+    max_chunk_bytes: int = DEFAULT_MAX_CHUNK_BYTES,
+) -> BootstrapResult:
+    """Bootstrap the metric distributions of a daily return series.
+
+    Args:
+        returns: 1-D daily simple returns.
+        n_paths: Number of resampled paths.
+        method: "stationary" or "block".
+        block_size: Mean (stationary) or fixed (block) block length in days.
+        seed: RNG seed for reproducible bands.
+        max_chunk_bytes: Working-set bound per chunk of paths.
+
+    Raises:
+        ValueError: Fewer than 2 returns, n_paths < 1 or an unknown method.
+    """
+    returns = np.asarray(returns, dtype=float)
+    returns = returns[np.isfinite(returns)]
+    n = len(returns)
+    if n < 2:
+        raise ValueError("Need at least 2 daily returns to bootstrap")
+    if n_paths < 1:
+        raise ValueError("n_paths must be >= 1")
+    _check_method(method)
+
+    rng = np.random.default_rng(seed)
+    log_returns = np.log1p(returns)
+    log_returns_twice = np.tile(log_returns, 2)
+    downside = np.minimum(returns, 0.0)
+    prefix = {
+        "total_log": _circular_prefix(log_returns),
+        "s1": _circular_prefix(returns),
+        "s2": _circular_prefix(returns * returns),
+        "d_count": _circular_prefix((returns < 0).astype(float)),
+        "d1": _circular_prefix(downside),
+        "d2": _circular_prefix(downside * downside),
+    }
+
+    chunk = max(1, max_chunk_bytes // (n * 8 * _ARRAYS_PER_CHUNK))
+    samples = {m: np.empty(n_paths) for m in BOOTSTRAP_METRICS}
+    for lo in range(0, n_paths, chunk):
+        hi = min(lo + chunk, n_paths)
+        sources, lengths = sample_blocks(n, hi - lo, method, block_size, rng)
+        ends = sources + lengths
+        sums = {
+            name: (p[ends] - p[sources]).sum(axis=1) for name, p in prefix.items()
+        }
+        sums["d_count"] = np.rint(sums["d_count"])
+        idx = _unwrapped_indices(sources, lengths, n)
+        metrics = _finish(n, mdd=_max_drawdown(log_returns_twice[idx]), **sums)
+        for m in BOOTSTRAP_METRICS:
+            samples[m][lo:hi] = metrics[m]
+
+    point = {m: float(v[0]) for m, v in path_metrics(returns).items()}
+    return BootstrapResult(
+        method=method,
+        block_size=max(1, min(block_size, n)),
+        n_paths=n_paths,
+        n_days=n,
+        point=point,
+        samples=samples,
+    )
+
+
+def bootstrap_backtest(result: BacktestResult, **kwargs) -> BootstrapResult:
+    """bootstrap_metrics on the daily returns of a backtest's equity curve."""
+    return bootstrap_metrics(returns_from_equity(result.equity_curve["equity"]), **kwargs)
@@ -5,16 +5,35 @@ import logging
 import time
 from dataclasses import dataclass, field
 
+import numpy as np
 import pandas as pd
-from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
-from db.models import FactorDaily
-from research_engine.factors import FACTOR_VERSION, compute_all_factors
-from research_engine.preprocessing import preprocess
+from db.bulk import bulk_upsert
+from db.models import FactorComputeState, FactorDaily, FactorDailyWide
+from db.ts_cache import get_ts_cache
+from research_engine.factors import (
+    ALL_FACTOR_NAMES,
+    FACTOR_VERSION,
+    INCREMENTAL_TAIL_ROWS,
+    OHLCV_COLUMNS,
+    build_panel,
+    compute_all_factors,
+    compute_factors_incremental,
+    compute_factors_panel,
+    ewm_state,
+    plan_factors,
+)
+from research_engine.preprocessing import (
+    DAILY_CATEGORIES,
+    align_calendar,
+    get_category,
+    load_prices,
+    preprocess,
+)
 
-# SMA(120) is the longest lookback; 150 calendar days gives sufficient margin.
-LOOKBACK_DAYS = 150
+# Extra calendar days on top of the planned lookback (holidays at the window edge)
+LOOKBACK_MARGIN_DAYS = 7
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +48,40 @@ class FactorStoreResult:
     elapsed_ms: float = 0.0
 
 
+def lookback_calendar_days(rows: int, category: str) -> int:
+    """Calendar days before a start date that hold `rows` aligned price rows."""
+    if category in DAILY_CATEGORIES:
+        return rows + LOOKBACK_MARGIN_DAYS
+    return int(np.ceil(rows * 7 / 5)) + LOOKBACK_MARGIN_DAYS
+
+
+def _extended_start(asset_id: str, start: str | None) -> str | None:
+    """Move start back to cover the factor plan's lookback (SMA-120 etc.)."""
+    if start is None:
+        return None
+    lookback_days = lookback_calendar_days(plan_factors().lookback_rows, get_category(asset_id))
+    start_date = datetime.date.fromisoformat(start)
+    extended_start = (start_date - datetime.timedelta(days=lookback_days)).isoformat()
+    logger.info(
+        "Extended start for %s: %s → %s (lookback %d days)",
+        asset_id, start, extended_start, lookback_days,
+    )
+    return extended_start
+
+
+def _trim(factors_df: pd.DataFrame, start: str | None, end: str | None) -> pd.DataFrame:
+    """Discard lookback rows outside the requested start..end."""
+    if start is not None:
+        factors_df = factors_df[factors_df.index >= pd.Timestamp(start)]
+    if end is not None:
+        factors_df = factors_df[factors_df.index <= pd.Timestamp(end)]
+    return factors_df
+
+
+def _date_keys(index: pd.Index) -> list:
+    return [d.date() if hasattr(d, "date") else d for d in index]
+
+
 def _factors_to_records(
     asset_id: str,
     factors_df: pd.DataFrame,
@@ -38,21 +91,40 @@ def _factors_to_records(
 
     Skips NaN values (early rows with insufficient lookback).
     """
-    records = []
-    for date_val, row in factors_df.iterrows():
-        date_key = date_val.date() if hasattr(date_val, "date") else date_val
-        for factor_name in factors_df.columns:
-            value = row[factor_name]
-            if pd.isna(value):
-                continue
-            records.append({
-                "asset_id": asset_id,
-                "date": date_key,
-                "factor_name": factor_name,
-                "version": version,
-                "value": float(value),
-            })
-    return records
+    values = factors_df.to_numpy(dtype=float)
+    rows, cols = np.nonzero(~np.isnan(values))
+    dates = _date_keys(factors_df.index)
+    names = list(factors_df.columns)
+    return [
+        {
+            "asset_id": asset_id,
+            "date": dates[r],
+            "factor_name": names[c],
+            "version": version,
+            "value": float(values[r, c]),
+        }
+        for r, c in zip(rows.tolist(), cols.tolist())
+    ]
+
+
+def _factors_to_wide_records(
+    asset_id: str,
+    factors_df: pd.DataFrame,
+    version: str = FACTOR_VERSION,
+) -> list[dict]:
+    """Convert a factor DataFrame to one record per date for factor_daily_wide.
+
+    Every ALL_FACTOR_NAMES column is present (NaN → None); dates where all
+    factors are NaN are skipped, mirroring _factors_to_records.
+    """
+    frame = factors_df.reindex(columns=ALL_FACTOR_NAMES).astype(float)
+    frame = frame[frame.notna().any(axis=1)]
+    values = frame.to_numpy(dtype=object)
+    values[pd.isna(frame).to_numpy()] = None
+    return [
+        {"asset_id": asset_id, "date": d, "version": version, **dict(zip(ALL_FACTOR_NAMES, row))}
+        for d, row in zip(_date_keys(frame.index), values.tolist())
+    ]
 
 
 def _upsert_factors(session: Session, records: list[dict], chunk_size: int = 2000) -> int:
@@ -60,19 +132,29 @@ def _upsert_factors(session: Session, records: list[dict], chunk_size: int = 200
 
     Conflict key: (asset_id, date, factor_name, version).
     """
-    total = 0
-    for i in range(0, len(records), chunk_size):
-        chunk = records[i : i + chunk_size]
-        stmt = insert(FactorDaily).values(chunk)
-        stmt = stmt.on_conflict_do_update(
-            index_elements=["asset_id", "date", "factor_name", "version"],
-            set_={"value": stmt.excluded.value},
-        )
-        session.execute(stmt)
-        total += len(chunk)
+    return bulk_upsert(
+        session,
+        FactorDaily,
+        records,
+        conflict_cols=["asset_id", "date", "factor_name", "version"],
+        update_cols=["value"],
+        chunk_size=chunk_size,
+    ).row_count
 
-    session.flush()
-    return total
+
+def _upsert_factors_wide(session: Session, records: list[dict], chunk_size: int = 500) -> int:
+    """UPSERT wide records into factor_daily_wide using ON CONFLICT DO UPDATE.
+
+    Conflict key: (asset_id, date, version).
+    """
+    return bulk_upsert(
+        session,
+        FactorDailyWide,
+        records,
+        conflict_cols=["asset_id", "date", "version"],
+        update_cols=list(ALL_FACTOR_NAMES),
+        chunk_size=chunk_size,
+    ).row_count
 
 
 def store_factors_for_asset(
@@ -85,20 +167,12 @@ def store_factors_for_asset(
 ) -> FactorStoreResult:
     """Compute and store factors for a single asset.
 
-    Pipeline: preprocess → compute_all_factors → UPSERT factor_daily.
+    Pipeline: preprocess → compute_all_factors → UPSERT factor_daily + factor_daily_wide.
     """
     t0 = time.perf_counter()
     logger.info("Computing factors for %s", asset_id)
 
-    # Extend start date to ensure sufficient lookback for indicators (SMA-120 etc.)
-    extended_start = start
-    if start is not None:
-        start_date = datetime.date.fromisoformat(start)
-        extended_start = (start_date - datetime.timedelta(days=LOOKBACK_DAYS)).isoformat()
-        logger.info(
-            "Extended start for %s: %s → %s (lookback %d days)",
-            asset_id, start, extended_start, LOOKBACK_DAYS,
-        )
+    extended_start = _extended_start(asset_id, start)
 
     # 1. Preprocess (with extended range for lookback)
     try:
@@ -127,15 +201,14 @@ def store_factors_for_asset(
         )
 
     # 2b. Trim factors to original requested range (discard lookback rows)
-    if start is not None:
-        factors_df = factors_df[factors_df.index >= pd.Timestamp(start)]
-    if end is not None:
-        factors_df = factors_df[factors_df.index <= pd.Timestamp(end)]
+    factors_df = _trim(factors_df, start, end)
 
     # 3. Convert to long format and UPSERT
     try:
         records = _factors_to_records(asset_id, factors_df, version)
         row_count = _upsert_factors(session, records)
+        _upsert_factors_wide(session, _factors_to_wide_records(asset_id, factors_df, version))
+        _save_factor_state(session, asset_id, version, df)
         session.commit()
     except Exception as e:
         session.rollback()
@@ -163,16 +236,327 @@ def store_factors_for_asset(
     )
 
 
+# ---------------------------------------------------------------------------
+# Incremental (append-only) mode
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class FactorConsistencyResult:
+    asset_id: str
+    ok: bool
+    dates_checked: int = 0
+    max_abs_diff: float = 0.0
+    mismatches: list[str] = field(default_factory=list)  # "date/factor_name"
+
+
+def _save_factor_state(
+    session: Session,
+    asset_id: str,
+    version: str,
+    df: pd.DataFrame,
+    state: dict | None = None,
+    history_start: datetime.date | None = None,
+) -> None:
+    """Persist the incremental state at the last row of an aligned OHLCV frame.
+
+    `df` must hold at least the last INCREMENTAL_TAIL_ROWS rows. When `state`
+    is None the EWM state is derived from `df` itself (full-history frame).
+    """
+    if df.empty:
+        return
+    tail = df[OHLCV_COLUMNS].iloc[-INCREMENTAL_TAIL_ROWS:]
+    if state is None:
+        state = ewm_state(df)
+    if history_start is None:
+        history_start = df.index[0].date()
+
+    session.merge(FactorComputeState(
+        asset_id=asset_id,
+        version=version,
+        last_date=tail.index[-1].date(),
+        state_json={
+            "history_start": history_start.isoformat(),
+            "ewm": state,
+            "tail": {
+                "date": [d.date().isoformat() for d in tail.index],
+                **{col: tail[col].astype(float).tolist() for col in OHLCV_COLUMNS},
+            },
+        },
+    ))
+
+
+def _load_factor_state(
+    session: Session, asset_id: str, version: str
+) -> tuple[pd.DataFrame, dict, datetime.date] | None:
+    """Load (tail, ewm state, history_start) or None if no state is stored."""
+    row = session.get(FactorComputeState, (asset_id, version))
+    if row is None:
+        return None
+    data = row.state_json
+    tail_data = dict(data["tail"])
+    index = pd.DatetimeIndex(pd.to_datetime(tail_data.pop("date")), name="date")
+    tail = pd.DataFrame(tail_data, index=index)[OHLCV_COLUMNS]
+    return tail, dict(data["ewm"]), datetime.date.fromisoformat(data["history_start"])
+
+
+def store_factors_incremental(
+    session: Session,
+    asset_id: str,
+    end: str | None = None,
+    version: str = FACTOR_VERSION,
+) -> FactorStoreResult:
+    """Compute and store factors only for price_daily rows after the saved state.
+
+    Loads the new rows, aligns them onto the stored OHLCV tail, continues the
+    EWM states and upserts only the new dates. Without a saved state (first
+    run) this falls back to a full store_factors_for_asset, which saves one.
+    """
+    t0 = time.perf_counter()
+    loaded = _load_factor_state(session, asset_id, version)
+    if loaded is None:
+        logger.info("No factor state for %s/%s — running full computation", asset_id, version)
+        return store_factors_for_asset(session, asset_id, end=end, version=version)
+    tail, state, history_start = loaded
+    last_date = tail.index[-1].date()
+
+    # 1. Load only rows after the saved state and align onto the tail calendar
+    new_start = (last_date + datetime.timedelta(days=1)).isoformat()
+    try:
+        new_prices = load_prices(session, asset_id, new_start, end)
+    except ValueError:
+        elapsed = (time.perf_counter() - t0) * 1000
+        logger.info("Factors for %s already up to date (%s)", asset_id, last_date)
+        return FactorStoreResult(asset_id=asset_id, status="success", elapsed_ms=elapsed)
+
+    try:
+        aligned = align_calendar(pd.concat([tail, new_prices]), get_category(asset_id))
+        new_rows = aligned[aligned.index > pd.Timestamp(last_date)][OHLCV_COLUMNS]
+        new_rows = new_rows.astype({"volume": float})
+        factors_df, new_state = compute_factors_incremental(tail, new_rows, state)
+    except Exception as e:
+        elapsed = (time.perf_counter() - t0) * 1000
+        logger.error("Incremental factor computation failed for %s: %s", asset_id, e)
+        return FactorStoreResult(
+            asset_id=asset_id,
+            status="compute_failed",
+            errors=[str(e)],
+            elapsed_ms=elapsed,
+        )
+
+    # 2. UPSERT new dates + advance the state in one transaction
+    try:
+        records = _factors_to_records(asset_id, factors_df, version)
+        row_count = _upsert_factors(session, records)
+        _upsert_factors_wide(session, _factors_to_wide_records(asset_id, factors_df, version))
+        _save_factor_state(
+            session, asset_id, version, pd.concat([tail, new_rows]),
+            state=new_state, history_start=history_start,
+        )
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        elapsed = (time.perf_counter() - t0) * 1000
+        logger.error("Incremental factor store failed for %s: %s", asset_id, e)
+        return FactorStoreResult(
+            asset_id=asset_id,
+            status="store_failed",
+            errors=[f"db_upsert_error: {e}"],
+            elapsed_ms=elapsed,
+        )
+
+    elapsed = (time.perf_counter() - t0) * 1000
+    logger.info(
+        "Incremental factors for %s: %d new dates, %d rows in %.0fms",
+        asset_id, len(factors_df), row_count, elapsed,
+    )
+    return FactorStoreResult(
+        asset_id=asset_id,
+        status="success",
+        row_count=row_count,
+        factor_count=len(factors_df.columns),
+        elapsed_ms=elapsed,
+    )
+
+
+def check_factor_consistency(
+    session: Session,
+    asset_id: str,
+    start: str | None = None,
+    version: str = FACTOR_VERSION,
+    rtol: float = 1e-9,
+    atol: float = 1e-12,
+) -> FactorConsistencyResult:
+    """Compare stored factor_daily values against a full recompute.
+
+    The recompute starts at the saved state's history_start (EWM factors
+    depend on where the history begins), so incrementally appended rows
+    should match up to floating-point rounding of the rolling windows.
+
+    Args:
+        start: First date to compare (default: all dates in the state history).
+    """
+    loaded = _load_factor_state(session, asset_id, version)
+    if loaded is None:
+        return FactorConsistencyResult(
+            asset_id=asset_id, ok=False, mismatches=["no factor state"],
+        )
+    tail, _, history_start = loaded
+
+    df = preprocess(session, asset_id, history_start.isoformat(), tail.index[-1].date().isoformat())
+    expected = compute_all_factors(df)
+    if start is not None:
+        expected = expected[expected.index >= pd.Timestamp(start)]
+
+    query = session.query(FactorDaily.date, FactorDaily.factor_name, FactorDaily.value).filter(
+        FactorDaily.asset_id == asset_id,
+        FactorDaily.version == version,
+        FactorDaily.date >= expected.index[0].date(),
+        FactorDaily.date <= expected.index[-1].date(),
+    )
+    stored = pd.DataFrame(query.all(), columns=["date", "factor_name", "value"])
+    if stored.empty:
+        return FactorConsistencyResult(asset_id=asset_id, ok=False, mismatches=["no stored rows"])
+    stored = stored.pivot(index="date", columns="factor_name", values="value")
+    stored.index = pd.to_datetime(stored.index)
+    stored = stored.reindex(index=expected.index, columns=ALL_FACTOR_NAMES)
+
+    exp = expected[ALL_FACTOR_NAMES].to_numpy(dtype=float)
+    got = stored.to_numpy(dtype=float)
+    both_nan = np.isnan(exp) & np.isnan(got)
+    close = np.isclose(got, exp, rtol=rtol, atol=atol) | both_nan
+    diff = np.abs(got - exp)
+    max_diff = float(np.nanmax(diff)) if np.isfinite(diff).any() else 0.0
+
+    bad_rows, bad_cols = np.nonzero(~close)
+    mismatches = [
+        f"{expected.index[r].date()}/{ALL_FACTOR_NAMES[c]}" for r, c in zip(bad_rows, bad_cols)
+    ]
+    if mismatches:
+        logger.warning(
+            "Factor consistency check failed for %s: %d mismatches (max diff %.3g)",
+            asset_id, len(mismatches), max_diff,
+        )
+    return FactorConsistencyResult(
+        asset_id=asset_id,
+        ok=not mismatches,
+        dates_checked=len(expected),
+        max_abs_diff=max_diff,
+        mismatches=mismatches,
+    )
+
+
+def store_factors_panel(
+    session: Session,
+    asset_ids: list[str],
+    start: str | None = None,
+    end: str | None = None,
+    version: str = FACTOR_VERSION,
+    missing_threshold: float = 0.05,
+) -> list[FactorStoreResult]:
+    """Compute and store factors for many assets in one panel pass.
+
+    Each asset is preprocessed as in store_factors_for_asset (failures are
+    reported per asset). Business-day and daily-calendar (crypto) assets
+    form separate (dates × assets) panels so each keeps its own calendar;
+    compute_factors_panel evaluates every factor once per panel. All rows
+    are then upserted and committed in one batch.
+    """
+    t0 = time.perf_counter()
+    results: dict[str, FactorStoreResult] = {}
+    calendars: dict[bool, dict[str, pd.DataFrame]] = {}
+    for asset_id in asset_ids:
+        try:
+            df = preprocess(
+                session, asset_id, _extended_start(asset_id, start), end,
+                missing_threshold=missing_threshold,
+            )
+        except Exception as e:
+            logger.error("Preprocess failed for %s: %s", asset_id, e)
+            results[asset_id] = FactorStoreResult(
+                asset_id=asset_id, status="preprocess_failed", errors=[str(e)],
+            )
+            continue
+        daily = get_category(asset_id) in DAILY_CATEGORIES
+        calendars.setdefault(daily, {})[asset_id] = df
+
+    frames: dict[str, pd.DataFrame] = {}
+    factors: dict[str, pd.DataFrame] = {}
+    for group in calendars.values():
+        try:
+            panel = compute_factors_panel(build_panel(group))
+        except Exception as e:
+            logger.error("Panel factor computation failed for %s: %s", list(group), e)
+            for asset_id in group:
+                results[asset_id] = FactorStoreResult(
+                    asset_id=asset_id, status="compute_failed", errors=[str(e)],
+                )
+            continue
+        for asset_id, df in group.items():
+            asset_factors = pd.DataFrame(
+                {name: panel[name][asset_id] for name in ALL_FACTOR_NAMES}
+            ).reindex(df.index)
+            frames[asset_id] = df
+            factors[asset_id] = _trim(asset_factors, start, end)
+
+    records: list[dict] = []
+    wide_records: list[dict] = []
+    row_counts: dict[str, int] = {}
+    for asset_id, factors_df in factors.items():
+        asset_records = _factors_to_records(asset_id, factors_df, version)
+        row_counts[asset_id] = len(asset_records)
+        records.extend(asset_records)
+        wide_records.extend(_factors_to_wide_records(asset_id, factors_df, version))
+
+    store_error = None
+    if factors:
+        try:
+            _upsert_factors(session, records)
+            _upsert_factors_wide(session, wide_records)
+            for asset_id, df in frames.items():
+                _save_factor_state(session, asset_id, version, df)
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            logger.error("Panel factor store failed: %s", e)
+            store_error = f"db_upsert_error: {e}"
+
+    elapsed = (time.perf_counter() - t0) * 1000
+    for asset_id in factors:
+        if store_error is not None:
+            results[asset_id] = FactorStoreResult(
+                asset_id=asset_id, status="store_failed", errors=[store_error],
+                elapsed_ms=elapsed,
+            )
+        else:
+            results[asset_id] = FactorStoreResult(
+                asset_id=asset_id,
+                status="success",
+                row_count=row_counts[asset_id],
+                factor_count=len(ALL_FACTOR_NAMES),
+                elapsed_ms=elapsed,
+            )
+    logger.info(
+        "Panel factors for %d assets: %d rows in %.0fms",
+        len(factors), len(records), elapsed,
+    )
+    return [results[asset_id] for asset_id in asset_ids]
+
+
 def store_factors_all(
     session: Session,
     asset_ids: list[str] | None = None,
     start: str | None = None,
     end: str | None = None,
     version: str = FACTOR_VERSION,
+    incremental: bool = False,
 ) -> list[FactorStoreResult]:
     """Compute and store factors for all (or specified) assets.
 
     If asset_ids is None, queries asset_master for active assets.
+    Full runs go through store_factors_panel (one panel pass, one write
+    batch). With incremental=True, only dates after each asset's saved
+    state are computed (start is ignored).
     """
     from collector.fdr_client import SYMBOL_MAP
     from db.models import AssetMaster
@@ -185,10 +569,13 @@ def store_factors_all(
             logger.warning("Could not query asset_master, falling back to SYMBOL_MAP")
             asset_ids = list(SYMBOL_MAP.keys())
 
-    results: list[FactorStoreResult] = []
-    for asset_id in asset_ids:
-        result = store_factors_for_asset(session, asset_id, start, end, version)
-        results.append(result)
+    if incremental:
+        results = [
+            store_factors_incremental(session, asset_id, end, version) for asset_id in asset_ids
+        ]
+    else:
+        results = store_factors_panel(session, asset_ids, start, end, version)
+    get_ts_cache().invalidate()
 
     success = sum(1 for r in results if r.status == "success")
     total = len(results)
@@ -9,6 +9,9 @@ Factors (15 total):
 """
 
 import logging
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from functools import lru_cache
 
 import numpy as np
 import pandas as pd
@@ -17,167 +20,234 @@ logger = logging.getLogger(__name__)
 
 FACTOR_VERSION = "v1"
 
+OHLCV_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+ALL_FACTOR_NAMES = [
+    "ret_1d", "ret_5d", "ret_20d", "ret_63d",
+    "sma_20", "sma_60", "sma_120",
+    "ema_12", "ema_26", "macd", "macd_signal",
+    "roc", "rsi_14",
+    "vol_20", "atr_14",
+    "vol_zscore_20",
+]
+
 
 # ---------------------------------------------------------------------------
-# Returns
+# Factor graph: each node declares its inputs and window; plan_factors resolves
+# a requested subset into the nodes it needs (shared intermediates once).
+# Node functions take Series (one asset) or DataFrames (dates × assets panel,
+# NaN outside each asset's history) and work column-wise on both.
 # ---------------------------------------------------------------------------
 
-def compute_returns(df: pd.DataFrame) -> pd.DataFrame:
-    """Compute return factors: ret_1d, ret_5d, ret_20d, ret_63d."""
-    close = df["close"]
-    result = pd.DataFrame(index=df.index)
-    for period, name in [(1, "ret_1d"), (5, "ret_5d"), (20, "ret_20d"), (63, "ret_63d")]:
-        result[name] = close.pct_change(period)
-    return result
+# EWM factors never fully forget their start; after this many spans the
+# weight left on the first observation is below e^-6 (~0.25%).
+EWM_WARMUP_SPANS = 3
+_WILDER_PERIOD = 14
 
 
-# ---------------------------------------------------------------------------
-# Trend
-# ---------------------------------------------------------------------------
+def _ewm_warmup(span: float) -> int:
+    return int(np.ceil(EWM_WARMUP_SPANS * span))
 
-def compute_sma(df: pd.DataFrame) -> pd.DataFrame:
-    """Compute SMA factors: sma_20, sma_60, sma_120."""
-    close = df["close"]
-    result = pd.DataFrame(index=df.index)
-    for window, name in [(20, "sma_20"), (60, "sma_60"), (120, "sma_120")]:
-        result[name] = close.rolling(window).mean()
-    return result
 
+def _like(template, values: np.ndarray):
+    """Wrap values with the index (and columns) of a Series / DataFrame."""
+    if isinstance(template, pd.DataFrame):
+        return pd.DataFrame(values, index=template.index, columns=template.columns)
+    return pd.Series(values, index=template.index)
 
-def compute_ema(df: pd.DataFrame) -> pd.DataFrame:
-    """Compute EMA factors: ema_12, ema_26."""
-    close = df["close"]
-    result = pd.DataFrame(index=df.index)
-    result["ema_12"] = close.ewm(span=12, adjust=False).mean()
-    result["ema_26"] = close.ewm(span=26, adjust=False).mean()
-    return result
 
+def _pct_change(close, periods: int):
+    # pct_change without its fill step (panels hold NaN outside an asset's history)
+    return close / close.shift(periods) - 1
 
-def compute_macd(df: pd.DataFrame) -> pd.DataFrame:
-    """Compute MACD and signal line.
 
-    MACD = EMA(12) - EMA(26)
-    macd_signal = EMA(9) of MACD  (standard signal line)
-    """
-    close = df["close"]
-    ema_12 = close.ewm(span=12, adjust=False).mean()
-    ema_26 = close.ewm(span=26, adjust=False).mean()
-    result = pd.DataFrame(index=df.index)
-    result["macd"] = ema_12 - ema_26
-    result["macd_signal"] = result["macd"].ewm(span=9, adjust=False).mean()
-    return result
+def _rsi(close, period: int = 14):
+    """Wilder RSI for a Series or a panel (rows before an asset's start stay NaN)."""
+    delta = close.diff()
+    valid = close.notna()
+    gain = delta.where(delta > 0, 0.0).where(valid)
+    loss = (-delta).where(delta < 0, 0.0).where(valid)
+    avg_gain = gain.ewm(alpha=1 / period, min_periods=period, adjust=False).mean()
+    avg_loss = loss.ewm(alpha=1 / period, min_periods=period, adjust=False).mean()
+    ratio = (100 - 100 / (1 + avg_gain / avg_loss)).to_numpy()
+    gain_v, loss_v = avg_gain.to_numpy(), avg_loss.to_numpy()
+    return _like(close, np.where(
+        np.isnan(gain_v),
+        np.nan,
+        np.where(loss_v == 0, np.where(gain_v == 0, 50.0, 100.0), ratio),
+    ))
 
 
-# ---------------------------------------------------------------------------
-# Momentum
-# ---------------------------------------------------------------------------
+def _true_range_panel(high, low, close):
+    prev_close = close.shift(1)
+    return np.fmax(np.fmax(high - low, (high - prev_close).abs()), (low - prev_close).abs())
 
-def compute_roc(df: pd.DataFrame, period: int = 12) -> pd.DataFrame:
-    """Compute Rate of Change (ROC)."""
-    close = df["close"]
-    result = pd.DataFrame(index=df.index)
-    result["roc"] = (close / close.shift(period) - 1) * 100
-    return result
 
+def _vol_zscore(volume, window: int = 20):
+    vol = volume.astype(float)
+    z = (vol - vol.rolling(window).mean()) / vol.rolling(window).std()
+    return z.replace([np.inf, -np.inf], np.nan)
 
-def compute_rsi(df: pd.DataFrame, period: int = 14) -> pd.DataFrame:
-    """Compute RSI using Wilder's smoothing method."""
-    close = df["close"]
-    delta = close.diff()
 
-    gain = delta.where(delta > 0, 0.0)
-    loss = (-delta).where(delta < 0, 0.0)
+@dataclass(frozen=True)
+class FactorNode:
+    """One factor or shared intermediate in the factor graph.
 
-    # Wilder's smoothing: first value is SMA, then EWM
-    avg_gain = gain.ewm(alpha=1 / period, min_periods=period, adjust=False).mean()
-    avg_loss = loss.ewm(alpha=1 / period, min_periods=period, adjust=False).mean()
+    `window` is the number of input rows the node needs before its first
+    (warm) value; a node's lookback is its window plus the largest lookback
+    among its inputs. Inputs are OHLCV columns or other node names.
+    """
 
-    # Handle edge cases: all gains (loss=0) → RSI=100, all losses (gain=0) → RSI=0
-    rsi = pd.Series(
-        np.where(
-            avg_gain.isna(),
-            np.nan,
-            np.where(
-                avg_loss == 0,
-                np.where(avg_gain == 0, 50.0, 100.0),
-                100 - 100 / (1 + avg_gain / avg_loss),
-            ),
+    name: str
+    inputs: tuple[str, ...]
+    compute: Callable[..., pd.Series | pd.DataFrame]
+    window: int = 0
+    public: bool = True  # False → intermediate, never returned
+
+
+_WILDER_WARMUP = _ewm_warmup(2 * _WILDER_PERIOD - 1)  # alpha 1/14 ≡ span 27
+
+FACTOR_NODES: dict[str, FactorNode] = {
+    node.name: node
+    for node in [
+        FactorNode("ret_1d", ("close",), lambda c: _pct_change(c, 1), 1),
+        FactorNode("ret_5d", ("close",), lambda c: _pct_change(c, 5), 5),
+        FactorNode("ret_20d", ("close",), lambda c: _pct_change(c, 20), 20),
+        FactorNode("ret_63d", ("close",), lambda c: _pct_change(c, 63), 63),
+        FactorNode("sma_20", ("close",), lambda c: c.rolling(20).mean(), 19),
+        FactorNode("sma_60", ("close",), lambda c: c.rolling(60).mean(), 59),
+        FactorNode("sma_120", ("close",), lambda c: c.rolling(120).mean(), 119),
+        FactorNode(
+            "ema_12", ("close",), lambda c: c.ewm(span=12, adjust=False).mean(),
+            _ewm_warmup(12),
         ),
-        index=df.index,
-    )
+        FactorNode(
+            "ema_26", ("close",), lambda c: c.ewm(span=26, adjust=False).mean(),
+            _ewm_warmup(26),
+        ),
+        FactorNode("macd", ("ema_12", "ema_26"), lambda fast, slow: fast - slow),
+        FactorNode(
+            "macd_signal", ("macd",), lambda m: m.ewm(span=9, adjust=False).mean(),
+            _ewm_warmup(9),
+        ),
+        FactorNode("roc", ("close",), lambda c: (c / c.shift(12) - 1) * 100, 12),
+        FactorNode("rsi_14", ("close",), _rsi, 1 + _WILDER_WARMUP),
+        FactorNode(
+            "vol_20", ("ret_1d",), lambda r: r.rolling(20).std() * np.sqrt(252), 19,
+        ),
+        FactorNode(
+            "_true_range", ("high", "low", "close"), _true_range_panel, 1, public=False,
+        ),
+        FactorNode(
+            "atr_14", ("_true_range",),
+            lambda tr: tr.ewm(
+                alpha=1 / _WILDER_PERIOD, min_periods=_WILDER_PERIOD, adjust=False
+            ).mean(),
+            _WILDER_WARMUP,
+        ),
+        FactorNode("vol_zscore_20", ("volume",), _vol_zscore, 19),
+    ]
+}
 
-    result = pd.DataFrame(index=df.index)
-    result["rsi_14"] = rsi
-    return result
 
+@dataclass(frozen=True)
+class FactorPlan:
+    """Evaluation order and history requirement for a set of factors."""
 
-# ---------------------------------------------------------------------------
-# Volatility
-# ---------------------------------------------------------------------------
+    factors: tuple[str, ...]  # requested, in output order
+    steps: tuple[str, ...]  # nodes to evaluate, dependencies first
+    lookback_rows: int  # history rows needed before the first warm value
 
-def compute_volatility(df: pd.DataFrame, window: int = 20) -> pd.DataFrame:
-    """Compute annualized volatility (vol_20)."""
-    ret = df["close"].pct_change()
-    result = pd.DataFrame(index=df.index)
-    result["vol_20"] = ret.rolling(window).std() * np.sqrt(252)
-    return result
 
+@lru_cache(maxsize=64)
+def _plan(names: tuple[str, ...]) -> FactorPlan:
+    unknown = [n for n in names if n not in FACTOR_NODES or not FACTOR_NODES[n].public]
+    if unknown:
+        raise ValueError(f"Unknown factor names: {unknown}. Available: {ALL_FACTOR_NAMES}")
 
-def compute_atr(df: pd.DataFrame, period: int = 14) -> pd.DataFrame:
-    """Compute Average True Range (ATR)."""
-    high = df["high"]
-    low = df["low"]
-    prev_close = df["close"].shift(1)
+    steps: list[str] = []
+    lookback: dict[str, int] = {}
 
-    tr = pd.concat(
-        [high - low, (high - prev_close).abs(), (low - prev_close).abs()],
-        axis=1,
-    ).max(axis=1)
+    def visit(name: str) -> int:
+        if name in lookback:
+            return lookback[name]
+        node = FACTOR_NODES.get(name)
+        if node is None:  # OHLCV column
+            return 0
+        lookback[name] = node.window + max(visit(i) for i in node.inputs)
+        steps.append(name)
+        return lookback[name]
 
-    result = pd.DataFrame(index=df.index)
-    result["atr_14"] = tr.ewm(alpha=1 / period, min_periods=period, adjust=False).mean()
-    return result
+    rows = max((visit(n) for n in names), default=0)
+    return FactorPlan(factors=names, steps=tuple(steps), lookback_rows=rows)
 
 
-# ---------------------------------------------------------------------------
-# Volume
-# ---------------------------------------------------------------------------
+def plan_factors(names: Iterable[str] | None = None) -> FactorPlan:
+    """Resolve requested factor names (default: all) into a FactorPlan.
 
-def compute_volume_zscore(df: pd.DataFrame, window: int = 20) -> pd.DataFrame:
-    """Compute volume z-score over rolling window."""
-    vol = df["volume"].astype(float)
-    mean = vol.rolling(window).mean()
-    std = vol.rolling(window).std()
-    result = pd.DataFrame(index=df.index)
-    result["vol_zscore_20"] = (vol - mean) / std
-    result["vol_zscore_20"] = result["vol_zscore_20"].replace([np.inf, -np.inf], np.nan)
-    return result
+    Raises:
+        ValueError: Unknown factor name.
+    """
+    return _plan(tuple(ALL_FACTOR_NAMES if names is None else dict.fromkeys(names)))
 
 
-# ---------------------------------------------------------------------------
-# All factors
-# ---------------------------------------------------------------------------
+def _evaluate(plan: FactorPlan, columns) -> dict:
+    values: dict = {}
+    for name in plan.steps:
+        node = FACTOR_NODES[name]
+        values[name] = node.compute(*[
+            values[i] if i in values else columns[i] for i in node.inputs
+        ])
+    return values
 
-ALL_FACTOR_FUNCS = [
-    compute_returns,
-    compute_sma,
-    compute_ema,
-    compute_macd,
-    compute_roc,
-    compute_rsi,
-    compute_volatility,
-    compute_atr,
-    compute_volume_zscore,
-]
 
-ALL_FACTOR_NAMES = [
-    "ret_1d", "ret_5d", "ret_20d", "ret_63d",
-    "sma_20", "sma_60", "sma_120",
-    "ema_12", "ema_26", "macd", "macd_signal",
-    "roc", "rsi_14",
-    "vol_20", "atr_14",
-    "vol_zscore_20",
-]
+def compute_factors(df: pd.DataFrame, names: Iterable[str] | None = None) -> pd.DataFrame:
+    """Compute only the requested factors (default: all) from an OHLCV DataFrame.
+
+    Shared intermediates (ret_1d for vol_20, ema_12/ema_26 for macd, ...) are
+    computed once; values match compute_all_factors column for column.
+    """
+    plan = plan_factors(names)
+    values = _evaluate(plan, df)
+    return pd.DataFrame({name: values[name] for name in plan.factors}, index=df.index)
+
+
+def build_panel(
+    frames: dict[str, pd.DataFrame],
+    columns: Iterable[str] = OHLCV_COLUMNS,
+) -> dict[str, pd.DataFrame]:
+    """Stack per-asset aligned OHLCV frames into column → (dates × assets) frames.
+
+    All frames must share one calendar (business days or every day); dates
+    outside an asset's own range are NaN.
+    """
+    return {
+        col: pd.DataFrame({asset_id: df[col] for asset_id, df in frames.items()}).astype(float)
+        for col in columns
+    }
+
+
+def compute_factors_panel(
+    panel: dict[str, pd.DataFrame],
+    names: Iterable[str] | None = None,
+) -> dict[str, pd.DataFrame]:
+    """Compute factors for every asset of an OHLCV panel in one pass.
+
+    Each node runs once on a (dates × assets) frame, so rolling and EWM
+    windows are evaluated column-wise in pandas' compiled loops instead of
+    once per asset. Column values match compute_factors on that asset's own
+    rows (NaN before its first date).
+
+    Args:
+        panel: OHLCV column → DataFrame (dates × assets), e.g. from build_panel.
+        names: Factors to compute (default: all).
+
+    Returns:
+        Factor name → DataFrame (dates × assets).
+    """
+    plan = plan_factors(names)
+    values = _evaluate(plan, panel)
+    return {name: values[name] for name in plan.factors}
 
 
 def compute_all_factors(df: pd.DataFrame) -> pd.DataFrame:
@@ -189,8 +259,7 @@ def compute_all_factors(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         DataFrame indexed by date with all factor columns
     """
-    parts = [func(df) for func in ALL_FACTOR_FUNCS]
-    result = pd.concat(parts, axis=1)
+    result = compute_factors(df)
 
     logger.info(
         "Computed %d factors, %d rows, NaN counts: %s",
@@ -200,3 +269,146 @@ def compute_all_factors(df: pd.DataFrame) -> pd.DataFrame:
     )
 
     return result
+
+
+# ---------------------------------------------------------------------------
+# Incremental (append-only) computation
+# ---------------------------------------------------------------------------
+
+# Rows of aligned OHLCV history kept so every rolling factor (SMA-120 is the
+# longest window) is exact on appended rows.
+INCREMENTAL_TAIL_ROWS = 120
+
+# Factors recomputed over tail + new; the EWM ones are stepped from state.
+_WINDOW_FACTORS = (
+    "ret_1d", "ret_5d", "ret_20d", "ret_63d",
+    "sma_20", "sma_60", "sma_120",
+    "roc", "vol_20", "vol_zscore_20",
+)
+
+
+def _ewm_alpha(span: float | None = None, alpha: float | None = None) -> float:
+    """Smoothing factor exactly as pandas derives it (via center of mass)."""
+    com = (span - 1) / 2 if span is not None else (1 - alpha) / alpha
+    return 1.0 / (1.0 + com)
+
+
+_ALPHA_12 = _ewm_alpha(span=12)
+_ALPHA_26 = _ewm_alpha(span=26)
+_ALPHA_9 = _ewm_alpha(span=9)
+_ALPHA_WILDER = _ewm_alpha(alpha=1 / 14)
+
+
+def _ewm_step(prev: float, value: float, alpha: float) -> float:
+    """One adjust=False EWM update using the same arithmetic as pandas."""
+    if prev != value:  # pandas skips the update when input equals the average
+        old_wt = 1.0 - alpha
+        prev = (old_wt * prev + alpha * value) / (old_wt + alpha)
+    return prev
+
+
+def _true_range(df: pd.DataFrame) -> pd.Series:
+    prev_close = df["close"].shift(1)
+    return pd.concat(
+        [df["high"] - df["low"], (df["high"] - prev_close).abs(), (df["low"] - prev_close).abs()],
+        axis=1,
+    ).max(axis=1)
+
+
+def ewm_state(df: pd.DataFrame) -> dict:
+    """Capture the EWM states at the last row of a preprocessed OHLCV frame.
+
+    These are the recursion states behind ema_12/ema_26/macd_signal, the
+    Wilder averages behind rsi_14, and atr_14 — enough to continue the
+    series with compute_factors_incremental.
+    """
+    close = df["close"]
+    ema_12 = close.ewm(span=12, adjust=False).mean()
+    ema_26 = close.ewm(span=26, adjust=False).mean()
+    macd_signal = (ema_12 - ema_26).ewm(span=9, adjust=False).mean()
+
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0.0)
+    loss = (-delta).where(delta < 0, 0.0)
+    alpha = 1 / _WILDER_PERIOD
+
+    return {
+        "n_obs": int(len(df)),
+        "ema_12": float(ema_12.iloc[-1]),
+        "ema_26": float(ema_26.iloc[-1]),
+        "macd_signal": float(macd_signal.iloc[-1]),
+        "rsi_avg_gain": float(gain.ewm(alpha=alpha, adjust=False).mean().iloc[-1]),
+        "rsi_avg_loss": float(loss.ewm(alpha=alpha, adjust=False).mean().iloc[-1]),
+        "atr_14": float(_true_range(df).ewm(alpha=alpha, adjust=False).mean().iloc[-1]),
+    }
+
+
+def compute_factors_incremental(
+    tail: pd.DataFrame,
+    new: pd.DataFrame,
+    state: dict,
+) -> tuple[pd.DataFrame, dict]:
+    """Compute all factors for appended rows only.
+
+    Rolling factors are evaluated on tail + new (the tail covers the longest
+    window); EWM factors continue from `state` one row at a time.
+
+    Args:
+        tail: Last INCREMENTAL_TAIL_ROWS aligned OHLCV rows already processed.
+        new: Aligned OHLCV rows after tail (same calendar, no gaps).
+        state: EWM state at the last tail row (from ewm_state or a previous call).
+
+    Returns:
+        (factors for the new dates in ALL_FACTOR_NAMES order, updated state)
+    """
+    if new.empty:
+        return pd.DataFrame(columns=ALL_FACTOR_NAMES, dtype=float), dict(state)
+
+    combined = pd.concat([tail[OHLCV_COLUMNS], new[OHLCV_COLUMNS]])
+    n_new = len(new)
+    window = compute_factors(combined, _WINDOW_FACTORS).iloc[-n_new:]
+
+    st = dict(state)
+    prev_close = float(tail["close"].iloc[-1])
+    ewm_rows = []
+    for high, low, close in zip(
+        new["high"].tolist(), new["low"].tolist(), new["close"].tolist()
+    ):
+        st["n_obs"] += 1
+        st["ema_12"] = _ewm_step(st["ema_12"], close, _ALPHA_12)
+        st["ema_26"] = _ewm_step(st["ema_26"], close, _ALPHA_26)
+        macd = st["ema_12"] - st["ema_26"]
+        st["macd_signal"] = _ewm_step(st["macd_signal"], macd, _ALPHA_9)
+
+        delta = close - prev_close
+        st["rsi_avg_gain"] = _ewm_step(
+            st["rsi_avg_gain"], delta if delta > 0 else 0.0, _ALPHA_WILDER
+        )
+        st["rsi_avg_loss"] = _ewm_step(
+            st["rsi_avg_loss"], -delta if delta < 0 else 0.0, _ALPHA_WILDER
+        )
+        tr = max(high - low, abs(high - prev_close), abs(low - prev_close))
+        st["atr_14"] = _ewm_step(st["atr_14"], tr, _ALPHA_WILDER)
+
+        warm = st["n_obs"] >= _WILDER_PERIOD
+        avg_gain, avg_loss = st["rsi_avg_gain"], st["rsi_avg_loss"]
+        if not warm:
+            rsi = np.nan
+        elif avg_loss == 0:
+            rsi = 50.0 if avg_gain == 0 else 100.0
+        else:
+            rsi = 100 - 100 / (1 + avg_gain / avg_loss)
+
+        ewm_rows.append((
+            st["ema_12"], st["ema_26"], macd, st["macd_signal"],
+            rsi, st["atr_14"] if warm else np.nan,
+        ))
+        prev_close = close
+
+    ewm_df = pd.DataFrame(
+        ewm_rows,
+        index=new.index,
+        columns=["ema_12", "ema_26", "macd", "macd_signal", "rsi_14", "atr_14"],
+    )
+    result = pd.concat([window, ewm_df], axis=1)[ALL_FACTOR_NAMES]
+    return result, st
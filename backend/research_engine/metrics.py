@@ -2,11 +2,11 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 
 import numpy as np
 
-from research_engine.backtest import BacktestResult
+from research_engine.backtest import BacktestResult, BatchBacktestResult
 
 
 @dataclass
@@ -28,6 +28,49 @@ class PerformanceMetrics:
     excess_return: float | None  # CAGR - BH CAGR
 
 
+@dataclass
+class BatchPerformanceMetrics:
+    """PerformanceMetrics for K curves at once: every field is a (K,) array.
+
+    Buy & Hold fields are NaN where the scalar version gives None.
+    """
+
+    total_return: np.ndarray
+    cagr: np.ndarray
+    mdd: np.ndarray
+    volatility: np.ndarray
+    sharpe: np.ndarray
+    sortino: np.ndarray
+    calmar: np.ndarray
+    win_rate: np.ndarray
+    num_trades: np.ndarray  # int
+    avg_trade_pnl: np.ndarray
+    turnover: np.ndarray
+    bh_total_return: np.ndarray
+    bh_cagr: np.ndarray
+    excess_return: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.total_return)
+
+    def __getitem__(self, i: int) -> PerformanceMetrics:
+        values: dict = {}
+        for f in fields(self):
+            v = getattr(self, f.name)[i]
+            if f.name == "num_trades":
+                values[f.name] = int(v)
+            elif f.name in _OPTIONAL_FIELDS:
+                values[f.name] = None if np.isnan(v) else float(v)
+            else:
+                values[f.name] = float(v)
+        return PerformanceMetrics(**values)
+
+    def to_list(self) -> list[PerformanceMetrics]:
+        return [self[i] for i in range(len(self))]
+
+
+_OPTIONAL_FIELDS = ("bh_total_return", "bh_cagr", "excess_return")
+
 TRADING_DAYS_PER_YEAR = 252
 
 
@@ -123,6 +166,130 @@ def compute_metrics(
     )
 
 
+def compute_metrics_batch(
+    equity: np.ndarray,
+    drawdown: np.ndarray | None = None,
+    buy_hold: np.ndarray | None = None,
+    trade_row: np.ndarray | None = None,
+    trade_pnl: np.ndarray | None = None,
+    trade_closed: np.ndarray | None = None,
+    risk_free_rate: float = 0.0,
+) -> BatchPerformanceMetrics:
+    """Vectorized compute_metrics over every row of an equity matrix.
+
+    Row i gives the same values as compute_metrics on a BacktestResult whose
+    equity curve is row i with its NaN (missing) bars dropped.
+
+    Args:
+        equity: (K, M) equity curves, NaN = missing bar.
+        drawdown: (K, M) stored drawdown column. Default: from equity.
+        buy_hold: (K, M) buy & hold equity. Default: none (bh fields NaN).
+        trade_row: (T,) row index of each trade in a flat trade table.
+        trade_pnl: (T,) trade PnL (NaN = unknown).
+        trade_closed: (T,) True for closed trades. Default: all closed.
+        risk_free_rate: Annualized risk-free rate (default 0).
+    """
+    equity = np.atleast_2d(np.asarray(equity, dtype=float))
+    k = equity.shape[0]
+    valid = np.isfinite(equity)
+    n_days = valid.sum(axis=1)
+    ok = n_days >= 2
+    years = n_days / TRADING_DAYS_PER_YEAR
+    first, last = _first_last(equity, valid)
+    ann = np.sqrt(TRADING_DAYS_PER_YEAR)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        total_return = last / first - 1.0
+        cagr = _cagr_rows(first, last, years)
+
+        if drawdown is None:
+            drawdown = equity / np.fmax.accumulate(equity, axis=1) - 1.0
+        mdd = np.where(valid, drawdown, np.inf).min(axis=1)
+
+        packed = _pack_valid(equity, valid)
+        daily = np.diff(packed, axis=1) / packed[:, :-1]
+        has_daily = np.isfinite(daily)
+        daily_mean, daily_std = _row_mean_std(daily, has_daily)
+        volatility = daily_std * ann
+        if risk_free_rate:
+            excess = daily - risk_free_rate / TRADING_DAYS_PER_YEAR
+            excess_mean, excess_std = _row_mean_std(excess, has_daily)
+        else:
+            excess, excess_mean, excess_std = daily, daily_mean, daily_std
+        _, downside_std = _row_mean_std(excess, has_daily & (excess < 0))
+        sharpe = _divide(excess_mean * ann, excess_std)
+        sortino = _divide(excess_mean * ann, downside_std)
+        calmar = _divide(cagr, np.abs(mdd))
+
+    # --- 거래 통계 ---
+    num_trades = np.zeros(k, dtype=np.int64)
+    win_rate = np.zeros(k)
+    avg_pnl = np.zeros(k)
+    if trade_row is not None and len(trade_row):
+        rows = np.asarray(trade_row, dtype=np.int64)
+        pnl = np.asarray(trade_pnl, dtype=float)
+        if trade_closed is not None:
+            closed = np.asarray(trade_closed, dtype=bool)
+            rows, pnl = rows[closed], pnl[closed]
+        has_pnl = np.isfinite(pnl)
+        num_trades = np.bincount(rows, minlength=k)
+        wins = np.bincount(rows, weights=pnl > 0, minlength=k)
+        pnl_sum = np.bincount(rows[has_pnl], weights=pnl[has_pnl], minlength=k)
+        pnl_count = np.bincount(rows[has_pnl], minlength=k)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            win_rate = np.where(num_trades > 0, wins / num_trades, 0.0)
+            avg_pnl = np.where(num_trades > 0, pnl_sum / pnl_count, 0.0)
+    turnover = np.where(years > 0, num_trades / np.where(years > 0, years, 1.0), 0.0)
+
+    # --- Buy & Hold ---
+    bh_total_return = np.full(k, np.nan)
+    bh_cagr = np.full(k, np.nan)
+    if buy_hold is not None:
+        buy_hold = np.atleast_2d(np.asarray(buy_hold, dtype=float))
+        bh_valid = np.isfinite(buy_hold)
+        bh_first, bh_last = _first_last(buy_hold, bh_valid)
+        has_bh = bh_valid.sum(axis=1) >= 2
+        with np.errstate(invalid="ignore", divide="ignore"):
+            bh_total_return = np.where(has_bh, bh_last / bh_first - 1.0, np.nan)
+            bh_cagr = np.where(has_bh, _cagr_rows(bh_first, bh_last, years), np.nan)
+    excess_return = cagr - bh_cagr
+
+    def _rows(values: np.ndarray, empty: float = 0.0) -> np.ndarray:
+        return np.where(ok, values, empty)
+
+    return BatchPerformanceMetrics(
+        total_return=_rows(total_return),
+        cagr=_rows(cagr),
+        mdd=_rows(mdd),
+        volatility=_rows(volatility),
+        sharpe=_rows(sharpe),
+        sortino=_rows(sortino),
+        calmar=_rows(calmar),
+        win_rate=_rows(win_rate),
+        num_trades=np.where(ok, num_trades, 0),
+        avg_trade_pnl=_rows(avg_pnl),
+        turnover=_rows(turnover),
+        bh_total_return=_rows(bh_total_return, np.nan),
+        bh_cagr=_rows(bh_cagr, np.nan),
+        excess_return=_rows(excess_return, np.nan),
+    )
+
+
+def compute_metrics_from_batch(
+    batch: BatchBacktestResult, risk_free_rate: float = 0.0
+) -> BatchPerformanceMetrics:
+    """compute_metrics_batch on a run_backtest_batch result (open trades excluded)."""
+    return compute_metrics_batch(
+        batch.equity,
+        drawdown=batch.drawdown,
+        buy_hold=batch.buy_hold,
+        trade_row=batch.trade_asset,
+        trade_pnl=batch.trade_pnl,
+        trade_closed=batch.trade_exit_idx >= 0,
+        risk_free_rate=risk_free_rate,
+    )
+
+
 def metrics_to_dict(m: PerformanceMetrics) -> dict:
     """Convert PerformanceMetrics to a plain dict (JSON-friendly)."""
     return {
@@ -158,6 +325,56 @@ def _safe_divide(numerator: float, denominator: float) -> float:
     return numerator / denominator
 
 
+def _cagr_rows(start: np.ndarray, end: np.ndarray, years: np.ndarray) -> np.ndarray:
+    """Row-wise _cagr."""
+    ok = (start > 0) & (years > 0)
+    return np.where(ok, (end / start) ** (1.0 / np.where(ok, years, 1.0)) - 1.0, 0.0)
+
+
+def _first_last(values: np.ndarray, valid: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """First and last valid value of each row (NaN-free rows assumed non-empty)."""
+    rows = np.arange(values.shape[0])
+    m = values.shape[1]
+    return (
+        values[rows, valid.argmax(axis=1)],
+        values[rows, m - 1 - valid[:, ::-1].argmax(axis=1)],
+    )
+
+
+def _pack_valid(values: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """Left-pack each row's valid values (NaN padded) so diffs skip missing bars."""
+    gappy = ~valid.all(axis=1)
+    if not gappy.any():
+        return values
+    sub_valid = valid[gappy]
+    order = np.argsort(~sub_valid, axis=1, kind="stable")
+    sub = np.take_along_axis(values[gappy], order, axis=1)
+    sub[np.take_along_axis(~sub_valid, order, axis=1)] = np.nan
+    packed = values.copy()
+    packed[gappy] = sub
+    return packed
+
+
+def _row_mean_std(values: np.ndarray, mask: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Row-wise mean and sample std (ddof=1) over masked entries.
+
+    Mean is NaN for rows without entries, std NaN with fewer than 2.
+    """
+    count = mask.sum(axis=1)
+    kept = np.where(mask, values, 0.0)
+    mean = kept.sum(axis=1) / np.where(count > 0, count, np.nan)
+    dev = np.where(mask, values - mean[:, np.newaxis], 0.0)
+    ss = np.einsum("ij,ij->i", dev, dev)
+    std = np.where(count > 1, np.sqrt(ss / np.maximum(count - 1, 1)), np.nan)
+    return mean, std
+
+
+def _divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """Row-wise _safe_divide: 0 where the denominator is 0 or NaN."""
+    ok = np.isfinite(denominator) & (denominator != 0)
+    return np.where(ok, numerator / np.where(ok, denominator, 1.0), 0.0)
+
+
 def _empty_metrics() -> PerformanceMetrics:
     return PerformanceMetrics(
         total_return=0.0,
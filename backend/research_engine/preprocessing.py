@@ -6,7 +6,7 @@ import pandas as pd
 from sqlalchemy.orm import Session
 
 from collector.fdr_client import SYMBOL_MAP
-from db.models import PriceDaily
+from db.price_loader import load_price_frames
 
 logger = logging.getLogger(__name__)
 
@@ -23,32 +23,9 @@ def load_prices(
 
     Returns DataFrame indexed by date with columns: open, high, low, close, volume.
     """
-    query = session.query(PriceDaily).filter(PriceDaily.asset_id == asset_id)
-    if start:
-        query = query.filter(PriceDaily.date >= start)
-    if end:
-        query = query.filter(PriceDaily.date <= end)
-    query = query.order_by(PriceDaily.date)
-
-    rows = query.all()
-    if not rows:
+    df = load_price_frames(session, [asset_id], start, end)[asset_id]
+    if df.empty:
         raise ValueError(f"No price data for {asset_id}")
-
-    records = [
-        {
-            "date": r.date,
-            "open": r.open,
-            "high": r.high,
-            "low": r.low,
-            "close": r.close,
-            "volume": r.volume,
-        }
-        for r in rows
-    ]
-
-    df = pd.DataFrame(records)
-    df["date"] = pd.to_datetime(df["date"])
-    df = df.set_index("date").sort_index()
     return df
 
 
@@ -167,6 +144,21 @@ def preprocess(
     Raises ValueError if no data or missing ratio exceeds threshold.
     """
     df = load_prices(session, asset_id, start, end)
+    return preprocess_prices(df, asset_id, missing_threshold, outlier_z)
+
+
+def preprocess_prices(
+    df: pd.DataFrame,
+    asset_id: str,
+    missing_threshold: float = 0.05,
+    outlier_z: float = 4.0,
+) -> pd.DataFrame:
+    """align → check missing → flag outliers for prices already loaded from DB.
+
+    Raises ValueError if df is empty or missing ratio exceeds threshold.
+    """
+    if df.empty:
+        raise ValueError(f"No price data for {asset_id}")
     category = get_category(asset_id)
 
     logger.info(
@@ -6,6 +6,7 @@ from dataclasses import dataclass, field
 
 from sqlalchemy.orm import Session
 
+from db.bulk import bulk_insert
 from db.models import SignalDaily
 from research_engine.strategies import STRATEGY_REGISTRY, get_strategy
 from research_engine.strategies.base import SignalResult
@@ -31,18 +32,24 @@ def _signal_result_to_records(
     signal_result: SignalResult,
 ) -> list[dict]:
     """Convert SignalResult to list of dicts for signal_daily INSERT."""
+    df = signal_result.signals
+    n = len(df)
+    scores = df["score"].tolist() if "score" in df.columns else [None] * n
+    actions = df["action"].tolist() if "action" in df.columns else [None] * n
+    metas = df["meta_json"].tolist() if "meta_json" in df.columns else [None] * n
+
     records = []
-    for _, row in signal_result.signals.iterrows():
-        date_val = row["date"]
-        date_key = date_val.date() if hasattr(date_val, "date") else date_val
+    for date_val, signal, score, action, meta in zip(
+        df["date"].tolist(), df["signal"].tolist(), scores, actions, metas
+    ):
         records.append({
             "asset_id": asset_id,
-            "date": date_key,
+            "date": date_val.date() if hasattr(date_val, "date") else date_val,
             "strategy_id": strategy_id,
-            "signal": int(row["signal"]),
-            "score": float(row["score"]) if row.get("score") is not None else None,
-            "action": row.get("action"),
-            "meta_json": row.get("meta_json"),
+            "signal": int(signal),
+            "score": float(score) if score is not None else None,
+            "action": action,
+            "meta_json": meta,
         })
     return records
 
@@ -65,15 +72,8 @@ def _delete_and_insert_signals(
         SignalDaily.strategy_id == strategy_id,
     ).delete(synchronize_session=False)
 
-    # Insert in chunks
-    total = 0
-    for i in range(0, len(records), chunk_size):
-        chunk = records[i : i + chunk_size]
-        session.bulk_insert_mappings(SignalDaily, chunk)
-        total += len(chunk)
-
-    session.flush()
-    return total
+    # Append (COPY for large batches, chunked INSERT otherwise)
+    return bulk_insert(session, SignalDaily, records, chunk_size=chunk_size).row_count
 
 
 def store_signals_for_asset(
@@ -29,3 +29,30 @@ def mdd_by_calendar_year(series: pd.Series) -> dict[int, float]:
         result[int(year)] = float(np.nanmin(drawdown))
 
     return result
+
+
+def mdd_by_calendar_year_arrays(dates: np.ndarray, values: np.ndarray) -> dict[int, float]:
+    """mdd_by_calendar_year의 배열 버전 (groupby 없이 연도 경계로 슬라이스).
+
+    Args:
+        dates: 오름차순 datetime64 배열
+        values: dates와 같은 길이의 KRW 평가액
+
+    Returns:
+        mdd_by_calendar_year와 같은 {연도: MDD} dict.
+    """
+    result: dict[int, float] = {}
+    if len(dates) == 0:
+        return result
+
+    years = dates.astype("datetime64[Y]").astype(np.int64) + 1970
+    bounds = np.r_[0, np.flatnonzero(years[1:] != years[:-1]) + 1, len(years)]
+    values = np.asarray(values, dtype=float)
+    for lo, hi in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+        prices = values[lo:hi]
+        running_max = np.maximum.accumulate(prices)
+        safe_max = np.where(running_max > 0, running_max, np.nan)
+        drawdown = (prices - running_max) / safe_max
+        result[int(years[lo])] = float(np.nanmin(drawdown))
+
+    return result
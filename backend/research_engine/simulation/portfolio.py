@@ -3,12 +3,17 @@
 기본 비중: 60% 주식/ETF + TLT 20% + BTC 20%.
 매월 적립금: 목표 비중대로 즉시 분배.
 연간 리밸런싱: 매년 마지막 거래일, 보유분 포함 실제 재조정.
+
+Portfolio는 하루씩 dict로 진행하는 참조 구현, run_portfolio는 같은 규칙을
+(dates × assets) 행렬로 계산하는 패널 엔진 (사용자 비중·리밸런싱 주기 지원).
 """
 
 from __future__ import annotations
 
 from dataclasses import dataclass
 
+import numpy as np
+
 
 @dataclass
 class PortfolioPreset:
@@ -159,3 +164,146 @@ class Portfolio:
             val = self._krw_value_of(code, shares, prices[code], fx_rates.get(code))
             result[code] = val / total
         return result
+
+
+# ── 패널 엔진 (dates × assets 행렬) ──────────────────────────────────────────
+
+REBALANCE_FREQUENCIES = ("none", "monthly", "quarterly", "yearly", "threshold")
+_THRESHOLD_CHUNK = 63  # threshold 모드: 이탈 검사 구간 (거래일)
+
+
+@dataclass
+class PortfolioCurve:
+    """run_portfolio 결과 (모든 배열은 dates와 같은 길이)."""
+
+    dates: np.ndarray  # datetime64[ns]
+    holdings: np.ndarray  # (T, N) 자산별 보유 수량
+    krw_value: np.ndarray  # (T,)
+    total_deposit_krw: int
+    rebalance_count: int
+
+
+def _period_end_mask(dates: np.ndarray, frequency: str) -> np.ndarray:
+    """각 기간(월/분기/연)의 마지막 거래일 (데이터 마지막 날 포함)."""
+    n = len(dates)
+    if frequency in ("none", "threshold") or n == 0:
+        return np.zeros(n, dtype=bool)
+    months = dates.astype("datetime64[M]").astype(np.int64)
+    period = {"monthly": months, "quarterly": months // 3, "yearly": months // 12}[frequency]
+    return np.r_[period[1:] != period[:-1], True]
+
+
+def _advance(
+    h0: np.ndarray,
+    bought: np.ndarray,
+    mult: np.ndarray,
+) -> np.ndarray:
+    """h_t = (h_{t-1} + bought_t) × m 를 L일 동안 한 번에 (자산별 선형 점화식).
+
+    h_t = m^(t+1) × cumsum(bought / m^t), h0는 첫날 bought에 더한다.
+    """
+    growth = np.power(mult[None, :], np.arange(len(bought), dtype=float)[:, None])
+    flows = bought.copy()
+    flows[0] += h0
+    return growth * mult[None, :] * np.cumsum(flows / growth, axis=0)
+
+
+def run_portfolio(
+    dates: np.ndarray,
+    prices: np.ndarray,
+    fx_rates: np.ndarray,
+    weights: np.ndarray,
+    annual_yields: np.ndarray,
+    monthly_amount_krw: int,
+    rebalance: str = "yearly",
+    threshold: float = 0.05,
+) -> PortfolioCurve:
+    """고정 비중 적립식 포트폴리오 (Portfolio 클래스와 같은 일별 규칙, 행렬 연산).
+
+    일별 순서: 월 첫 거래일 적립 (목표 비중 분배) → 배당 재투자 → 리밸런싱.
+    리밸런싱은 기간 말 (monthly/quarterly/yearly, 마지막 날 포함), 또는
+    threshold 모드에서 어떤 자산이든 |실제 비중 - 목표 비중| > threshold 인 날.
+    리밸런싱 사이에는 보유 수량을 cumsum/거듭제곱으로 한 번에 갱신한다.
+
+    가격이 아직 없는 자산(NaN, 상장 전)은 그날 목표 비중에서 빼고 나머지로
+    재정규화한다. 가격이 있는 자산이 하나도 없는 날은 곡선에서 제외된다.
+
+    Args:
+        dates: 오름차순 datetime64 (T,)
+        prices: (T, N) 현지통화 종가, forward-fill 된 값 (상장 전 NaN)
+        fx_rates: (T, N) 원화 환산율 (KRW 자산 = 1.0)
+        weights: (N,) 목표 비중 (합 = 1)
+        annual_yields: (N,) 연 배당률
+        monthly_amount_krw: 월 적립금 (원화)
+        rebalance: REBALANCE_FREQUENCIES 중 하나
+        threshold: threshold 모드 이탈 허용폭
+    """
+    if rebalance not in REBALANCE_FREQUENCIES:
+        raise ValueError(f"알 수 없는 rebalance: {rebalance}. 선택 가능: {REBALANCE_FREQUENCIES}")
+
+    from research_engine.simulation.replay import _first_day_of_month_mask
+
+    deposit_days = _first_day_of_month_mask(dates)
+    period_ends = _period_end_mask(dates, rebalance)
+
+    available = prices > 0  # NaN → False
+    keep = available.any(axis=1)
+    dates, prices, fx_rates = dates[keep], prices[keep], fx_rates[keep]
+    available, deposit_days, period_ends = available[keep], deposit_days[keep], period_ends[keep]
+    n_days, n_assets = prices.shape
+
+    # 그날 가격 있는 자산만으로 재정규화한 목표 비중
+    day_weights = np.where(available, weights[None, :], 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        day_weights = day_weights / day_weights.sum(axis=1, keepdims=True)
+        unit_values = np.where(available, prices * fx_rates, 0.0)
+        bought = np.where(
+            available & deposit_days[:, None],
+            ((monthly_amount_krw * day_weights) / fx_rates) / prices,
+            0.0,
+        )
+    mult = 1.0 + np.maximum(np.asarray(annual_yields, dtype=float), 0.0) / 252.0
+
+    holdings = np.zeros((n_days, n_assets))
+    h = np.zeros(n_assets)
+    rebalance_count = 0
+    ends = np.flatnonzero(period_ends)
+    pos = 0
+    while pos < n_days:
+        if rebalance == "threshold":
+            stop = min(pos + _THRESHOLD_CHUNK, n_days)
+        elif rebalance == "none":
+            stop = n_days
+        else:
+            stop = int(ends[np.searchsorted(ends, pos)]) + 1
+
+        block = _advance(h, bought[pos:stop], mult)
+        rebalance_at: int | None = stop - 1 if period_ends[stop - 1] else None
+        if rebalance == "threshold":
+            values = block * unit_values[pos:stop]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                drift = np.abs(values / values.sum(axis=1, keepdims=True) - day_weights[pos:stop])
+            drift = np.where(available[pos:stop] & np.isfinite(drift), drift, 0.0)
+            hit = np.flatnonzero(drift.max(axis=1) > threshold)
+            if len(hit):
+                stop = pos + int(hit[0]) + 1
+                block = block[: stop - pos]
+                rebalance_at = stop - 1
+
+        if rebalance_at is not None:
+            row = block[-1]
+            total = float(np.sum(row * unit_values[rebalance_at]))
+            if total > 0:
+                avail = available[rebalance_at]
+                row[avail] = (
+                    (total * day_weights[rebalance_at, avail]) / fx_rates[rebalance_at, avail]
+                ) / prices[rebalance_at, avail]
+                rebalance_count += 1
+
+        holdings[pos:stop] = block
+        h = block[-1]
+        pos = stop
+
+    krw_value = np.sum(holdings * unit_values, axis=1)
+    total_deposit = monthly_amount_krw * int(deposit_days.sum())
+    return PortfolioCurve(dates, holdings, krw_value, total_deposit, rebalance_count)
@@ -8,15 +8,20 @@ D-lock:
 
 from __future__ import annotations
 
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import date as date_type
 
+import numpy as np
 import pandas as pd
 from sqlalchemy.orm import Session
 
-from db.models import AssetMaster, PriceDaily
+from config.settings import settings
+from db.models import AssetMaster
+from db.ts_cache import get_ts_cache
 from research_engine.simulation.fx import load_fx_series
-from research_engine.simulation.mdd import mdd_by_calendar_year
+from research_engine.simulation.mdd import mdd_by_calendar_year_arrays
 from research_engine.simulation.padding import pad_returns, prices_with_padding
 from research_engine.simulation.wbi import generate_wbi
 
@@ -40,6 +45,42 @@ class KpiResult:
     total_deposit_krw: int
 
 
+@dataclass
+class ReplayCurve:
+    """replay 결과 컬럼 배열 (모두 dates와 같은 길이)."""
+
+    dates: np.ndarray  # datetime64[ns], 오름차순
+    shares: np.ndarray
+    local_value: np.ndarray
+    krw_value: np.ndarray
+    total_deposit_krw: int
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def scaled(self, factor: float) -> ReplayCurve:
+        """월 적립금 배수 적용 — replay는 적립금에 선형 (shares·평가액·원금 모두 비례)."""
+        return ReplayCurve(
+            dates=self.dates,
+            shares=self.shares * factor,
+            local_value=self.local_value * factor,
+            krw_value=self.krw_value * factor,
+            total_deposit_krw=int(self.total_deposit_krw * factor),
+        )
+
+    def to_points(self) -> list[EquityPoint]:
+        """EquityPoint 리스트로 변환 (기존 curve 형식)."""
+        return [
+            EquityPoint(date=d, krw_value=k, local_value=v, shares=sh)
+            for d, k, v, sh in zip(
+                self.dates.astype("datetime64[D]").astype(object).tolist(),
+                self.krw_value.tolist(),
+                self.local_value.tolist(),
+                self.shares.tolist(),
+            )
+        ]
+
+
 # ── KPI 산출 (마스터플랜 §3.8) ───────────────────────────────────────────────
 
 
@@ -48,18 +89,31 @@ def compute_kpi(
     total_deposit_krw: int,
     period_years: int,
 ) -> KpiResult:
-    if not curve or total_deposit_krw <= 0:
+    if not curve:
+        return KpiResult(0.0, 0.0, 0.0, 0.0, total_deposit_krw)
+    return compute_kpi_arrays(
+        np.array([pt.date for pt in curve], dtype="datetime64[D]"),
+        np.array([pt.krw_value for pt in curve], dtype=float),
+        total_deposit_krw,
+        period_years,
+    )
+
+
+def compute_kpi_arrays(
+    dates: np.ndarray,
+    krw_values: np.ndarray,
+    total_deposit_krw: int,
+    period_years: int,
+) -> KpiResult:
+    """compute_kpi의 배열 버전 (dates 오름차순 datetime64)."""
+    if len(krw_values) == 0 or total_deposit_krw <= 0:
         return KpiResult(0.0, 0.0, 0.0, 0.0, total_deposit_krw)
 
-    final = curve[-1].krw_value
+    final = float(krw_values[-1])
     total_return = (final - total_deposit_krw) / total_deposit_krw
     annualized = (final / total_deposit_krw) ** (1.0 / period_years) - 1
 
-    krw_series = pd.Series(
-        [pt.krw_value for pt in curve],
-        index=pd.DatetimeIndex([pd.Timestamp(pt.date) for pt in curve]),
-    )
-    mdd_dict = mdd_by_calendar_year(krw_series)
+    mdd_dict = mdd_by_calendar_year_arrays(dates, krw_values)
     worst_mdd = min(mdd_dict.values()) if mdd_dict else 0.0
 
     return KpiResult(
@@ -86,29 +140,116 @@ def _first_trading_days_of_month(index: pd.DatetimeIndex) -> set[pd.Timestamp]:
     return first_days
 
 
+def _first_day_of_month_mask(dates: np.ndarray) -> np.ndarray:
+    """오름차순 datetime64 배열에서 각 월의 첫 거래일 위치 (bool mask)."""
+    months = dates.astype("datetime64[M]")
+    return np.r_[True, months[1:] != months[:-1]] if len(dates) else np.zeros(0, dtype=bool)
+
+
+def _align_fx(fx_series: pd.Series, dates: np.ndarray) -> np.ndarray:
+    """fx_series를 dates에 정렬 — 같은 날짜 값, 없으면 asof (직전 유효값, 없으면 NaN)."""
+    out = np.full(len(dates), np.nan)
+    if fx_series.empty:
+        return out
+    fx_dates = fx_series.index.to_numpy(dtype="datetime64[ns]")
+    fx_values = fx_series.to_numpy(dtype=float)
+    pos = np.searchsorted(fx_dates, dates, side="right") - 1
+    has_prior = pos >= 0
+    pos = np.maximum(pos, 0)
+    exact = has_prior & (fx_dates[pos] == dates)
+    # 직전 유효(non-NaN) 위치 forward-fill — Series.asof와 같은 규칙
+    valid_pos = np.maximum.accumulate(
+        np.where(np.isnan(fx_values), -1, np.arange(len(fx_values)))
+    )
+    asof_pos = np.where(has_prior, valid_pos[pos], -1)
+    out = np.where(asof_pos >= 0, fx_values[np.maximum(asof_pos, 0)], np.nan)
+    return np.where(exact, fx_values[pos], out)
+
+
 def _load_price_series(
     session: Session,
     asset_id: str,
     start: date_type,
     end: date_type,
 ) -> pd.Series:
-    rows = (
-        session.query(PriceDaily)
-        .filter(PriceDaily.asset_id == asset_id, PriceDaily.date >= start, PriceDaily.date <= end)
-        .order_by(PriceDaily.date)
-        .all()
-    )
-    if not rows:
-        return pd.Series(dtype=float)
-    return pd.Series(
-        {pd.Timestamp(row.date): float(row.close) for row in rows},
-        name="close",
-    )
+    return get_ts_cache().close_series(session, asset_id, start, end, name="close")
 
 
 # ── 순수 로직 (테스트 가능) ───────────────────────────────────────────────────
 
 
+def replay_kernel(
+    prices: np.ndarray,
+    fx_rates: np.ndarray | None,
+    deposit_mask: np.ndarray,
+    monthly_amount_krw: int,
+    daily_yield_mult: float,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """적립식 replay 배열 커널 (Python 일별 루프 없음).
+
+    일별 점화식 shares_t = (shares_{t-1} + bought_t) × m 은 선형이므로
+    shares_t = m^(t+1) × cumsum(bought_k / m^k) 로 한 번에 계산한다
+    (m == 1 이면 단순 cumsum — 루프와 비트 단위로 같다).
+
+    Args:
+        prices: 현지통화 종가 (float64)
+        fx_rates: 일별 USD/KRW (KRW 자산이면 None). 0인 날은 환산하지 않음.
+        deposit_mask: 적립일 (각 월 첫 거래일) bool 배열
+        monthly_amount_krw: 월 적립금 (원화)
+        daily_yield_mult: 1 + annual_yield / 252
+
+    Returns:
+        (shares, local_value, krw_value) 배열
+    """
+    n = len(prices)
+    rates = None if fx_rates is None else np.where(fx_rates == 0, 1.0, fx_rates)
+
+    # D-16: 정기 적립 먼저 (적립일에 산 주식 수)
+    bought = np.zeros(n)
+    if rates is None:
+        bought[deposit_mask] = monthly_amount_krw / prices[deposit_mask]
+    else:
+        bought[deposit_mask] = (monthly_amount_krw / rates[deposit_mask]) / prices[deposit_mask]
+
+    # D-4: 배당 재투자 (매 거래일)
+    if daily_yield_mult == 1.0:
+        shares = np.cumsum(bought)
+    else:
+        growth = np.power(daily_yield_mult, np.arange(n, dtype=float))
+        shares = growth * daily_yield_mult * np.cumsum(bought / growth)
+
+    local_value = shares * prices
+    krw_value = local_value if rates is None else local_value * rates
+    return shares, local_value, krw_value
+
+
+def replay_arrays(
+    prices: pd.Series,
+    fx_series: pd.Series | None,
+    currency: str,
+    annual_yield: float,
+    monthly_amount_krw: int,
+    period_years: int,
+) -> tuple[ReplayCurve, KpiResult]:
+    """replay_core와 같은 계산, 결과를 컬럼 배열(ReplayCurve)로 반환."""
+    dates = prices.index.to_numpy(dtype="datetime64[ns]")
+    price_values = prices.to_numpy(dtype=float)
+    deposit_mask = _first_day_of_month_mask(dates)
+    fx_rates = (
+        _align_fx(fx_series, dates)
+        if currency == "USD" and fx_series is not None
+        else None
+    )
+
+    shares, local_value, krw_value = replay_kernel(
+        price_values, fx_rates, deposit_mask, monthly_amount_krw, 1.0 + annual_yield / 252.0
+    )
+    total_deposit = monthly_amount_krw * int(deposit_mask.sum())
+    curve = ReplayCurve(dates, shares, local_value, krw_value, total_deposit)
+    kpi = compute_kpi_arrays(dates, krw_value, total_deposit, period_years)
+    return curve, kpi
+
+
 def replay_core(
     prices: pd.Series,
     fx_series: pd.Series | None,
@@ -120,7 +261,7 @@ def replay_core(
     """적립식 replay 순수 로직 (DB 의존성 없음).
 
     Args:
-        prices: DatetimeIndex pd.Series, 현지통화 종가 (이미 clean)
+        prices: DatetimeIndex pd.Series, 현지통화 종가 (이미 clean, 오름차순)
         fx_series: DatetimeIndex pd.Series, USD/KRW (KRW 자산이면 None)
         currency: "KRW" or "USD"
         annual_yield: 연 배당률 (0.035 = 3.5%)
@@ -130,77 +271,108 @@ def replay_core(
     Returns:
         (curve, kpi) tuple
     """
-    daily_yield_mult = 1.0 + annual_yield / 252.0
-    trading_index = prices.index
-    first_days = _first_trading_days_of_month(trading_index)
-
-    shares = 0.0
-    total_deposit = 0
-    curve: list[EquityPoint] = []
-
-    for ts in trading_index:
-        price = float(prices[ts])
-        fx_rate: float | None = None
-        if currency == "USD" and fx_series is not None and ts in fx_series.index:
-            fx_rate = float(fx_series[ts])
-        elif currency == "USD" and fx_series is not None:
-            # forward-fill: nearest available
-            fx_rate = float(fx_series.asof(ts))
-
-        # D-16: 정기 적립 먼저
-        if ts in first_days:
-            if currency == "USD" and fx_rate:
-                shares += (monthly_amount_krw / fx_rate) / price
-            else:
-                shares += monthly_amount_krw / price
-            total_deposit += monthly_amount_krw
-
-        # D-4: 배당 재투자 (매 거래일)
-        shares *= daily_yield_mult
-
-        # 평가액 계산
-        local_value = shares * price
-        krw_value = local_value * fx_rate if (currency == "USD" and fx_rate) else local_value
-
-        curve.append(EquityPoint(
-            date=ts.date(),
-            krw_value=krw_value,
-            local_value=local_value,
-            shares=shares,
-        ))
-
-    kpi = compute_kpi(curve, total_deposit, period_years)
-    return curve, kpi
+    curve, kpi = replay_arrays(
+        prices, fx_series, currency, annual_yield, monthly_amount_krw, period_years
+    )
+    return curve.to_points(), kpi
+
+
+# ── 단위 적립금 curve 저장소 ─────────────────────────────────────────────────
+
+
+@dataclass
+class ReplayInputs:
+    """replay_core 입력 (DB/합성 데이터 로드 결과)."""
+
+    prices: pd.Series
+    fx_series: pd.Series | None
+    currency: str
+    annual_yield: float
+
+
+class UnitCurveStore:
+    """월 적립금 1원 replay curve를 (asset, period, 기준일, 자산 메타)별로 보관.
+
+    replay는 월 적립금에 선형이므로 어떤 금액이든 unit curve를 곱해서 답한다.
+    항목은 ts_cache generation에 묶여 있어, ingest로 가격 캐시가 비워지면
+    (같은 프로세스 invalidate() 또는 data version 변경) 함께 비워진다.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, ReplayCurve] = OrderedDict()
+        self._generation: int | None = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple, generation: int, compute) -> ReplayCurve:
+        """key의 unit curve (없으면 compute()로 계산 후 저장)."""
+        with self._lock:
+            if generation != self._generation:
+                self._entries.clear()
+                self._generation = generation
+            curve = self._entries.get(key)
+            if curve is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return curve
+            self.misses += 1
+
+        curve = compute()
+        with self._lock:
+            if generation == self._generation:
+                self._entries[key] = curve
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return curve
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "generation": self._generation,
+            }
+
+
+_unit_store: UnitCurveStore | None = None
+_unit_store_lock = threading.Lock()
+
+
+def get_unit_store() -> UnitCurveStore:
+    """프로세스 공용 unit curve 저장소 (settings 크기로 최초 생성)."""
+    global _unit_store
+    if _unit_store is None:
+        with _unit_store_lock:
+            if _unit_store is None:
+                _unit_store = UnitCurveStore(max_entries=settings.replay_unit_cache_entries)
+    return _unit_store
 
 
 # ── 공개 인터페이스 ───────────────────────────────────────────────────────────
 
 
-def replay(
+def _replay_inputs(
     asset_code: str,
-    monthly_amount_krw: int,
+    asset: AssetMaster | None,
     period_years: int,
+    end_date: date_type,
     session: Session,
-) -> tuple[list[EquityPoint], KpiResult]:
-    """적립식 Tab A 엔진 공개 인터페이스.
+    fx_all: pd.Series | None = None,
+) -> ReplayInputs:
+    """replay_core 입력 로드. WBI → generate_wbi(), JEPI(allow_padding) → padding.py.
 
-    DB에서 가격/환율 로드 후 replay_core 호출.
-    WBI → generate_wbi(), JEPI(allow_padding) → padding.py.
-
-    Args:
-        asset_code: "QQQ" / "KS200" / "WBI" / "JEPI" 등
-        monthly_amount_krw: 월 적립금 (원화)
-        period_years: 3 / 5 / 10
-        session: SQLAlchemy session
-
-    Returns:
-        (curve, kpi) tuple
+    fx_all: 미리 로드한 USD/KRW 시계열 (batch) — 주어지면 DB 대신 구간만 잘라 쓴다.
     """
-    from datetime import date as _date
-
     from dateutil.relativedelta import relativedelta
 
-    end_date = _date.today()
     start_date = end_date - relativedelta(years=period_years)
 
     # WBI: DB 조회 없이 GBM synthetic 생성
@@ -211,10 +383,9 @@ def replay(
         n_days = len(trading_dates)  # 실제 business day 수로 맞춤
         wbi_prices = generate_wbi(n_days, seed=42)
         prices = pd.Series(wbi_prices, index=trading_dates, name="close")
-        return replay_core(prices, None, "KRW", 0.0, monthly_amount_krw, period_years)
+        return ReplayInputs(prices, None, "KRW", 0.0)
 
     # 일반 자산: asset_master 조회
-    asset = session.query(AssetMaster).filter_by(asset_id=asset_code).first()
     if asset is None:
         raise ValueError(f"asset not found in asset_master: {asset_code}")
 
@@ -251,11 +422,68 @@ def replay(
 
     # USD 자산 환율 로드
     fx_series: pd.Series | None = None
-    if currency == "USD":
+    if currency == "USD" and fx_all is not None:
+        fx_series = fx_all.loc[prices.index[0]:prices.index[-1]]
+    elif currency == "USD":
         fx_series = load_fx_series(
             session,
             prices.index[0].date(),
             prices.index[-1].date(),
         )
 
-    return replay_core(prices, fx_series, currency, annual_yield, monthly_amount_krw, period_years)
+    return ReplayInputs(prices, fx_series, currency, annual_yield)
+
+
+def unit_replay(asset_code: str, period_years: int, session: Session) -> ReplayCurve:
+    """월 적립금 1원 기준 replay curve (UnitCurveStore 캐시).
+
+    키 = (asset_code, period_years, 오늘 날짜, currency, annual_yield, allow_padding);
+    가격·환율 데이터가 바뀌면 ts_cache generation으로 함께 무효화된다.
+    """
+    end_date = date_type.today()
+    asset = None
+    meta: tuple = ()
+    if asset_code != "WBI":
+        asset = session.query(AssetMaster).filter_by(asset_id=asset_code).first()
+        if asset is not None:
+            meta = (asset.currency, float(asset.annual_yield), bool(asset.allow_padding))
+
+    def compute() -> ReplayCurve:
+        inputs = _replay_inputs(asset_code, asset, period_years, end_date, session)
+        curve, _ = replay_arrays(
+            inputs.prices, inputs.fx_series, inputs.currency, inputs.annual_yield, 1, period_years
+        )
+        for arr in (curve.dates, curve.shares, curve.local_value, curve.krw_value):
+            arr.flags.writeable = False  # 요청 간 공유 — scaled()로만 사용
+        return curve
+
+    return get_unit_store().get(
+        (asset_code, period_years, end_date, meta),
+        get_ts_cache().current_generation(session),
+        compute,
+    )
+
+
+def replay(
+    asset_code: str,
+    monthly_amount_krw: int,
+    period_years: int,
+    session: Session,
+) -> tuple[list[EquityPoint], KpiResult]:
+    """적립식 Tab A 엔진 공개 인터페이스.
+
+    unit_replay() curve를 monthly_amount_krw배 한 뒤 KPI를 다시 계산한다
+    (결과는 replay_core를 직접 호출한 것과 반올림 오차 내에서 같다).
+
+    Args:
+        asset_code: "QQQ" / "KS200" / "WBI" / "JEPI" 등
+        monthly_amount_krw: 월 적립금 (원화)
+        period_years: 3 / 5 / 10
+        session: SQLAlchemy session
+
+    Returns:
+        (curve, kpi) tuple
+    """
+    curve = unit_replay(asset_code, period_years, session).scaled(monthly_amount_krw)
+    kpi = compute_kpi_arrays(curve.dates, curve.krw_value, curve.total_deposit_krw, period_years)
+    return curve.to_points(), kpi
@@ -0,0 +1,148 @@
+"""적립식 진입 시점 분석 — 모든 월 시작일 × 기간 (rolling entry).
+
+replay_core 의미론(정기 적립 먼저 → 매일 배당 재투자 → 환율 환산)을 그대로
+따르되, 시작 월마다 replay를 다시 돌리지 않는다.
+
+시작 월 j (첫 거래일 M_j)의 day t 보유 주식 수는
+    shares_j(t) = m^(t+1) × Σ_{j ≤ k, M_k ≤ t} bought_k / m^(M_k)
+이므로 w_k = bought_k / m^(M_k) 의 prefix sum C 하나로
+    value_j(t) = (C[K(t)] - C[j]) × q_t,   q_t = m^(t+1) × price_t × fx_t
+가 된다 (K(t) = t까지의 적립 횟수). 최종 평가액·수익률은 (시작, 기간) 셀마다
+O(1), 캘린더 연도 MDD는 연도별로 (시작 × 그 해 거래일) 배열 한 번으로 구한다.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from research_engine.simulation.replay import _align_fx, _first_day_of_month_mask
+
+
+@dataclass
+class RollingEntryResult:
+    """(기간 × 시작 월) 행렬. 기간이 데이터 끝을 넘는 셀은 NaN."""
+
+    start_dates: np.ndarray  # datetime64[D], 각 월 첫 거래일 (S,)
+    horizons_months: np.ndarray  # (H,)
+    total_deposit_krw: np.ndarray  # (H,) int
+    final_asset_krw: np.ndarray  # (H, S)
+    total_return: np.ndarray  # (H, S)
+    annualized_return: np.ndarray  # (H, S)
+    yearly_worst_mdd: np.ndarray  # (H, S)
+
+
+def rolling_entry_analysis(
+    prices: pd.Series,
+    fx_series: pd.Series | None,
+    currency: str,
+    annual_yield: float,
+    monthly_amount_krw: int,
+    horizons_months: list[int],
+) -> RollingEntryResult:
+    """모든 월 시작일 × 기간의 적립식 KPI.
+
+    시작 월 j, 기간 h개월 셀 = prices[M_j : M_{j+h}) 구간에 replay_core를 돌린
+    결과 (h회 적립, 마지막 달까지 온전히 포함). annualized_return은 h/12년 기준.
+
+    Args:
+        prices: DatetimeIndex pd.Series, 현지통화 종가 (오름차순)
+        fx_series: DatetimeIndex pd.Series, USD/KRW (KRW 자산이면 None)
+        currency: "KRW" or "USD"
+        annual_yield: 연 배당률
+        monthly_amount_krw: 월 적립금 (원화)
+        horizons_months: 기간 (개월) 목록
+    """
+    dates = prices.index.to_numpy(dtype="datetime64[ns]")
+    price_values = prices.to_numpy(dtype=float)
+    n = len(dates)
+    horizons = np.asarray(horizons_months, dtype=np.int64)
+
+    rates = np.ones(n)
+    if currency == "USD" and fx_series is not None:
+        fx = _align_fx(fx_series, dates)
+        rates = np.where(fx == 0, 1.0, fx)  # replay_kernel과 같은 규칙: 0 = 환산 안 함
+
+    mult = 1.0 + annual_yield / 252.0
+    month_starts = np.flatnonzero(_first_day_of_month_mask(dates))
+    n_starts = len(month_starts)
+
+    growth = np.power(mult, np.arange(n, dtype=float))
+    bought = (monthly_amount_krw / rates[month_starts]) / price_values[month_starts]
+    prefix = np.r_[0.0, np.cumsum(bought / growth[month_starts])]
+    q = growth * mult * price_values * rates
+    deposits_by_day = np.searchsorted(month_starts, np.arange(n), side="right")
+
+    # (H, S) 셀 인덱스: 시작 j, 종료일 = 다음 (j+h)번째 월 첫 거래일 전날
+    starts = np.arange(n_starts)
+    end_month = starts[None, :] + horizons[:, None]
+    valid = end_month < n_starts
+    end_month = np.where(valid, end_month, 0)
+    end_day = np.where(valid, month_starts[end_month] - 1, 0)
+
+    final = np.where(valid, (prefix[end_month] - prefix[starts][None, :]) * q[end_day], np.nan)
+    deposit = horizons * monthly_amount_krw
+    with np.errstate(divide="ignore", invalid="ignore"):
+        total_return = (final - deposit[:, None]) / deposit[:, None]
+        annualized = (final / deposit[:, None]) ** (12.0 / horizons[:, None]) - 1
+
+    worst = _rolling_worst_mdd(
+        dates, month_starts, prefix, q, deposits_by_day, end_day, valid
+    )
+
+    return RollingEntryResult(
+        start_dates=dates[month_starts].astype("datetime64[D]"),
+        horizons_months=horizons,
+        total_deposit_krw=deposit,
+        final_asset_krw=final,
+        total_return=np.where(valid, total_return, np.nan),
+        annualized_return=np.where(valid, annualized, np.nan),
+        yearly_worst_mdd=np.where(valid, worst, np.nan),
+    )
+
+
+def _rolling_worst_mdd(
+    dates: np.ndarray,
+    month_starts: np.ndarray,
+    prefix: np.ndarray,
+    q: np.ndarray,
+    deposits_by_day: np.ndarray,
+    end_day: np.ndarray,
+    valid: np.ndarray,
+) -> np.ndarray:
+    """(H, S) 셀별 연도 MDD 최악값 (mdd_by_calendar_year + min 과 같은 정의).
+
+    연도마다 (그 해 이전/중에 시작한 시작 월 × 그 해 거래일) 평가액 행렬에서
+    연초(또는 시작일)부터의 running max 낙폭을 누적 최소로 만든 뒤,
+    종료일이 그 해인 셀은 종료일 값을, 이후 해에 끝나는 셀은 연말 값을 취한다.
+    """
+    years = dates.astype("datetime64[Y]").astype(np.int64)
+    year_bounds = np.r_[0, np.flatnonzero(years[1:] != years[:-1]) + 1, len(years)]
+    end_year = np.searchsorted(year_bounds, end_day, side="right") - 1
+
+    worst = np.full(end_day.shape, np.inf)
+    starts = month_starts
+    start_idx = np.broadcast_to(np.arange(end_day.shape[1])[None, :], end_day.shape)
+    for y, (lo, hi) in enumerate(zip(year_bounds[:-1].tolist(), year_bounds[1:].tolist())):
+        rows = int(np.searchsorted(starts, hi))  # 이 해 안에 시작했거나 이전에 시작한 시작 월
+        in_year = valid & (start_idx < rows) & (end_year >= y)
+        if not in_year.any():
+            continue
+        days = np.arange(lo, hi)
+        values = (prefix[deposits_by_day[lo:hi]][None, :] - prefix[:rows, None]) * q[None, lo:hi]
+        values[days[None, :] < starts[:rows, None]] = np.nan  # 시작 전 구간 제외
+        running_max = np.fmax.accumulate(values, axis=1)
+        with np.errstate(invalid="ignore"):
+            safe_max = np.where(running_max > 0, running_max, np.nan)
+            drawdown = (values - running_max) / safe_max
+        running_worst = np.fmin.accumulate(drawdown, axis=1)
+
+        # 종료가 이 해인 셀 → 종료일까지, 이후 해에 끝나는 셀 → 연말까지
+        col = np.where(end_year == y, end_day - lo, hi - lo - 1)
+        worst[in_year] = np.fmin(
+            worst[in_year], running_worst[start_idx[in_year], col[in_year]]
+        )
+
+    return np.where(np.isinf(worst), 0.0, worst)
@@ -6,6 +6,7 @@ import logging
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 
+import numpy as np
 import pandas as pd
 
 logger = logging.getLogger(__name__)
@@ -38,6 +39,12 @@ class Strategy(ABC):
     """
 
     strategy_id: str  # Must be set by subclass
+    # Columns of the _raw_signals output that make up the per-row meta dict.
+    # Meta dicts are only built when generate_signals(with_meta=True).
+    meta_columns: tuple[str, ...] = ()
+    # Factor columns _raw_signals reads, so callers can compute just those
+    # (research_engine.factors.compute_factors). None means all factors.
+    required_factors: tuple[str, ...] | None = None
 
     def __init__(
         self,
@@ -56,12 +63,13 @@ class Strategy(ABC):
             DataFrame indexed by date with columns:
                 - signal: int (+1=long, 0=neutral, -1=short)
                 - score: float (optional confidence/strength, can be NaN)
-                - meta: dict or None (strategy-specific metadata)
+                - meta: dict or None (optional, strategy-specific metadata)
+                - any columns listed in meta_columns (lazy alternative to meta)
         """
         ...
 
     def generate_signals(
-        self, factors_df: pd.DataFrame, asset_id: str
+        self, factors_df: pd.DataFrame, asset_id: str, with_meta: bool = True
     ) -> SignalResult:
         """Generate signals with next-day execution rule.
 
@@ -74,6 +82,8 @@ class Strategy(ABC):
         Args:
             factors_df: DataFrame indexed by date with factor columns.
             asset_id: Asset identifier.
+            with_meta: Build per-row meta dicts. Backtests that only need the
+                signal column can skip this (meta_json is then all None).
 
         Returns:
             SignalResult with formatted signal DataFrame.
@@ -93,25 +103,25 @@ class Strategy(ABC):
 
         signals = raw[["signal"]].copy()
         signals["score"] = raw["score"] if "score" in raw.columns else None
-        meta_col = raw["meta"] if "meta" in raw.columns else None
+        meta_list = _build_meta(raw, self.meta_columns) if with_meta else None
 
         # Label actions based on position changes
-        prev_signal = signals["signal"].shift(1).fillna(0).astype(int)
-        curr_signal = signals["signal"]
+        curr_signal = signals["signal"].to_numpy()
+        prev_signal = np.zeros_like(curr_signal)
+        prev_signal[1:] = curr_signal[:-1]
 
-        actions = pd.Series("hold", index=signals.index)
-        # Entry: from 0 to non-zero
-        actions[(prev_signal == 0) & (curr_signal != 0)] = "entry"
+        # Entry: from 0 to non-zero, or reversal (+1 ↔ -1)
+        is_entry = (curr_signal != 0) & (prev_signal != curr_signal)
         # Exit: from non-zero to 0
-        actions[(prev_signal != 0) & (curr_signal == 0)] = "exit"
-        # Reversal: from +1 to -1 or vice versa → treat as entry
-        actions[
-            (prev_signal != 0) & (curr_signal != 0) & (prev_signal != curr_signal)
-        ] = "entry"
+        is_exit = (prev_signal != 0) & (curr_signal == 0)
+
+        actions = np.full(len(signals), "hold", dtype=object)
+        actions[is_entry] = "entry"
+        actions[is_exit] = "exit"
 
         signals["action"] = actions
         signals["meta_json"] = (
-            meta_col.tolist() if meta_col is not None else [None] * len(signals)
+            meta_list if meta_list is not None else [None] * len(signals)
         )
 
         # Reset index to get date as column
@@ -119,9 +129,9 @@ class Strategy(ABC):
         if signals.columns[0] != "date":
             signals = signals.rename(columns={signals.columns[0]: "date"})
 
-        n_entry = (signals["action"] == "entry").sum()
-        n_exit = (signals["action"] == "exit").sum()
-        n_hold = (signals["action"] == "hold").sum()
+        n_entry = int(is_entry.sum())
+        n_exit = int(is_exit.sum())
+        n_hold = len(signals) - n_entry - n_exit
 
         logger.info(
             "%s/%s: %d signals (entry=%d, exit=%d, hold=%d)",
@@ -143,6 +153,71 @@ class Strategy(ABC):
         )
 
 
+def position_from_events(
+    entry_events: np.ndarray,
+    exit_events: np.ndarray,
+    first_entry: int = 0,
+    entry_gap: int = 1,
+) -> np.ndarray:
+    """Long/flat state machine driven by boolean entry and exit event masks.
+
+    Flat → long on the first entry event at or after the search start; long →
+    flat on the first exit event after the entry day. After an exit on day x
+    the next entry is searched from x + entry_gap. The loop runs once per
+    trade (jumping between precomputed next-event indices), never per bar.
+
+    Args:
+        entry_events: Boolean mask of days where a flat strategy would enter.
+        exit_events: Boolean mask of days where a long strategy would exit.
+        first_entry: First index at which an entry may occur.
+        entry_gap: Days after an exit before entries are considered again.
+
+    Returns:
+        int array of 1 (long) / 0 (flat), same length as the masks.
+    """
+    n = len(entry_events)
+    next_entry = _next_true_index(np.asarray(entry_events, dtype=bool)).tolist()
+    next_exit = _next_true_index(np.asarray(exit_events, dtype=bool)).tolist()
+
+    delta = np.zeros(n + 1, dtype=np.int64)
+    i = first_entry
+    while i < n:
+        e = next_entry[i]
+        if e >= n:
+            break
+        x = next_exit[e + 1]
+        delta[e] += 1
+        delta[x] -= 1
+        i = x + entry_gap
+
+    return np.cumsum(delta[:n]).astype(int)
+
+
+def _next_true_index(mask: np.ndarray) -> np.ndarray:
+    """For each i in [0, n], the smallest j >= i with mask[j] (n if none)."""
+    n = len(mask)
+    idx = np.where(mask, np.arange(n), n)
+    out = np.empty(n + 1, dtype=np.int64)
+    out[n] = n
+    out[:n] = np.minimum.accumulate(idx[::-1])[::-1]
+    return out
+
+
+def _build_meta(raw: pd.DataFrame, meta_columns: tuple[str, ...]) -> list | None:
+    """Build per-row meta dicts; rows with any NaN meta value get None."""
+    if "meta" in raw.columns:
+        return raw["meta"].tolist()
+    if not meta_columns:
+        return None
+
+    values = raw[list(meta_columns)].to_numpy(dtype=float)
+    complete = ~np.isnan(values).any(axis=1)
+    return [
+        dict(zip(meta_columns, row)) if ok else None
+        for row, ok in zip(values.tolist(), complete.tolist())
+    ]
+
+
 def _empty_signal_df() -> pd.DataFrame:
     """Return empty DataFrame with signal columns."""
     return pd.DataFrame(columns=["date", "signal", "score", "action", "meta_json"])
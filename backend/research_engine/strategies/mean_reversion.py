@@ -4,9 +4,10 @@ from __future__ import annotations
 
 import logging
 
+import numpy as np
 import pandas as pd
 
-from research_engine.strategies.base import Strategy
+from research_engine.strategies.base import Strategy, position_from_events
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +22,8 @@ class MeanReversionStrategy(Strategy):
     """
 
     strategy_id = "mean_reversion"
+    meta_columns = ("zscore", "sma")
+    required_factors = ()  # reads close only
 
     def __init__(
         self,
@@ -50,44 +53,23 @@ class MeanReversionStrategy(Strategy):
         zscore = (close - sma) / std
         zscore = zscore.fillna(0.0)
 
-        # Build signal with state machine
-        signal = pd.Series(0, index=factors_df.index, dtype=int)
-        in_position = False
-        triggered = False  # Was z-score below entry_z?
-
-        for i in range(len(factors_df)):
-            z = zscore.iloc[i]
-
-            if not in_position:
-                if z <= self.entry_z:
-                    triggered = True
-                elif triggered and z > self.entry_z:
-                    # Crossed back above entry band → enter long
-                    signal.iloc[i] = 1
-                    in_position = True
-                    triggered = False
-            else:
-                if z >= self.exit_z:
-                    # Reached mean → exit
-                    signal.iloc[i] = 0
-                    in_position = False
-                elif z <= self.stop_z:
-                    # Stop loss → exit
-                    signal.iloc[i] = 0
-                    in_position = False
-                else:
-                    signal.iloc[i] = 1
+        # Entry: z crosses back above entry band after being at/below it.
+        # The band must be touched on a flat day, so the day after an exit
+        # can never be an entry (entry_gap=2).
+        z = zscore.to_numpy()
+        cross_up = np.zeros(len(z), dtype=bool)
+        cross_up[1:] = (z[1:] > self.entry_z) & (z[:-1] <= self.entry_z)
+        # Exit: reached mean OR stop loss
+        exit_mask = (z >= self.exit_z) | (z <= self.stop_z)
+
+        signal = position_from_events(cross_up, exit_mask, first_entry=1, entry_gap=2)
 
         result = pd.DataFrame(
             {
                 "signal": signal,
                 "score": zscore.abs(),
-                "meta": [
-                    {"zscore": float(z), "sma": float(s)}
-                    if pd.notna(z) and pd.notna(s)
-                    else None
-                    for z, s in zip(zscore, sma)
-                ],
+                "zscore": zscore,
+                "sma": sma,
             },
             index=factors_df.index,
         )
@@ -6,7 +6,7 @@ import logging
 
 import pandas as pd
 
-from research_engine.strategies.base import Strategy
+from research_engine.strategies.base import Strategy, position_from_events
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +20,8 @@ class MomentumStrategy(Strategy):
     """
 
     strategy_id = "momentum"
+    meta_columns = ("ret_63d", "vol_20")
+    required_factors = ("ret_63d", "vol_20")
 
     def __init__(
         self,
@@ -34,8 +36,7 @@ class MomentumStrategy(Strategy):
         self.vol_cap = vol_cap
 
     def _raw_signals(self, factors_df: pd.DataFrame) -> pd.DataFrame:
-        required = {"ret_63d", "vol_20"}
-        missing = required - set(factors_df.columns)
+        missing = set(self.required_factors) - set(factors_df.columns)
         if missing:
             logger.warning("Missing factors for momentum: %s", missing)
             return pd.DataFrame(columns=["signal", "score", "meta"])
@@ -48,32 +49,15 @@ class MomentumStrategy(Strategy):
         # Exit condition: weak momentum OR high volatility
         exit_mask = (ret < self.exit_threshold) | (vol >= self.vol_cap)
 
-        # Build signal: iterate to respect entry/exit logic
-        signal = pd.Series(0, index=factors_df.index, dtype=int)
-        in_position = False
-
-        for i in range(len(factors_df)):
-            if not in_position:
-                if entry_mask.iloc[i]:
-                    signal.iloc[i] = 1
-                    in_position = True
-            else:
-                if exit_mask.iloc[i]:
-                    signal.iloc[i] = 0
-                    in_position = False
-                else:
-                    signal.iloc[i] = 1
+        # Build signal: entry/exit state machine evaluated between events
+        signal = position_from_events(entry_mask.to_numpy(), exit_mask.to_numpy())
 
         result = pd.DataFrame(
             {
                 "signal": signal,
                 "score": ret.abs(),  # momentum strength as score
-                "meta": [
-                    {"ret_63d": float(r), "vol_20": float(v)}
-                    if pd.notna(r) and pd.notna(v)
-                    else None
-                    for r, v in zip(ret, vol)
-                ],
+                "ret_63d": ret,
+                "vol_20": vol,
             },
             index=factors_df.index,
         )
@@ -30,10 +30,14 @@ class TrendStrategy(Strategy):
         super().__init__(commission_pct=commission_pct)
         self.fast_col = fast_col
         self.slow_col = slow_col
+        self.meta_columns = (fast_col, slow_col)
+
+    @property
+    def required_factors(self) -> tuple[str, ...]:
+        return (self.fast_col, self.slow_col)
 
     def _raw_signals(self, factors_df: pd.DataFrame) -> pd.DataFrame:
-        required = {self.fast_col, self.slow_col}
-        missing = required - set(factors_df.columns)
+        missing = set(self.required_factors) - set(factors_df.columns)
         if missing:
             logger.warning("Missing factors for trend: %s", missing)
             return pd.DataFrame(columns=["signal", "score", "meta"])
@@ -52,12 +56,8 @@ class TrendStrategy(Strategy):
             {
                 "signal": signal,
                 "score": spread.abs(),
-                "meta": [
-                    {self.fast_col: float(f), self.slow_col: float(s)}
-                    if pd.notna(f) and pd.notna(s)
-                    else None
-                    for f, s in zip(fast, slow)
-                ],
+                self.fast_col: fast,
+                self.slow_col: slow,
             },
             index=factors_df.index,
         )
@@ -0,0 +1,274 @@
+"""Parameter sweep: grid-search strategy parameters over assets with process-pool fan-out."""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import fields
+
+import numpy as np
+import pandas as pd
+from sqlalchemy.orm import Session
+
+from research_engine.backtest import BacktestConfig, run_backtest_batch
+from research_engine.factors import compute_all_factors
+from research_engine.metrics import PerformanceMetrics, compute_metrics_from_batch, metrics_to_dict
+from research_engine.preprocessing import preprocess
+from research_engine.strategies import STRATEGY_REGISTRY, get_strategy
+
+logger = logging.getLogger(__name__)
+
+# Default search space per strategy (constructor keyword → candidate values)
+DEFAULT_PARAM_GRIDS: dict[str, dict[str, list]] = {
+    "momentum": {
+        "ret_threshold": [0.0, 0.03, 0.05, 0.08, 0.10],
+        "exit_threshold": [-0.02, 0.0, 0.02],
+        "vol_cap": [0.30, 0.40, 0.60],
+    },
+    "trend": {
+        "fast_col": ["sma_20", "ema_12"],
+        "slow_col": ["sma_60", "sma_120", "ema_26"],
+    },
+    "mean_reversion": {
+        "lookback": [10, 20, 40],
+        "entry_z": [-2.5, -2.0, -1.5],
+        "exit_z": [-0.5, 0.0, 0.5],
+        "stop_z": [-3.5, -3.0],
+    },
+}
+
+METRIC_COLUMNS = [f.name for f in fields(PerformanceMetrics)]
+
+# Param combos evaluated per worker task (one batch backtest per task)
+DEFAULT_CHUNK_SIZE = 32
+
+# Per-process inputs, set once by the pool initializer
+_WORKER_INPUTS: dict[str, pd.DataFrame] = {}
+_WORKER_CONFIG: BacktestConfig | None = None
+
+
+def expand_grid(grid: dict[str, list]) -> list[dict]:
+    """Expand {param: [values]} into the list of all parameter combinations."""
+    if not grid:
+        return [{}]
+    keys = list(grid.keys())
+    return [dict(zip(keys, values)) for values in itertools.product(*grid.values())]
+
+
+def build_sweep_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Build the per-asset sweep input from a preprocessed OHLCV DataFrame.
+
+    Columns: all factors + open/close (close is also what mean_reversion reads).
+    """
+    factors = compute_all_factors(df)
+    factors["open"] = df["open"]
+    factors["close"] = df["close"]
+    return factors
+
+
+def prepare_sweep_inputs(
+    session: Session,
+    asset_ids: list[str],
+    start: str | None = None,
+    end: str | None = None,
+    missing_threshold: float = 0.10,
+) -> dict[str, pd.DataFrame]:
+    """Load, preprocess and compute factors once per asset.
+
+    Assets that fail preprocessing are logged and skipped.
+    """
+    inputs: dict[str, pd.DataFrame] = {}
+    for asset_id in asset_ids:
+        try:
+            df = preprocess(session, asset_id, start, end, missing_threshold=missing_threshold)
+        except ValueError as e:
+            logger.warning("Skipping %s in sweep: %s", asset_id, e)
+            continue
+        inputs[asset_id] = build_sweep_frame(df)
+    return inputs
+
+
+def build_signal_matrix(
+    frame: pd.DataFrame,
+    asset_id: str,
+    strategy_name: str,
+    param_list: list[dict],
+) -> tuple[list[dict], list[dict], np.ndarray]:
+    """Generate one signal row per parameter set, aligned to frame.index.
+
+    Returns:
+        (failed_rows, ok_params, signals): status rows for parameter sets that
+        raised or produced no signals, the parameter sets that worked, and
+        their (len(ok_params), len(frame)) signal matrix (NaN = no signal).
+    """
+    failed: list[dict] = []
+    signal_rows: list[np.ndarray] = []
+    ok_params: list[dict] = []
+    strategy_id = STRATEGY_REGISTRY[strategy_name].strategy_id
+
+    for params in param_list:
+        base = {"asset_id": asset_id, "strategy_id": strategy_id, "params": params}
+        try:
+            strategy = get_strategy(strategy_name, **params)
+            sig = strategy.generate_signals(frame, asset_id, with_meta=False).signals
+        except Exception as e:
+            failed.append({**base, "status": "failed", "error": str(e)})
+            continue
+        if sig.empty:
+            failed.append({**base, "status": "no_signals", "error": None})
+            continue
+        series = pd.Series(
+            sig["signal"].to_numpy(dtype=float), index=pd.to_datetime(sig["date"])
+        )
+        signal_rows.append(series.reindex(frame.index).to_numpy())
+        ok_params.append(params)
+
+    signals = np.vstack(signal_rows) if signal_rows else np.empty((0, len(frame)))
+    return failed, ok_params, signals
+
+
+def evaluate_param_group(
+    frame: pd.DataFrame,
+    asset_id: str,
+    strategy_name: str,
+    param_list: list[dict],
+    config: BacktestConfig,
+) -> list[dict]:
+    """Evaluate many parameter sets of one strategy on one asset.
+
+    Signals are generated per parameter set, then all of them run through a
+    single batch backtest (one row per parameter set) scored by one batch
+    metrics pass.
+    """
+    rows, ok_params, signals = build_signal_matrix(frame, asset_id, strategy_name, param_list)
+    if not ok_params:
+        return rows
+
+    strategy_id = STRATEGY_REGISTRY[strategy_name].strategy_id
+    k = len(ok_params)
+    batch = run_backtest_batch(
+        opens=np.broadcast_to(frame["open"].to_numpy(dtype=float), (k, len(frame))),
+        closes=np.broadcast_to(frame["close"].to_numpy(dtype=float), (k, len(frame))),
+        signals=signals,
+        config=config,
+    )
+    batch_metrics = compute_metrics_from_batch(batch)
+
+    for i, params in enumerate(ok_params):
+        metrics = metrics_to_dict(batch_metrics[i])
+        rows.append({
+            "asset_id": asset_id,
+            "strategy_id": strategy_id,
+            "params": params,
+            "status": "success",
+            "error": None,
+            **metrics,
+        })
+    return rows
+
+
+def _init_worker(inputs: dict[str, pd.DataFrame], config: BacktestConfig) -> None:
+    """Pool initializer: receive the shared per-asset inputs once per process."""
+    global _WORKER_INPUTS, _WORKER_CONFIG
+    _WORKER_INPUTS = inputs
+    _WORKER_CONFIG = config
+
+
+def _evaluate_in_worker(asset_id: str, strategy_name: str, param_list: list[dict]) -> list[dict]:
+    return evaluate_param_group(
+        _WORKER_INPUTS[asset_id], asset_id, strategy_name, param_list, _WORKER_CONFIG,
+    )
+
+
+def run_sweep(
+    inputs: dict[str, pd.DataFrame],
+    param_grids: dict[str, dict[str, list]] | None = None,
+    strategy_names: list[str] | None = None,
+    config: BacktestConfig | None = None,
+    max_workers: int | None = None,
+    rank_by: str = "sharpe",
+    ascending: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> pd.DataFrame:
+    """Run (asset × strategy × params) combinations and return a ranked table.
+
+    Args:
+        inputs: {asset_id: sweep frame} from prepare_sweep_inputs / build_sweep_frame.
+        param_grids: {strategy_name: {param: [values]}}. Missing strategies use
+            DEFAULT_PARAM_GRIDS.
+        strategy_names: Strategies to sweep. Default: keys of param_grids, or all.
+        config: Backtest configuration. Uses defaults if None.
+        max_workers: Process count. 1 runs inline; None uses os.cpu_count().
+        rank_by: Metric column used for ranking.
+        ascending: Sort order for rank_by (False = higher is better).
+        chunk_size: Param combos per worker task.
+
+    Returns:
+        DataFrame with rank, asset_id, strategy_id, params, status, error and
+        every metrics_to_dict field, sorted best-first (failures last).
+    """
+    if config is None:
+        config = BacktestConfig()
+    if rank_by not in METRIC_COLUMNS:
+        raise KeyError(f"Unknown rank_by metric: {rank_by}. Available: {METRIC_COLUMNS}")
+    param_grids = dict(param_grids or {})
+    if strategy_names is None:
+        strategy_names = list(param_grids) or list(STRATEGY_REGISTRY)
+    for name in strategy_names:
+        if name not in STRATEGY_REGISTRY:
+            raise KeyError(
+                f"Unknown strategy: {name}. Available: {list(STRATEGY_REGISTRY.keys())}"
+            )
+
+    tasks: list[tuple[str, str, list[dict]]] = []
+    for asset_id in inputs:
+        for name in strategy_names:
+            combos = expand_grid(param_grids.get(name, DEFAULT_PARAM_GRIDS.get(name, {})))
+            for i in range(0, len(combos), chunk_size):
+                tasks.append((asset_id, name, combos[i : i + chunk_size]))
+
+    n_combos = sum(len(t[2]) for t in tasks)
+    workers = max_workers or os.cpu_count() or 1
+    t0 = time.perf_counter()
+    logger.info(
+        "Sweep: %d assets × %d strategies = %d combos in %d tasks (%d workers)",
+        len(inputs), len(strategy_names), n_combos, len(tasks), workers,
+    )
+
+    rows: list[dict] = []
+    if workers == 1 or len(tasks) <= 1:
+        for asset_id, name, params in tasks:
+            rows.extend(evaluate_param_group(inputs[asset_id], asset_id, name, params, config))
+    else:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(tasks)),
+            initializer=_init_worker,
+            initargs=(inputs, config),
+        ) as pool:
+            futures = [pool.submit(_evaluate_in_worker, *task) for task in tasks]
+            for future in as_completed(futures):
+                rows.extend(future.result())
+
+    elapsed = time.perf_counter() - t0
+    logger.info("Sweep complete: %d combos in %.1fs", n_combos, elapsed)
+    return rank_sweep_results(rows, rank_by=rank_by, ascending=ascending)
+
+
+def rank_sweep_results(
+    rows: list[dict], rank_by: str = "sharpe", ascending: bool = False
+) -> pd.DataFrame:
+    """Sort sweep rows by a metric and add a 1-based rank column."""
+    table = pd.DataFrame(rows)
+    if table.empty:
+        return pd.DataFrame(columns=["rank", "asset_id", "strategy_id", "params", "status"])
+    if rank_by not in table.columns:  # every combo failed
+        table[rank_by] = np.nan
+
+    table = table.sort_values(
+        rank_by, ascending=ascending, na_position="last", kind="stable"
+    ).reset_index(drop=True)
+    table.insert(0, "rank", np.arange(1, len(table) + 1))
+    return table
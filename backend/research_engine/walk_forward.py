@@ -0,0 +1,413 @@
+"""Walk-forward evaluation: pick parameters on each train window, trade them out of sample.
+
+Per (asset, strategy) the factor frame is built once and the signals of every
+parameter set are generated once over the full history (strategies are causal,
+so a signal at t only uses data up to t). Each window is then pure array
+slicing plus two batch backtests: all parameter sets on the train slice, the
+winner on the following test slice. Test windows are stitched into one
+out-of-sample equity curve.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, replace
+
+import numpy as np
+import pandas as pd
+
+from research_engine.backtest import (
+    BacktestConfig,
+    BacktestResult,
+    batch_to_results,
+    run_backtest_batch,
+)
+from research_engine.metrics import compute_metrics, compute_metrics_batch, metrics_to_dict
+from research_engine.strategies import STRATEGY_REGISTRY
+from research_engine.sweep import DEFAULT_PARAM_GRIDS, build_signal_matrix, expand_grid
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TRAIN_BARS = 504  # ~2 years
+DEFAULT_TEST_BARS = 126  # ~6 months
+
+# Windows evaluated per worker task
+DEFAULT_CHUNK_SIZE = 8
+
+# Metrics usable for in-sample parameter selection
+SCORE_METRICS = ("sharpe", "sortino", "total_return", "cagr", "calmar", "mdd", "volatility")
+
+# Window bounds as bar positions: (train_start, train_end, test_start, test_end), end exclusive
+Window = tuple[int, int, int, int]
+
+# Per-process inputs, set once by the pool initializer
+_WORKER_INPUTS: dict[str, pd.DataFrame] = {}
+_WORKER_COMBOS: dict[str, list[dict]] = {}
+_WORKER_CONFIG: BacktestConfig | None = None
+_WORKER_RANKING: tuple[str, bool] = ("sharpe", False)
+_WORKER_SIGNALS: dict[tuple[str, str], tuple[list[dict], np.ndarray]] = {}
+
+
+@dataclass
+class WindowOutcome:
+    """One walk-forward step: the parameters chosen in-sample and their test run."""
+
+    window: Window
+    params: dict
+    train_score: float
+    test: BacktestResult
+
+
+@dataclass
+class WalkForwardResult:
+    asset_id: str
+    strategy_id: str
+    result: BacktestResult  # stitched out-of-sample run
+    windows: pd.DataFrame  # one row per window
+    metrics: dict  # metrics_to_dict of the out-of-sample run
+
+
+def make_windows(
+    n_bars: int,
+    train_bars: int = DEFAULT_TRAIN_BARS,
+    test_bars: int = DEFAULT_TEST_BARS,
+    expanding: bool = False,
+) -> list[Window]:
+    """Consecutive, non-overlapping test windows each preceded by a train window.
+
+    Rolling windows keep train_bars of history; expanding windows train on
+    everything before the test window. A trailing test window shorter than
+    2 bars is dropped.
+    """
+    if train_bars < 2 or test_bars < 2:
+        raise ValueError("train_bars and test_bars must be >= 2")
+    windows: list[Window] = []
+    test_start = train_bars
+    while n_bars - test_start >= 2:
+        test_end = min(test_start + test_bars, n_bars)
+        train_start = 0 if expanding else test_start - train_bars
+        windows.append((train_start, test_start, test_start, test_end))
+        test_start = test_end
+    return windows
+
+
+def score_equity_rows(equity: np.ndarray, metric: str) -> np.ndarray:
+    """Score every row of an (K, M) equity matrix with a compute_metrics formula.
+
+    Missing bars (NaN) are skipped. Rows without two valid bars score NaN.
+    """
+    if metric not in SCORE_METRICS:
+        raise KeyError(f"Unknown score metric: {metric}. Available: {list(SCORE_METRICS)}")
+    equity = np.atleast_2d(np.asarray(equity, dtype=float))
+    score = getattr(compute_metrics_batch(equity), metric)
+    return np.where(np.isfinite(equity).sum(axis=1) >= 2, score, np.nan)
+
+
+def evaluate_windows(
+    frame: pd.DataFrame,
+    asset_id: str,
+    strategy_id: str,
+    params: list[dict],
+    signals: np.ndarray,
+    windows: list[Window],
+    config: BacktestConfig,
+    rank_by: str = "sharpe",
+    ascending: bool = False,
+) -> list[WindowOutcome]:
+    """Select the best parameter row on each train slice and run it on the test slice."""
+    opens = frame["open"].to_numpy(dtype=float)
+    closes = frame["close"].to_numpy(dtype=float)
+    k = len(params)
+    outcomes: list[WindowOutcome] = []
+
+    for window in windows:
+        tr0, tr1, te0, te1 = window
+        train = run_backtest_batch(
+            opens=np.broadcast_to(opens[tr0:tr1], (k, tr1 - tr0)),
+            closes=np.broadcast_to(closes[tr0:tr1], (k, tr1 - tr0)),
+            signals=signals[:, tr0:tr1],
+            config=config,
+        )
+        scores = score_equity_rows(train.equity, rank_by)
+        ranked = np.where(np.isnan(scores), np.inf if ascending else -np.inf, scores)
+        best = int(np.argmin(ranked) if ascending else np.argmax(ranked))
+
+        test = run_backtest_batch(
+            opens=opens[np.newaxis, te0:te1],
+            closes=closes[np.newaxis, te0:te1],
+            signals=signals[np.newaxis, best, te0:te1],
+            config=config,
+        )
+        result = batch_to_results(test, [asset_id], strategy_id, frame.index[te0:te1], config)[0]
+        outcomes.append(WindowOutcome(
+            window=window, params=params[best], train_score=float(scores[best]), test=result,
+        ))
+    return outcomes
+
+
+def stitch_windows(
+    frame: pd.DataFrame,
+    asset_id: str,
+    strategy_id: str,
+    outcomes: list[WindowOutcome],
+    config: BacktestConfig,
+) -> WalkForwardResult:
+    """Chain test-window runs into one out-of-sample curve.
+
+    Each test run starts flat with config.initial_cash; window i is rescaled
+    by the equity multiple reached at the end of window i-1 (positions are
+    valued at the last close of each window and re-entered from flat).
+    """
+    outcomes = sorted(outcomes, key=lambda o: o.window[2])
+    initial_cash = float(config.initial_cash)
+    scale = 1.0
+    curves: list[pd.DataFrame] = []
+    trades = []
+    rows: list[dict] = []
+
+    for o in outcomes:
+        curve = o.test.equity_curve
+        if curve.empty:
+            continue
+        equity = curve["equity"].to_numpy(dtype=float) * scale
+        curves.append(pd.DataFrame({"date": curve["date"], "equity": equity}))
+        trades.extend(
+            replace(t, shares=t.shares * scale, pnl=t.pnl * scale, cost=t.cost * scale)
+            for t in o.test.trades
+        )
+        tr0, tr1, te0, te1 = o.window
+        rows.append({
+            "train_start": frame.index[tr0],
+            "train_end": frame.index[tr1 - 1],
+            "test_start": frame.index[te0],
+            "test_end": frame.index[te1 - 1],
+            "params": o.params,
+            "train_score": o.train_score,
+            "test_return": equity[-1] / equity[0] - 1.0,
+            "test_trades": len(o.test.trades),
+        })
+        scale = equity[-1] / initial_cash
+
+    if curves:
+        equity_curve = pd.concat(curves, ignore_index=True)
+        running_max = equity_curve["equity"].cummax()
+        equity_curve["drawdown"] = equity_curve["equity"] / running_max - 1.0
+
+        # Buy & hold over the same out-of-sample span
+        te0, te1 = outcomes[0].window[2], outcomes[-1].window[3]
+        opens = frame["open"].to_numpy(dtype=float)
+        closes = frame["close"].to_numpy(dtype=float)
+        bh_shares = (initial_cash - initial_cash * config.commission_pct) / opens[te0]
+        buy_hold = pd.DataFrame({
+            "date": list(frame.index[te0:te1]),
+            "equity": bh_shares * closes[te0:te1],
+        })
+    else:
+        equity_curve = pd.DataFrame(columns=["date", "equity", "drawdown"])
+        buy_hold = pd.DataFrame(columns=["date", "equity"])
+
+    result = BacktestResult(
+        strategy_id=strategy_id,
+        asset_id=asset_id,
+        config=config,
+        equity_curve=equity_curve,
+        trades=trades,
+        buy_hold_equity=buy_hold,
+    )
+    return WalkForwardResult(
+        asset_id=asset_id,
+        strategy_id=strategy_id,
+        result=result,
+        windows=pd.DataFrame(rows),
+        metrics=metrics_to_dict(compute_metrics(result)),
+    )
+
+
+def _signals_for(
+    cache: dict,
+    inputs: dict[str, pd.DataFrame],
+    combos: dict[str, list[dict]],
+    asset_id: str,
+    strategy_name: str,
+) -> tuple[list[dict], np.ndarray]:
+    """Signal matrix per (asset, strategy), generated once per process."""
+    key = (asset_id, strategy_name)
+    if key not in cache:
+        failed, ok_params, signals = build_signal_matrix(
+            inputs[asset_id], asset_id, strategy_name, combos[strategy_name],
+        )
+        for row in failed:
+            logger.warning(
+                "Walk-forward %s/%s params %s: %s",
+                asset_id, strategy_name, row["params"], row["error"] or row["status"],
+            )
+        cache[key] = (ok_params, signals)
+    return cache[key]
+
+
+def _evaluate_task(
+    inputs: dict[str, pd.DataFrame],
+    combos: dict[str, list[dict]],
+    cache: dict,
+    config: BacktestConfig,
+    rank_by: str,
+    ascending: bool,
+    asset_id: str,
+    strategy_name: str,
+    windows: list[Window],
+) -> list[WindowOutcome]:
+    params, signals = _signals_for(cache, inputs, combos, asset_id, strategy_name)
+    if not params:
+        return []
+    return evaluate_windows(
+        inputs[asset_id], asset_id, STRATEGY_REGISTRY[strategy_name].strategy_id,
+        params, signals, windows, config, rank_by, ascending,
+    )
+
+
+def _init_worker(
+    inputs: dict[str, pd.DataFrame],
+    combos: dict[str, list[dict]],
+    config: BacktestConfig,
+    ranking: tuple[str, bool],
+) -> None:
+    """Pool initializer: receive the shared inputs once per process."""
+    global _WORKER_INPUTS, _WORKER_COMBOS, _WORKER_CONFIG, _WORKER_RANKING
+    _WORKER_INPUTS = inputs
+    _WORKER_COMBOS = combos
+    _WORKER_CONFIG = config
+    _WORKER_RANKING = ranking
+    _WORKER_SIGNALS.clear()
+
+
+def _evaluate_in_worker(
+    asset_id: str, strategy_name: str, windows: list[Window]
+) -> tuple[str, str, list[WindowOutcome]]:
+    rank_by, ascending = _WORKER_RANKING
+    outcomes = _evaluate_task(
+        _WORKER_INPUTS, _WORKER_COMBOS, _WORKER_SIGNALS, _WORKER_CONFIG,
+        rank_by, ascending, asset_id, strategy_name, windows,
+    )
+    return asset_id, strategy_name, outcomes
+
+
+def run_walk_forward(
+    inputs: dict[str, pd.DataFrame],
+    param_grids: dict[str, dict[str, list]] | None = None,
+    strategy_names: list[str] | None = None,
+    train_bars: int = DEFAULT_TRAIN_BARS,
+    test_bars: int = DEFAULT_TEST_BARS,
+    expanding: bool = False,
+    config: BacktestConfig | None = None,
+    max_workers: int | None = None,
+    rank_by: str = "sharpe",
+    ascending: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> list[WalkForwardResult]:
+    """Walk-forward every (asset × strategy) pair.
+
+    Args:
+        inputs: {asset_id: sweep frame} from sweep.prepare_sweep_inputs.
+        param_grids: {strategy_name: {param: [values]}}. Missing strategies use
+            DEFAULT_PARAM_GRIDS.
+        strategy_names: Strategies to evaluate. Default: keys of param_grids, or all.
+        train_bars: In-sample window length (rolling) / minimum history (expanding).
+        test_bars: Out-of-sample window length.
+        expanding: Train on all history before each test window.
+        config: Backtest configuration. Uses defaults if None.
+        max_workers: Process count. 1 runs inline; None uses os.cpu_count().
+        rank_by: In-sample selection metric (one of SCORE_METRICS).
+        ascending: Selection order for rank_by (False = higher is better).
+        chunk_size: Windows per worker task.
+
+    Returns:
+        One WalkForwardResult per (asset, strategy) with at least one window.
+    """
+    if config is None:
+        config = BacktestConfig()
+    if rank_by not in SCORE_METRICS:
+        raise KeyError(f"Unknown rank_by metric: {rank_by}. Available: {list(SCORE_METRICS)}")
+    param_grids = dict(param_grids or {})
+    if strategy_names is None:
+        strategy_names = list(param_grids) or list(STRATEGY_REGISTRY)
+    for name in strategy_names:
+        if name not in STRATEGY_REGISTRY:
+            raise KeyError(
+                f"Unknown strategy: {name}. Available: {list(STRATEGY_REGISTRY.keys())}"
+            )
+    combos = {
+        name: expand_grid(param_grids.get(name, DEFAULT_PARAM_GRIDS.get(name, {})))
+        for name in strategy_names
+    }
+
+    tasks: list[tuple[str, str, list[Window]]] = []
+    for asset_id, frame in inputs.items():
+        windows = make_windows(len(frame), train_bars, test_bars, expanding)
+        if not windows:
+            logger.warning(
+                "Skipping %s in walk-forward: %d bars < train %d + 2",
+                asset_id, len(frame), train_bars,
+            )
+            continue
+        for name in strategy_names:
+            for i in range(0, len(windows), chunk_size):
+                tasks.append((asset_id, name, windows[i : i + chunk_size]))
+
+    n_windows = sum(len(t[2]) for t in tasks)
+    workers = max_workers or os.cpu_count() or 1
+    t0 = time.perf_counter()
+    logger.info(
+        "Walk-forward: %d assets × %d strategies, %d windows in %d tasks (%d workers)",
+        len(inputs), len(strategy_names), n_windows, len(tasks), workers,
+    )
+
+    collected: dict[tuple[str, str], list[WindowOutcome]] = {}
+    if workers == 1 or len(tasks) <= 1:
+        cache: dict = {}
+        for asset_id, name, windows in tasks:
+            collected.setdefault((asset_id, name), []).extend(_evaluate_task(
+                inputs, combos, cache, config, rank_by, ascending, asset_id, name, windows,
+            ))
+    else:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(tasks)),
+            initializer=_init_worker,
+            initargs=(inputs, combos, config, (rank_by, ascending)),
+        ) as pool:
+            futures = [pool.submit(_evaluate_in_worker, *task) for task in tasks]
+            for future in as_completed(futures):
+                asset_id, name, outcomes = future.result()
+                collected.setdefault((asset_id, name), []).extend(outcomes)
+
+    results: list[WalkForwardResult] = []
+    for asset_id in inputs:
+        for name in strategy_names:
+            outcomes = collected.get((asset_id, name))
+            if not outcomes:
+                continue
+            results.append(stitch_windows(
+                inputs[asset_id], asset_id, STRATEGY_REGISTRY[name].strategy_id,
+                outcomes, config,
+            ))
+
+    logger.info(
+        "Walk-forward complete: %d windows in %.1fs", n_windows, time.perf_counter() - t0,
+    )
+    return results
+
+
+def summarize_walk_forward(results: list[WalkForwardResult]) -> pd.DataFrame:
+    """One row per (asset, strategy): window count plus out-of-sample metrics."""
+    rows = [
+        {
+            "asset_id": r.asset_id,
+            "strategy_id": r.strategy_id,
+            "windows": len(r.windows),
+            **r.metrics,
+        }
+        for r in results
+    ]
+    return pd.DataFrame(rows)
@@ -0,0 +1,69 @@
+"""Benchmark: batch metrics vs per-result compute_metrics on synthetic batch backtests.
+
+Runs one run_backtest_batch over random price paths, then scores it two ways:
+    scalar: batch_to_results → compute_metrics per row (the pre-batch sweep path)
+    batch:  compute_metrics_from_batch (one vectorized pass)
+and checks that metrics_to_dict output agrees row by row.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Ensure backend/ is on sys.path when running as script
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+import pandas as pd
+
+from research_engine.backtest import BacktestConfig, batch_to_results, run_backtest_batch
+from research_engine.metrics import compute_metrics, compute_metrics_from_batch, metrics_to_dict
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Batch vs scalar metrics benchmark")
+    parser.add_argument(
+        "--curves", type=int, nargs="+", default=[100, 1000, 5000], help="Curve counts"
+    )
+    parser.add_argument("--bars", type=int, default=1260, help="Bars per curve (default 5y)")
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args(argv)
+
+
+def _synthetic_batch(k: int, n: int, seed: int):
+    rng = np.random.default_rng(seed)
+    closes = 100 * np.cumprod(1 + rng.normal(0.0003, 0.015, (k, n)), axis=1)
+    opens = closes * (1 + rng.normal(0, 0.003, (k, n)))
+    signals = np.where(rng.random((k, n)) < 0.02, rng.choice([1.0, 0.0], (k, n)), np.nan)
+    return run_backtest_batch(opens, closes, signals, BacktestConfig())
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    dates = pd.bdate_range("2015-01-02", periods=args.bars)
+    print(f"{'curves':>8} {'scalar_s':>10} {'batch_s':>10} {'speedup':>8} {'mismatch':>9}")
+    for k in args.curves:
+        batch = _synthetic_batch(k, args.bars, args.seed)
+
+        t0 = time.perf_counter()
+        results = batch_to_results(batch, [f"A{i}" for i in range(k)], "bench", dates)
+        scalar = [compute_metrics(r) for r in results]
+        scalar_s = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        batch_metrics = compute_metrics_from_batch(batch)
+        batch_s = time.perf_counter() - t0
+
+        mismatch = sum(
+            metrics_to_dict(a) != metrics_to_dict(batch_metrics[i])
+            for i, a in enumerate(scalar)
+        )
+        print(
+            f"{k:>8} {scalar_s:>10.3f} {batch_s:>10.3f} "
+            f"{scalar_s / batch_s:>7.1f}x {mismatch:>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Benchmark: ORM per-asset price loading vs the one-query Core panel loader.
+
+Seeds synthetic price_daily rows (default 15 assets × 10 years of business
+days) into a throwaway SQLite database, or reads an existing database with
+--database-url, then loads every asset's OHLCV history three ways:
+    orm:   session.query(PriceDaily) per asset → list of dicts → DataFrame
+           (the pre-loader preprocessing.load_prices path)
+    core:  db.price_loader.load_price_frames per asset
+    panel: db.price_loader.load_price_frames / load_price_panel for all assets
+           in one query
+and checks that the close prices agree.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Ensure backend/ is on sys.path when running as script
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from db.models import Base, PriceDaily
+from db.price_loader import load_price_frames, load_price_panel
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="ORM vs Core price loading benchmark")
+    parser.add_argument("--assets", type=int, default=15, help="Synthetic asset count")
+    parser.add_argument("--years", type=int, default=10, help="Synthetic history length")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed repetitions (best of)")
+    parser.add_argument(
+        "--database-url", default=None,
+        help="Benchmark an existing database instead of seeding SQLite",
+    )
+    parser.add_argument(
+        "--asset-ids", nargs="+", default=None, help="Asset IDs to load (with --database-url)"
+    )
+    return parser.parse_args(argv)
+
+
+def _seed(session, n_assets: int, years: int) -> list[str]:
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range(end="2025-12-31", periods=years * 252)
+    asset_ids = [f"A{i:02d}" for i in range(n_assets)]
+    for asset_id in asset_ids:
+        close = 100 * np.cumprod(1 + rng.normal(0.0003, 0.015, len(dates)))
+        session.execute(insert(PriceDaily), [
+            {
+                "asset_id": asset_id, "date": d.date(), "source": "bench",
+                "open": c, "high": c, "low": c, "close": c, "volume": 1000,
+            }
+            for d, c in zip(dates, close.tolist())
+        ])
+    session.commit()
+    return asset_ids
+
+
+def _orm_frame(session, asset_id: str) -> pd.DataFrame:
+    rows = (
+        session.query(PriceDaily)
+        .filter(PriceDaily.asset_id == asset_id)
+        .order_by(PriceDaily.date)
+        .all()
+    )
+    df = pd.DataFrame([
+        {"date": r.date, "open": r.open, "high": r.high, "low": r.low,
+         "close": r.close, "volume": r.volume}
+        for r in rows
+    ])
+    df["date"] = pd.to_datetime(df["date"])
+    return df.set_index("date").sort_index()
+
+
+def _best(fn, session, repeat: int) -> tuple[float, object]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        session.expunge_all()
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    engine = create_engine(args.database_url or "sqlite://")
+    session = sessionmaker(bind=engine)()
+    if args.database_url:
+        asset_ids = args.asset_ids or []
+        if not asset_ids:
+            print("ERROR: --asset-ids is required with --database-url", file=sys.stderr)
+            sys.exit(1)
+    else:
+        Base.metadata.create_all(engine)
+        asset_ids = _seed(session, args.assets, args.years)
+
+    orm_s, orm = _best(
+        lambda: {a: _orm_frame(session, a) for a in asset_ids}, session, args.repeat
+    )
+    core_s, _ = _best(
+        lambda: {a: load_price_frames(session, [a])[a] for a in asset_ids},
+        session, args.repeat,
+    )
+    frames_s, frames = _best(
+        lambda: load_price_frames(session, asset_ids), session, args.repeat
+    )
+    panel_s, panel = _best(
+        lambda: load_price_panel(session, asset_ids), session, args.repeat
+    )
+    session.close()
+
+    rows = sum(len(df) for df in frames.values())
+    mismatch = sum(
+        not np.array_equal(orm[a]["close"].to_numpy(), frames[a]["close"].to_numpy())
+        or not np.array_equal(panel[a].dropna().to_numpy(), frames[a]["close"].to_numpy())
+        for a in asset_ids
+    )
+    print(f"{len(asset_ids)} assets, {rows} rows (best of {args.repeat})")
+    print(f"{'loader':>24} {'seconds':>9} {'speedup':>8}")
+    for name, secs in (
+        ("orm per asset", orm_s),
+        ("core per asset", core_s),
+        ("core one query (frames)", frames_s),
+        ("core one query (panel)", panel_s),
+    ):
+        print(f"{name:>24} {secs:>9.4f} {orm_s / secs:>7.1f}x")
+    print(f"mismatched assets: {mismatch}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,7 +8,8 @@ from pathlib import Path
 # Ensure backend/ is on sys.path when running as script
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-from collector.ingest import ingest_all, ingest_asset
+from collector.fetch_cache import configure_fetch_cache
+from collector.ingest import ingest_all
 from config.logging import setup_logging
 from config.settings import settings
 from db.session import SessionLocal
@@ -16,19 +17,54 @@ from db.session import SessionLocal
 
 def parse_args(argv=None):
     parser = argparse.ArgumentParser(description="Collect OHLCV data for registered assets")
-    parser.add_argument("--start", required=True, help="Start date (YYYY-MM-DD)")
+    parser.add_argument(
+        "--start",
+        default=None,
+        help="Start date (YYYY-MM-DD). Required unless --sync",
+    )
     parser.add_argument("--end", required=True, help="End date (YYYY-MM-DD)")
     parser.add_argument(
         "--assets",
         default=None,
         help="Comma-separated asset IDs (e.g. KS200,005930). Default: all active assets",
     )
-    return parser.parse_args(argv)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.ingest_workers,
+        help=f"Concurrent fetch workers (default: {settings.ingest_workers}, 1 = sequential)",
+    )
+    parser.add_argument(
+        "--sync",
+        action="store_true",
+        help=(
+            "Fetch only dates after each asset's last stored row (plus a short overlap) "
+            "and skip unchanged rows. --start is then only used for assets with no data"
+        ),
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=settings.fdr_cache_dir or None,
+        help="Parquet cache directory for raw FDR responses (default: FDR_CACHE_DIR)",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        default=settings.fdr_offline,
+        help="Replay from --cache-dir only; uncached windows fail instead of fetching",
+    )
+    args = parser.parse_args(argv)
+    if args.offline and not args.cache_dir:
+        parser.error("--offline requires --cache-dir (or FDR_CACHE_DIR)")
+    if args.start is None and not args.sync:
+        parser.error("--start is required unless --sync is given")
+    return args
 
 
 def main(argv=None):
     args = parse_args(argv)
     setup_logging(settings.log_level)
+    configure_fetch_cache(args.cache_dir, offline=args.offline)
 
     if SessionLocal is None:
         print("ERROR: DATABASE_URL not configured. Set it in .env or environment.", file=sys.stderr)
@@ -38,14 +74,11 @@ def main(argv=None):
     t0 = time.perf_counter()
 
     try:
-        if args.assets:
-            asset_ids = [a.strip() for a in args.assets.split(",")]
-            results = []
-            for asset_id in asset_ids:
-                result = ingest_asset(asset_id, args.start, args.end, session)
-                results.append(result)
-        else:
-            results = ingest_all(args.start, args.end, session)
+        asset_ids = [a.strip() for a in args.assets.split(",")] if args.assets else None
+        results = ingest_all(
+            args.start, args.end, session,
+            asset_ids=asset_ids, workers=args.workers, sync=args.sync,
+        )
     finally:
         session.close()
 
@@ -55,10 +88,13 @@ def main(argv=None):
     success = [r for r in results if r.status == "success"]
     failed = [r for r in results if r.status != "success"]
     total_rows = sum(r.row_count for r in success)
+    unchanged_rows = sum(r.unchanged_count for r in success)
 
     print(f"\n{'='*50}")
     print(f"Collection complete: {len(success)}/{len(results)} assets succeeded")
     print(f"Total rows: {total_rows:,}")
+    if args.sync:
+        print(f"Unchanged rows skipped: {unchanged_rows:,}")
     print(f"Elapsed: {elapsed:.1f}s")
 
     if failed:
@@ -0,0 +1,118 @@
+"""CLI script: convert row-stored backtest runs to compact blob storage.
+
+Runs whose equity curve / trade log live in backtest_equity_curve and
+backtest_trade_log rows are re-encoded into one backtest_run_blob row each
+(research_engine.backtest_codec); the original rows are deleted unless
+--keep-rows is given. Runs that already have a blob are skipped, so the
+script can be re-run safely.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Ensure backend/ is on sys.path when running as script
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import select
+
+from config.logging import setup_logging
+from db.models import BacktestEquityCurve, BacktestRunBlob
+from db.session import SessionLocal
+from research_engine.backtest_store import compact_backtest_run
+
+# Postgres heap tuple + primary-key index entry per equity row (approximate)
+ROW_BYTES_ESTIMATE = 100
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Convert row-stored backtest runs to compact blob storage"
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=50, help="Runs per commit (default: 50)"
+    )
+    parser.add_argument(
+        "--limit", type=int, default=None, help="Convert at most this many runs"
+    )
+    parser.add_argument(
+        "--keep-rows", action="store_true", help="Keep the original equity/trade rows"
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Encode and report sizes without writing"
+    )
+    parser.add_argument(
+        "--log-level",
+        default="INFO",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        help="Log level (default: INFO)",
+    )
+    return parser.parse_args(argv)
+
+
+def pending_run_ids(session, limit: int | None = None) -> list:
+    """Run IDs that have equity rows but no blob yet."""
+    query = (
+        select(BacktestEquityCurve.run_id)
+        .distinct()
+        .where(~BacktestEquityCurve.run_id.in_(select(BacktestRunBlob.run_id)))
+    )
+    if limit is not None:
+        query = query.limit(limit)
+    return list(session.execute(query).scalars())
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    setup_logging(args.log_level)
+
+    if SessionLocal is None:
+        print("ERROR: DATABASE_URL not configured. Set it in .env or environment.", file=sys.stderr)
+        sys.exit(1)
+
+    t0 = time.perf_counter()
+    session = SessionLocal()
+    converted = rows = blob_bytes = 0
+    try:
+        run_ids = pending_run_ids(session, args.limit)
+        print(f"{len(run_ids)} row-stored runs to convert")
+        for i, run_id in enumerate(run_ids, start=1):
+            blob = compact_backtest_run(session, run_id, keep_rows=args.keep_rows)
+            if blob is None:
+                continue
+            converted += 1
+            rows += blob.n_equity + blob.n_trades
+            blob_bytes += len(blob.equity_blob) + len(blob.trades_blob)
+            if i % args.batch_size == 0:
+                if args.dry_run:
+                    session.rollback()
+                else:
+                    session.commit()
+                print(f"  {i}/{len(run_ids)} runs")
+        if args.dry_run:
+            session.rollback()
+        else:
+            session.commit()
+    except Exception as e:
+        session.rollback()
+        print(f"ERROR: conversion failed: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        session.close()
+
+    elapsed = time.perf_counter() - t0
+    est = rows * ROW_BYTES_ESTIMATE
+    ratio = est / blob_bytes if blob_bytes else 0.0
+    print(f"\n{'='*60}")
+    print(
+        f"{'Dry run' if args.dry_run else 'Converted'}: {converted} runs, {rows} rows "
+        f"→ {blob_bytes / 1024:.1f} KiB of blobs (~{est / 1024:.1f} KiB as rows, "
+        f"{ratio:.1f}x) in {elapsed:.1f}s"
+    )
+    print(f"{'='*60}")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
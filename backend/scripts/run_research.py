@@ -12,7 +12,7 @@ from config.logging import setup_logging
 from db.session import SessionLocal
 from research_engine.backtest import BacktestConfig, run_backtest
 from research_engine.backtest_store import store_backtest_result
-from research_engine.factor_store import store_factors_for_asset
+from research_engine.factor_store import store_factors_for_asset, store_factors_incremental
 from research_engine.factors import compute_all_factors
 from research_engine.metrics import compute_metrics, metrics_to_dict
 from research_engine.preprocessing import preprocess
@@ -50,6 +50,11 @@ def parse_args(argv=None):
         action="store_true",
         help="Skip backtest (only compute factors and signals)",
     )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Compute factors only for dates after each asset's saved factor state",
+    )
     parser.add_argument(
         "--missing-threshold",
         type=float,
@@ -99,7 +104,7 @@ def _resolve_strategy_names(strategy_arg: str | None) -> list[str]:
 
 def run_pipeline(
     session, asset_ids, strategy_names, start, end, config,
-    skip_backtest=False, missing_threshold=0.10,
+    skip_backtest=False, missing_threshold=0.10, incremental=False,
 ):
     """Run the full research pipeline and return summary dict."""
     summary = {
@@ -115,9 +120,12 @@ def run_pipeline(
 
         # Step 1: Preprocess + Factors → DB
         print(f"\n--- {asset_id}: Computing factors ---")
-        factor_result = store_factors_for_asset(
-            session, asset_id, start, end, missing_threshold=missing_threshold,
-        )
+        if incremental:
+            factor_result = store_factors_incremental(session, asset_id, end=end)
+        else:
+            factor_result = store_factors_for_asset(
+                session, asset_id, start, end, missing_threshold=missing_threshold,
+            )
         asset_summary["factors"] = factor_result.status
         if factor_result.status != "success":
             summary["errors"].append(f"{asset_id}/factors: {factor_result.errors}")
@@ -234,10 +242,12 @@ def main(argv=None):
         print(f"  Period: {args.start} ~ {args.end}")
         if args.skip_backtest:
             print("  Backtest: SKIPPED")
+        if args.incremental:
+            print("  Factors: incremental")
 
         summary = run_pipeline(
             session, asset_ids, strategy_names, args.start, args.end,
-            config, args.skip_backtest, args.missing_threshold,
+            config, args.skip_backtest, args.missing_threshold, args.incremental,
         )
     finally:
         session.close()
@@ -0,0 +1,172 @@
+"""CLI script for strategy parameter sweeps: factors once per asset → grid fan-out → ranked metrics."""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Ensure backend/ is on sys.path when running as script
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config.logging import setup_logging
+from db.session import SessionLocal
+from research_engine.backtest import BacktestConfig
+from research_engine.strategies import STRATEGY_REGISTRY
+from research_engine.sweep import (
+    DEFAULT_PARAM_GRIDS,
+    METRIC_COLUMNS,
+    prepare_sweep_inputs,
+    run_sweep,
+)
+from scripts.run_research import _resolve_asset_ids, _resolve_strategy_names
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Grid-search strategy parameters across assets (process-pool fan-out)"
+    )
+    parser.add_argument("--start", required=True, help="Start date (YYYY-MM-DD)")
+    parser.add_argument("--end", required=True, help="End date (YYYY-MM-DD)")
+    parser.add_argument(
+        "--assets",
+        default=None,
+        help="Comma-separated asset IDs (e.g. KS200,005930). Default: all active assets",
+    )
+    parser.add_argument(
+        "--strategy",
+        default=None,
+        help=(
+            f"Comma-separated strategy names. "
+            f"Available: {','.join(STRATEGY_REGISTRY.keys())}. Default: all"
+        ),
+    )
+    parser.add_argument(
+        "--grid",
+        default=None,
+        help=(
+            'Parameter grids as JSON or a path to a .json file, e.g. '
+            '\'{"momentum": {"ret_threshold": [0.03, 0.05]}}\'. '
+            "Strategies not listed use the built-in default grid"
+        ),
+    )
+    parser.add_argument(
+        "--initial-cash",
+        type=float,
+        default=10_000_000,
+        help="Initial cash for backtest (default: 10,000,000)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes (default: CPU count, 1 = run inline)",
+    )
+    parser.add_argument(
+        "--rank-by",
+        default="sharpe",
+        choices=METRIC_COLUMNS,
+        metavar="METRIC",
+        help=f"Metric to rank by: {', '.join(METRIC_COLUMNS)} (default: sharpe)",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=20,
+        help="Rows to print (default: 20)",
+    )
+    parser.add_argument("--output", default=None, help="Write the full ranked table to CSV")
+    parser.add_argument(
+        "--missing-threshold",
+        type=float,
+        default=0.10,
+        help="Missing data ratio threshold (default: 0.10 = 10%%)",
+    )
+    parser.add_argument(
+        "--log-level",
+        default="INFO",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        help="Log level (default: INFO)",
+    )
+    return parser.parse_args(argv)
+
+
+def _load_grids(grid_arg: str | None) -> dict:
+    """Parse --grid from inline JSON or a JSON file path."""
+    if not grid_arg:
+        return {}
+    path = Path(grid_arg)
+    text = path.read_text(encoding="utf-8") if path.suffix == ".json" else grid_arg
+    try:
+        grids = json.loads(text)
+    except json.JSONDecodeError as e:
+        print(f"ERROR: Invalid --grid JSON: {e}", file=sys.stderr)
+        sys.exit(1)
+    for name, grid in grids.items():
+        if name not in STRATEGY_REGISTRY or not isinstance(grid, dict):
+            print(f"ERROR: Invalid grid for strategy '{name}'", file=sys.stderr)
+            sys.exit(1)
+    return grids
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    setup_logging(args.log_level)
+
+    if SessionLocal is None:
+        print("ERROR: DATABASE_URL not configured. Set it in .env or environment.", file=sys.stderr)
+        sys.exit(1)
+
+    grids = _load_grids(args.grid)
+    strategy_names = _resolve_strategy_names(args.strategy)
+    t0 = time.perf_counter()
+
+    # Factors are computed once per asset; the DB session is closed before fan-out
+    session = SessionLocal()
+    try:
+        asset_ids = _resolve_asset_ids(session, args.assets)
+        inputs = prepare_sweep_inputs(
+            session, asset_ids, args.start, args.end, args.missing_threshold,
+        )
+    finally:
+        session.close()
+
+    if not inputs:
+        print("ERROR: No asset had usable price data", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"Sweep: {len(inputs)} assets × {len(strategy_names)} strategies")
+    for name in strategy_names:
+        grid = grids.get(name, DEFAULT_PARAM_GRIDS.get(name, {}))
+        print(f"  {name}: {json.dumps(grid)}")
+
+    table = run_sweep(
+        inputs,
+        param_grids=grids,
+        strategy_names=strategy_names,
+        config=BacktestConfig(initial_cash=args.initial_cash),
+        max_workers=args.workers,
+        rank_by=args.rank_by,
+    )
+    elapsed = time.perf_counter() - t0
+
+    table["params"] = table["params"].map(json.dumps)
+    if args.output:
+        table.to_csv(args.output, index=False)
+        print(f"Wrote {len(table)} rows to {args.output}")
+
+    cols = ["rank", "asset_id", "strategy_id", "params", args.rank_by, "cagr", "mdd", "num_trades"]
+    cols = list(dict.fromkeys(c for c in cols if c in table.columns))
+    print(f"\n{'='*60}")
+    print(f"Sweep complete: {len(table)} combos ({elapsed:.1f}s)")
+    print(table[cols].head(args.top).to_string(index=False))
+    print(f"{'='*60}")
+
+    failed = int((table["status"] != "success").sum())
+    if failed:
+        print(f"  {failed} combos did not produce metrics")
+    sys.exit(0 if failed < len(table) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""CLI script for walk-forward evaluation: factors once per asset → rolling train/test windows."""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+# Ensure backend/ is on sys.path when running as script
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config.logging import setup_logging
+from db.session import SessionLocal
+from research_engine.backtest import BacktestConfig
+from research_engine.strategies import STRATEGY_REGISTRY
+from research_engine.sweep import prepare_sweep_inputs
+from research_engine.walk_forward import (
+    DEFAULT_TEST_BARS,
+    DEFAULT_TRAIN_BARS,
+    SCORE_METRICS,
+    run_walk_forward,
+    summarize_walk_forward,
+)
+from scripts.run_research import _resolve_asset_ids, _resolve_strategy_names
+from scripts.run_sweep import _load_grids
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Walk-forward (rolling out-of-sample) strategy evaluation"
+    )
+    parser.add_argument("--start", required=True, help="Start date (YYYY-MM-DD)")
+    parser.add_argument("--end", required=True, help="End date (YYYY-MM-DD)")
+    parser.add_argument(
+        "--assets",
+        default=None,
+        help="Comma-separated asset IDs (e.g. KS200,005930). Default: all active assets",
+    )
+    parser.add_argument(
+        "--strategy",
+        default=None,
+        help=(
+            f"Comma-separated strategy names. "
+            f"Available: {','.join(STRATEGY_REGISTRY.keys())}. Default: all"
+        ),
+    )
+    parser.add_argument(
+        "--grid",
+        default=None,
+        help="Parameter grids as JSON or a path to a .json file (see run_sweep.py)",
+    )
+    parser.add_argument(
+        "--train-bars",
+        type=int,
+        default=DEFAULT_TRAIN_BARS,
+        help=f"Train window length in trading days (default: {DEFAULT_TRAIN_BARS})",
+    )
+    parser.add_argument(
+        "--test-bars",
+        type=int,
+        default=DEFAULT_TEST_BARS,
+        help=f"Test window length in trading days (default: {DEFAULT_TEST_BARS})",
+    )
+    parser.add_argument(
+        "--expanding",
+        action="store_true",
+        help="Train on all history before each test window instead of a rolling window",
+    )
+    parser.add_argument(
+        "--rank-by",
+        default="sharpe",
+        choices=list(SCORE_METRICS),
+        help="In-sample selection metric (default: sharpe)",
+    )
+    parser.add_argument(
+        "--initial-cash",
+        type=float,
+        default=10_000_000,
+        help="Initial cash for backtest (default: 10,000,000)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes (default: CPU count, 1 = run inline)",
+    )
+    parser.add_argument(
+        "--output", default=None, help="Write the per-window table (all pairs) to CSV",
+    )
+    parser.add_argument(
+        "--missing-threshold",
+        type=float,
+        default=0.10,
+        help="Missing data ratio threshold (default: 0.10 = 10%%)",
+    )
+    parser.add_argument(
+        "--log-level",
+        default="INFO",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        help="Log level (default: INFO)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    setup_logging(args.log_level)
+
+    if SessionLocal is None:
+        print("ERROR: DATABASE_URL not configured. Set it in .env or environment.", file=sys.stderr)
+        sys.exit(1)
+
+    grids = _load_grids(args.grid)
+    strategy_names = _resolve_strategy_names(args.strategy)
+    t0 = time.perf_counter()
+
+    # Factors are computed once per asset; the DB session is closed before fan-out
+    session = SessionLocal()
+    try:
+        asset_ids = _resolve_asset_ids(session, args.assets)
+        inputs = prepare_sweep_inputs(
+            session, asset_ids, args.start, args.end, args.missing_threshold,
+        )
+    finally:
+        session.close()
+
+    if not inputs:
+        print("ERROR: No asset had usable price data", file=sys.stderr)
+        sys.exit(1)
+
+    mode = "expanding" if args.expanding else "rolling"
+    print(
+        f"Walk-forward ({mode}, train={args.train_bars}, test={args.test_bars}): "
+        f"{len(inputs)} assets × {len(strategy_names)} strategies"
+    )
+
+    results = run_walk_forward(
+        inputs,
+        param_grids=grids,
+        strategy_names=strategy_names,
+        train_bars=args.train_bars,
+        test_bars=args.test_bars,
+        expanding=args.expanding,
+        config=BacktestConfig(initial_cash=args.initial_cash),
+        max_workers=args.workers,
+        rank_by=args.rank_by,
+    )
+    elapsed = time.perf_counter() - t0
+
+    if not results:
+        print("ERROR: No asset had enough history for a single window", file=sys.stderr)
+        sys.exit(1)
+
+    if args.output:
+        frames = []
+        for r in results:
+            windows = r.windows.copy()
+            windows.insert(0, "strategy_id", r.strategy_id)
+            windows.insert(0, "asset_id", r.asset_id)
+            windows["params"] = windows["params"].map(json.dumps)
+            frames.append(windows)
+        table = pd.concat(frames, ignore_index=True)
+        table.to_csv(args.output, index=False)
+        print(f"Wrote {len(table)} windows to {args.output}")
+
+    summary = summarize_walk_forward(results)
+    cols = ["asset_id", "strategy_id", "windows", "cagr", "sharpe", "mdd", "num_trades",
+            "bh_cagr", "excess_return"]
+    print(f"\n{'='*60}")
+    print(f"Walk-forward complete: {len(results)} pairs ({elapsed:.1f}s) — out-of-sample")
+    print(summary[cols].to_string(index=False))
+    print(f"{'='*60}")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-"""Shared test fixtures for collector tests."""
+"""Shared test fixtures (collector OHLCV frames, price-cache adapters)."""
 
 from datetime import datetime, timezone
 
@@ -65,3 +65,21 @@ def mock_fdr_dataframe():
         "Volume": [50000, 60000],
     }, index=pd.DatetimeIndex(["2026-01-02", "2026-01-03"], name="Date"))
     return df
+
+
+@pytest.fixture
+def closes_from_rows():
+    """Adapt a price_repo-style row provider to TimeSeriesCache.close_series.
+
+    Usage: ``mock_cache.return_value.close_series.side_effect = closes_from_rows(get_prices)``
+    """
+    def _adapt(get_prices):
+        def _close_series(db, aid, start_date=None, end_date=None, **kw):
+            rows = get_prices(db, aid, start_date=start_date, end_date=end_date)
+            if not rows:
+                return pd.Series(dtype=float, index=pd.DatetimeIndex([]), name=aid)
+            return pd.Series(
+                {pd.Timestamp(r.date): float(r.close) for r in rows}, name=aid
+            ).sort_index()
+        return _close_series
+    return _adapt
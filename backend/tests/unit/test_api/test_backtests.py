@@ -0,0 +1,343 @@
+"""Tests for the backtest bootstrap, cache and async job endpoints.
+
+The backtests router is not mounted on api.main.app, so it is served from a
+bare FastAPI app here.
+"""
+
+from datetime import date
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from api.routers import backtests
+
+
+@pytest.fixture
+def mock_db():
+    return MagicMock(spec=Session)
+
+
+@pytest.fixture
+def client(mock_db):
+    from api.dependencies import get_db
+
+    def _override():
+        yield mock_db
+
+    app = FastAPI()
+    app.include_router(backtests.router)
+    app.dependency_overrides[get_db] = _override
+    return TestClient(app, raise_server_exceptions=False)
+
+
+def _equity_rows(n: int = 300):
+    equity = 1_000_000 * np.cumprod(1 + np.random.default_rng(0).normal(0.0005, 0.01, n))
+    rows = []
+    for value in equity:
+        m = MagicMock()
+        m.date = date(2024, 1, 1)
+        m.equity = float(value)
+        m.drawdown = 0.0
+        rows.append(m)
+    return rows
+
+
+@pytest.fixture
+def repo():
+    """backtest_repo as seen by both the router and the service."""
+    mock_repo = MagicMock()
+    mock_repo.get_run_blob.return_value = None
+    with (
+        patch("api.routers.backtests.backtest_repo", mock_repo),
+        patch("api.services.backtest_service.backtest_repo", mock_repo),
+    ):
+        yield mock_repo
+
+
+class TestBootstrapEndpoint:
+    def test_bands(self, repo, client):
+        run_id = uuid4()
+        repo.get_run_by_id.return_value = MagicMock()
+        repo.get_equity_curve.return_value = _equity_rows()
+
+        resp = client.get(
+            f"/v1/backtests/{run_id}/bootstrap",
+            params={"paths": 500, "method": "block", "block_size": 10, "seed": 1},
+        )
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["run_id"] == str(run_id)
+        assert data["n_paths"] == 500
+        assert data["n_days"] == 299
+        assert set(data["metrics"]) == {"cagr", "mdd", "sharpe", "sortino"}
+        band = data["metrics"]["sharpe"]["percentiles"]
+        assert band["p5"] <= band["p50"] <= band["p95"]
+
+    def test_not_found(self, repo, client):
+        repo.get_run_by_id.return_value = None
+        resp = client.get(f"/v1/backtests/{uuid4()}/bootstrap")
+        assert resp.status_code == 404
+
+    def test_short_curve_is_400(self, repo, client):
+        repo.get_run_by_id.return_value = MagicMock()
+        repo.get_equity_curve.return_value = _equity_rows(2)
+        resp = client.get(f"/v1/backtests/{uuid4()}/bootstrap")
+        assert resp.status_code == 400
+
+    def test_invalid_method_is_422(self, client):
+        resp = client.get(f"/v1/backtests/{uuid4()}/bootstrap", params={"method": "iid"})
+        assert resp.status_code == 422
+
+
+class TestCompactStorageEndpoints:
+    def _blob(self, n: int = 5000):
+        import pandas as pd
+
+        from research_engine.backtest import TradeRecord
+        from research_engine.backtest_codec import encode_equity_curve, encode_trades
+
+        equity = 1e6 * np.cumprod(1 + np.random.default_rng(1).normal(0, 0.01, n))
+        df = pd.DataFrame({
+            "date": pd.bdate_range("2010-01-01", periods=n),
+            "equity": equity,
+            "drawdown": equity / np.maximum.accumulate(equity) - 1.0,
+        })
+        trade = TradeRecord("KS200", date(2024, 1, 2), 300.0, None, None, "long", 2.0, None, 0.6)
+        blob = MagicMock()
+        blob.equity_blob = encode_equity_curve(df)
+        blob.trades_blob = encode_trades([trade])
+        return blob, df
+
+    def test_equity_streams_from_blob(self, repo, client):
+        run_id = uuid4()
+        blob, df = self._blob()
+        repo.get_run_by_id.return_value = MagicMock()
+        repo.get_run_blob.return_value = blob
+
+        resp = client.get(f"/v1/backtests/{run_id}/equity")
+        assert resp.status_code == 200
+        data = resp.json()
+        assert len(data) == len(df)
+        assert data[0] == {
+            "run_id": str(run_id), "date": "2010-01-01",
+            "equity": df["equity"].iloc[0], "drawdown": df["drawdown"].iloc[0],
+        }
+        assert data[-1]["equity"] == df["equity"].iloc[-1]
+        repo.get_equity_curve.assert_not_called()
+
+    def test_equity_non_finite_values_are_null(self, repo, client):
+        """NaN/Infinity are not valid JSON — streamed as null like the Pydantic path."""
+        rows = _equity_rows(3)
+        rows[1].equity = float("nan")
+        rows[2].drawdown = float("-inf")
+        repo.get_run_by_id.return_value = MagicMock()
+        repo.get_equity_curve.return_value = rows
+
+        resp = client.get(f"/v1/backtests/{uuid4()}/equity")
+        assert resp.status_code == 200
+        assert "NaN" not in resp.text and "Infinity" not in resp.text
+        data = resp.json()
+        assert data[1]["equity"] is None and data[2]["drawdown"] is None
+        assert data[0]["equity"] == rows[0].equity
+
+    def test_equity_falls_back_to_rows(self, repo, client):
+        repo.get_run_by_id.return_value = MagicMock()
+        repo.get_equity_curve.return_value = _equity_rows(3)
+        resp = client.get(f"/v1/backtests/{uuid4()}/equity")
+        assert resp.status_code == 200
+        assert [r["date"] for r in resp.json()] == ["2024-01-01"] * 3
+
+    def test_trades_from_blob(self, repo, client):
+        repo.get_run_by_id.return_value = MagicMock()
+        repo.get_run_blob.return_value = self._blob(10)[0]
+        resp = client.get(f"/v1/backtests/{uuid4()}/trades")
+        assert resp.status_code == 200
+        trade = resp.json()[0]
+        assert trade["id"] == 1 and trade["exit_date"] is None and trade["pnl"] is None
+
+
+# --- On-demand result cache ---
+
+
+@pytest.fixture
+def sqlite_db():
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from db.models import Base
+
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def _tiny_result(*args, **kwargs):
+    import pandas as pd
+
+    from research_engine.backtest import BacktestConfig, BacktestResult
+
+    dates = pd.bdate_range("2024-01-01", periods=3)
+    return BacktestResult(
+        strategy_id="momentum",
+        asset_id="KS200",
+        config=BacktestConfig(),
+        equity_curve=pd.DataFrame({
+            "date": dates, "equity": [100.0, 101.0, 102.0], "drawdown": [0.0] * 3,
+        }),
+    )
+
+
+class TestRequestCache:
+    def _request(self, **overrides):
+        from api.schemas.backtest import BacktestRunRequest
+
+        return BacktestRunRequest(
+            strategy_id="momentum", asset_id="KS200", start_date=date(2024, 1, 1), **overrides
+        )
+
+    @patch("api.services.backtest_service._run_single", side_effect=_tiny_result)
+    def test_identical_request_reuses_run(self, mock_run, sqlite_db):
+        from api.services.backtest_service import run_backtest_on_demand
+
+        first = run_backtest_on_demand(self._request(), sqlite_db)
+        second = run_backtest_on_demand(self._request(), sqlite_db)
+        assert second.run_id == first.run_id
+        assert mock_run.call_count == 1
+
+        third = run_backtest_on_demand(self._request(commission_pct=0.002), sqlite_db)
+        assert third.run_id != first.run_id
+        assert mock_run.call_count == 2
+
+    @patch("api.services.backtest_service._run_single", side_effect=_tiny_result)
+    def test_new_data_version_misses(self, mock_run, sqlite_db):
+        from api.services.backtest_service import run_backtest_on_demand
+
+        with patch("api.services.backtest_service._data_version", return_value="a|v1"):
+            first = run_backtest_on_demand(self._request(), sqlite_db)
+        with patch("api.services.backtest_service._data_version", return_value="b|v1"):
+            second = run_backtest_on_demand(self._request(), sqlite_db)
+        assert second.run_id != first.run_id
+
+    @patch("api.services.backtest_service._run_single", side_effect=_tiny_result)
+    def test_disabled(self, mock_run, sqlite_db):
+        from api.services.backtest_service import run_backtest_on_demand
+
+        with patch("api.services.backtest_service.settings") as mock_settings:
+            mock_settings.backtest_cache_ttl_hours = 0
+            run_backtest_on_demand(self._request(), sqlite_db)
+            run_backtest_on_demand(self._request(), sqlite_db)
+        assert mock_run.call_count == 2
+
+    def test_duplicate_in_flight_waits(self, sqlite_db):
+        import threading
+
+        from api.services import backtest_service
+
+        cached = MagicMock()
+        cached.run_id = uuid4()
+        with (
+            patch.object(backtest_service, "_execute", return_value="computed") as mock_exec,
+            patch.object(backtest_service, "_data_version", return_value="x|v1"),
+            patch.object(backtest_service.backtest_repo, "get_cached_run") as mock_cached,
+            patch.object(
+                backtest_service.BacktestRunResponse, "model_validate", return_value="reused"
+            ),
+        ):
+            mock_cached.side_effect = [None, cached]
+            req = self._request()
+            strategy = backtest_service.get_strategy("momentum")
+            key = backtest_service.backtest_request_key(
+                strategy, ["KS200"], "2024-01-01", None,
+                backtest_service.BacktestConfig(commission_pct=req.commission_pct), "x|v1",
+            )
+            pending = threading.Event()
+            backtest_service._inflight[key] = pending
+            threading.Timer(0.05, pending.set).start()
+            try:
+                assert backtest_service.run_backtest_on_demand(req, sqlite_db) == "reused"
+            finally:
+                backtest_service._inflight.pop(key, None)
+            mock_exec.assert_not_called()
+
+
+# --- Async jobs ---
+
+
+def _job(**overrides):
+    from datetime import datetime, timezone
+
+    job = MagicMock()
+    job.job_id = uuid4()
+    job.status = "queued"
+    job.stage = "queued"
+    job.progress_current = 0
+    job.progress_total = 0
+    job.message = None
+    job.run_id = None
+    job.error_message = None
+    job.created_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    job.started_at = None
+    job.ended_at = None
+    for key, value in overrides.items():
+        setattr(job, key, value)
+    return job
+
+
+class TestJobEndpoints:
+    _body = {"strategy_id": "momentum", "asset_id": "KS200"}
+
+    @patch("api.routers.backtests.submit_job")
+    def test_submit_accepted(self, mock_submit, client):
+        job = _job()
+        mock_submit.return_value = job
+        resp = client.post("/v1/backtests/jobs", json=self._body)
+        assert resp.status_code == 202
+        assert resp.json()["job_id"] == str(job.job_id)
+        assert resp.json()["status"] == "queued"
+
+    @patch("api.routers.backtests.submit_job", side_effect=ValueError("Unknown strategy"))
+    def test_submit_invalid_is_400(self, mock_submit, client):
+        assert client.post("/v1/backtests/jobs", json=self._body).status_code == 400
+
+    def test_submit_queue_full_is_429(self, client):
+        from api.services.backtest_job_service import JobQueueFull
+
+        with patch("api.routers.backtests.submit_job", side_effect=JobQueueFull("busy")):
+            assert client.post("/v1/backtests/jobs", json=self._body).status_code == 429
+
+    @patch("api.routers.backtests.backtest_repo")
+    def test_get_job(self, mock_repo, client):
+        run_id = uuid4()
+        job = _job(status="success", stage="done", run_id=run_id)
+        mock_repo.get_job_by_id.return_value = job
+        resp = client.get(f"/v1/backtests/jobs/{job.job_id}")
+        assert resp.status_code == 200
+        assert resp.json()["run_id"] == str(run_id)
+
+    @patch("api.routers.backtests.backtest_repo")
+    def test_get_job_not_found(self, mock_repo, client):
+        mock_repo.get_job_by_id.return_value = None
+        assert client.get(f"/v1/backtests/jobs/{uuid4()}").status_code == 404
+        assert client.get(f"/v1/backtests/jobs/{uuid4()}/events").status_code == 404
+
+    @patch("api.routers.backtests.backtest_repo")
+    def test_events_stream(self, mock_repo, client):
+        mock_repo.get_job_by_id.return_value = _job()
+
+        async def fake_stream(job_id):
+            yield 'data: {"type": "done", "status": "success"}\n\n'
+
+        with patch("api.routers.backtests.stream_job_events", side_effect=fake_stream):
+            resp = client.get(f"/v1/backtests/jobs/{uuid4()}/events")
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/event-stream")
+        assert '"done"' in resp.text
@@ -49,9 +49,9 @@ def _make_prices(asset_id: str, base: float, n: int = 10):
 class TestCorrelation:
     """GET /v1/correlation tests."""
 
-    @patch("api.services.correlation_service.price_repo")
+    @patch("api.services.correlation_service.get_ts_cache")
     @patch("api.services.correlation_service.asset_repo")
-    def test_correlation_basic(self, mock_asset, mock_price, client):
+    def test_correlation_basic(self, mock_asset, mock_cache, client, closes_from_rows):
         """Returns NxN matrix for 2 assets."""
         mock_asset.get_all.return_value = [
             _make_asset("KS200"),
@@ -63,7 +63,7 @@ class TestCorrelation:
                 return _make_prices("KS200", 300.0, 10)
             return _make_prices("005930", 70000.0, 10)
 
-        mock_price.get_prices.side_effect = _price_side_effect
+        mock_cache.return_value.close_series.side_effect = closes_from_rows(_price_side_effect)
 
         resp = client.get("/v1/correlation")
         assert resp.status_code == 200
@@ -75,14 +75,14 @@ class TestCorrelation:
         assert data["matrix"][0][0] == pytest.approx(1.0, abs=0.01)
         assert data["matrix"][1][1] == pytest.approx(1.0, abs=0.01)
 
-    @patch("api.services.correlation_service.price_repo")
+    @patch("api.services.correlation_service.get_ts_cache")
     @patch("api.services.correlation_service.asset_repo")
-    def test_correlation_specific_assets(self, mock_asset, mock_price, client):
+    def test_correlation_specific_assets(self, mock_asset, mock_cache, client, closes_from_rows):
         """asset_ids query param filters assets."""
         def _price_side_effect(db, aid, **kwargs):
             return _make_prices(aid, 100.0, 10)
 
-        mock_price.get_prices.side_effect = _price_side_effect
+        mock_cache.return_value.close_series.side_effect = closes_from_rows(_price_side_effect)
 
         resp = client.get("/v1/correlation?asset_ids=KS200,BTC")
         assert resp.status_code == 200
@@ -91,9 +91,9 @@ class TestCorrelation:
         # asset_repo.get_all should NOT be called when asset_ids specified
         mock_asset.get_all.assert_not_called()
 
-    @patch("api.services.correlation_service.price_repo")
+    @patch("api.services.correlation_service.get_ts_cache")
     @patch("api.services.correlation_service.asset_repo")
-    def test_correlation_insufficient_assets(self, mock_asset, mock_price, client):
+    def test_correlation_insufficient_assets(self, mock_asset, mock_cache, client):
         """Single asset → 400."""
         mock_asset.get_all.return_value = [_make_asset("KS200")]
 
@@ -101,22 +101,22 @@ class TestCorrelation:
         assert resp.status_code == 400
         assert "2 assets" in resp.json()["detail"]
 
-    @patch("api.services.correlation_service.price_repo")
+    @patch("api.services.correlation_service.get_ts_cache")
     @patch("api.services.correlation_service.asset_repo")
-    def test_correlation_no_price_data(self, mock_asset, mock_price, client):
+    def test_correlation_no_price_data(self, mock_asset, mock_cache, client, closes_from_rows):
         """No price data → 400."""
         mock_asset.get_all.return_value = [
             _make_asset("KS200"),
             _make_asset("005930"),
         ]
-        mock_price.get_prices.return_value = []
+        mock_cache.return_value.close_series.side_effect = closes_from_rows(lambda *a, **kw: [])
 
         resp = client.get("/v1/correlation")
         assert resp.status_code == 400
 
-    @patch("api.services.correlation_service.price_repo")
+    @patch("api.services.correlation_service.get_ts_cache")
     @patch("api.services.correlation_service.asset_repo")
-    def test_correlation_window_param(self, mock_asset, mock_price, client):
+    def test_correlation_window_param(self, mock_asset, mock_cache, client, closes_from_rows):
         """Custom window parameter."""
         mock_asset.get_all.return_value = [
             _make_asset("KS200"),
@@ -126,16 +126,16 @@ class TestCorrelation:
         def _price_side_effect(db, aid, **kwargs):
             return _make_prices(aid, 100.0, 20)
 
-        mock_price.get_prices.side_effect = _price_side_effect
+        mock_cache.return_value.close_series.side_effect = closes_from_rows(_price_side_effect)
 
         resp = client.get("/v1/correlation?window=10")
         assert resp.status_code == 200
         data = resp.json()
         assert data["period"]["window"] <= 10
 
-    @patch("api.services.correlation_service.price_repo")
+    @patch("api.services.correlation_service.get_ts_cache")
     @patch("api.services.correlation_service.asset_repo")
-    def test_correlation_date_filter(self, mock_asset, mock_price, client):
+    def test_correlation_date_filter(self, mock_asset, mock_cache, client, closes_from_rows):
         """Date params are passed through."""
         mock_asset.get_all.return_value = [
             _make_asset("KS200"),
@@ -145,7 +145,7 @@ class TestCorrelation:
         def _price_side_effect(db, aid, **kwargs):
             return _make_prices(aid, 100.0, 10)
 
-        mock_price.get_prices.side_effect = _price_side_effect
+        mock_cache.return_value.close_series.side_effect = closes_from_rows(_price_side_effect)
 
         resp = client.get("/v1/correlation?start_date=2026-01-01&end_date=2026-02-01")
         assert resp.status_code == 200
@@ -155,9 +155,9 @@ class TestCorrelation:
         resp = client.get("/v1/correlation?window=2")
         assert resp.status_code == 422
 
-    @patch("api.services.correlation_service.price_repo")
+    @patch("api.services.correlation_service.get_ts_cache")
     @patch("api.services.correlation_service.asset_repo")
-    def test_correlation_response_schema(self, mock_asset, mock_price, client):
+    def test_correlation_response_schema(self, mock_asset, mock_cache, client, closes_from_rows):
         """Response matches CorrelationResponse schema."""
         mock_asset.get_all.return_value = [
             _make_asset("KS200"),
@@ -167,7 +167,7 @@ class TestCorrelation:
         def _price_side_effect(db, aid, **kwargs):
             return _make_prices(aid, 100.0, 10)
 
-        mock_price.get_prices.side_effect = _price_side_effect
+        mock_cache.return_value.close_series.side_effect = closes_from_rows(_price_side_effect)
 
         resp = client.get("/v1/correlation")
         data = resp.json()
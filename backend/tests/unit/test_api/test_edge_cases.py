@@ -161,9 +161,9 @@ class TestDateValidation:
         assert "start_date" in resp.json()["detail"]
 
     @patch("api.services.correlation_service.asset_repo")
-    @patch("api.services.correlation_service.price_repo")
+    @patch("api.services.correlation_service.get_ts_cache")
     def test_correlation_date_range_pass_through(
-        self, mock_price, mock_asset, client
+        self, mock_cache, mock_asset, client, closes_from_rows
     ):
         """Correlation does not validate date order — passes to service."""
         # When start_date > end_date, no price data → 400 from service
@@ -171,7 +171,7 @@ class TestDateValidation:
             MagicMock(asset_id="KS200", is_active=True),
             MagicMock(asset_id="BTC", is_active=True),
         ]
-        mock_price.get_prices.return_value = []
+        mock_cache.return_value.close_series.side_effect = closes_from_rows(lambda *a, **kw: [])
         resp = client.get("/v1/correlation?start_date=2026-12-01&end_date=2026-01-01")
         # Either 400 (no data) or 200 (empty). Just make sure no crash.
         assert resp.status_code in (200, 400)
@@ -193,9 +193,9 @@ class TestCorrelationEdge:
         resp = client.get("/v1/correlation?window=501")
         assert resp.status_code == 422
 
-    @patch("api.services.correlation_service.price_repo")
+    @patch("api.services.correlation_service.get_ts_cache")
     @patch("api.services.correlation_service.asset_repo")
-    def test_window_at_min(self, mock_asset, mock_price, client):
+    def test_window_at_min(self, mock_asset, mock_cache, client, closes_from_rows):
         """window=5 → 200 (boundary ok)."""
         mock_asset.get_all.return_value = [
             MagicMock(asset_id="KS200", is_active=True),
@@ -214,19 +214,19 @@ class TestCorrelationEdge:
                 prices.append(m)
             return prices
 
-        mock_price.get_prices.side_effect = _prices
+        mock_cache.return_value.close_series.side_effect = closes_from_rows(_prices)
         resp = client.get("/v1/correlation?window=5")
         assert resp.status_code == 200
 
-    @patch("api.services.correlation_service.price_repo")
+    @patch("api.services.correlation_service.get_ts_cache")
     @patch("api.services.correlation_service.asset_repo")
-    def test_window_at_max(self, mock_asset, mock_price, client):
+    def test_window_at_max(self, mock_asset, mock_cache, client, closes_from_rows):
         """window=500 → accepted (200 or 400 if insufficient data)."""
         mock_asset.get_all.return_value = [
             MagicMock(asset_id="KS200", is_active=True),
             MagicMock(asset_id="BTC", is_active=True),
         ]
-        mock_price.get_prices.return_value = []
+        mock_cache.return_value.close_series.side_effect = closes_from_rows(lambda *a, **kw: [])
         resp = client.get("/v1/correlation?window=500")
         # May be 400 (insufficient data) but not 422 (validation error)
         assert resp.status_code != 422
@@ -71,6 +71,13 @@ class TestHealthEndpoint:
         assert data["status"] == "ok"
         assert data["db"] == "not_configured"
 
+    def test_health_cache_stats(self, client):
+        """GET /v1/health/cache exposes the time-series cache counters."""
+        response = client.get("/v1/health/cache")
+        assert response.status_code == 200
+        data = response.json()
+        assert {"entries", "bytes", "hits", "misses", "evictions"} <= set(data)
+
     def test_ready_ok(self, client, mock_db, monkeypatch):
         """GET /v1/ready returns 200 with connected status."""
         mock_session_local = MagicMock(return_value=mock_db)
@@ -1,8 +1,13 @@
 """Tests for factor_repo."""
 
 import datetime
+import math
+
+import pytest
 
 from api.repositories import factor_repo
+from db.models import FactorDaily, FactorDailyWide
+from research_engine.factors import ALL_FACTOR_NAMES
 
 
 class TestGetFactors:
@@ -33,3 +38,70 @@ class TestGetFactors:
     def test_pagination(self, db, seed_factors):
         result = factor_repo.get_factors(db, limit=2, offset=0)
         assert len(result) == 2
+
+
+@pytest.fixture()
+def seed_wide(db, seed_assets):
+    """KS200 in factor_daily_wide (3 dates), 005930 only in factor_daily (2 dates)."""
+    base = datetime.date(2026, 1, 5)
+    for i in range(3):
+        db.add(FactorDailyWide(
+            asset_id="KS200", date=base + datetime.timedelta(days=i), version="v1",
+            rsi_14=40.0 + i, macd=0.1 * i, sma_120=None,
+        ))
+    for i in range(2):
+        for name, value in (("rsi_14", 60.0 + i), ("macd", -0.5)):
+            db.add(FactorDaily(
+                asset_id="005930", date=base + datetime.timedelta(days=i),
+                factor_name=name, version="v1", value=value,
+            ))
+    db.commit()
+
+
+class TestFactorDailyWideModel:
+    def test_columns_match_factor_names(self):
+        cols = [c.name for c in FactorDailyWide.__table__.columns]
+        assert cols == ["asset_id", "date", "version", *ALL_FACTOR_NAMES]
+
+
+class TestGetFactorFrame:
+    def test_wide_rows(self, db, seed_wide):
+        df = factor_repo.get_factor_frame(db, "KS200", ["rsi_14", "macd", "sma_120"])
+        assert list(df.columns) == ["rsi_14", "macd", "sma_120"]
+        assert df.index.name == "date"
+        assert df["rsi_14"].tolist() == [40.0, 41.0, 42.0]
+        assert df["sma_120"].isna().all()
+
+    def test_all_factors_by_default(self, db, seed_wide):
+        df = factor_repo.get_factor_frame(db, "KS200")
+        assert list(df.columns) == ALL_FACTOR_NAMES
+
+    def test_date_filter(self, db, seed_wide):
+        df = factor_repo.get_factor_frame(
+            db, "KS200", ["rsi_14"], start_date=datetime.date(2026, 1, 6),
+        )
+        assert df["rsi_14"].tolist() == [41.0, 42.0]
+
+    def test_falls_back_to_long_table(self, db, seed_wide):
+        df = factor_repo.get_factor_frame(db, "005930", ["rsi_14", "macd", "atr_14"])
+        assert df["rsi_14"].tolist() == [60.0, 61.0]
+        assert df["macd"].tolist() == [-0.5, -0.5]
+        assert all(math.isnan(v) for v in df["atr_14"])
+
+    def test_no_data(self, db, seed_wide):
+        df = factor_repo.get_factor_frame(db, "NONEXIST", ["rsi_14"])
+        assert df.empty
+        assert list(df.columns) == ["rsi_14"]
+
+    def test_unknown_factor(self, db, seed_wide):
+        with pytest.raises(ValueError):
+            factor_repo.get_factor_frame(db, "KS200", ["momentum_20d"])
+
+
+class TestGetFactorPanel:
+    def test_mixed_sources(self, db, seed_wide):
+        df = factor_repo.get_factor_panel(db, ["KS200", "005930"], ["rsi_14"])
+        assert df.index.names == ["asset_id", "date"]
+        assert len(df) == 5
+        assert df.loc["005930", "rsi_14"].tolist() == [60.0, 61.0]
+        assert df.loc["KS200", "rsi_14"].tolist() == [40.0, 41.0, 42.0]
@@ -4,11 +4,14 @@ from __future__ import annotations
 
 import numpy as np
 import pandas as pd
+import pytest
 
 from research_engine.backtest import (
     BacktestConfig,
     TradeRecord,
+    align_backtest_inputs,
     run_backtest,
+    run_backtest_batch,
     run_backtest_multi,
 )
 
@@ -270,6 +273,109 @@ class TestMulti:
         # Final equity should exceed initial (both assets are rising)
         assert result.equity_curve["equity"].iloc[-1] > cfg.initial_cash
 
+    def test_single_asset_matches_run_backtest(self):
+        """One asset with equal sizing is bit-identical to the single-asset engine."""
+        rng = np.random.default_rng(3)
+        prices = _make_prices(n=120, daily_return=0.0)
+        prices["close"] = 100 * np.cumprod(1 + rng.normal(0, 0.02, 120))
+        prices["open"] = np.r_[100.0, prices["close"].to_numpy()[:-1]]
+        signals = _make_signals(prices.index, (rng.random(120) > 0.5).astype(int))
+
+        single = run_backtest(prices, signals, "A", "s")
+        multi = run_backtest_multi({"A": prices}, {"A": signals}, "s")
+
+        np.testing.assert_array_equal(
+            multi.equity_curve["equity"].to_numpy(), single.equity_curve["equity"].to_numpy()
+        )
+        np.testing.assert_array_equal(
+            multi.buy_hold_equity["equity"].to_numpy(),
+            single.buy_hold_equity["equity"].to_numpy(),
+        )
+        assert [(t.entry_date, t.exit_date, t.shares, t.pnl) for t in multi.trades] == [
+            (t.entry_date, t.exit_date, t.shares, t.pnl) for t in single.trades
+        ]
+
+    def test_shared_cash_funds_later_entries(self):
+        """Cash freed by one asset's exit is reinvested by another asset's entry."""
+        dates = pd.bdate_range("2024-01-01", periods=6)
+        flat = pd.DataFrame({"open": 100.0, "close": 100.0}, index=dates)
+        signals_a = _make_signals(dates, [1, 0, 0, 0, 0, 0])  # in on day1, out on day2
+        signals_b = _make_signals(dates, [0, 0, 1, 1, 1, 1])  # in on day3
+
+        cfg = BacktestConfig(initial_cash=1_000, commission_pct=0.0, sizing="active")
+        result = run_backtest_multi(
+            {"A": flat, "B": flat}, {"A": signals_a, "B": signals_b}, "s", config=cfg
+        )
+
+        by_asset = {t.asset_id: t for t in result.trades}
+        assert by_asset["A"].shares == pytest.approx(10.0)
+        assert by_asset["B"].shares == pytest.approx(10.0)  # the whole pool, not half
+        np.testing.assert_allclose(result.equity_curve["equity"], 1_000.0)
+
+    def test_buys_scaled_to_available_cash(self):
+        """Simultaneous entries asking for more than the cash are scaled pro rata."""
+        dates = pd.bdate_range("2024-01-01", periods=4)
+        flat = pd.DataFrame({"open": 10.0, "close": 10.0}, index=dates)
+        signals = _make_constant_signals(dates, 1)
+
+        cfg = BacktestConfig(
+            initial_cash=1_000, commission_pct=0.0, sizing={"A": 0.6, "B": 0.4},
+        )
+        result = run_backtest_multi(
+            {"A": flat, "B": flat}, {"A": signals, "B": signals}, "s", config=cfg
+        )
+        shares = {t.asset_id: t.shares for t in result.trades}
+        assert shares == pytest.approx({"A": 60.0, "B": 40.0})
+
+    def test_monthly_rebalance_restores_weights(self):
+        """Drifted positions are traded back to target on the first bar of a month."""
+        dates = pd.bdate_range("2024-01-25", periods=10)  # crosses into February
+        up = pd.DataFrame({"open": np.linspace(100, 190, 10)}, index=dates)
+        up["close"] = up["open"]
+        flat = pd.DataFrame({"open": 100.0, "close": 100.0}, index=dates)
+        signals = _make_constant_signals(dates, 1)
+
+        def run(rebalance):
+            cfg = BacktestConfig(initial_cash=10_000, commission_pct=0.0, rebalance=rebalance)
+            return run_backtest_multi(
+                {"A": up, "B": flat}, {"A": signals, "B": signals}, "s", config=cfg
+            )
+
+        drift, rebalanced = run(None), run("M")
+        # Rebalancing sells part of the winner, so the final equity is lower
+        assert rebalanced.equity_curve["equity"].iloc[-1] < drift.equity_curve["equity"].iloc[-1]
+        trade_a = next(t for t in rebalanced.trades if t.asset_id == "A")
+        assert trade_a.exit_date is None
+        assert trade_a.pnl > 0
+
+    def test_union_date_axis_and_buy_hold(self):
+        """Assets with different calendars share one axis; B&H splits cash 1/N."""
+        prices_a = _make_prices(n=10)
+        prices_b = _make_prices(n=10).iloc[3:]
+        result = run_backtest_multi(
+            {"A": prices_a, "B": prices_b},
+            {"A": _make_constant_signals(prices_a.index, 0),
+             "B": _make_constant_signals(prices_b.index, 0)},
+            "s",
+        )
+        assert list(result.equity_curve["date"]) == list(prices_a.index)
+        np.testing.assert_allclose(result.equity_curve["equity"], 10_000_000)
+        # B's sleeve is idle cash until its first bar
+        assert result.buy_hold_equity["equity"].iloc[0] > 5_000_000
+
+    def test_invalid_sizing(self):
+        prices = _make_prices(n=5)
+        signals = _make_constant_signals(prices.index, 1)
+        with pytest.raises(ValueError, match="sum to at most 1"):
+            run_backtest_multi(
+                {"A": prices}, {"A": signals}, "s",
+                config=BacktestConfig(sizing={"A": 1.5}),
+            )
+        with pytest.raises(ValueError, match="Unknown rebalance"):
+            run_backtest_multi(
+                {"A": prices}, {"A": signals}, "s", config=BacktestConfig(rebalance="H"),
+            )
+
 
 # ---------------------------------------------------------------------------
 # Next-day execution test
@@ -307,3 +413,91 @@ class TestNextDay:
         expected_shares = 1_000_000 / 110.0
         expected_pnl = expected_shares * (130.0 - 110.0)
         np.testing.assert_allclose(trade.pnl, expected_pnl, rtol=1e-6)
+
+
+# ---------------------------------------------------------------------------
+# Vectorized batch engine tests
+# ---------------------------------------------------------------------------
+
+def _reference_loop(opens, closes, sigs, cfg):
+    """Bar-by-bar reference of the original run_backtest loop (equity, pnls)."""
+    cash, shares, entry_price, trade_cost = cfg.initial_cash, 0.0, 0.0, 0.0
+    equity, pnls = [], []
+    for i in range(len(opens)):
+        if i > 0:
+            if sigs[i - 1] == 1 and shares == 0.0:
+                comm = cash * cfg.commission_pct
+                shares = (cash - comm) / opens[i]
+                entry_price, trade_cost, cash = opens[i], comm, 0.0
+            elif sigs[i - 1] == 0 and shares > 0.0:
+                proceeds = shares * opens[i]
+                comm = proceeds * cfg.commission_pct
+                cash = proceeds - comm
+                trade_cost += comm
+                pnls.append(shares * opens[i] - shares * entry_price - trade_cost)
+                shares = 0.0
+        equity.append(cash + shares * closes[i])
+    return np.array(equity), pnls
+
+
+class TestBatch:
+    def test_bit_identical_to_reference_loop(self):
+        rng = np.random.default_rng(7)
+        cfg = BacktestConfig(commission_pct=0.001)
+        for _ in range(20):
+            n = 120
+            closes = 100 * np.cumprod(1 + rng.normal(0, 0.02, n))
+            opens = closes * (1 + rng.normal(0, 0.01, n))
+            sigs = rng.choice([-1, 0, 1], size=n)
+            dates = pd.bdate_range("2024-01-01", periods=n)
+            prices = pd.DataFrame({"open": opens, "close": closes}, index=dates)
+
+            result = run_backtest(prices, _make_signals(dates, sigs), "T", "s", cfg)
+            ref_equity, ref_pnls = _reference_loop(opens, closes, sigs, cfg)
+
+            np.testing.assert_array_equal(result.equity_curve["equity"].values, ref_equity)
+            closed = [t.pnl for t in result.trades if t.exit_date is not None]
+            assert closed == ref_pnls
+
+    def test_matrix_rows_match_single_asset_runs(self):
+        """Each row of a universe run equals run_backtest on that asset alone."""
+        prices_a = _make_prices(n=30, start_price=100, daily_return=0.01)
+        prices_b = _make_prices(n=25, start_price=50, daily_return=-0.005)
+        prices_b.index = prices_b.index + pd.offsets.BDay(3)  # misaligned calendars
+        sig_a = _make_signals(prices_a.index, ([0, 1, 1, 0, 1] * 6))
+        sig_b = _make_signals(prices_b.index, ([1, 1, 0, 0, 1] * 5))
+        cfg = BacktestConfig(commission_pct=0.002)
+
+        asset_ids, dates, opens, closes, signals = align_backtest_inputs(
+            {"A": prices_a, "B": prices_b}, {"A": sig_a, "B": sig_b},
+        )
+        batch = run_backtest_batch(opens, closes, signals, cfg)
+
+        assert asset_ids == ["A", "B"]
+        assert batch.equity.shape == (2, len(dates))
+        for row, (prices, sig) in enumerate([(prices_a, sig_a), (prices_b, sig_b)]):
+            single = run_backtest(prices, sig, asset_ids[row], "s", cfg)
+            valid = ~np.isnan(batch.equity[row])
+            np.testing.assert_array_equal(
+                batch.equity[row][valid], single.equity_curve["equity"].values,
+            )
+            np.testing.assert_array_equal(
+                batch.buy_hold[row][valid], single.buy_hold_equity["equity"].values,
+            )
+            row_pnls = batch.trade_pnl[batch.trade_asset == row]
+            np.testing.assert_array_equal(row_pnls, [t.pnl for t in single.trades])
+
+    def test_open_trade_marked_at_last_close(self):
+        prices = _make_prices(n=10, daily_return=0.01)
+        batch = run_backtest_batch(
+            prices["open"].values, prices["close"].values, np.ones(10),
+            BacktestConfig(commission_pct=0.0),
+        )
+        assert batch.trade_exit_idx.tolist() == [-1]
+        assert np.isnan(batch.trade_exit_price[0])
+        expected = batch.trade_shares[0] * (prices["close"].iloc[-1] - prices["open"].iloc[1])
+        np.testing.assert_allclose(batch.trade_pnl[0], expected, rtol=1e-12)
+
+    def test_shape_mismatch_raises(self):
+        with pytest.raises(ValueError, match="Shape mismatch"):
+            run_backtest_batch(np.ones((2, 5)), np.ones((2, 5)), np.ones((2, 4)))
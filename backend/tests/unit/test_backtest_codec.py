@@ -0,0 +1,82 @@
+"""Tests for the compact backtest equity/trade encoding."""
+
+from __future__ import annotations
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from research_engine.backtest import TradeRecord
+from research_engine.backtest_codec import (
+    decode_equity_curve,
+    decode_trades,
+    encode_equity_curve,
+    encode_trades,
+    pack_columns,
+    unpack_columns,
+)
+
+
+def _equity_df(n: int = 2520, seed: int = 0) -> pd.DataFrame:
+    equity = 1e7 * np.cumprod(1 + np.random.default_rng(seed).normal(0.0003, 0.01, n))
+    return pd.DataFrame({
+        "date": pd.bdate_range("2015-01-02", periods=n),
+        "equity": equity,
+        "drawdown": equity / np.maximum.accumulate(equity) - 1.0,
+    })
+
+
+class TestEquityCurve:
+    def test_roundtrip_is_exact(self):
+        df = _equity_df()
+        cols = decode_equity_curve(encode_equity_curve(df))
+        assert np.array_equal(cols["date"], df["date"].to_numpy(dtype="datetime64[D]"))
+        assert np.array_equal(cols["equity"], df["equity"].to_numpy())
+        assert np.array_equal(cols["drawdown"], df["drawdown"].to_numpy())
+
+    def test_compact(self):
+        df = _equity_df()
+        # ~100 bytes per equity row in Postgres (tuple + primary-key index)
+        assert len(encode_equity_curve(df)) * 10 < len(df) * 100
+
+    def test_non_derived_drawdown_kept(self):
+        df = _equity_df(50)
+        df["drawdown"] = np.linspace(0, -0.1, 50)
+        cols = decode_equity_curve(encode_equity_curve(df))
+        assert np.array_equal(cols["drawdown"], df["drawdown"].to_numpy())
+
+    def test_empty(self):
+        df = pd.DataFrame(columns=["date", "equity", "drawdown"])
+        cols = decode_equity_curve(encode_equity_curve(df))
+        assert all(len(v) == 0 for v in cols.values())
+
+
+class TestTrades:
+    def test_roundtrip_with_nulls(self):
+        trades = [
+            TradeRecord("005930", date(2024, 1, 2), 70000.0, date(2024, 1, 5), 72000.0,
+                        "long", 100.0, 200000.0, 14200.0),
+            TradeRecord("SOXL", date(2024, 1, 8), 25.5, None, None, "long", 3.0, None, 0.1),
+        ]
+        decoded = decode_trades(encode_trades(trades))
+        assert decoded[0]["exit_date"] == date(2024, 1, 5)
+        assert decoded[1] == {
+            "asset_id": "SOXL", "entry_date": date(2024, 1, 8), "entry_price": 25.5,
+            "exit_date": None, "exit_price": None, "side": "long", "shares": 3.0,
+            "pnl": None, "cost": 0.1,
+        }
+
+    def test_empty(self):
+        assert decode_trades(encode_trades([])) == []
+
+
+class TestColumns:
+    def test_length_mismatch(self):
+        with pytest.raises(ValueError, match="differ in length"):
+            pack_columns({"a": np.zeros(2), "b": np.zeros(3)}, {"a": "shuffle", "b": "shuffle"})
+
+    def test_bad_blob(self):
+        with pytest.raises(ValueError, match="Not a backtest column blob"):
+            unpack_columns(b"nope")
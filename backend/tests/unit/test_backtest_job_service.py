@@ -0,0 +1,255 @@
+"""Tests for the table-backed async backtest job queue."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from api.schemas.backtest import BacktestRunRequest
+from api.services import backtest_job_service as jobs
+from db.models import BacktestJob, Base
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)
+
+
+@pytest.fixture(autouse=True)
+def no_runner():
+    runner = MagicMock()
+    with patch.object(jobs, "get_job_runner", return_value=runner):
+        yield runner
+
+
+def _request(**overrides) -> BacktestRunRequest:
+    return BacktestRunRequest(
+        strategy_id="momentum", asset_id="KS200", start_date=date(2024, 1, 1), **overrides
+    )
+
+
+def _events(chunks: list[str]) -> list[dict]:
+    return [json.loads(c.removeprefix("data: ").strip()) for c in chunks]
+
+
+async def _collect(gen) -> list[str]:
+    return [chunk async for chunk in gen]
+
+
+class TestSubmitAndClaim:
+    def test_submit_queues_and_wakes(self, session_factory, no_runner):
+        with session_factory() as db:
+            job = jobs.submit_job(db, _request())
+            assert job.status == "queued"
+            assert job.request_json["strategy_id"] == "momentum"
+        no_runner.wake.assert_called_once()
+
+    def test_invalid_request_not_queued(self, session_factory):
+        with session_factory() as db:
+            with pytest.raises(ValueError, match="Unknown strategy"):
+                jobs.submit_job(db, _request().model_copy(update={"strategy_id": "nope"}))
+            assert db.query(BacktestJob).count() == 0
+
+    def test_queue_full(self, session_factory):
+        with session_factory() as db, patch.object(jobs, "settings") as mock_settings:
+            mock_settings.backtest_job_max_pending = 2
+            jobs.submit_job(db, _request())
+            jobs.submit_job(db, _request())
+            with pytest.raises(jobs.JobQueueFull):
+                jobs.submit_job(db, _request())
+
+    def test_concurrent_submits_respect_cap(self, tmp_path):
+        """Count and insert are one critical section — parallel submits stop at the cap."""
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'jobs.db'}", connect_args={"timeout": 30}
+        )
+        Base.metadata.create_all(engine)
+        factory = sessionmaker(bind=engine)
+        real_now = jobs._now
+
+        def slow_now():  # widen the window between the count and the insert
+            time.sleep(0.05)
+            return real_now()
+
+        def submit():
+            with factory() as db:
+                try:
+                    jobs.submit_job(db, _request())
+                except jobs.JobQueueFull:
+                    pass
+
+        with (
+            patch.object(jobs.settings, "backtest_job_max_pending", 3),
+            patch.object(jobs, "_now", side_effect=slow_now),
+        ):
+            threads = [threading.Thread(target=submit) for _ in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join(10)
+
+        with factory() as db:
+            assert db.query(BacktestJob).count() == 3
+
+    def test_claim_oldest_once(self, session_factory):
+        with session_factory() as db:
+            first = jobs.submit_job(db, _request()).job_id
+            first_row = db.get(BacktestJob, first)
+            first_row.created_at = datetime.now(timezone.utc) - timedelta(minutes=1)
+            second = jobs.submit_job(db, _request()).job_id
+            db.commit()
+
+            assert jobs.claim_next_job(db) == first
+            assert jobs.claim_next_job(db) == second
+            assert jobs.claim_next_job(db) is None
+            db.expire_all()
+            assert db.get(BacktestJob, first).status == "running"
+
+    def test_requeue_stale(self, session_factory):
+        with session_factory() as db:
+            job_id = jobs.submit_job(db, _request()).job_id
+            jobs.claim_next_job(db)
+            job = db.get(BacktestJob, job_id)
+            job.updated_at = datetime.now(timezone.utc) - timedelta(hours=1)
+            db.commit()
+
+            assert jobs.requeue_stale_jobs(db, stale_seconds=60) == 1
+            db.expire_all()
+            assert db.get(BacktestJob, job_id).status == "queued"
+
+
+class TestRunJob:
+    def _claimed(self, session_factory) -> uuid.UUID:
+        with session_factory() as db:
+            jobs.submit_job(db, _request())
+            return jobs.claim_next_job(db)
+
+    def test_success_records_run_and_progress(self, session_factory):
+        job_id = self._claimed(session_factory)
+        run_id = uuid.uuid4()
+        seen = []
+
+        def fake_run(request, db, progress):
+            progress("prepare", 0, 1, "KS200")
+            with session_factory() as other:
+                row = other.get(BacktestJob, job_id)
+                seen.append((row.stage, row.progress_total, row.message))
+            return MagicMock(run_id=run_id)
+
+        with patch.object(jobs, "run_backtest_on_demand", side_effect=fake_run):
+            jobs.run_job(session_factory, job_id)
+
+        assert seen == [("prepare", 1, "KS200")]
+        with session_factory() as db:
+            job = db.get(BacktestJob, job_id)
+            assert job.status == "success"
+            assert job.run_id == run_id
+            assert job.ended_at is not None
+
+    def test_failure_records_error(self, session_factory):
+        job_id = self._claimed(session_factory)
+        with patch.object(
+            jobs, "run_backtest_on_demand", side_effect=ValueError("No price data")
+        ):
+            jobs.run_job(session_factory, job_id)
+
+        with session_factory() as db:
+            job = db.get(BacktestJob, job_id)
+            assert job.status == "failed"
+            assert job.error_message == "No price data"
+
+
+class TestStreamJobEvents:
+    def test_streams_until_terminal(self, session_factory):
+        with session_factory() as db:
+            job_id = jobs.submit_job(db, _request()).job_id
+
+        async def scenario():
+            gen = jobs.stream_job_events(job_id, session_factory, poll_seconds=0.01)
+            first = await gen.__anext__()
+            jobs._update_job(session_factory, job_id, status="running", stage="backtest")
+            jobs._update_job(
+                session_factory, job_id, status="success", stage="done", run_id=uuid.uuid4()
+            )
+            return [first] + await _collect(gen)
+
+        events = _events(asyncio.run(scenario()))
+        assert events[0]["type"] == "progress" and events[0]["status"] == "queued"
+        assert events[-2]["status"] == "success"
+        assert events[-1] == {"type": "done", "status": "success"}
+
+    def test_missing_job(self, session_factory):
+        events = _events(asyncio.run(_collect(
+            jobs.stream_job_events(uuid.uuid4(), session_factory, poll_seconds=0.01)
+        )))
+        assert events == [{"type": "error", "detail": "Backtest job not found"}]
+
+
+class TestRunner:
+    def test_worker_drains_queue(self, session_factory):
+        with session_factory() as db:
+            job_id = jobs.submit_job(db, _request()).job_id
+
+        runner = jobs.BacktestJobRunner(session_factory, workers=1, poll_seconds=0.01)
+        with patch.object(
+            jobs, "run_backtest_on_demand", return_value=MagicMock(run_id=uuid.uuid4())
+        ):
+            runner.start()
+            try:
+                for _ in range(500):
+                    with session_factory() as db:
+                        if db.get(BacktestJob, job_id).status == "success":
+                            break
+                    time.sleep(0.01)
+            finally:
+                runner.stop(timeout=5)
+
+        with session_factory() as db:
+            assert db.get(BacktestJob, job_id).status == "success"
+
+    def test_idle_worker_requeues_orphaned_jobs(self, session_factory):
+        """A job left running by a crashed process is picked up without a restart."""
+        runner = jobs.BacktestJobRunner(session_factory, workers=1, poll_seconds=0.01)
+        with (
+            patch.object(jobs.settings, "backtest_job_stale_seconds", 0.2),
+            patch.object(
+                jobs, "run_backtest_on_demand", return_value=MagicMock(run_id=uuid.uuid4())
+            ),
+        ):
+            runner.start()
+            try:
+                job_id = uuid.uuid4()
+                stale = datetime.now(timezone.utc) - timedelta(hours=1)
+                with session_factory() as db:  # orphan appears after start()'s requeue
+                    db.add(BacktestJob(
+                        job_id=job_id, status="running", stage="prepare",
+                        request_json=_request().model_dump(mode="json"),
+                        progress_current=0, progress_total=0,
+                        created_at=stale, started_at=stale, updated_at=stale,
+                    ))
+                    db.commit()
+                for _ in range(500):
+                    with session_factory() as db:
+                        if db.get(BacktestJob, job_id).status == "success":
+                            break
+                    time.sleep(0.01)
+            finally:
+                runner.stop(timeout=5)
+
+        with session_factory() as db:
+            assert db.get(BacktestJob, job_id).status == "success"
+
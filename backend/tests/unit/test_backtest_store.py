@@ -99,6 +99,8 @@ class TestConfigToDict:
         assert d["commission_pct"] == 0.001
         assert d["slippage_pct"] == 0.0
         assert d["allow_short"] is False
+        assert d["sizing"] == "equal"
+        assert d["rebalance"] is None
 
     def test_custom_config(self):
         cfg = BacktestConfig(initial_cash=5_000_000, commission_pct=0.002)
@@ -164,7 +166,7 @@ class TestStoreBacktestResult:
         result = _make_backtest_result()
         metrics = _make_metrics()
 
-        store_result = store_backtest_result(session, result, metrics)
+        store_result = store_backtest_result(session, result, metrics, compact=False)
 
         assert store_result.status == "success"
         assert store_result.strategy_id == "momentum_v1"
@@ -188,7 +190,7 @@ class TestStoreBacktestResult:
         result.trades = []
         metrics = _make_metrics()
 
-        store_result = store_backtest_result(session, result, metrics)
+        store_result = store_backtest_result(session, result, metrics, compact=False)
 
         assert store_result.status == "success"
         assert store_result.row_count_trades == 0
@@ -229,7 +231,7 @@ class TestStoreBacktestResult:
         store_backtest_result(session, result, metrics)
 
         # Check the BacktestRun object passed to session.add
-        run_obj = session.add.call_args[0][0]
+        run_obj = session.add.call_args_list[0][0][0]
         assert run_obj.strategy_id == "momentum_v1"
         assert run_obj.asset_id == "005930"
         assert run_obj.status == "success"  # updated after commit
@@ -247,6 +249,22 @@ class TestStoreBacktestResult:
         assert store_result.status == "success"
         assert store_result.asset_id == "MULTI"
 
+    def test_compact_writes_one_blob(self):
+        from db.models import BacktestRunBlob
+        from research_engine.backtest_codec import decode_equity_curve, decode_trades
+
+        session = MagicMock()
+        store_result = store_backtest_result(session, _make_backtest_result(), _make_metrics())
+
+        assert store_result.row_count_equity == 5
+        assert store_result.row_count_trades == 2
+        session.bulk_insert_mappings.assert_not_called()
+        blob = session.add.call_args_list[1][0][0]
+        assert isinstance(blob, BacktestRunBlob)
+        assert blob.run_id == store_result.run_id
+        assert decode_equity_curve(blob.equity_blob)["equity"][-1] == 10_400_000
+        assert decode_trades(blob.trades_blob)[1]["exit_date"] is None
+
 
 # ---------------------------------------------------------------------------
 # BacktestStoreResult dataclass tests
@@ -270,3 +288,84 @@ class TestBacktestStoreResult:
         )
         assert r.status == "store_failed"
         assert len(r.errors) == 1
+
+
+class TestEvictBacktestRuns:
+    def _session(self):
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+
+        from db.models import Base
+
+        engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(engine)
+        return sessionmaker(bind=engine)()
+
+    def _store(self, session, key, age_hours=0.0):
+        from datetime import datetime, timedelta, timezone
+
+        from db.models import BacktestRun
+
+        result = store_backtest_result(
+            session, _make_backtest_result(), _make_metrics(), request_key=key
+        )
+        run = session.get(BacktestRun, result.run_id)
+        run.started_at = datetime.now(timezone.utc) - timedelta(hours=age_hours)
+        session.commit()
+        return result.run_id
+
+    def test_ttl_and_max_runs(self):
+        from sqlalchemy import func, select
+
+        from db.models import BacktestRun, BacktestRunBlob, BacktestTradeLog
+        from research_engine.backtest_store import evict_backtest_runs
+
+        session = self._session()
+        research = self._store(session, None, age_hours=1000)
+        old = self._store(session, "a" * 64, age_hours=200)
+        mid = self._store(session, "b" * 64, age_hours=2)
+        new = self._store(session, "c" * 64, age_hours=1)
+
+        assert evict_backtest_runs(session, ttl_hours=168, max_runs=2) == 1
+        assert evict_backtest_runs(session, ttl_hours=168, max_runs=1) == 1
+        session.commit()
+
+        remaining = set(session.execute(select(BacktestRun.run_id)).scalars())
+        assert remaining == {research, new}
+        assert old not in remaining and mid not in remaining
+        blob_runs = set(session.execute(select(BacktestRunBlob.run_id)).scalars())
+        assert blob_runs == remaining
+        assert session.execute(
+            select(func.count()).select_from(BacktestTradeLog)
+            .where(BacktestTradeLog.run_id.in_([old, mid]))
+        ).scalar() == 0
+
+
+class TestCompactBacktestRun:
+    def test_rows_to_blob(self):
+        from sqlalchemy import create_engine, func, select
+        from sqlalchemy.orm import sessionmaker
+
+        from db.models import BacktestEquityCurve, BacktestTradeLog, Base
+        from research_engine.backtest_codec import decode_equity_curve, decode_trades
+        from research_engine.backtest_store import compact_backtest_run
+
+        engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+        result = _make_backtest_result()
+        run_id = store_backtest_result(
+            session, result, _make_metrics(), compact=False
+        ).run_id
+
+        blob = compact_backtest_run(session, run_id)
+        session.commit()
+
+        assert blob.n_equity == 5 and blob.n_trades == 2
+        equity = decode_equity_curve(blob.equity_blob)
+        assert equity["equity"].tolist() == result.equity_curve["equity"].tolist()
+        trades = decode_trades(blob.trades_blob)
+        assert trades[0]["pnl"] == 200000.0 and trades[1]["pnl"] is None
+        for model in (BacktestEquityCurve, BacktestTradeLog):
+            assert session.execute(select(func.count()).select_from(model)).scalar() == 0
+        assert compact_backtest_run(session, run_id) is None
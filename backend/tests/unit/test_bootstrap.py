@@ -0,0 +1,138 @@
+"""Tests for bootstrap confidence intervals (resampling indices, path metrics, bands)."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from research_engine.backtest import BacktestConfig, BacktestResult
+from research_engine.bootstrap import (
+    BOOTSTRAP_METRICS,
+    bootstrap_backtest,
+    bootstrap_indices,
+    bootstrap_metrics,
+    indices_from_blocks,
+    path_metrics,
+    sample_blocks,
+)
+from research_engine.metrics import compute_metrics
+
+
+def _returns(n: int = 750, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).normal(0.0005, 0.012, n)
+
+
+def _result(returns: np.ndarray) -> BacktestResult:
+    equity = 1_000_000 * np.r_[1.0, np.cumprod(1 + returns)]
+    peak = np.maximum.accumulate(equity)
+    return BacktestResult(
+        strategy_id="s",
+        asset_id="KS200",
+        config=BacktestConfig(),
+        equity_curve=pd.DataFrame({
+            "date": pd.bdate_range("2020-01-01", periods=len(equity)),
+            "equity": equity,
+            "drawdown": equity / peak - 1,
+        }),
+    )
+
+
+class TestIndices:
+    @pytest.mark.parametrize("method", ["stationary", "block"])
+    def test_shape_and_range(self, method):
+        idx = bootstrap_indices(300, 50, method, 10, np.random.default_rng(1))
+        assert idx.shape == (50, 300)
+        assert idx.min() >= 0 and idx.max() < 300
+
+    def test_block_is_contiguous_runs(self):
+        idx = bootstrap_indices(100, 20, "block", 10, np.random.default_rng(2))
+        blocks = idx.reshape(20, 10, 10)
+        assert (np.diff(blocks, axis=2) == 1).all()
+
+    def test_stationary_mean_block_length(self):
+        n, paths = 2000, 200
+        idx = bootstrap_indices(n, paths, "stationary", 25, np.random.default_rng(3))
+        step = np.diff(idx, axis=1)
+        breaks = ((step != 1) & (step != 1 - n)).sum() + paths
+        assert idx.size / breaks == pytest.approx(25, rel=0.1)
+
+    def test_stationary_wraps_circularly(self):
+        sources = np.array([[8, 3]])
+        lengths = np.array([[4, 6]])
+        idx = indices_from_blocks(sources, lengths, 10)
+        assert idx.tolist() == [[8, 9, 0, 1, 3, 4, 5, 6, 7, 8]]
+
+    def test_lengths_fill_path_exactly(self):
+        for method in ("stationary", "block"):
+            _, lengths = sample_blocks(333, 40, method, 30, np.random.default_rng(4))
+            assert (lengths.sum(axis=1) == 333).all()
+
+    def test_unknown_method(self):
+        with pytest.raises(ValueError, match="Unknown bootstrap method"):
+            bootstrap_indices(10, 1, "iid")
+
+
+class TestPathMetrics:
+    def test_single_path_matches_compute_metrics(self):
+        returns = _returns()
+        metrics = path_metrics(returns)
+        expected = compute_metrics(_result(returns))
+        assert metrics["cagr"][0] == pytest.approx(expected.cagr, rel=1e-9)
+        assert metrics["mdd"][0] == pytest.approx(expected.mdd, rel=1e-9)
+        assert metrics["sharpe"][0] == pytest.approx(expected.sharpe, rel=1e-9)
+        assert metrics["sortino"][0] == pytest.approx(expected.sortino, rel=1e-9)
+
+    def test_flat_path_is_zero(self):
+        metrics = path_metrics(np.zeros((2, 50)))
+        for name in BOOTSTRAP_METRICS:
+            assert (metrics[name] == 0).all()
+
+
+class TestBootstrapMetrics:
+    @pytest.mark.parametrize("method", ["stationary", "block"])
+    def test_block_sums_match_gathered_paths(self, method):
+        """Prefix-sum statistics equal path_metrics on the materialized paths."""
+        returns = _returns(400)
+        result = bootstrap_metrics(returns, n_paths=64, method=method, block_size=15, seed=7)
+
+        sources, lengths = sample_blocks(400, 64, method, 15, np.random.default_rng(7))
+        expected = path_metrics(returns[indices_from_blocks(sources, lengths, 400)])
+        for name in BOOTSTRAP_METRICS:
+            np.testing.assert_allclose(result.samples[name], expected[name], rtol=1e-9, atol=1e-12)
+
+    def test_chunking_does_not_change_samples(self):
+        returns = _returns(300)
+        full = bootstrap_metrics(returns, n_paths=100, seed=3)
+        chunked = bootstrap_metrics(returns, n_paths=100, seed=3, max_chunk_bytes=1)
+        assert full.n_paths == chunked.n_paths == 100
+        # Chunks draw from one generator in sequence, so only the distribution is shared
+        assert np.median(chunked.samples["cagr"]) == pytest.approx(
+            np.median(full.samples["cagr"]), abs=0.05
+        )
+
+    def test_seed_is_reproducible(self):
+        a = bootstrap_metrics(_returns(), n_paths=200, seed=11)
+        b = bootstrap_metrics(_returns(), n_paths=200, seed=11)
+        for name in BOOTSTRAP_METRICS:
+            np.testing.assert_array_equal(a.samples[name], b.samples[name])
+
+    def test_percentile_bands_are_ordered(self):
+        result = bootstrap_metrics(_returns(), n_paths=500, seed=5)
+        bands = result.percentiles()
+        assert set(bands) == set(BOOTSTRAP_METRICS)
+        for band in bands.values():
+            assert list(band) == ["p5", "p25", "p50", "p75", "p95"]
+            assert list(band.values()) == sorted(band.values())
+        assert bands["mdd"]["p95"] <= 0
+        assert bands["sharpe"]["p5"] < result.point["sharpe"] < bands["sharpe"]["p95"]
+
+    def test_bootstrap_backtest_point(self):
+        returns = _returns()
+        result = bootstrap_backtest(_result(returns), n_paths=10, seed=0)
+        assert result.n_days == len(returns)
+        assert result.point["cagr"] == pytest.approx(compute_metrics(_result(returns)).cagr)
+
+    def test_too_short(self):
+        with pytest.raises(ValueError, match="at least 2"):
+            bootstrap_metrics(np.array([0.01]))
@@ -0,0 +1,195 @@
+"""Tests for db.bulk — COPY bulk loader and executemany fallback."""
+
+import datetime
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from db.bulk import BulkWriteResult, bulk_insert, bulk_upsert
+from db.models import Base, FactorDaily, PriceDaily, SignalDaily
+
+
+@pytest.fixture
+def sqlite_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def _price_frame(n=3, close=100.0):
+    dates = pd.bdate_range("2025-01-02", periods=n)
+    return pd.DataFrame({
+        "asset_id": ["KS200"] * n,
+        "date": [d.date() for d in dates],
+        "open": [close] * n,
+        "high": [close + 1] * n,
+        "low": [close - 1] * n,
+        "close": [close] * n,
+        "volume": [1000] * n,
+        "source": ["fdr"] * n,
+        "ingested_at": [datetime.datetime(2025, 1, 10, tzinfo=datetime.timezone.utc)] * n,
+    })
+
+
+class _FakeCopyCursor:
+    """psycopg2-style cursor recording SQL and COPY payloads."""
+
+    def __init__(self):
+        self.sql: list[str] = []
+        self.copies: list[tuple[str, str]] = []
+        self.closed = False
+
+    def execute(self, sql):
+        self.sql.append(sql)
+
+    def copy_expert(self, sql, buf):
+        self.copies.append((sql, buf.read()))
+
+    def close(self):
+        self.closed = True
+
+
+def _pg_session(cursor):
+    session = MagicMock()
+    session.get_bind.return_value.dialect.name = "postgresql"
+    session.connection.return_value.connection.driver_connection.cursor.return_value = cursor
+    return session
+
+
+# --- Fallback path (SQLite) ---
+
+
+class TestExecutemanyFallback:
+    def test_upsert_inserts_then_updates(self, sqlite_session):
+        result = bulk_upsert(
+            sqlite_session, PriceDaily, _price_frame(close=100.0),
+            conflict_cols=["asset_id", "date", "source"],
+        )
+        sqlite_session.commit()
+        assert result.method == "executemany"
+        assert result.row_count == 3
+
+        bulk_upsert(
+            sqlite_session, PriceDaily, _price_frame(close=200.0),
+            conflict_cols=["asset_id", "date", "source"],
+        )
+        sqlite_session.commit()
+        closes = sqlite_session.execute(select(PriceDaily.close)).scalars().all()
+        assert closes == [200.0, 200.0, 200.0]
+
+    def test_default_conflict_is_primary_key(self, sqlite_session):
+        records = [{
+            "asset_id": "KS200", "date": datetime.date(2025, 1, 2),
+            "factor_name": "ret_1d", "version": "v1", "value": v,
+        } for v in (0.1, 0.2)]
+        bulk_upsert(sqlite_session, FactorDaily, records[:1])
+        bulk_upsert(sqlite_session, FactorDaily, records[1:])
+        sqlite_session.commit()
+        assert sqlite_session.execute(select(FactorDaily.value)).scalars().all() == [0.2]
+
+    def test_bulk_insert_appends(self, sqlite_session):
+        records = [{
+            "asset_id": "KS200", "date": datetime.date(2025, 1, 2), "strategy_id": "s",
+            "signal": 1, "score": None, "action": "entry", "meta_json": {"k": 1},
+        }] * 2
+        result = bulk_insert(sqlite_session, SignalDaily, records)
+        sqlite_session.commit()
+        assert result.row_count == 2
+        assert sqlite_session.execute(select(func.count(SignalDaily.id))).scalar() == 2
+
+    def test_nan_written_as_null(self, sqlite_session):
+        df = pd.DataFrame({
+            "asset_id": ["KS200"], "date": [datetime.date(2025, 1, 2)], "strategy_id": ["s"],
+            "signal": [0], "score": [np.nan], "action": [None], "meta_json": [None],
+        })
+        bulk_insert(sqlite_session, SignalDaily, df)
+        sqlite_session.commit()
+        assert sqlite_session.execute(select(SignalDaily.score)).scalar() is None
+
+    def test_empty(self):
+        session = MagicMock()
+        result = bulk_upsert(session, PriceDaily, [])
+        assert result.row_count == 0
+        session.execute.assert_not_called()
+
+
+# --- COPY path ---
+
+
+class TestCopyPath:
+    def test_upsert_via_temp_table(self):
+        cursor = _FakeCopyCursor()
+        session = _pg_session(cursor)
+        result = bulk_upsert(
+            session, PriceDaily, _price_frame(n=5),
+            conflict_cols=["asset_id", "date", "source"],
+            update_cols=["close"],
+            copy_threshold=1,
+        )
+
+        assert result.method == "copy"
+        assert result.row_count == 5
+        assert cursor.closed
+        session.execute.assert_not_called()
+
+        create, merge, drop = cursor.sql
+        tmp = create.split()[3]
+        assert create.startswith(f"CREATE TEMP TABLE {tmp} ON COMMIT DROP AS SELECT")
+        assert merge.startswith("INSERT INTO price_daily (asset_id, date, open")
+        assert f"FROM {tmp} ON CONFLICT (asset_id, date, source)" in merge
+        assert merge.endswith("DO UPDATE SET close = EXCLUDED.close")
+        assert drop == f"DROP TABLE {tmp}"
+
+        copy_sql, payload = cursor.copies[0]
+        assert copy_sql.startswith(f"COPY {tmp} (")
+        lines = payload.splitlines()
+        assert len(lines) == 5
+        assert lines[0].startswith("KS200,2025-01-02,100.0,101.0,99.0,100.0,1000,fdr,")
+
+    def test_append_copies_into_target(self):
+        cursor = _FakeCopyCursor()
+        session = _pg_session(cursor)
+        records = [{
+            "asset_id": "KS200", "date": pd.Timestamp("2025-01-02"), "strategy_id": "s",
+            "signal": 1.0, "score": None, "action": "entry", "meta_json": {"k": "가"},
+        }]
+        bulk_insert(session, SignalDaily, records, copy_threshold=1)
+
+        assert cursor.sql == []
+        copy_sql, payload = cursor.copies[0]
+        assert copy_sql.startswith("COPY signal_daily (asset_id, date, strategy_id")
+        assert "NULL '\\N'" in copy_sql
+        assert payload.strip() == 'KS200,2025-01-02,s,1,\\N,entry,"{""k"": ""가""}"'
+
+    def test_psycopg3_cursor(self):
+        cursor = MagicMock(spec=["execute", "copy", "close"])
+        session = _pg_session(cursor)
+        bulk_upsert(session, FactorDaily, [{
+            "asset_id": "KS200", "date": datetime.date(2025, 1, 2),
+            "factor_name": "ret_1d", "version": "v1", "value": 0.5,
+        }], copy_threshold=1)
+
+        cursor.copy.return_value.__enter__.return_value.write.assert_called_once()
+
+    def test_small_batch_uses_executemany(self):
+        cursor = _FakeCopyCursor()
+        session = _pg_session(cursor)
+        result = bulk_upsert(session, PriceDaily, _price_frame(n=3))
+
+        assert result.method == "executemany"
+        assert cursor.copies == []
+        stmt = session.execute.call_args[0][0]
+        assert "ON CONFLICT" in str(stmt.compile())
+
+
+def test_rows_per_sec():
+    assert BulkWriteResult("t", 5000, "copy", elapsed_ms=500).rows_per_sec == 10_000
+    assert BulkWriteResult("t", 0, "copy").rows_per_sec == 0.0
@@ -8,11 +8,21 @@ import pytest
 
 from research_engine.factor_store import (
     _factors_to_records,
+    _factors_to_wide_records,
+    _load_factor_state,
+    _save_factor_state,
     _upsert_factors,
+    _upsert_factors_wide,
     store_factors_all,
     store_factors_for_asset,
+    store_factors_incremental,
+)
+from research_engine.factors import (
+    ALL_FACTOR_NAMES,
+    FACTOR_VERSION,
+    INCREMENTAL_TAIL_ROWS,
+    compute_all_factors,
 )
-from research_engine.factors import ALL_FACTOR_NAMES, FACTOR_VERSION
 
 
 def _make_ohlcv(n=150, base_price=100.0, seed=42):
@@ -103,6 +113,33 @@ class TestFactorsToRecords:
             assert isinstance(r["date"], datetime.date)
 
 
+class TestFactorsToWideRecords:
+    def test_one_record_per_date(self, factors_df):
+        records = _factors_to_wide_records("KS200", factors_df)
+        assert len(records) == len(factors_df)
+        assert set(records[0]) == {"asset_id", "date", "version", *ALL_FACTOR_NAMES}
+
+    def test_nan_becomes_none(self, factors_df):
+        records = _factors_to_wide_records("KS200", factors_df)
+        assert records[0]["sma_120"] is None
+        assert records[-1]["sma_120"] == pytest.approx(factors_df["sma_120"].iloc[-1])
+
+    def test_matches_long_records(self, factors_df):
+        wide = {r["date"]: r for r in _factors_to_wide_records("KS200", factors_df)}
+        for r in _factors_to_records("KS200", factors_df):
+            assert wide[r["date"]][r["factor_name"]] == r["value"]
+
+    def test_all_nan_rows_skipped(self):
+        df = pd.DataFrame(
+            {"ret_1d": [np.nan, 0.01]},
+            index=pd.date_range("2025-01-01", periods=2),
+        )
+        records = _factors_to_wide_records("TEST", df)
+        assert len(records) == 1
+        assert records[0]["ret_1d"] == 0.01
+        assert records[0]["rsi_14"] is None
+
+
 # --- _upsert_factors ---
 
 
@@ -148,6 +185,19 @@ class TestUpsertFactors:
         mock_session.execute.assert_not_called()
 
 
+class TestUpsertFactorsWide:
+    def test_upsert_updates_all_factor_columns(self, factors_df):
+        records = _factors_to_wide_records("KS200", factors_df.iloc[-3:])
+        mock_session = MagicMock()
+        assert _upsert_factors_wide(mock_session, records) == 3
+
+        stmt = mock_session.execute.call_args[0][0]
+        compiled = str(stmt.compile())
+        assert "factor_daily_wide" in compiled
+        assert "ON CONFLICT (asset_id, date, version) DO UPDATE SET" in compiled
+        assert "vol_zscore_20 = excluded.vol_zscore_20" in compiled
+
+
 # --- store_factors_for_asset ---
 
 
@@ -219,10 +269,11 @@ class TestStoreFactorsForAsset:
         ):
             store_factors_for_asset(mock_session, "KS200", start="2026-03-08", end="2026-03-15")
 
-        # preprocess should be called with extended start (150 days before 2026-03-08)
+        # preprocess should be called with extended start: 119 bday rows (SMA-120)
+        # → ceil(119 * 7/5) + 7 margin = 174 calendar days before 2026-03-08
         args, kwargs = mock_preprocess.call_args
         actual_start = args[2]  # session, asset_id, start, end
-        assert actual_start == "2025-10-09"  # 2026-03-08 - 150 days
+        assert actual_start == "2025-09-15"
         assert args[3] == "2026-03-15"  # end unchanged
 
     def test_lookback_no_extension_when_start_none(self, ohlcv):
@@ -319,3 +370,156 @@ class TestStoreFactorsAll:
             results = store_factors_all(mock_session)
 
         assert len(results) == 2
+
+
+class TestStoreFactorsPanel:
+    def test_mixed_calendars_one_batch(self):
+        from research_engine.factor_store import store_factors_panel
+
+        stock = _make_ohlcv(n=200, seed=1)
+        crypto = _make_ohlcv(n=200, seed=2)
+        crypto.index = pd.date_range(crypto.index[0], periods=200, freq="D")
+        frames = {"KS200": stock, "BTC": crypto}
+        mock_session = MagicMock()
+        captured = []
+
+        with (
+            patch(
+                "research_engine.factor_store.preprocess",
+                side_effect=lambda s, aid, *a, **k: frames[aid],
+            ),
+            patch(
+                "research_engine.factor_store._upsert_factors",
+                side_effect=lambda s, recs: captured.append(recs) or len(recs),
+            ),
+            patch("research_engine.factor_store._upsert_factors_wide", return_value=0),
+        ):
+            results = store_factors_panel(mock_session, ["KS200", "BTC"])
+
+        assert [r.status for r in results] == ["success", "success"]
+        assert len(captured) == 1
+        mock_session.commit.assert_called_once()
+        for asset_id, df in frames.items():
+            expected = _factors_to_records(asset_id, compute_all_factors(df))
+            got = [r for r in captured[0] if r["asset_id"] == asset_id]
+            assert got == expected
+            assert results[list(frames).index(asset_id)].row_count == len(expected)
+
+    def test_store_failure_marks_all(self, ohlcv):
+        from research_engine.factor_store import store_factors_panel
+
+        mock_session = MagicMock()
+        with (
+            patch("research_engine.factor_store.preprocess", return_value=ohlcv),
+            patch(
+                "research_engine.factor_store._upsert_factors",
+                side_effect=Exception("DB error"),
+            ),
+        ):
+            results = store_factors_panel(mock_session, ["KS200", "005930"])
+
+        assert [r.status for r in results] == ["store_failed", "store_failed"]
+        mock_session.rollback.assert_called_once()
+
+
+# --- Incremental mode ---
+
+
+def _state_session():
+    """Mock session whose merge/get round-trip FactorComputeState rows."""
+    session = MagicMock()
+    rows = {}
+    session.merge.side_effect = lambda row: rows.__setitem__((row.asset_id, row.version), row)
+    session.get.side_effect = lambda model, key: rows.get(key)
+    return session, rows
+
+
+class TestFactorState:
+    def test_round_trip(self, ohlcv):
+        session, rows = _state_session()
+        _save_factor_state(session, "KS200", FACTOR_VERSION, ohlcv)
+
+        row = rows[("KS200", FACTOR_VERSION)]
+        assert row.last_date == ohlcv.index[-1].date()
+        tail, state, history_start = _load_factor_state(session, "KS200", FACTOR_VERSION)
+        assert len(tail) == INCREMENTAL_TAIL_ROWS
+        assert tail.index[-1] == ohlcv.index[-1]
+        np.testing.assert_array_equal(tail["close"], ohlcv["close"].iloc[-INCREMENTAL_TAIL_ROWS:])
+        assert state["n_obs"] == len(ohlcv)
+        assert history_start == ohlcv.index[0].date()
+
+    def test_missing_state(self):
+        session, _ = _state_session()
+        assert _load_factor_state(session, "KS200", FACTOR_VERSION) is None
+
+
+class TestStoreFactorsIncremental:
+    def test_no_state_falls_back_to_full(self, ohlcv):
+        session, rows = _state_session()
+        with (
+            patch("research_engine.factor_store.preprocess", return_value=ohlcv),
+            patch("research_engine.factor_store._upsert_factors", return_value=10) as upsert,
+        ):
+            result = store_factors_incremental(session, "KS200")
+
+        assert result.status == "success"
+        assert len(upsert.call_args[0][1]) > 0
+        assert ("KS200", FACTOR_VERSION) in rows
+
+    def test_appends_only_new_dates(self):
+        full = _make_ohlcv(n=200)
+        history, new = full.iloc[:170], full.iloc[170:]
+        session, _ = _state_session()
+        _save_factor_state(session, "KS200", FACTOR_VERSION, history)
+
+        with (
+            patch("research_engine.factor_store.load_prices", return_value=new) as load,
+            patch(
+                "research_engine.factor_store._upsert_factors",
+                side_effect=lambda s, records: len(records),
+            ) as upsert,
+        ):
+            result = store_factors_incremental(session, "KS200")
+
+        assert result.status == "success"
+        assert load.call_args[0][2] == (history.index[-1] + pd.Timedelta(days=1)).date().isoformat()
+        records = upsert.call_args[0][1]
+        assert {r["date"] for r in records} == {d.date() for d in new.index}
+
+        expected = compute_all_factors(full).iloc[170:]
+        for r in records:
+            assert r["value"] == pytest.approx(
+                expected.at[pd.Timestamp(r["date"]), r["factor_name"]], rel=1e-12
+            )
+        _, state, _ = _load_factor_state(session, "KS200", FACTOR_VERSION)
+        assert state["n_obs"] == 200
+        session.commit.assert_called_once()
+
+    def test_up_to_date(self, ohlcv):
+        session, _ = _state_session()
+        _save_factor_state(session, "KS200", FACTOR_VERSION, ohlcv)
+        with (
+            patch("research_engine.factor_store.load_prices", side_effect=ValueError("No data")),
+            patch("research_engine.factor_store._upsert_factors") as upsert,
+        ):
+            result = store_factors_incremental(session, "KS200")
+
+        assert result.status == "success"
+        assert result.row_count == 0
+        upsert.assert_not_called()
+
+    def test_store_failure_rolls_back(self):
+        full = _make_ohlcv(n=160)
+        session, _ = _state_session()
+        _save_factor_state(session, "KS200", FACTOR_VERSION, full.iloc[:150])
+        with (
+            patch("research_engine.factor_store.load_prices", return_value=full.iloc[150:]),
+            patch(
+                "research_engine.factor_store._upsert_factors",
+                side_effect=Exception("DB error"),
+            ),
+        ):
+            result = store_factors_incremental(session, "KS200")
+
+        assert result.status == "store_failed"
+        session.rollback.assert_called_once()
@@ -6,16 +6,13 @@ import pytest
 
 from research_engine.factors import (
     ALL_FACTOR_NAMES,
+    build_panel,
     compute_all_factors,
-    compute_atr,
-    compute_ema,
-    compute_macd,
-    compute_returns,
-    compute_roc,
-    compute_rsi,
-    compute_sma,
-    compute_volatility,
-    compute_volume_zscore,
+    compute_factors,
+    compute_factors_incremental,
+    compute_factors_panel,
+    ewm_state,
+    plan_factors,
 )
 
 
@@ -52,21 +49,21 @@ def ohlcv():
 
 class TestComputeReturns:
     def test_output_columns(self, ohlcv):
-        result = compute_returns(ohlcv)
+        result = compute_factors(ohlcv, ["ret_1d", "ret_5d", "ret_20d", "ret_63d"])
         assert list(result.columns) == ["ret_1d", "ret_5d", "ret_20d", "ret_63d"]
 
     def test_ret_1d_calculation(self, ohlcv):
-        result = compute_returns(ohlcv)
+        result = compute_factors(ohlcv, ["ret_1d", "ret_5d", "ret_20d", "ret_63d"])
         expected = ohlcv["close"].pct_change(1)
         pd.testing.assert_series_equal(result["ret_1d"], expected, check_names=False)
 
     def test_ret_5d_calculation(self, ohlcv):
-        result = compute_returns(ohlcv)
+        result = compute_factors(ohlcv, ["ret_1d", "ret_5d", "ret_20d", "ret_63d"])
         expected = ohlcv["close"].pct_change(5)
         pd.testing.assert_series_equal(result["ret_5d"], expected, check_names=False)
 
     def test_nan_count_ret_63d(self, ohlcv):
-        result = compute_returns(ohlcv)
+        result = compute_factors(ohlcv, ["ret_1d", "ret_5d", "ret_20d", "ret_63d"])
         assert result["ret_63d"].isna().sum() == 63
 
 
@@ -75,16 +72,16 @@ class TestComputeReturns:
 
 class TestComputeSma:
     def test_output_columns(self, ohlcv):
-        result = compute_sma(ohlcv)
+        result = compute_factors(ohlcv, ["sma_20", "sma_60", "sma_120"])
         assert list(result.columns) == ["sma_20", "sma_60", "sma_120"]
 
     def test_sma_20_value(self, ohlcv):
-        result = compute_sma(ohlcv)
+        result = compute_factors(ohlcv, ["sma_20", "sma_60", "sma_120"])
         expected = ohlcv["close"].rolling(20).mean()
         pd.testing.assert_series_equal(result["sma_20"], expected, check_names=False)
 
     def test_sma_120_nan_count(self, ohlcv):
-        result = compute_sma(ohlcv)
+        result = compute_factors(ohlcv, ["sma_20", "sma_60", "sma_120"])
         assert result["sma_120"].isna().sum() == 119
 
 
@@ -93,11 +90,11 @@ class TestComputeSma:
 
 class TestComputeEma:
     def test_output_columns(self, ohlcv):
-        result = compute_ema(ohlcv)
+        result = compute_factors(ohlcv, ["ema_12", "ema_26"])
         assert list(result.columns) == ["ema_12", "ema_26"]
 
     def test_ema_12_not_all_nan(self, ohlcv):
-        result = compute_ema(ohlcv)
+        result = compute_factors(ohlcv, ["ema_12", "ema_26"])
         assert result["ema_12"].notna().sum() > 0
 
 
@@ -106,24 +103,24 @@ class TestComputeEma:
 
 class TestComputeMacd:
     def test_macd_equals_ema_diff(self, ohlcv):
-        macd = compute_macd(ohlcv)
-        ema = compute_ema(ohlcv)
+        macd = compute_factors(ohlcv, ["macd", "macd_signal"])
+        ema = compute_factors(ohlcv, ["ema_12", "ema_26"])
         expected = ema["ema_12"] - ema["ema_26"]
         pd.testing.assert_series_equal(macd["macd"], expected, check_names=False)
 
     def test_macd_signal_output(self, ohlcv):
-        result = compute_macd(ohlcv)
+        result = compute_factors(ohlcv, ["macd", "macd_signal"])
         assert "macd_signal" in result.columns
 
     def test_macd_signal_is_ema9_of_macd(self, ohlcv):
-        result = compute_macd(ohlcv)
+        result = compute_factors(ohlcv, ["macd", "macd_signal"])
         expected_signal = result["macd"].ewm(span=9, adjust=False).mean()
         pd.testing.assert_series_equal(
             result["macd_signal"], expected_signal, check_names=False,
         )
 
     def test_macd_signal_not_all_nan(self, ohlcv):
-        result = compute_macd(ohlcv)
+        result = compute_factors(ohlcv, ["macd", "macd_signal"])
         assert result["macd_signal"].notna().sum() > 0
 
 
@@ -132,13 +129,13 @@ class TestComputeMacd:
 
 class TestComputeRoc:
     def test_roc_calculation(self, ohlcv):
-        result = compute_roc(ohlcv, period=12)
+        result = compute_factors(ohlcv, ["roc"])
         close = ohlcv["close"]
         expected = (close / close.shift(12) - 1) * 100
         pd.testing.assert_series_equal(result["roc"], expected, check_names=False)
 
     def test_roc_nan_count(self, ohlcv):
-        result = compute_roc(ohlcv)
+        result = compute_factors(ohlcv, ["roc"])
         assert result["roc"].isna().sum() == 12
 
 
@@ -147,13 +144,13 @@ class TestComputeRoc:
 
 class TestComputeRsi:
     def test_rsi_range(self, ohlcv):
-        result = compute_rsi(ohlcv)
+        result = compute_factors(ohlcv, ["rsi_14"])
         valid = result["rsi_14"].dropna()
         assert (valid >= 0).all()
         assert (valid <= 100).all()
 
     def test_rsi_nan_for_initial_period(self, ohlcv):
-        result = compute_rsi(ohlcv)
+        result = compute_factors(ohlcv, ["rsi_14"])
         # ewm(min_periods=14): first 13 rows are NaN (delta.where converts NaN→0)
         assert result["rsi_14"].isna().sum() >= 13
 
@@ -163,7 +160,7 @@ class TestComputeRsi:
             {"close": [100.0 + i for i in range(50)]},
             index=pd.bdate_range("2025-06-01", periods=50),
         )
-        result = compute_rsi(df)
+        result = compute_factors(df, ["rsi_14"])
         valid = result["rsi_14"].dropna()
         assert valid.iloc[-1] > 90
 
@@ -173,7 +170,7 @@ class TestComputeRsi:
             {"close": [200.0 - i for i in range(50)]},
             index=pd.bdate_range("2025-06-01", periods=50),
         )
-        result = compute_rsi(df)
+        result = compute_factors(df, ["rsi_14"])
         valid = result["rsi_14"].dropna()
         assert valid.iloc[-1] < 10
 
@@ -183,12 +180,12 @@ class TestComputeRsi:
 
 class TestComputeVolatility:
     def test_vol_20_positive(self, ohlcv):
-        result = compute_volatility(ohlcv)
+        result = compute_factors(ohlcv, ["vol_20"])
         valid = result["vol_20"].dropna()
         assert (valid >= 0).all()
 
     def test_vol_20_nan_count(self, ohlcv):
-        result = compute_volatility(ohlcv)
+        result = compute_factors(ohlcv, ["vol_20"])
         # 1 NaN from pct_change + 19 from rolling = 20
         assert result["vol_20"].isna().sum() == 20
 
@@ -198,12 +195,12 @@ class TestComputeVolatility:
 
 class TestComputeAtr:
     def test_atr_positive(self, ohlcv):
-        result = compute_atr(ohlcv)
+        result = compute_factors(ohlcv, ["atr_14"])
         valid = result["atr_14"].dropna()
         assert (valid >= 0).all()
 
     def test_atr_nan_initial(self, ohlcv):
-        result = compute_atr(ohlcv)
+        result = compute_factors(ohlcv, ["atr_14"])
         # shift(1) produces 1 NaN, but max(axis=1) skips NaN → tr has 0 NaN
         # ewm(min_periods=14): first 13 rows are NaN
         assert result["atr_14"].isna().sum() >= 13
@@ -214,12 +211,12 @@ class TestComputeAtr:
 
 class TestComputeVolumeZscore:
     def test_zscore_mean_near_zero(self, ohlcv):
-        result = compute_volume_zscore(ohlcv)
+        result = compute_factors(ohlcv, ["vol_zscore_20"])
         valid = result["vol_zscore_20"].dropna()
         assert abs(valid.mean()) < 1.0
 
     def test_zscore_nan_count(self, ohlcv):
-        result = compute_volume_zscore(ohlcv)
+        result = compute_factors(ohlcv, ["vol_zscore_20"])
         assert result["vol_zscore_20"].isna().sum() >= 19
 
 
@@ -238,3 +235,152 @@ class TestComputeAllFactors:
     def test_no_duplicate_columns(self, ohlcv):
         result = compute_all_factors(ohlcv)
         assert len(result.columns) == len(set(result.columns))
+
+
+# --- Incremental ---
+
+
+# --- Factor graph ---
+
+
+def _reference_factors(df):
+    """The original per-group formulas, kept as an oracle for the factor graph."""
+    close, high, low = df["close"], df["high"], df["low"]
+    out = pd.DataFrame(index=df.index)
+    for period in (1, 5, 20, 63):
+        out[f"ret_{period}d"] = close.pct_change(period)
+    for window in (20, 60, 120):
+        out[f"sma_{window}"] = close.rolling(window).mean()
+    out["ema_12"] = close.ewm(span=12, adjust=False).mean()
+    out["ema_26"] = close.ewm(span=26, adjust=False).mean()
+    out["macd"] = out["ema_12"] - out["ema_26"]
+    out["macd_signal"] = out["macd"].ewm(span=9, adjust=False).mean()
+    out["roc"] = (close / close.shift(12) - 1) * 100
+
+    delta = close.diff()
+    avg_gain = delta.where(delta > 0, 0.0).ewm(alpha=1 / 14, min_periods=14, adjust=False).mean()
+    avg_loss = (-delta).where(delta < 0, 0.0).ewm(
+        alpha=1 / 14, min_periods=14, adjust=False
+    ).mean()
+    out["rsi_14"] = np.where(
+        avg_gain.isna(),
+        np.nan,
+        np.where(
+            avg_loss == 0,
+            np.where(avg_gain == 0, 50.0, 100.0),
+            100 - 100 / (1 + avg_gain / avg_loss),
+        ),
+    )
+
+    out["vol_20"] = close.pct_change().rolling(20).std() * np.sqrt(252)
+    prev_close = close.shift(1)
+    tr = pd.concat(
+        [high - low, (high - prev_close).abs(), (low - prev_close).abs()], axis=1,
+    ).max(axis=1)
+    out["atr_14"] = tr.ewm(alpha=1 / 14, min_periods=14, adjust=False).mean()
+
+    vol = df["volume"].astype(float)
+    z = (vol - vol.rolling(20).mean()) / vol.rolling(20).std()
+    out["vol_zscore_20"] = z.replace([np.inf, -np.inf], np.nan)
+    return out
+
+
+class TestFactorPlan:
+    def test_graph_matches_reference_formulas(self):
+        df = _make_ohlcv(n=300)
+        expected = _reference_factors(df)
+        got = compute_factors(df)
+        assert list(got.columns) == ALL_FACTOR_NAMES
+        np.testing.assert_array_equal(got.to_numpy(), expected[ALL_FACTOR_NAMES].to_numpy())
+
+    def test_subset_in_requested_order(self, ohlcv):
+        got = compute_factors(ohlcv, ["vol_20", "rsi_14"])
+        assert list(got.columns) == ["vol_20", "rsi_14"]
+        pd.testing.assert_frame_equal(got, compute_all_factors(ohlcv)[["vol_20", "rsi_14"]])
+
+    def test_shared_intermediates_once(self):
+        plan = plan_factors(["macd_signal", "ema_12", "vol_20"])
+        assert plan.steps == ("ema_12", "ema_26", "macd", "macd_signal", "ret_1d", "vol_20")
+        assert plan.factors == ("macd_signal", "ema_12", "vol_20")
+
+    def test_lookback(self):
+        assert plan_factors().lookback_rows == 119  # sma_120
+        assert plan_factors(["ret_63d", "vol_20"]).lookback_rows == 63
+        assert plan_factors(["vol_20"]).lookback_rows == 20  # ret_1d + 19
+        assert plan_factors(["macd_signal"]).lookback_rows == 78 + 27  # ema_26 + signal warmup
+
+    def test_unknown_or_private_name(self):
+        with pytest.raises(ValueError, match="Unknown factor names"):
+            plan_factors(["rsi_99"])
+        with pytest.raises(ValueError, match="Unknown factor names"):
+            plan_factors(["_true_range"])
+
+
+class TestComputeFactorsPanel:
+    def test_matches_per_asset(self):
+        frames = {
+            "A": _make_ohlcv(n=300, seed=1),
+            "B": _make_ohlcv(n=200, seed=2).iloc[40:],  # starts later
+            "C": _make_ohlcv(n=250, seed=3).iloc[:180],  # ends earlier
+        }
+        panel = compute_factors_panel(build_panel(frames))
+        assert list(panel) == ALL_FACTOR_NAMES
+        for asset_id, df in frames.items():
+            expected = compute_factors(df)
+            got = pd.DataFrame({n: panel[n][asset_id] for n in ALL_FACTOR_NAMES}).reindex(df.index)
+            np.testing.assert_array_equal(got.to_numpy(), expected.to_numpy())
+
+    def test_subset(self, ohlcv):
+        panel = compute_factors_panel(build_panel({"A": ohlcv, "B": ohlcv * 2}), ["rsi_14"])
+        assert list(panel) == ["rsi_14"]
+        pd.testing.assert_series_equal(
+            panel["rsi_14"]["A"], panel["rsi_14"]["B"], check_names=False
+        )
+
+
+class TestComputeFactorsIncremental:
+    def _split(self, df, cut):
+        from research_engine.factors import INCREMENTAL_TAIL_ROWS
+
+        history = df.iloc[:cut]
+        return history.iloc[-INCREMENTAL_TAIL_ROWS:], df.iloc[cut:], ewm_state(history)
+
+    def test_matches_full_recompute(self):
+        df = _make_ohlcv(n=300)
+        tail, new, state = self._split(df, 260)
+        got, _ = compute_factors_incremental(tail, new, state)
+        expected = compute_all_factors(df)[ALL_FACTOR_NAMES].iloc[260:]
+
+        assert list(got.columns) == ALL_FACTOR_NAMES
+        assert got.index.equals(new.index)
+        ewm_cols = ["ema_12", "ema_26", "macd", "macd_signal", "rsi_14", "atr_14"]
+        pd.testing.assert_frame_equal(got[ewm_cols], expected[ewm_cols])
+        pd.testing.assert_frame_equal(got, expected, rtol=1e-12)
+
+    def test_chained_state(self):
+        """Two incremental steps equal one step over the same rows."""
+        df = _make_ohlcv(n=300)
+        tail, new, state = self._split(df, 200)
+        once, final_once = compute_factors_incremental(tail, new, state)
+
+        first, mid_state = compute_factors_incremental(tail, new.iloc[:50], state)
+        tail2 = pd.concat([tail, new.iloc[:50]]).iloc[-len(tail):]
+        second, final_twice = compute_factors_incremental(tail2, new.iloc[50:], mid_state)
+
+        pd.testing.assert_frame_equal(pd.concat([first, second]), once, rtol=1e-12)
+        assert final_twice == final_once
+        assert final_once["n_obs"] == 300
+
+    def test_warmup_nan_on_short_history(self):
+        df = _make_ohlcv(n=30)
+        tail, new, state = self._split(df, 5)
+        got, _ = compute_factors_incremental(tail, new, state)
+        expected = compute_all_factors(df)[ALL_FACTOR_NAMES].iloc[5:]
+        pd.testing.assert_frame_equal(got, expected, rtol=1e-12)
+
+    def test_empty_new(self):
+        df = _make_ohlcv(n=50)
+        tail, _, state = self._split(df, 50)
+        got, new_state = compute_factors_incremental(tail, df.iloc[0:0], state)
+        assert got.empty
+        assert new_state == state
@@ -0,0 +1,160 @@
+"""Tests for collector.fetch_cache (on-disk Parquet FDR cache)."""
+
+import os
+import time
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from collector import fetch_cache
+from collector.fdr_client import _fetch_raw, fetch_ohlcv
+from collector.fetch_cache import (
+    FetchCache,
+    FetchCacheConfigError,
+    FetchCacheMiss,
+    configure_fetch_cache,
+    get_fetch_cache,
+)
+
+
+def _raw(n=5, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.normal(0, 1, n).cumsum()
+    return pd.DataFrame(
+        {
+            "Open": close, "High": close + 1, "Low": close - 1, "Close": close,
+            "Volume": rng.integers(1000, 2000, n), "Change": np.r_[np.nan, np.diff(close) / 100],
+        },
+        index=pd.DatetimeIndex(pd.bdate_range("2026-01-02", periods=n), name="Date"),
+    )
+
+
+def _age(cache: FetchCache, seconds: float) -> None:
+    past = time.time() - seconds
+    for path in cache.cache_dir.glob("*.parquet"):
+        os.utime(path, (past, past))
+
+
+class TestFetchCache:
+    def test_round_trip(self, tmp_path):
+        cache = FetchCache(tmp_path)
+        df = _raw()
+        cache.put("KS200", "2026-01-01", "2026-01-31", df)
+
+        got = cache.get("KS200", "2026-01-01", "2026-01-31")
+        pd.testing.assert_frame_equal(got, df, check_freq=False)
+        assert cache.get("KS200", "2026-01-01", "2026-02-28") is None
+
+    def test_ttl_expiry(self, tmp_path):
+        cache = FetchCache(tmp_path, ttl_seconds=60)
+        cache.put("KS200", "2026-01-01", None, _raw())
+        _age(cache, 120)
+        assert cache.get("KS200", "2026-01-01", None) is None
+
+    def test_offline_ignores_ttl_and_raises_on_miss(self, tmp_path):
+        FetchCache(tmp_path, ttl_seconds=60).put("KS200", "2026-01-01", None, _raw())
+        offline = FetchCache(tmp_path, ttl_seconds=60, offline=True)
+        _age(offline, 10_000)
+
+        assert offline.get("KS200", "2026-01-01", None) is not None
+        with pytest.raises(FetchCacheMiss):
+            offline.get("SPY", "2026-01-01", None)
+
+    def test_size_eviction_drops_least_recently_used(self, tmp_path):
+        cache = FetchCache(tmp_path)
+        for i, sym in enumerate(["A", "B", "C"]):
+            cache.put(sym, None, None, _raw(n=200, seed=i))
+        _age(cache, 100)
+        cache.get("A", None, None)  # A becomes most recently used
+
+        one_file = max(p.stat().st_size for p in tmp_path.glob("*.parquet"))
+        cache.max_bytes = int(one_file * 2.5)
+        assert cache.evict() == 1
+        assert cache.get("A", None, None) is not None
+        assert cache.get("B", None, None) is None
+
+    def test_expired_entries_evicted(self, tmp_path):
+        cache = FetchCache(tmp_path, ttl_seconds=60)
+        cache.put("A", None, None, _raw())
+        _age(cache, 120)
+        assert cache.evict() == 1
+        assert list(tmp_path.glob("*.parquet")) == []
+
+
+class TestFetchRawWithCache:
+    def test_second_call_served_from_disk(self, tmp_path):
+        cache = FetchCache(tmp_path)
+        reader = MagicMock(return_value=_raw())
+        with (
+            patch("collector.fdr_client.get_fetch_cache", return_value=cache),
+            patch("FinanceDataReader.DataReader", reader),
+        ):
+            first = _fetch_raw("KS200", "2026-01-01", "2026-01-31")
+            second = _fetch_raw("KS200", "2026-01-01", "2026-01-31")
+
+        assert reader.call_count == 1
+        pd.testing.assert_frame_equal(first, second, check_freq=False)
+
+    def test_empty_response_not_cached(self, tmp_path):
+        cache = FetchCache(tmp_path)
+        with (
+            patch("collector.fdr_client.get_fetch_cache", return_value=cache),
+            patch("FinanceDataReader.DataReader", return_value=pd.DataFrame()),
+        ):
+            _fetch_raw("KS200", "2026-01-01", "2026-01-31")
+        assert list(tmp_path.glob("*.parquet")) == []
+
+    def test_offline_replay_pipeline(self, tmp_path):
+        """A cached window replays through fetch_ohlcv without network or retries."""
+        FetchCache(tmp_path).put("KS200", "2026-01-01", "2026-01-31", _raw())
+        offline = FetchCache(tmp_path, offline=True)
+        reader = MagicMock(side_effect=AssertionError("network used"))
+
+        with (
+            patch("collector.fdr_client.get_fetch_cache", return_value=offline),
+            patch("FinanceDataReader.DataReader", reader),
+        ):
+            df = fetch_ohlcv("KS200", "2026-01-01", "2026-01-31")
+            assert len(df) == 5
+            assert set(df["asset_id"]) == {"KS200"}
+
+            t0 = time.perf_counter()
+            with pytest.raises(RuntimeError, match="No cached response"):
+                fetch_ohlcv("SPY", "2026-01-01", "2026-01-31")
+            assert time.perf_counter() - t0 < 0.5  # no backoff sleeps
+
+        reader.assert_not_called()
+
+
+class TestConfigureFetchCache:
+    @pytest.fixture(autouse=True)
+    def _reset(self):
+        with (
+            patch.object(fetch_cache, "_cache", None),
+            patch.object(fetch_cache, "_configured", False),
+        ):
+            yield
+
+    def test_offline_without_cache_dir_refuses_to_fetch(self):
+        reader = MagicMock(side_effect=AssertionError("network used"))
+        with (
+            patch("collector.fetch_cache.settings.fdr_cache_dir", ""),
+            patch("collector.fetch_cache.settings.fdr_offline", True),
+            patch("FinanceDataReader.DataReader", reader),
+        ):
+            with pytest.raises(FetchCacheConfigError):
+                configure_fetch_cache(None, offline=True)
+            with pytest.raises(FetchCacheConfigError):
+                get_fetch_cache()
+            t0 = time.perf_counter()
+            with pytest.raises(FetchCacheConfigError):
+                fetch_ohlcv("KS200", "2026-01-01", "2026-01-31")
+            assert time.perf_counter() - t0 < 0.5  # no retries
+
+        reader.assert_not_called()
+
+    def test_online_without_cache_dir_disables_cache(self):
+        assert configure_fetch_cache("", offline=False) is None
+
@@ -3,6 +3,7 @@
 from datetime import date
 from unittest.mock import MagicMock, patch
 
+import pandas as pd
 import pytest
 
 from api.services.analysis.indicator_signal_service import (
@@ -323,33 +324,23 @@ class TestGenerateIndicatorSignals:
         assert "macd" in VALID_INDICATOR_IDS
         assert "atr_vol" in VALID_INDICATOR_IDS
 
-    @patch("api.services.analysis.indicator_signal_service.price_repo")
+    @patch("api.services.analysis.indicator_signal_service.get_ts_cache")
     @patch("api.services.analysis.indicator_signal_service.factor_repo")
-    def test_rsi_integration(self, mock_factor_repo, mock_price_repo):
+    def test_rsi_integration(self, mock_factor_repo, mock_cache):
         """Full integration: factor_repo → signal generation."""
         ds = _dates(5)
         db = MagicMock()
 
-        # Mock factor_repo.get_factors
-        rsi_rows = []
-        rsi_values = [35.0, 31.0, 28.0, 25.0, 32.0]
-        for i, d in enumerate(ds):
-            row = MagicMock()
-            row.date = d
-            row.value = rsi_values[i]
-            rsi_rows.append(row)
-
-        mock_factor_repo.get_factors.return_value = rsi_rows
-
-        # Mock price_repo.get_prices
-        price_rows = []
-        for d in ds:
-            row = MagicMock()
-            row.date = d
-            row.close = 100.0
-            price_rows.append(row)
+        # Mock factor_repo.get_factor_frame
+        mock_factor_repo.get_factor_frame.return_value = pd.DataFrame(
+            {"rsi_14": [35.0, 31.0, 28.0, 25.0, 32.0]},
+            index=pd.DatetimeIndex(ds, name="date"),
+        )
 
-        mock_price_repo.get_prices.return_value = price_rows
+        # Mock the cached close series
+        mock_cache.return_value.close_series.return_value = pd.Series(
+            100.0, index=pd.DatetimeIndex(ds)
+        )
 
         signals = generate_indicator_signals(db, "005930", "rsi_14")
 
@@ -357,13 +348,17 @@ class TestGenerateIndicatorSignals:
         assert all(isinstance(s, IndicatorSignal) for s in signals)
         assert all(s.indicator_id == "rsi_14" for s in signals)
 
-    @patch("api.services.analysis.indicator_signal_service.price_repo")
+    @patch("api.services.analysis.indicator_signal_service.get_ts_cache")
     @patch("api.services.analysis.indicator_signal_service.factor_repo")
-    def test_empty_data(self, mock_factor_repo, mock_price_repo):
+    def test_empty_data(self, mock_factor_repo, mock_cache):
         """No factor data → empty signals."""
         db = MagicMock()
-        mock_factor_repo.get_factors.return_value = []
-        mock_price_repo.get_prices.return_value = []
+        mock_factor_repo.get_factor_frame.return_value = pd.DataFrame(
+            columns=["rsi_14"], index=pd.DatetimeIndex([], name="date"), dtype=float,
+        )
+        mock_cache.return_value.close_series.return_value = pd.Series(
+            dtype=float, index=pd.DatetimeIndex([])
+        )
 
         signals = generate_indicator_signals(db, "005930", "rsi_14")
 
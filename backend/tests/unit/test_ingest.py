@@ -1,15 +1,27 @@
 """Tests for collector.ingest."""
 
 import json
+import threading
+import time
+from datetime import date, datetime, timezone
 from unittest.mock import MagicMock, patch
 
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
 from collector.ingest import (
     IngestResult,
+    _drop_unchanged,
     _finish_job_run,
+    _sync_start,
     _upsert,
     ingest_all,
     ingest_asset,
 )
+from collector.rate_limit import RateLimiter
+from db.models import Base, PriceDaily
 
 
 class TestIngestAsset:
@@ -154,3 +166,274 @@ class TestIngestAll:
         with patch("collector.ingest.fetch_ohlcv", return_value=sample_ohlcv_df):
             results = ingest_all("2026-01-01", "2026-01-10")
             assert len(results) == 15
+
+
+class TestIngestConcurrent:
+    def test_results_in_asset_order(self, sample_ohlcv_df):
+        def slow_first(asset_id, start, end):
+            if asset_id == "A":
+                time.sleep(0.1)
+            return sample_ohlcv_df
+
+        with patch("collector.ingest.fetch_ohlcv", side_effect=slow_first):
+            results = ingest_all("2026-01-01", "2026-01-10", asset_ids=["A", "B", "C"], workers=3)
+
+        assert [r.asset_id for r in results] == ["A", "B", "C"]
+        assert all(r.status == "success" for r in results)
+
+    def test_single_writer_thread(self, sample_ohlcv_df):
+        """All upserts and commits run on the calling thread."""
+        mock_session = MagicMock()
+        writer_threads = set()
+
+        def record_upsert(session, df):
+            writer_threads.add(threading.get_ident())
+            return len(df)
+
+        with (
+            patch("collector.ingest.fetch_ohlcv", return_value=sample_ohlcv_df),
+            patch("collector.ingest._upsert", side_effect=record_upsert),
+        ):
+            results = ingest_all(
+                "2026-01-01", "2026-01-10", session=mock_session,
+                asset_ids=["A", "B", "C", "D"], workers=4,
+            )
+
+        assert writer_threads == {threading.get_ident()}
+        assert sum(r.row_count for r in results) == 12
+
+    def test_slow_asset_does_not_stall_others(self, sample_ohlcv_df):
+        def fetch(asset_id, start, end):
+            time.sleep(0.3 if asset_id == "SLOW" else 0.01)
+            return sample_ohlcv_df
+
+        stored = []
+        with (
+            patch("collector.ingest.fetch_ohlcv", side_effect=fetch),
+            patch(
+                "collector.ingest._upsert",
+                side_effect=lambda s, df: stored.append(time.perf_counter()) or 3,
+            ),
+        ):
+            t0 = time.perf_counter()
+            ingest_all(
+                "2026-01-01", "2026-01-10", session=MagicMock(),
+                asset_ids=["SLOW", "A", "B"], workers=3,
+            )
+
+        # A and B are written before SLOW finishes fetching
+        assert stored[0] - t0 < 0.25
+
+    def test_job_run_committed_before_assets(self, sample_ohlcv_df):
+        """The job row survives a per-asset rollback."""
+        mock_session = MagicMock()
+        events = []
+        mock_session.commit.side_effect = lambda: events.append("commit")
+        mock_session.rollback.side_effect = lambda: events.append("rollback")
+
+        with (
+            patch("collector.ingest.fetch_ohlcv", return_value=sample_ohlcv_df),
+            patch("collector.ingest._upsert", side_effect=Exception("DB down")),
+        ):
+            results = ingest_all(
+                "2026-01-01", "2026-01-10", session=mock_session,
+                asset_ids=["A", "B"], workers=2,
+            )
+
+        assert events[0] == "commit"
+        assert all(r.status == "fetch_failed" for r in results)
+        job = mock_session.add.call_args_list[0][0][0]
+        assert job.status == "failure"
+
+    def test_abort_marks_job_failed(self, sample_ohlcv_df):
+        mock_session = MagicMock()
+        with (
+            patch("collector.ingest.fetch_ohlcv", return_value=sample_ohlcv_df),
+            patch("collector.ingest._store", side_effect=KeyboardInterrupt),
+            pytest.raises(KeyboardInterrupt),
+        ):
+            ingest_all(
+                "2026-01-01", "2026-01-10", session=mock_session,
+                asset_ids=["A", "B"], workers=2,
+            )
+
+        job = mock_session.add.call_args_list[0][0][0]
+        assert job.status == "failure"
+        assert job.ended_at is not None
+        assert "aborted" in json.loads(job.error_message)
+
+    def test_writer_error_does_not_hang_workers(self, sample_ohlcv_df):
+        """Workers blocked on the full handoff queue exit once the writer aborts."""
+        outcome = {}
+
+        def run():
+            try:
+                ingest_all(
+                    "2026-01-01", "2026-01-10", session=MagicMock(),
+                    asset_ids=["A", "B", "C", "D", "E", "F"], workers=4,
+                )
+            except RuntimeError as e:
+                outcome["error"] = e
+
+        with (
+            patch("collector.ingest.settings.ingest_queue_size", 1),
+            patch("collector.ingest.fetch_ohlcv", return_value=sample_ohlcv_df),
+            patch("collector.ingest._store", side_effect=RuntimeError("writer died")),
+        ):
+            thread = threading.Thread(target=run, daemon=True)
+            thread.start()
+            thread.join(timeout=5)
+
+        assert not thread.is_alive()
+        assert str(outcome["error"]) == "writer died"
+
+
+class TestRateLimiter:
+    def test_spaces_calls_across_threads(self):
+        limiter = RateLimiter(rate_per_sec=50)  # 20ms interval
+        stamps = []
+        lock = threading.Lock()
+
+        def call():
+            limiter.acquire()
+            with lock:
+                stamps.append(time.monotonic())
+
+        threads = [threading.Thread(target=call) for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        stamps.sort()
+        assert stamps[-1] - stamps[0] >= 4 * 0.02 * 0.9
+
+    def test_zero_rate_is_unlimited(self):
+        assert RateLimiter(0).acquire() == 0.0
+
+
+# --- Sync (delta) mode ---
+
+
+def _prices(dates, close=100.0, asset_id="KS200"):
+    n = len(dates)
+    closes = [close] * n if isinstance(close, float) else close
+    return pd.DataFrame({
+        "asset_id": [asset_id] * n,
+        "date": pd.to_datetime(dates),
+        "open": closes,
+        "high": [c + 1 for c in closes],
+        "low": [c - 1 for c in closes],
+        "close": closes,
+        "volume": [1000] * n,
+        "source": ["fdr"] * n,
+        "ingested_at": [datetime(2026, 1, 1, tzinfo=timezone.utc)] * n,
+    })
+
+
+@pytest.fixture
+def price_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    _upsert(session, _prices(["2026-01-05", "2026-01-06", "2026-01-07"]))
+    session.commit()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+class TestSyncWindow:
+    def test_gap_plus_overlap(self, price_session):
+        assert _sync_start(price_session, "KS200", None, "2026-01-20", 3) == "2026-01-04"
+
+    def test_start_is_floor(self, price_session):
+        assert _sync_start(price_session, "KS200", "2026-01-06", "2026-01-20", 3) == "2026-01-06"
+
+    def test_up_to_date(self, price_session):
+        assert _sync_start(price_session, "KS200", None, "2026-01-07", 3) is None
+
+    def test_no_stored_rows_uses_start(self, price_session):
+        assert _sync_start(price_session, "SPY", "2020-01-01", "2026-01-20", 3) == "2020-01-01"
+        with pytest.raises(ValueError):
+            _sync_start(price_session, "SPY", None, "2026-01-20", 3)
+
+
+class TestDropUnchanged:
+    def test_only_changed_and_new_rows_kept(self, price_session):
+        fetched = _prices(
+            ["2026-01-06", "2026-01-07", "2026-01-08"], close=[100.0, 101.5, 102.0],
+        )
+        rows, unchanged = _drop_unchanged(price_session, fetched)
+
+        assert unchanged == 1
+        assert pd.to_datetime(rows["date"]).dt.date.tolist() == [date(2026, 1, 7), date(2026, 1, 8)]
+
+
+class TestIngestSync:
+    def _run(self, session, fetched, **kwargs):
+        calls = []
+
+        def fetch(asset_id, start, end):
+            calls.append((asset_id, start, end))
+            return fetched
+
+        with (
+            patch("collector.ingest.fetch_ohlcv", side_effect=fetch),
+            patch("collector.ingest.settings.ingest_sync_overlap_days", 2),
+        ):
+            result = ingest_asset("KS200", None, "2026-01-09", session, sync=True)
+        return result, calls
+
+    def test_fetches_gap_and_skips_unchanged(self, price_session):
+        fetched = _prices(["2026-01-06", "2026-01-07", "2026-01-08", "2026-01-09"])
+        result, calls = self._run(price_session, fetched)
+
+        assert calls == [("KS200", "2026-01-05", "2026-01-09")]
+        assert result.status == "success"
+        assert result.row_count == 2
+        assert result.unchanged_count == 2
+
+        stored = price_session.execute(
+            select(PriceDaily.date, PriceDaily.ingested_at).order_by(PriceDaily.date)
+        ).all()
+        assert [d for d, _ in stored][-1] == date(2026, 1, 9)
+        assert len(stored) == 5
+
+    def test_nothing_changed_writes_nothing(self, price_session):
+        fetched = _prices(["2026-01-06", "2026-01-07"])
+        with patch("collector.ingest._upsert") as upsert:
+            result, _ = self._run(price_session, fetched)
+
+        upsert.assert_not_called()
+        assert result.row_count == 0
+        assert result.unchanged_count == 2
+
+    def test_up_to_date_skips_fetch(self, price_session):
+        with patch("collector.ingest.fetch_ohlcv") as fetch:
+            result = ingest_asset("KS200", None, "2026-01-07", price_session, sync=True)
+
+        fetch.assert_not_called()
+        assert result.status == "success"
+        assert result.row_count == 0
+
+    def test_ingest_all_concurrent_sync(self, price_session):
+        fetched = _prices(["2026-01-07", "2026-01-08"])
+        spy = _prices(["2026-01-07", "2026-01-08"], asset_id="SPY")
+        calls = {}
+
+        def fetch(asset_id, start, end):
+            calls[asset_id] = start
+            return spy if asset_id == "SPY" else fetched
+
+        with patch("collector.ingest.fetch_ohlcv", side_effect=fetch):
+            results = ingest_all(
+                "2026-01-01", "2026-01-08", session=price_session,
+                asset_ids=["KS200", "SPY"], workers=2, sync=True,
+            )
+
+        assert calls == {"KS200": "2026-01-01", "SPY": "2026-01-01"}
+        by_id = {r.asset_id: r for r in results}
+        assert by_id["KS200"].row_count == 1 and by_id["KS200"].unchanged_count == 1
+        assert by_id["SPY"].row_count == 2
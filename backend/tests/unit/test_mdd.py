@@ -8,7 +8,7 @@ import numpy as np
 import pandas as pd
 import pytest
 
-from research_engine.simulation.mdd import mdd_by_calendar_year
+from research_engine.simulation.mdd import mdd_by_calendar_year, mdd_by_calendar_year_arrays
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
@@ -111,3 +111,12 @@ def test_dense_series_qqq_2022_like():
 
     result = mdd_by_calendar_year(s)
     assert result[2022] <= -0.25, f"2022 MDD={result[2022]:.2%}, expected ≤ -25%"
+
+
+def test_arrays_version_matches_groupby():
+    """배열 버전 = groupby 버전 (여러 해, 연도 경계)."""
+    rng = np.random.default_rng(0)
+    idx = pd.bdate_range("2019-06-01", "2023-03-31")
+    s = pd.Series(1e6 * np.cumprod(1 + rng.normal(0, 0.01, len(idx))), index=idx)
+    assert mdd_by_calendar_year_arrays(idx.to_numpy(), s.to_numpy()) == mdd_by_calendar_year(s)
+    assert mdd_by_calendar_year_arrays(idx.to_numpy()[:0], s.to_numpy()[:0]) == {}
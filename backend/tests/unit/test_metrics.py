@@ -231,3 +231,70 @@ class TestMetricsToDict:
         assert d["bh_total_return"] is None
         assert d["bh_cagr"] is None
         assert d["excess_return"] is None
+
+
+# ---------------------------------------------------------------------------
+# Test: batch metrics
+# ---------------------------------------------------------------------------
+
+def _assert_same_metrics(actual, expected):
+    for name, value in vars(expected).items():
+        got = getattr(actual, name)
+        if value is None:
+            assert got is None, name
+        elif np.isnan(value):
+            assert np.isnan(got), name
+        else:
+            assert got == pytest.approx(value, rel=1e-12, abs=1e-15), name
+
+
+class TestComputeMetricsBatch:
+    @pytest.fixture
+    def batch(self):
+        from research_engine.backtest import run_backtest_batch
+
+        rng = np.random.default_rng(3)
+        k, n = 40, 400
+        closes = 100 * np.cumprod(1 + rng.normal(0.0004, 0.015, (k, n)), axis=1)
+        opens = closes * (1 + rng.normal(0, 0.003, (k, n)))
+        closes[:3, :120] = opens[:3, :120] = np.nan  # late listings
+        closes[5] = opens[5] = np.nan  # no data at all
+        closes[6, 2:] = opens[6, 2:] = np.nan  # two bars only
+        signals = np.where(rng.random((k, n)) < 0.03, rng.choice([1.0, 0.0], (k, n)), np.nan)
+        return run_backtest_batch(opens, closes, signals, BacktestConfig())
+
+    def test_matches_scalar(self, batch):
+        from research_engine.backtest import batch_to_results
+        from research_engine.metrics import compute_metrics_from_batch
+
+        k, n = batch.equity.shape
+        results = batch_to_results(
+            batch, [f"A{i}" for i in range(k)], "s", pd.bdate_range("2020-01-01", periods=n)
+        )
+        batch_metrics = compute_metrics_from_batch(batch)
+        assert len(batch_metrics) == k
+        for i, result in enumerate(results):
+            _assert_same_metrics(batch_metrics[i], compute_metrics(result))
+            assert metrics_to_dict(batch_metrics[i]) == metrics_to_dict(compute_metrics(result))
+
+    def test_risk_free_rate(self):
+        from research_engine.metrics import compute_metrics_batch
+
+        equities = [100.0, 101.0, 99.0, 103.0, 102.0, 104.0]
+        batch = compute_metrics_batch(np.array([equities]), risk_free_rate=0.03)
+        _assert_same_metrics(batch[0], compute_metrics(_make_result(equities), 0.03))
+
+    def test_trade_table(self):
+        from research_engine.metrics import compute_metrics_batch
+
+        equity = np.tile(np.linspace(100, 110, 10), (3, 1))
+        batch = compute_metrics_batch(
+            equity,
+            trade_row=np.array([0, 0, 0, 2]),
+            trade_pnl=np.array([5.0, -1.0, 9.0, np.nan]),
+            trade_closed=np.array([True, True, False, True]),
+        )
+        assert batch.num_trades.tolist() == [2, 0, 1]
+        assert batch.win_rate.tolist() == [0.5, 0.0, 0.0]
+        assert batch.avg_trade_pnl[0] == 2.0
+        assert batch[1].bh_cagr is None
@@ -1,11 +1,14 @@
 """portfolio.py unit tests — 마스터플랜 §3.6.
 
 Portfolio: preset 비중, 월 적립 분배, 연 리밸런싱.
+run_portfolio: 같은 규칙의 패널 엔진 — Portfolio 일별 루프와 비교.
 """
 
+import numpy as np
+import pandas as pd
 import pytest
 
-from research_engine.simulation.portfolio import PRESETS, Portfolio
+from research_engine.simulation.portfolio import PRESETS, Portfolio, PortfolioPreset, run_portfolio
 
 # ── helpers ───────────────────────────────────────────────────────────────────
 
@@ -132,3 +135,135 @@ def test_dividends_increase_shares():
     assert port.holdings["QQQ"] > before_qqq  # 배당 0.6%
     assert port.holdings["TLT"] > 0            # 배당 3.8%
     assert port.holdings["BTC"] == pytest.approx(before_btc, rel=1e-9)  # 배당 0%
+
+
+# ── 패널 엔진 (run_portfolio) ─────────────────────────────────────────────────
+
+
+def _panel(seed: int = 0, years: int = 4):
+    """QQQ/TLT (USD, 영업일) + BTC (KRW, 매일) — 합집합 날짜, forward-fill."""
+    rng = np.random.default_rng(seed)
+    cal = pd.date_range("2019-01-01", periods=365 * years)
+    business = cal.dayofweek < 5
+    prices = 100 * np.cumprod(1 + rng.normal(0.0003, 0.015, (len(cal), 3)), axis=0)
+    prices[~business, :2] = np.nan
+    prices = pd.DataFrame(prices, index=cal, columns=["QQQ", "TLT", "BTC"]).ffill().to_numpy()
+    fx = 1200 + np.cumsum(rng.normal(0, 2, len(cal)))
+    fx_rates = np.column_stack([fx, fx, np.ones(len(cal))])
+    return cal.to_numpy(), prices, fx_rates
+
+
+def _reference(dates, prices, fx_rates, weights, yields, amount, rebalance_days):
+    """Portfolio 클래스로 하루씩 진행한 참조 곡선."""
+    codes = list(weights)
+    port = Portfolio(PortfolioPreset("ref", weights))
+    months = dates.astype("datetime64[M]")
+    values = []
+    for t in range(len(dates)):
+        p = {c: prices[t, j] for j, c in enumerate(codes)}
+        fx = {c: fx_rates[t, j] for j, c in enumerate(codes)}
+        if t == 0 or months[t] != months[t - 1]:
+            port.deposit(amount, p, fx)
+        port.apply_dividends(dict(zip(codes, yields)), p, fx)
+        if t in rebalance_days:
+            port.rebalance(p, fx)
+        values.append(port.total_krw_value(p, fx))
+    return np.array(values)
+
+
+@pytest.mark.parametrize("rebalance,period", [
+    ("yearly", "datetime64[Y]"), ("quarterly", None), ("monthly", "datetime64[M]"),
+])
+def test_run_portfolio_matches_daily_loop(rebalance, period):
+    dates, prices, fx_rates = _panel()
+    weights = PRESETS["QQQ_TLT_BTC"].weights
+    yields = [0.006, 0.035, 0.0]
+    if period is None:
+        months = dates.astype("datetime64[M]").astype(np.int64)
+        key = months // 3
+    else:
+        key = dates.astype(period).astype(np.int64)
+    ends = set(np.flatnonzero(np.r_[key[1:] != key[:-1], True]).tolist())
+
+    result = run_portfolio(
+        dates, prices, fx_rates, np.array(list(weights.values())), np.array(yields),
+        1_000_000, rebalance=rebalance,
+    )
+    expected = _reference(dates, prices, fx_rates, weights, yields, 1_000_000, ends)
+
+    np.testing.assert_allclose(result.krw_value, expected, rtol=1e-9)
+    assert result.rebalance_count == len(ends)
+    assert result.total_deposit_krw == 1_000_000 * len(np.unique(dates.astype("datetime64[M]")))
+
+
+def test_run_portfolio_none_and_threshold():
+    dates, prices, fx_rates = _panel(seed=1)
+    args = (dates, prices, fx_rates, np.array([0.5, 0.3, 0.2]), np.zeros(3), 1_000_000)
+
+    none = run_portfolio(*args, rebalance="none")
+    tight = run_portfolio(*args, rebalance="threshold", threshold=0.01)
+    loose = run_portfolio(*args, rebalance="threshold", threshold=0.9)
+
+    assert none.rebalance_count == 0
+    # 리밸런싱 없이 적립만 → 보유 수량은 적립분 합
+    months = dates.astype("datetime64[M]")
+    first = np.r_[True, months[1:] != months[:-1]]
+    bought = (1_000_000 * np.array([0.5, 0.3, 0.2]) / fx_rates[first]) / prices[first]
+    np.testing.assert_allclose(none.holdings[-1], bought.sum(axis=0), rtol=1e-12)
+    np.testing.assert_allclose(loose.krw_value, none.krw_value, rtol=1e-12)
+    assert tight.rebalance_count > 0
+
+    # 참조: 매일 비중 이탈을 검사해 넘으면 Portfolio.rebalance
+    weights = {"QQQ": 0.5, "TLT": 0.3, "BTC": 0.2}
+    port = Portfolio(PortfolioPreset("ref", weights))
+    expected, count = [], 0
+    for t in range(len(dates)):
+        p = dict(zip(weights, prices[t]))
+        fx = dict(zip(weights, fx_rates[t]))
+        if first[t]:
+            port.deposit(1_000_000, p, fx)
+        current = port.current_weights(p, fx)
+        if max(abs(current[c] - w) for c, w in weights.items()) > 0.01:
+            port.rebalance(p, fx)
+            count += 1
+        expected.append(port.total_krw_value(p, fx))
+    np.testing.assert_allclose(tight.krw_value, expected, rtol=1e-9)
+    assert tight.rebalance_count == count
+
+
+def test_run_portfolio_renormalizes_before_listing():
+    dates, prices, fx_rates = _panel(seed=2, years=2)
+    prices[:100, 2] = np.nan  # BTC 상장 전
+    result = run_portfolio(
+        dates, prices, fx_rates, np.array([0.6, 0.2, 0.2]), np.zeros(3), 1_000_000,
+        rebalance="none",
+    )
+
+    assert (result.holdings[:100, 2] == 0).all()
+    # 첫 적립은 QQQ/TLT 에 0.75/0.25 로 전액 투입
+    first = result.holdings[0] * prices[0] * fx_rates[0]
+    np.testing.assert_allclose(first[:2], [750_000, 250_000])
+    assert result.holdings[-1, 2] > 0
+
+
+def test_run_portfolio_rejects_unknown_frequency():
+    dates, prices, fx_rates = _panel(years=1)
+    with pytest.raises(ValueError, match="rebalance"):
+        run_portfolio(dates, prices, fx_rates, np.ones(3) / 3, np.zeros(3), 1, rebalance="weekly")
+
+
+def test_portfolio_request_validation():
+    from pydantic import ValidationError
+
+    from api.schemas.simulation import SimulatePortfolioRequest
+
+    custom = SimulatePortfolioRequest(weights={"QQQ": 0.7, "BTC": 0.3}, monthly_amount=1_000_000)
+    assert custom.preset_key is None and custom.rebalance == "yearly"
+    for bad in (
+        {},
+        {"preset_key": "QQQ_TLT_BTC", "weights": {"QQQ": 1.0}},
+        {"weights": {"QQQ": 0.7, "BTC": 0.2}},
+        {"weights": {"QQQ": 1.2, "BTC": -0.2}},
+    ):
+        with pytest.raises(ValidationError):
+            SimulatePortfolioRequest(monthly_amount=1_000_000, **bad)
@@ -0,0 +1,118 @@
+"""Tests for db.price_loader — one-query multi-asset price loading."""
+
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from db.models import Base, PriceDaily
+from db.price_loader import fetch_price_arrays, load_price_frames, load_price_panel
+from research_engine.preprocessing import load_prices
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    return engine
+
+
+@pytest.fixture
+def session(engine):
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def _add_prices(session, asset_id, start="2025-01-02", n=5, close=100.0, source="fdr"):
+    for i, d in enumerate(pd.bdate_range(start, periods=n)):
+        session.add(PriceDaily(
+            asset_id=asset_id, date=d.date(), source=source,
+            open=close + i, high=close + i + 1, low=close + i - 1, close=close + i,
+            volume=1000 + i,
+        ))
+    session.commit()
+
+
+def _count_selects(engine):
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _record(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    return statements
+
+
+class TestFetchPriceArrays:
+    def test_one_query_for_many_assets(self, engine, session):
+        _add_prices(session, "KS200", n=4)
+        _add_prices(session, "SPY", n=3, close=500.0)
+        statements = _count_selects(engine)
+
+        arrays = fetch_price_arrays(session, ["SPY", "KS200", "NONE"])
+
+        assert len(statements) == 1
+        assert list(arrays) == ["SPY", "KS200", "NONE"]
+        dates, values = arrays["KS200"]
+        assert dates.dtype == np.dtype("datetime64[ns]")
+        assert values["close"].tolist() == [100.0, 101.0, 102.0, 103.0]
+        assert values["volume"].dtype == np.int64
+        assert arrays["SPY"][1]["close"].tolist() == [500.0, 501.0, 502.0]
+        assert len(arrays["NONE"][0]) == 0
+
+    def test_date_range_and_columns(self, session):
+        _add_prices(session, "KS200", n=5)
+        dates, values = fetch_price_arrays(
+            session, ["KS200"], ["close"], start="2025-01-03", end=datetime.date(2025, 1, 7)
+        )["KS200"]
+        assert list(values) == ["close"]
+        assert values["close"].tolist() == [101.0, 102.0, 103.0]
+        assert pd.Timestamp(dates[0]) == pd.Timestamp("2025-01-03")
+
+    def test_duplicate_sources_keep_last(self, session):
+        _add_prices(session, "KS200", n=3, close=100.0, source="fdr")
+        _add_prices(session, "KS200", n=3, close=200.0, source="krx")
+        _add_prices(session, "SPY", n=2, close=500.0)
+        arrays = fetch_price_arrays(session, ["KS200", "SPY"])
+        assert arrays["KS200"][1]["close"].tolist() == [200.0, 201.0, 202.0]
+        assert arrays["SPY"][1]["close"].tolist() == [500.0, 501.0]
+
+
+class TestFramesAndPanel:
+    def test_frames_match_load_prices(self, session):
+        _add_prices(session, "KS200", n=5)
+        frame = load_price_frames(session, ["KS200"])["KS200"]
+        single = load_prices(session, "KS200")
+
+        pd.testing.assert_frame_equal(frame, single)
+        assert list(frame.columns) == ["open", "high", "low", "close", "volume"]
+        assert frame.index.name == "date"
+
+    def test_load_prices_missing_raises(self, session):
+        with pytest.raises(ValueError, match="No price data for KS200"):
+            load_prices(session, "KS200")
+
+    def test_panel_aligns_on_union_of_dates(self, session):
+        _add_prices(session, "KS200", start="2025-01-02", n=3)
+        _add_prices(session, "SPY", start="2025-01-06", n=2, close=500.0)
+        panel = load_price_panel(session, ["KS200", "SPY", "NONE"])
+
+        assert list(panel.columns) == ["KS200", "SPY", "NONE"]
+        assert panel.index.tolist() == list(pd.to_datetime(
+            ["2025-01-02", "2025-01-03", "2025-01-06", "2025-01-07"]
+        ))
+        assert panel["KS200"].tolist()[:3] == [100.0, 101.0, 102.0]
+        assert np.isnan(panel["KS200"].iloc[3])
+        assert panel["SPY"].tolist()[2:] == [500.0, 501.0]
+        assert panel["NONE"].isna().all()
+
+    def test_empty_panel(self, session):
+        panel = load_price_panel(session, [])
+        assert panel.empty and isinstance(panel.index, pd.DatetimeIndex)
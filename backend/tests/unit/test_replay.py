@@ -4,15 +4,21 @@ replay_core()를 중심으로 DB 없이 순수 로직 검증.
 """
 
 from datetime import date
+from decimal import Decimal
 
 import numpy as np
 import pandas as pd
 import pytest
 
+from db.models import AssetMaster
 from research_engine.simulation.replay import (
     EquityPoint,
     KpiResult,
+    _align_fx,
+    _first_trading_days_of_month,
     compute_kpi,
+    compute_kpi_arrays,
+    replay_arrays,
     replay_core,
 )
 
@@ -203,3 +209,217 @@ def test_replay_monthly_deposit_count():
     # 실 적립 횟수 ≈ n_days / 21 (거래일 기준 월 수)
     assert kpi.total_deposit_krw > 0
     assert kpi.total_deposit_krw % monthly == 0  # 정수배
+
+
+# ── 배열 커널: 일별 루프 구현과 일치 ─────────────────────────────────────────
+
+
+def _reference_replay(prices, fx_series, currency, annual_yield, monthly):
+    """기존 일별 루프 구현 (배열 커널 검증용)."""
+    mult = 1.0 + annual_yield / 252.0
+    first_days = _first_trading_days_of_month(prices.index)
+    shares, total, rows = 0.0, 0, []
+    for ts in prices.index:
+        price = float(prices[ts])
+        fx_rate = None
+        if currency == "USD" and fx_series is not None:
+            fx_rate = float(fx_series[ts]) if ts in fx_series.index else float(fx_series.asof(ts))
+        if ts in first_days:
+            if currency == "USD" and fx_rate:
+                shares += (monthly / fx_rate) / price
+            else:
+                shares += monthly / price
+            total += monthly
+        shares *= mult
+        local = shares * price
+        rows.append((shares, local, local * fx_rate if currency == "USD" and fx_rate else local))
+    return np.array(rows), total
+
+
+def _random_inputs(seed: int, n: int = 2520):
+    rng = np.random.default_rng(seed)
+    prices = pd.Series(
+        100 * np.cumprod(1 + rng.normal(0, 0.01, n)), index=pd.bdate_range("2015-01-01", periods=n)
+    )
+    fx_idx = pd.date_range("2015-01-01", prices.index[-1], freq="D")
+    fx_idx = fx_idx[rng.random(len(fx_idx)) > 0.2]  # 누락일 → asof
+    fx = pd.Series(1200 + rng.normal(0, 10, len(fx_idx)), index=fx_idx)
+    return prices, fx
+
+
+@pytest.mark.parametrize("currency,annual_yield", [
+    ("KRW", 0.0), ("KRW", 0.035), ("USD", 0.0), ("USD", 0.08),
+])
+def test_replay_arrays_match_daily_loop(currency, annual_yield):
+    prices, fx = _random_inputs(7)
+    expected, total = _reference_replay(prices, fx, currency, annual_yield, 1_000_000)
+
+    curve, kpi = replay_arrays(prices, fx, currency, annual_yield, 1_000_000, 10)
+
+    got = np.column_stack([curve.shares, curve.local_value, curve.krw_value])
+    np.testing.assert_allclose(got, expected, rtol=1e-12)
+    if annual_yield == 0.0:
+        np.testing.assert_array_equal(got, expected)  # 단순 cumsum — 비트 단위 일치
+    assert curve.total_deposit_krw == total == kpi.total_deposit_krw
+    assert kpi.final_asset_krw == pytest.approx(expected[-1, 2], rel=1e-12)
+
+
+def test_align_fx_matches_series_lookup():
+    idx = pd.to_datetime(["2024-01-02", "2024-01-03", "2024-01-05", "2024-01-08"])
+    fx = pd.Series(
+        [1300.0, np.nan, 1320.0],
+        index=pd.to_datetime(["2024-01-03", "2024-01-05", "2024-01-06"]),
+    )
+    aligned = _align_fx(fx, idx.to_numpy())
+    # 01-02: 이전 값 없음 → NaN / 01-03: 정확히 일치 / 01-05: 같은 날짜 NaN 그대로 / 01-08: asof
+    np.testing.assert_array_equal(aligned, [np.nan, 1300.0, np.nan, 1320.0])
+    assert np.isnan(_align_fx(pd.Series(dtype=float), idx.to_numpy())).all()
+
+
+def test_replay_curve_to_points():
+    prices = _krw_prices("2023-01-02", 30)
+    curve, _ = replay_arrays(prices, None, "KRW", 0.035, 1_000_000, 1)
+    points = curve.to_points()
+    assert len(points) == len(curve) == 30
+    assert points[0].date == date(2023, 1, 2)
+    assert isinstance(points[-1].krw_value, float)
+    assert points[-1].shares == curve.shares[-1]
+
+
+def test_compute_kpi_arrays_matches_compute_kpi():
+    prices, _ = _random_inputs(3, n=600)
+    curve, kpi = replay_arrays(prices, None, "KRW", 0.02, 500_000, 3)
+    assert compute_kpi(curve.to_points(), curve.total_deposit_krw, 3) == kpi
+    assert compute_kpi_arrays(curve.dates[:0], curve.krw_value[:0], 0, 3) == KpiResult(
+        0.0, 0.0, 0.0, 0.0, 0
+    )
+
+
+# ── 단위 적립금 curve 저장소 ─────────────────────────────────────────────────
+
+
+@pytest.fixture
+def replay_db():
+    from datetime import timedelta
+
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from db.models import AssetMaster, Base, FxDaily, PriceDaily
+
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    rng = np.random.default_rng(5)
+    idx = pd.bdate_range(end=date.today(), periods=252 * 4)
+    for asset_id, currency, annual_yield in (("KS200", "KRW", 0.0), ("SCHD", "USD", 0.035)):
+        session.add(AssetMaster(
+            asset_id=asset_id, name=asset_id, category="etf", source_priority={},
+            currency=currency, annual_yield=annual_yield,
+        ))
+        closes = 100 * np.cumprod(1 + rng.normal(0, 0.01, len(idx)))
+        for d, c in zip(idx, closes.tolist()):
+            session.add(PriceDaily(
+                asset_id=asset_id, date=d.date(), source="fdr",
+                open=c, high=c, low=c, close=c, volume=1,
+            ))
+    for i in range((idx[-1] - idx[0]).days + 1):
+        session.add(FxDaily(date=idx[0].date() + timedelta(days=i), usd_krw_close=1300.0 + i % 7))
+    session.commit()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def fresh_caches():
+    from unittest.mock import patch
+
+    from db.ts_cache import TimeSeriesCache
+    from research_engine.simulation import replay as replay_mod
+
+    cache = TimeSeriesCache()
+    store = replay_mod.UnitCurveStore(max_entries=8)
+    with (
+        patch.object(replay_mod, "get_ts_cache", return_value=cache),
+        patch.object(replay_mod, "get_unit_store", return_value=store),
+    ):
+        yield cache, store
+
+
+@pytest.mark.parametrize("asset_code", ["KS200", "SCHD"])
+def test_replay_scales_unit_curve(replay_db, fresh_caches, asset_code):
+    from research_engine.simulation import replay as replay_mod
+
+    _, store = fresh_caches
+    curve_a, kpi_a = replay_mod.replay(asset_code, 1_000_000, 3, replay_db)
+    curve_b, kpi_b = replay_mod.replay(asset_code, 250_000, 3, replay_db)
+    assert store.stats()["misses"] == 1 and store.stats()["hits"] == 1
+
+    inputs = replay_mod._replay_inputs(
+        asset_code, replay_db.get(AssetMaster, asset_code), 3, date.today(), replay_db
+    )
+    direct, kpi_direct = replay_core(
+        inputs.prices, inputs.fx_series, inputs.currency, inputs.annual_yield, 250_000, 3
+    )
+    assert [p.date for p in curve_b] == [p.date for p in direct]
+    np.testing.assert_allclose(
+        [p.krw_value for p in curve_b], [p.krw_value for p in direct], rtol=1e-12
+    )
+    assert kpi_b.total_deposit_krw == kpi_direct.total_deposit_krw == kpi_a.total_deposit_krw // 4
+    assert kpi_b.final_asset_krw == pytest.approx(kpi_direct.final_asset_krw, rel=1e-12)
+    assert kpi_b.yearly_worst_mdd == pytest.approx(kpi_a.yearly_worst_mdd, rel=1e-12)
+
+
+def test_ingest_invalidation_recomputes(replay_db, fresh_caches):
+    from research_engine.simulation import replay as replay_mod
+
+    cache, store = fresh_caches
+    replay_mod.replay("KS200", 1_000_000, 3, replay_db)
+    cache.invalidate()
+    replay_mod.replay("KS200", 1_000_000, 3, replay_db)
+    assert store.stats()["misses"] == 2
+
+
+def test_fx_refresh_invalidates_usd_unit_curves(replay_db):
+    """fx_collector.run 후 다음 replay는 store를 놓치고 새 환율로 계산한다."""
+    from unittest.mock import patch
+
+    from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+    from sqlalchemy.orm import sessionmaker
+
+    from collector import fx_collector
+    from db.models import FxDaily
+    from db.ts_cache import TimeSeriesCache
+    from research_engine.simulation import replay as replay_mod
+
+    cache = TimeSeriesCache(check_seconds=0)  # 다른 프로세스: data_version으로만 갱신
+    store = replay_mod.UnitCurveStore(max_entries=8)
+    last = replay_db.query(FxDaily).order_by(FxDaily.date.desc()).first().date
+    new_rates = pd.DataFrame({"date": [last], "usd_krw_close": [Decimal("2000.0")]})
+
+    with (
+        patch.object(replay_mod, "get_ts_cache", return_value=cache),
+        patch.object(replay_mod, "get_unit_store", return_value=store),
+    ):
+        _, before = replay_mod.replay("SCHD", 1_000_000, 3, replay_db)
+        with (
+            patch.object(fx_collector, "collect_usd_krw", return_value=new_rates),
+            patch.object(fx_collector, "insert", sqlite_insert),
+            patch.object(fx_collector, "SessionLocal", sessionmaker(bind=replay_db.get_bind())),
+            patch.object(fx_collector, "get_ts_cache", return_value=TimeSeriesCache()),
+        ):
+            assert fx_collector.run("2020-01-01", "2030-01-01")["status"] == "success"
+        replay_db.expire_all()
+        _, after = replay_mod.replay("SCHD", 1_000_000, 3, replay_db)
+
+    assert store.stats()["misses"] == 2 and store.stats()["hits"] == 0
+    assert after.final_asset_krw > before.final_asset_krw * 1.4
+
+
+def test_unknown_asset_raises(replay_db, fresh_caches):
+    from research_engine.simulation import replay as replay_mod
+
+    with pytest.raises(ValueError, match="asset not found"):
+        replay_mod.replay("NOPE", 1_000_000, 3, replay_db)
@@ -14,6 +14,7 @@ class TestParseArgs:
         assert args.strategy is None
         assert args.initial_cash == 10_000_000
         assert args.skip_backtest is False
+        assert args.incremental is False
         assert args.log_level == "INFO"
 
     def test_all_args(self):
@@ -0,0 +1,181 @@
+"""simulation_service.simulate_batch — 시나리오 합집합 로드 + 병렬 계산.
+
+각 시나리오 결과가 Tab A/B/C 단건 서비스 결과와 같은지, 가격·환율이
+한 번씩만 조회되는지 검증.
+"""
+
+from datetime import date, timedelta
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from api.schemas.simulation import (
+    SimulateBatchRequest,
+    SimulatePortfolioRequest,
+    SimulateReplayRequest,
+    SimulateStrategyRequest,
+)
+from api.services import simulation_service
+from db.models import AssetMaster, Base, FxDaily, PriceDaily
+from db.ts_cache import TimeSeriesCache
+from research_engine.simulation import replay as replay_mod
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    rng = np.random.default_rng(11)
+    business = pd.bdate_range(end=date.today(), periods=252 * 4)
+    calendar = pd.date_range(business[0], business[-1])
+    for asset_id, currency, annual_yield, index in (
+        ("QQQ", "USD", 0.006, business),
+        ("TLT", "USD", 0.035, business),
+        ("KS200", "KRW", 0.0, business),
+        ("BTC", "KRW", 0.0, calendar),
+    ):
+        session.add(AssetMaster(
+            asset_id=asset_id, name=asset_id, category="etf", source_priority={},
+            currency=currency, annual_yield=annual_yield,
+        ))
+        closes = 100 * np.cumprod(1 + rng.normal(0.0003, 0.012, len(index)))
+        for d, c in zip(index, closes.tolist()):
+            session.add(PriceDaily(
+                asset_id=asset_id, date=d.date(), source="fdr",
+                open=c, high=c, low=c, close=c, volume=1,
+            ))
+    for i in range(len(calendar) + 10):
+        session.add(FxDaily(
+            date=calendar[0].date() - timedelta(days=10) + timedelta(days=i),
+            usd_krw_close=1300.0 + (i * 7) % 13,
+        ))
+    session.commit()
+    session.close()
+    return engine
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine)()
+    cache = TimeSeriesCache()
+    with (
+        patch.object(simulation_service, "get_ts_cache", return_value=cache),
+        patch.object(replay_mod, "get_ts_cache", return_value=cache),
+        patch.object(replay_mod, "get_unit_store", return_value=replay_mod.UnitCurveStore(8)),
+    ):
+        yield session
+    session.close()
+
+
+def _scenarios():
+    return [
+        {"kind": "replay", "asset_code": "QQQ", "monthly_amount": 500_000, "period_years": 3},
+        {"kind": "replay", "asset_code": "KS200", "period_years": 3},
+        {"kind": "strategy", "asset_code": "QQQ", "strategy": "A", "period_years": 3},
+        {"kind": "strategy", "asset_code": "KS200", "strategy": "B", "period_years": 3},
+        {"kind": "portfolio", "preset_key": "QQQ_TLT_BTC", "period_years": 3},
+        {"kind": "portfolio", "weights": {"KS200": 0.5, "BTC": 0.5}, "period_years": 3,
+         "rebalance": "quarterly"},
+    ]
+
+
+def _single(db, scenario):
+    kind = scenario["kind"]
+    fields = {k: v for k, v in scenario.items() if k != "kind"}
+    fields.setdefault("monthly_amount", 1_000_000)
+    if kind == "replay":
+        return simulation_service.simulate_replay(db, SimulateReplayRequest(**fields))
+    if kind == "strategy":
+        return simulation_service.simulate_strategy(db, SimulateStrategyRequest(**fields))
+    return simulation_service.simulate_portfolio(db, SimulatePortfolioRequest(**fields))
+
+
+def test_batch_matches_single_scenarios(db):
+    scenarios = _scenarios()
+    result = simulation_service.simulate_batch(
+        db, SimulateBatchRequest(scenarios=scenarios, include_curves=True)
+    )
+
+    assert result.kind == [s["kind"] for s in scenarios]
+    assert result.label == ["QQQ", "KS200", "QQQ:A", "KS200:B", "QQQ_TLT_BTC", "custom"]
+    assert result.error == [None] * len(scenarios)
+    for i, scenario in enumerate(scenarios):
+        single = _single(db, scenario)
+        for field in ("final_asset_krw", "total_return", "annualized_return",
+                      "yearly_worst_mdd"):
+            assert getattr(result, field)[i] == pytest.approx(
+                getattr(single.kpi, field), rel=1e-9
+            ), (i, field)
+        assert result.total_deposit_krw[i] == single.kpi.total_deposit_krw
+        assert result.curves[i].dates == [pt.date for pt in single.curve]
+        np.testing.assert_allclose(
+            result.curves[i].krw_value, [pt.krw_value for pt in single.curve], rtol=1e-9
+        )
+    assert result.event_count[2] is not None and result.event_count[0] is None
+    assert result.rebalance_count[5] is not None and result.rebalance_count[2] is None
+
+
+def test_batch_loads_union_once(db, engine):
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    result = simulation_service.simulate_batch(db, SimulateBatchRequest(scenarios=_scenarios()))
+
+    assert result.curves is None
+    assert sum("FROM price_daily" in s and "ingested_at" not in s for s in statements) == 1
+    assert sum("FROM fx_daily" in s for s in statements) == 1
+    assert sum("FROM asset_master" in s for s in statements) == 1
+
+
+def test_batch_reports_failed_scenarios(db):
+    result = simulation_service.simulate_batch(db, SimulateBatchRequest(scenarios=[
+        {"kind": "replay", "asset_code": "NOPE", "period_years": 3},
+        {"kind": "portfolio", "preset_key": "NOPE"},
+        {"kind": "replay", "asset_code": "KS200", "period_years": 3},
+    ]))
+
+    assert "NOPE" in result.error[0] and "NOPE" in result.error[1]
+    assert result.final_asset_krw[:2] == [None, None]
+    assert result.error[2] is None and result.final_asset_krw[2] > 0
+
+
+@pytest.mark.parametrize("weights,message", [
+    ({"QQQQ": 0.5, "TLT": 0.5}, "QQQQ"),
+    ({"QQQ": 0.5, "SPY": 0.5}, "SPY"),
+])
+def test_portfolio_rejects_unknown_weight_codes(db, weights, message):
+    """오타 자산이 조용히 재정규화로 빠지지 않는다 (asset_master 없음 / 가격 없음)."""
+    if "SPY" in weights:  # asset_master에는 있지만 가격 데이터 없음
+        db.add(AssetMaster(
+            asset_id="SPY", name="SPY", category="etf", source_priority={},
+            currency="USD", annual_yield=0.0,
+        ))
+        db.commit()
+    req = SimulatePortfolioRequest(weights=weights, monthly_amount=1_000_000, period_years=3)
+    with pytest.raises(ValueError, match=message):
+        simulation_service.simulate_portfolio(db, req)
+
+    result = simulation_service.simulate_batch(db, SimulateBatchRequest(scenarios=[
+        {"kind": "portfolio", "weights": weights, "period_years": 3},
+    ]))
+    assert message in result.error[0] and result.final_asset_krw == [None]
+
+
+@pytest.mark.parametrize("scenario", [
+    {"kind": "replay"},
+    {"kind": "strategy", "asset_code": "QQQ"},
+    {"kind": "portfolio"},
+    {"kind": "portfolio", "weights": {"QQQ": 0.5}},
+])
+def test_batch_scenario_validation(scenario):
+    with pytest.raises(ValidationError):
+        SimulateBatchRequest(scenarios=[scenario])
@@ -35,15 +35,15 @@ def mock_db():
 # ---------------------------------------------------------------------------
 
 class TestComputeSpread:
-    @patch("api.services.analysis.spread_service.price_repo")
-    def test_basic_spread(self, mock_price, mock_db):
+    @patch("api.services.analysis.spread_service.get_ts_cache")
+    def test_basic_spread(self, mock_cache, mock_db, closes_from_rows):
         """Two assets with same trend → spread ≈ 1.0, z-scores ≈ 0."""
         def _side(db, aid, **kw):
             if aid == "A":
                 return _make_prices("A", 100.0, 20, trend=0.01)
             return _make_prices("B", 50.0, 20, trend=0.01)
 
-        mock_price.get_prices.side_effect = _side
+        mock_cache.return_value.close_series.side_effect = closes_from_rows(_side)
 
         result = compute_spread(mock_db, "A", "B")
         assert result.asset_a == "A"
@@ -55,37 +55,37 @@ class TestComputeSpread:
         for v in result.spread_values:
             assert 0.9 < v < 1.1
 
-    @patch("api.services.analysis.spread_service.price_repo")
-    def test_diverging_assets(self, mock_price, mock_db):
+    @patch("api.services.analysis.spread_service.get_ts_cache")
+    def test_diverging_assets(self, mock_cache, mock_db, closes_from_rows):
         """Assets diverging → spread deviates from 1.0."""
         def _side(db, aid, **kw):
             if aid == "A":
                 return _make_prices("A", 100.0, 30, trend=0.05)  # strong up
             return _make_prices("B", 100.0, 30, trend=-0.01)  # slight down
 
-        mock_price.get_prices.side_effect = _side
+        mock_cache.return_value.close_series.side_effect = closes_from_rows(_side)
 
         result = compute_spread(mock_db, "A", "B")
         # Last spread should be > 1 (A grew more)
         assert result.spread_values[-1] > 1.0
         assert result.std > 0
 
-    @patch("api.services.analysis.spread_service.price_repo")
-    def test_z_scores_normalized(self, mock_price, mock_db):
+    @patch("api.services.analysis.spread_service.get_ts_cache")
+    def test_z_scores_normalized(self, mock_cache, mock_db, closes_from_rows):
         """Z-scores should have mean ≈ 0."""
         def _side(db, aid, **kw):
             if aid == "A":
                 return _make_prices("A", 100.0, 30, trend=0.02)
             return _make_prices("B", 200.0, 30, trend=0.01)
 
-        mock_price.get_prices.side_effect = _side
+        mock_cache.return_value.close_series.side_effect = closes_from_rows(_side)
 
         result = compute_spread(mock_db, "A", "B")
         avg_z = sum(result.z_scores) / len(result.z_scores)
         assert abs(avg_z) < 0.5  # z-scores centered near 0
 
-    @patch("api.services.analysis.spread_service.price_repo")
-    def test_convergence_events_detected(self, mock_price, mock_db):
+    @patch("api.services.analysis.spread_service.get_ts_cache")
+    def test_convergence_events_detected(self, mock_cache, mock_db, closes_from_rows):
         """Strong divergence should trigger events."""
         # Create asset B with a spike in the middle
         prices_a = []
@@ -112,22 +112,22 @@ class TestComputeSpread:
                 return list(reversed(prices_a))
             return list(reversed(prices_b))
 
-        mock_price.get_prices.side_effect = _side
+        mock_cache.return_value.close_series.side_effect = closes_from_rows(_side)
 
         result = compute_spread(mock_db, "A", "B", z_threshold=1.5)
         # Should detect at least some events due to the spike
         assert len(result.convergence_events) >= 1
 
-    @patch("api.services.analysis.spread_service.price_repo")
-    def test_empty_data_raises(self, mock_price, mock_db):
+    @patch("api.services.analysis.spread_service.get_ts_cache")
+    def test_empty_data_raises(self, mock_cache, mock_db, closes_from_rows):
         """No data → ValueError."""
-        mock_price.get_prices.return_value = []
+        mock_cache.return_value.close_series.side_effect = closes_from_rows(lambda *a, **kw: [])
 
         with pytest.raises(ValueError, match="Insufficient price data"):
             compute_spread(mock_db, "A", "B")
 
-    @patch("api.services.analysis.spread_service.price_repo")
-    def test_insufficient_overlap_raises(self, mock_price, mock_db):
+    @patch("api.services.analysis.spread_service.get_ts_cache")
+    def test_insufficient_overlap_raises(self, mock_cache, mock_db, closes_from_rows):
         """Non-overlapping dates → ValueError."""
         def _side(db, aid, **kw):
             if aid == "A":
@@ -142,48 +142,48 @@ class TestComputeSpread:
                 prices.append(m)
             return list(reversed(prices))
 
-        mock_price.get_prices.side_effect = _side
+        mock_cache.return_value.close_series.side_effect = closes_from_rows(_side)
 
         with pytest.raises(ValueError, match="Insufficient overlapping"):
             compute_spread(mock_db, "A", "B")
 
-    @patch("api.services.analysis.spread_service.price_repo")
-    def test_date_params_passed(self, mock_price, mock_db):
-        """start_date and end_date are passed to price_repo."""
+    @patch("api.services.analysis.spread_service.get_ts_cache")
+    def test_date_params_passed(self, mock_cache, mock_db, closes_from_rows):
+        """start_date and end_date are passed to the price cache."""
         def _side(db, aid, **kw):
             return _make_prices(aid, 100.0, 10)
 
-        mock_price.get_prices.side_effect = _side
+        mock_cache.return_value.close_series.side_effect = closes_from_rows(_side)
 
         start = date(2026, 1, 1)
         end = date(2026, 1, 31)
         compute_spread(mock_db, "A", "B", start_date=start, end_date=end)
 
-        calls = mock_price.get_prices.call_args_list
+        calls = mock_cache.return_value.close_series.call_args_list
         for call in calls:
             assert call.kwargs["start_date"] == start
             assert call.kwargs["end_date"] == end
 
-    @patch("api.services.analysis.spread_service.price_repo")
-    def test_current_z_score(self, mock_price, mock_db):
+    @patch("api.services.analysis.spread_service.get_ts_cache")
+    def test_current_z_score(self, mock_cache, mock_db, closes_from_rows):
         """current_z_score is the last z-score."""
         def _side(db, aid, **kw):
             return _make_prices(aid, 100.0, 15, trend=0.01)
 
-        mock_price.get_prices.side_effect = _side
+        mock_cache.return_value.close_series.side_effect = closes_from_rows(_side)
 
         result = compute_spread(mock_db, "A", "B")
         assert result.current_z_score == result.z_scores[-1]
 
-    @patch("api.services.analysis.spread_service.price_repo")
-    def test_event_directions(self, mock_price, mock_db):
+    @patch("api.services.analysis.spread_service.get_ts_cache")
+    def test_event_directions(self, mock_cache, mock_db, closes_from_rows):
         """Convergence events have valid direction values."""
         def _side(db, aid, **kw):
             if aid == "A":
                 return _make_prices("A", 100.0, 30, trend=0.05)
             return _make_prices("B", 100.0, 30, trend=-0.02)
 
-        mock_price.get_prices.side_effect = _side
+        mock_cache.return_value.close_series.side_effect = closes_from_rows(_side)
 
         result = compute_spread(mock_db, "A", "B", z_threshold=1.0)
         for event in result.convergence_events:
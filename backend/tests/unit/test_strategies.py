@@ -7,7 +7,12 @@ import pandas as pd
 import pytest
 
 from research_engine.strategies import STRATEGY_REGISTRY, get_strategy
-from research_engine.strategies.base import SignalResult, Strategy, _empty_signal_df
+from research_engine.strategies.base import (
+    SignalResult,
+    Strategy,
+    _empty_signal_df,
+    position_from_events,
+)
 from research_engine.strategies.mean_reversion import MeanReversionStrategy
 from research_engine.strategies.momentum import MomentumStrategy
 from research_engine.strategies.trend import TrendStrategy
@@ -339,3 +344,97 @@ class TestMeanReversionStrategy:
         if len(non_null_meta) > 0:
             meta = non_null_meta.iloc[0]
             assert "zscore" in meta
+
+
+# ---------------------------------------------------------------------------
+# Vectorized state machine
+# ---------------------------------------------------------------------------
+
+def _loop_momentum(entry, exit_):
+    """Per-row reference of the entry/exit state machine."""
+    out, in_pos = [], False
+    for e, x in zip(entry, exit_):
+        if not in_pos:
+            in_pos = bool(e)
+        elif x:
+            in_pos = False
+        out.append(int(in_pos))
+    return out
+
+
+def _loop_mean_reversion(z, entry_z, exit_z, stop_z):
+    out, in_pos, triggered = [], False, False
+    for v in z:
+        if not in_pos:
+            if v <= entry_z:
+                triggered = True
+            elif triggered:
+                in_pos, triggered = True, False
+        elif v >= exit_z or v <= stop_z:
+            in_pos = False
+        out.append(int(in_pos))
+    return out
+
+
+class TestPositionFromEvents:
+    def test_basic_entry_exit(self):
+        entry = np.array([0, 1, 0, 1, 1, 0, 0], dtype=bool)
+        exit_ = np.array([0, 1, 0, 1, 0, 0, 1], dtype=bool)
+        # Exits are checked from the day after entry; entries from the day after exit
+        assert position_from_events(entry, exit_).tolist() == [0, 1, 1, 0, 1, 1, 0]
+
+    def test_no_events(self):
+        flat = np.zeros(5, dtype=bool)
+        assert position_from_events(flat, flat).tolist() == [0] * 5
+
+    def test_matches_loop_on_random_masks(self):
+        rng = np.random.default_rng(0)
+        for _ in range(50):
+            entry = rng.random(200) < 0.1
+            exit_ = rng.random(200) < 0.2
+            assert position_from_events(entry, exit_).tolist() == _loop_momentum(entry, exit_)
+
+    def test_momentum_matches_loop(self):
+        factors = _make_factors_df(n=300)
+        strat = MomentumStrategy(ret_threshold=0.05, vol_cap=0.3)
+        raw = strat._raw_signals(factors)
+        entry = (factors["ret_63d"] > 0.05) & (factors["vol_20"] < 0.3)
+        exit_ = (factors["ret_63d"] < 0.0) | (factors["vol_20"] >= 0.3)
+        assert raw["signal"].tolist() == _loop_momentum(entry, exit_)
+
+    def test_mean_reversion_matches_loop(self):
+        rng = np.random.default_rng(5)
+        close = 100 * np.cumprod(1 + rng.normal(0, 0.03, 400))
+        factors = _make_factors_df(n=400, close=close)
+        strat = MeanReversionStrategy(lookback=10, entry_z=-1.0, exit_z=0.0, stop_z=-1.8)
+        raw = strat._raw_signals(factors)
+
+        close_s = factors["close"]
+        z = ((close_s - close_s.rolling(10).mean()) / close_s.rolling(10).std()).fillna(0.0)
+        assert raw["signal"].tolist() == _loop_mean_reversion(z, -1.0, 0.0, -1.8)
+
+
+class TestLazyMeta:
+    def test_without_meta_signals_unchanged(self):
+        factors = _make_factors_df()
+        strat = MomentumStrategy()
+        full = strat.generate_signals(factors, "TEST")
+        lean = strat.generate_signals(factors, "TEST", with_meta=False)
+
+        assert lean.signals["meta_json"].isna().all()
+        pd.testing.assert_frame_equal(
+            full.signals.drop(columns="meta_json"), lean.signals.drop(columns="meta_json"),
+        )
+
+    def test_meta_none_when_value_missing(self):
+        ret = _make_factors_df()["ret_63d"].to_numpy().copy()
+        ret[:5] = np.nan
+        result = MomentumStrategy().generate_signals(_make_factors_df(ret_63d=ret), "TEST")
+        meta = result.signals["meta_json"]
+        assert meta.iloc[:5].isna().all()
+        assert set(meta.iloc[5]) == {"ret_63d", "vol_20"}
+
+    def test_trend_meta_uses_configured_columns(self):
+        strat = TrendStrategy(fast_col="ema_12", slow_col="ema_26")
+        result = strat.generate_signals(_make_factors_df(), "TEST")
+        assert set(result.signals["meta_json"].iloc[0]) == {"ema_12", "ema_26"}
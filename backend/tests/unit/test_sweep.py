@@ -0,0 +1,149 @@
+"""Tests for the parameter sweep runner and its CLI."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from research_engine.backtest import BacktestConfig, run_backtest
+from research_engine.metrics import compute_metrics, metrics_to_dict
+from research_engine.strategies import get_strategy
+from research_engine.sweep import (
+    build_sweep_frame,
+    evaluate_param_group,
+    expand_grid,
+    run_sweep,
+)
+from scripts.run_sweep import _load_grids, parse_args
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _make_ohlcv(n: int = 300, seed: int = 1) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2022-01-03", periods=n)
+    close = 100 * np.cumprod(1 + rng.normal(0.0005, 0.015, n))
+    opens = close * (1 + rng.normal(0, 0.005, n))
+    return pd.DataFrame({
+        "open": opens,
+        "high": np.maximum(opens, close) * 1.01,
+        "low": np.minimum(opens, close) * 0.99,
+        "close": close,
+        "volume": rng.integers(1_000, 10_000, n).astype(float),
+    }, index=dates)
+
+
+@pytest.fixture
+def inputs():
+    return {"A": build_sweep_frame(_make_ohlcv(seed=1)), "B": build_sweep_frame(_make_ohlcv(seed=2))}
+
+
+# ---------------------------------------------------------------------------
+# Grid expansion
+# ---------------------------------------------------------------------------
+
+class TestExpandGrid:
+    def test_cartesian_product(self):
+        combos = expand_grid({"a": [1, 2], "b": ["x", "y", "z"]})
+        assert len(combos) == 6
+        assert combos[0] == {"a": 1, "b": "x"}
+        assert combos[-1] == {"a": 2, "b": "z"}
+
+    def test_empty_grid_is_default_params(self):
+        assert expand_grid({}) == [{}]
+
+
+# ---------------------------------------------------------------------------
+# Evaluation
+# ---------------------------------------------------------------------------
+
+class TestEvaluate:
+    def test_matches_single_backtest(self, inputs):
+        """Batch-evaluated metrics equal the one-at-a-time pipeline."""
+        frame = inputs["A"]
+        params = [{"lookback": 10, "entry_z": -1.5}, {"lookback": 20, "entry_z": -2.0}]
+        cfg = BacktestConfig()
+        rows = evaluate_param_group(frame, "A", "mean_reversion", params, cfg)
+
+        assert [r["status"] for r in rows] == ["success", "success"]
+        for row, p in zip(rows, params):
+            sig = get_strategy("mean_reversion", **p).generate_signals(frame, "A")
+            single = run_backtest(frame, sig.signals, "A", "mean_reversion", cfg)
+            expected = metrics_to_dict(compute_metrics(single))
+            for key, value in expected.items():
+                assert row[key] == value, key
+
+    def test_bad_params_reported_not_raised(self, inputs):
+        rows = evaluate_param_group(
+            inputs["A"], "A", "momentum", [{"no_such_param": 1}], BacktestConfig(),
+        )
+        assert rows[0]["status"] == "failed"
+        assert "no_such_param" in rows[0]["error"]
+
+
+# ---------------------------------------------------------------------------
+# Sweep runner
+# ---------------------------------------------------------------------------
+
+class TestRunSweep:
+    GRIDS = {
+        "momentum": {"ret_threshold": [0.0, 0.05], "vol_cap": [0.3, 0.6]},
+        "trend": {"fast_col": ["sma_20", "ema_12"]},
+    }
+
+    def test_ranked_table(self, inputs):
+        table = run_sweep(inputs, self.GRIDS, max_workers=1)
+
+        assert len(table) == 2 * (4 + 2)
+        assert table["rank"].tolist() == list(range(1, len(table) + 1))
+        sharpe = table["sharpe"].to_numpy()
+        assert (np.diff(sharpe) <= 0).all()
+
+    def test_process_pool_matches_inline(self, inputs):
+        inline = run_sweep(inputs, self.GRIDS, max_workers=1, chunk_size=2)
+        pooled = run_sweep(inputs, self.GRIDS, max_workers=2, chunk_size=2)
+
+        key = ["asset_id", "strategy_id", "cagr", "sharpe"]
+        a = inline[key].sort_values(key).reset_index(drop=True)
+        b = pooled[key].sort_values(key).reset_index(drop=True)
+        pd.testing.assert_frame_equal(a, b)
+
+    def test_unknown_strategy(self, inputs):
+        with pytest.raises(KeyError):
+            run_sweep(inputs, strategy_names=["nope"], max_workers=1)
+
+    def test_unknown_rank_metric(self, inputs):
+        with pytest.raises(KeyError):
+            run_sweep(inputs, self.GRIDS, max_workers=1, rank_by="nope")
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+class TestCli:
+    def test_parse_args_defaults(self):
+        args = parse_args(["--start", "2024-01-01", "--end", "2024-12-31"])
+        assert args.grid is None
+        assert args.workers is None
+        assert args.rank_by == "sharpe"
+        assert args.top == 20
+
+    def test_parse_args_rejects_unknown_rank_metric(self):
+        with pytest.raises(SystemExit):
+            parse_args(["--start", "2024-01-01", "--end", "2024-12-31", "--rank-by", "sharpee"])
+
+    def test_load_grids_inline_json(self):
+        grids = _load_grids('{"trend": {"fast_col": ["sma_20"]}}')
+        assert grids == {"trend": {"fast_col": ["sma_20"]}}
+
+    def test_load_grids_from_file(self, tmp_path):
+        path = tmp_path / "grid.json"
+        path.write_text('{"momentum": {"vol_cap": [0.3]}}')
+        assert _load_grids(str(path)) == {"momentum": {"vol_cap": [0.3]}}
+
+    def test_load_grids_unknown_strategy_exits(self):
+        with pytest.raises(SystemExit):
+            _load_grids('{"nope": {}}')
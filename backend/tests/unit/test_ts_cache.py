@@ -0,0 +1,209 @@
+"""Tests for db.ts_cache — process-wide price/factor array cache."""
+
+import datetime
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from db.models import Base, FactorDaily, FactorDailyWide, JobRun, PriceDaily
+from db.ts_cache import (
+    TimeSeriesCache,
+    load_factor_block,
+    load_price_block,
+    load_price_blocks,
+)
+
+T0 = datetime.datetime(2025, 1, 10, tzinfo=datetime.timezone.utc)
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def _add_prices(session, asset_id, n=5, close=100.0, source="fdr", ingested_at=T0):
+    for i, d in enumerate(pd.bdate_range("2025-01-02", periods=n)):
+        session.add(PriceDaily(
+            asset_id=asset_id, date=d.date(), source=source,
+            open=close + i, high=close + i + 1, low=close + i - 1, close=close + i,
+            volume=1000, ingested_at=ingested_at,
+        ))
+    session.commit()
+
+
+class TestSeriesBlock:
+    def test_load_prices_sorted_and_deduplicated(self, session):
+        _add_prices(session, "KS200", n=3, close=100.0, source="fdr")
+        _add_prices(session, "KS200", n=3, close=200.0, source="krx")
+        block = load_price_block(session, "KS200")
+
+        assert len(block) == 3
+        assert block.dates.dtype == np.dtype("datetime64[ns]")
+        assert block.columns["close"].tolist() == [200.0, 201.0, 202.0]  # last source wins
+
+    def test_window_is_zero_copy_view(self, session):
+        _add_prices(session, "KS200", n=5)
+        block = load_price_block(session, "KS200")
+        window = block.window(datetime.date(2025, 1, 3), "2025-01-07")
+
+        assert window.dates.tolist() == block.dates[1:4].tolist()
+        assert np.shares_memory(window.columns["close"], block.columns["close"])
+        series = window.series("close")
+        assert np.shares_memory(series.to_numpy(), block.columns["close"])
+        assert series.name == "KS200"
+        assert isinstance(series.index, pd.DatetimeIndex)
+
+    def test_arrays_are_read_only(self, session):
+        _add_prices(session, "KS200", n=2)
+        block = load_price_block(session, "KS200")
+        with pytest.raises(ValueError):
+            block.columns["close"][0] = 0.0
+
+    def test_unknown_asset_empty(self, session):
+        block = load_price_block(session, "NOPE")
+        assert len(block) == 0
+        assert block.window("2025-01-01", "2025-12-31").series("close").empty
+
+    def test_factor_block_wide(self, session):
+        session.add(FactorDailyWide(
+            asset_id="KS200", date=datetime.date(2025, 1, 2), version="v1", rsi_14=55.0,
+        ))
+        session.commit()
+        block = load_factor_block(session, "KS200")
+        assert block.columns["rsi_14"].tolist() == [55.0]
+        assert np.isnan(block.columns["macd"][0])
+
+    def test_factor_block_long_fallback(self, session):
+        for name, value in [("rsi_14", 40.0), ("macd", 1.5)]:
+            session.add(FactorDaily(
+                asset_id="KS200", date=datetime.date(2025, 1, 2),
+                factor_name=name, version="v1", value=value,
+            ))
+        session.commit()
+        frame = load_factor_block(session, "KS200").frame(["rsi_14", "macd"])
+        assert frame.iloc[0].tolist() == [40.0, 1.5]
+
+
+class TestTimeSeriesCache:
+    def test_hits_and_misses(self, session):
+        _add_prices(session, "KS200")
+        cache = TimeSeriesCache()
+
+        first = cache.close_series(session, "KS200")
+        second = cache.close_series(session, "KS200", start_date="2025-01-06")
+
+        assert len(first) == 5 and len(second) == 3
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+        assert stats["bytes"] == cache.prices(session, "KS200").nbytes
+
+    def test_prices_many_loads_misses_together(self, session):
+        _add_prices(session, "KS200", n=3)
+        _add_prices(session, "SPY", n=2, close=500.0)
+        cache = TimeSeriesCache()
+        cache.prices(session, "KS200")
+
+        with patch("db.ts_cache.load_price_blocks", wraps=load_price_blocks) as loader:
+            blocks = cache.prices_many(session, ["KS200", "SPY", "NONE"])
+        loader.assert_called_once_with(session, ["SPY", "NONE"])
+        assert list(blocks) == ["KS200", "SPY", "NONE"]
+        assert (cache.hits, cache.misses) == (1, 3)
+
+    def test_close_panel(self, session):
+        _add_prices(session, "KS200", n=3)
+        _add_prices(session, "SPY", n=2, close=500.0)
+        panel = TimeSeriesCache().close_panel(session, ["KS200", "SPY"], "2025-01-03")
+
+        assert list(panel.columns) == ["KS200", "SPY"]
+        assert len(panel) == 2
+        assert panel["KS200"].tolist() == [101.0, 102.0]
+        assert panel["SPY"].iloc[0] == 501.0 and np.isnan(panel["SPY"].iloc[1])
+
+    def test_lru_eviction_over_budget(self, session):
+        for aid in ("A", "B", "C"):
+            _add_prices(session, aid)
+        block_bytes = load_price_block(session, "A").nbytes
+        cache = TimeSeriesCache(max_bytes=2 * block_bytes)
+
+        cache.prices(session, "A")
+        cache.prices(session, "B")
+        cache.prices(session, "A")  # A becomes most recently used
+        cache.prices(session, "C")  # evicts B
+
+        assert cache.stats()["evictions"] == 1
+        misses = cache.misses
+        cache.prices(session, "A")
+        assert cache.misses == misses
+        cache.prices(session, "B")
+        assert cache.misses == misses + 1
+
+    def test_new_job_run_invalidates(self, session):
+        _add_prices(session, "KS200", n=3)
+        cache = TimeSeriesCache(check_seconds=0)
+        assert len(cache.close_series(session, "KS200")) == 3
+
+        session.add(PriceDaily(  # same ingested_at: only the job_run moves the version
+            asset_id="KS200", date=datetime.date(2025, 1, 7), source="fdr",
+            open=1.0, high=1.0, low=1.0, close=1.0, volume=1, ingested_at=T0,
+        ))
+        session.add(JobRun(
+            job_name="ingest_all", started_at=T0, ended_at=T0 + datetime.timedelta(hours=1),
+            status="success",
+        ))
+        session.commit()
+
+        assert len(cache.close_series(session, "KS200")) == 4
+        assert cache.stats()["invalidations"] == 1
+
+    def test_unchanged_version_keeps_entries(self, session):
+        _add_prices(session, "KS200", n=3)
+        cache = TimeSeriesCache(check_seconds=0)
+        cache.prices(session, "KS200")
+        cache.prices(session, "KS200")
+        assert cache.stats()["hits"] == 1
+
+    def test_version_check_uses_ingested_at_index(self, session):
+        plan = session.execute(
+            text("EXPLAIN QUERY PLAN SELECT max(ingested_at) FROM price_daily")
+        ).all()
+        assert any("ix_price_daily_ingested_at" in row[-1] for row in plan)
+
+    def test_explicit_invalidate(self, session):
+        _add_prices(session, "KS200")
+        cache = TimeSeriesCache()
+        cache.prices(session, "KS200")
+        generation = cache.current_generation(session)
+        cache.invalidate()
+        assert cache.stats()["entries"] == 0
+        assert cache.current_generation(session) == generation + 1
+        cache.prices(session, "KS200")
+        assert cache.misses == 2
+
+    def test_load_racing_invalidate_is_not_cached(self, session):
+        """A block loaded before an invalidation must not be cached after it."""
+        _add_prices(session, "KS200", n=3)
+        cache = TimeSeriesCache()
+
+        def invalidating_loader(session, asset_ids):
+            blocks = load_price_blocks(session, asset_ids)
+            cache.invalidate()  # ingest commits while the read is in flight
+            return blocks
+
+        with patch("db.ts_cache.load_price_blocks", side_effect=invalidating_loader):
+            assert len(cache.prices(session, "KS200")) == 3
+            cache.prices_many(session, ["KS200", "SPY"])
+
+        assert cache.stats()["entries"] == 0
+        cache.prices(session, "KS200")
+        assert cache.stats()["entries"] == 1
+
@@ -0,0 +1,191 @@
+"""Tests for walk-forward evaluation (window slicing, selection, stitching, pool)."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from research_engine.backtest import BacktestConfig, run_backtest
+from research_engine.metrics import compute_metrics
+from research_engine.sweep import build_signal_matrix, build_sweep_frame
+from research_engine.walk_forward import (
+    SCORE_METRICS,
+    evaluate_windows,
+    make_windows,
+    run_walk_forward,
+    score_equity_rows,
+    summarize_walk_forward,
+)
+from scripts.run_walk_forward import parse_args
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _make_ohlcv(n: int = 400, seed: int = 1) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2021-01-04", periods=n)
+    close = 100 * np.cumprod(1 + rng.normal(0.0005, 0.015, n))
+    opens = close * (1 + rng.normal(0, 0.005, n))
+    return pd.DataFrame({
+        "open": opens,
+        "high": np.maximum(opens, close) * 1.01,
+        "low": np.minimum(opens, close) * 0.99,
+        "close": close,
+        "volume": rng.integers(1_000, 10_000, n).astype(float),
+    }, index=dates)
+
+
+GRIDS = {
+    "momentum": {"ret_threshold": [0.0, 0.05], "vol_cap": [0.3, 0.6]},
+    "trend": {"fast_col": ["sma_20", "ema_12"]},
+}
+
+
+@pytest.fixture
+def inputs():
+    return {"A": build_sweep_frame(_make_ohlcv(seed=1)), "B": build_sweep_frame(_make_ohlcv(seed=2))}
+
+
+# ---------------------------------------------------------------------------
+# Windows
+# ---------------------------------------------------------------------------
+
+class TestMakeWindows:
+    def test_rolling(self):
+        assert make_windows(10, train_bars=4, test_bars=3) == [(0, 4, 4, 7), (3, 7, 7, 10)]
+
+    def test_expanding(self):
+        assert make_windows(10, train_bars=4, test_bars=3, expanding=True) == [
+            (0, 4, 4, 7), (0, 7, 7, 10),
+        ]
+
+    def test_short_tail_dropped_and_too_short(self):
+        assert make_windows(8, train_bars=4, test_bars=3) == [(0, 4, 4, 7)]
+        assert make_windows(5, train_bars=4, test_bars=3) == []
+
+
+# ---------------------------------------------------------------------------
+# Scoring
+# ---------------------------------------------------------------------------
+
+class TestScoreEquityRows:
+    def test_matches_compute_metrics(self):
+        prices = _make_ohlcv(n=300)
+        rng = np.random.default_rng(7)
+        signals = pd.DataFrame({
+            "date": prices.index, "signal": (rng.random(300) > 0.4).astype(int),
+        })
+        result = run_backtest(prices, signals, "A", "s")
+        metrics = compute_metrics(result)
+        equity = result.equity_curve["equity"].to_numpy()
+
+        for metric in SCORE_METRICS:
+            assert score_equity_rows(equity, metric)[0] == pytest.approx(
+                getattr(metrics, metric), rel=1e-12
+            ), metric
+
+    def test_nan_rows(self):
+        equity = np.array([[100.0, 101.0, np.nan, 103.0], [np.nan] * 4])
+        scores = score_equity_rows(equity, "total_return")
+        assert scores[0] == pytest.approx(0.03)
+        assert np.isnan(scores[1])
+
+    def test_unknown_metric(self):
+        with pytest.raises(KeyError):
+            score_equity_rows(np.ones((1, 3)), "win_rate")
+
+
+# ---------------------------------------------------------------------------
+# Window evaluation
+# ---------------------------------------------------------------------------
+
+class TestEvaluateWindows:
+    def test_picks_best_train_params_and_runs_test(self, inputs):
+        frame = inputs["A"]
+        _, params, signals = build_signal_matrix(
+            frame, "A", "momentum", [{"ret_threshold": 0.0}, {"ret_threshold": 0.05}],
+        )
+        window = (50, 250, 250, 320)
+        (outcome,) = evaluate_windows(
+            frame, "A", "momentum", params, signals, [window], BacktestConfig(),
+        )
+
+        # Selection agrees with full metrics on each train slice
+        train_sharpes = []
+        for row in range(len(params)):
+            sig = pd.DataFrame({"date": frame.index[50:250], "signal": signals[row, 50:250]})
+            r = run_backtest(frame.iloc[50:250], sig, "A", "momentum")
+            train_sharpes.append(compute_metrics(r).sharpe)
+        assert outcome.params == params[int(np.argmax(train_sharpes))]
+        assert outcome.train_score == pytest.approx(max(train_sharpes))
+
+        # Test run equals a plain backtest of the chosen row on the test slice
+        best = params.index(outcome.params)
+        sig = pd.DataFrame({"date": frame.index[250:320], "signal": signals[best, 250:320]})
+        expected = run_backtest(frame.iloc[250:320], sig, "A", "momentum")
+        np.testing.assert_allclose(
+            outcome.test.equity_curve["equity"], expected.equity_curve["equity"]
+        )
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+class TestRunWalkForward:
+    def test_stitched_out_of_sample_curve(self, inputs):
+        results = run_walk_forward(
+            inputs, GRIDS, train_bars=150, test_bars=60, max_workers=1,
+        )
+
+        assert {(r.asset_id, r.strategy_id) for r in results} == {
+            (a, s) for a in ("A", "B") for s in ("momentum", "trend")
+        }
+        r = results[0]
+        windows = make_windows(400, 150, 60)
+        assert len(r.windows) == len(windows)
+        curve = r.result.equity_curve
+        assert len(curve) == 400 - 150
+        assert curve["date"].iloc[0] == inputs[r.asset_id].index[150]
+        assert (curve["drawdown"] <= 0).all()
+
+        # Window returns compound into the stitched total return
+        total = np.prod(1 + r.windows["test_return"].to_numpy()) - 1
+        assert r.metrics["total_return"] == pytest.approx(total, abs=1e-6)
+
+    def test_expanding_train_starts_at_zero(self, inputs):
+        results = run_walk_forward(
+            {"A": inputs["A"]}, GRIDS, strategy_names=["trend"],
+            train_bars=150, test_bars=60, expanding=True, max_workers=1,
+        )
+        assert (results[0].windows["train_start"] == inputs["A"].index[0]).all()
+
+    def test_process_pool_matches_inline(self, inputs):
+        kwargs = dict(train_bars=150, test_bars=60, chunk_size=2)
+        inline = run_walk_forward(inputs, GRIDS, max_workers=1, **kwargs)
+        pooled = run_walk_forward(inputs, GRIDS, max_workers=2, **kwargs)
+
+        pd.testing.assert_frame_equal(
+            summarize_walk_forward(inline), summarize_walk_forward(pooled)
+        )
+
+    def test_asset_without_enough_history_skipped(self, inputs):
+        short = {"S": build_sweep_frame(_make_ohlcv(n=100))}
+        assert run_walk_forward(short, GRIDS, train_bars=150, max_workers=1) == []
+
+    def test_unknown_strategy_and_metric(self, inputs):
+        with pytest.raises(KeyError):
+            run_walk_forward(inputs, strategy_names=["nope"], max_workers=1)
+        with pytest.raises(KeyError):
+            run_walk_forward(inputs, GRIDS, rank_by="win_rate", max_workers=1)
+
+
+class TestCli:
+    def test_parse_args_defaults(self):
+        args = parse_args(["--start", "2020-01-01", "--end", "2024-12-31"])
+        assert args.train_bars == 504
+        assert args.test_bars == 126
+        assert args.expanding is False
+        assert args.rank_by == "sharpe"